@@ -145,7 +145,7 @@ class GeneticSearch:
                     if seed_base is not None:
                         # mix in individuals to get deterministic-ish per pairing
                         random.seed((hash(tuple(individual)) + hash(tuple(opp_ind)) + i) & 0xffffffff)
-                    res = run_combat_simulation(team_a, team_b)
+                    res = run_combat_simulation(team_a, team_b, mode='outcome')
                     if _is_win(res):
                         wins += 1
                     total += 1
@@ -163,7 +163,7 @@ class GeneticSearch:
                 raise RuntimeError('No valid opponents in population')
             opp_ind = random.choice(opponents)
             opponent = self.build_team(opp_ind)
-            res = run_combat_simulation(team_a, opponent)
+            res = run_combat_simulation(team_a, opponent, mode='outcome')
             if _is_win(res):
                 wins += 1
         return wins / float(n_games)
@@ -17,7 +17,7 @@ load_dotenv(Path(__file__).parent.parent / '.env')
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'waffen-tactics' / 'src'))
 
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from waffen_tactics.models.player_state import PlayerState
 
 # Import shared combat system
@@ -46,7 +46,7 @@ app.register_blueprint(admin_bp, url_prefix='/api/admin')
 # Database path - use the same DB as Discord bot
 DB_PATH = str(Path(__file__).parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 
 print(f"📦 Using database: {DB_PATH}")
 
@@ -4,7 +4,7 @@ Game actions - handlers for game actions like buying, selling, moving units
 from flask import request, jsonify
 from pathlib import Path
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from .game_state_utils import run_async, enrich_player_state
 from services.game_actions_service import (
     buy_unit_action, sell_unit_action, move_to_board_action, switch_line_action,
@@ -14,7 +14,7 @@ from services.game_actions_service import (
 # Initialize services
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 
 
 def buy_unit(user_id):
@@ -7,8 +7,9 @@ import json
 from pathlib import Path
 import logging
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics import trace
 from services.combat_service import (
     prepare_player_units_for_combat, prepare_opponent_units_for_combat,
     run_combat_simulation, process_combat_results
@@ -19,7 +20,17 @@ from routes.auth import verify_token
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
 logger = logging.getLogger('waffen_tactics.game_combat')
-game_manager = GameManager()
+game_manager = get_game_manager()
+
+# SSE stream protocols for start_combat. 'delta' (default) sends the board
+# once in units_init, then events plus periodic state_snapshot keyframes and
+# state_delta changes in between; clients rebuild the board from those.
+# 'legacy' attaches a full game_state to every event for older frontends.
+SSE_PROTOCOLS = ('delta', 'legacy')
+# Seconds between full state_snapshot keyframes in the 'delta' protocol
+SSE_KEYFRAME_INTERVAL = 1.0
+
+
 def map_event_to_sse_payload(event_type: str, data: dict):
     """Map internal combat events to SSE payload dicts.
 
@@ -164,24 +175,15 @@ def map_event_to_sse_payload(event_type: str, data: dict):
             'timestamp': data.get('timestamp', time.time()),
             'seq': data.get('seq')
         }
-    # DEBUG: Print mapped unit_attack payloads so we can see exactly what
-    # is streamed over SSE (helps debug UI not applying events).
-    try:
-        if res and res.get('type') == 'unit_attack':
-            try:
-                print(f"[SSE_MAPPED_PAYLOAD] type=unit_attack seq={res.get('seq')} is_skill={res.get('is_skill')} attacker={res.get('attacker_id')} target={res.get('target_id')} payload_keys={list(res.keys())}")
-            except Exception:
-                print("[SSE_MAPPED_PAYLOAD] unit_attack mapped (unable to stringify payload)")
-    except Exception:
-        pass
-    try:
-        if res and res.get('type') == 'animation_start':
-            try:
-                print(f"[SSE_MAPPED_PAYLOAD] type=animation_start seq={res.get('seq')} animation_id={res.get('animation_id')} attacker={res.get('attacker_id')} target={res.get('target_id')} duration={res.get('duration')}")
-            except Exception:
-                print("[SSE_MAPPED_PAYLOAD] animation_start mapped (unable to stringify payload)")
-    except Exception:
-        pass
+    # Mapped unit_attack/animation_start payloads show exactly what is
+    # streamed over SSE (helps debug UI not applying events).
+    if res and trace.enabled('sse'):
+        if res.get('type') == 'unit_attack':
+            trace.debug('sse', "type=unit_attack seq=%s is_skill=%s attacker=%s target=%s payload_keys=%s",
+                        res.get('seq'), res.get('is_skill'), res.get('attacker_id'), res.get('target_id'), list(res.keys()))
+        elif res.get('type') == 'animation_start':
+            trace.debug('sse', "type=animation_start seq=%s animation_id=%s attacker=%s target=%s duration=%s",
+                        res.get('seq'), res.get('animation_id'), res.get('attacker_id'), res.get('target_id'), res.get('duration'))
     if event_type == 'unit_stunned':
         eff = {'type': 'stun', 'duration': data.get('duration')}
         res = {
@@ -268,6 +270,14 @@ def map_event_to_sse_payload(event_type: str, data: dict):
             'timestamp': data.get('timestamp', time.time()),
             'seq': data.get('seq')
         }
+    if event_type == 'state_delta':
+        res = {
+            'type': 'state_delta',
+            'player_units': data.get('player_units'),
+            'opponent_units': data.get('opponent_units'),
+            'timestamp': data.get('timestamp', time.time()),
+            'seq': data.get('seq')
+        }
     if event_type == 'animation_start':
         res = {
             'type': 'animation_start',
@@ -315,6 +325,11 @@ def start_combat():
         logger.warning('start_combat: invalid token: %s', str(e))
         return jsonify({'error': 'Invalid token'}), 401
 
+    protocol = data.get('protocol', 'delta')
+    if protocol not in SSE_PROTOCOLS:
+        return jsonify({'error': f'Unknown protocol {protocol!r}; expected one of {list(SSE_PROTOCOLS)}'}), 400
+    legacy_protocol = protocol == 'legacy'
+
     player = run_async(db_manager.load_player(user_id))
     if not player:
         return jsonify({'error': 'Player not found'}), 404
@@ -336,7 +351,7 @@ def start_combat():
     # Check if player has valid units (not just empty board)
     valid_units = 0
     for ui in player.board:
-        unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+        unit = game_manager.data.units_by_id.get(ui.unit_id)
         if unit:
             valid_units += 1
     if valid_units == 0:
@@ -378,7 +393,10 @@ def start_combat():
                 u.effects = []
 
             # Apply per-round buffs before sending units_init
-            simulator = CombatSimulator(dt=0.1, timeout=60)
+            if legacy_protocol:
+                simulator = CombatSimulator(dt=0.1, timeout=60, stall_window=CombatSimulator.STALL_WINDOW)
+            else:
+                simulator = CombatSimulator(dt=0.1, timeout=60, stall_window=CombatSimulator.STALL_WINDOW, snapshot_policy='keyframe', keyframe_interval=SSE_KEYFRAME_INTERVAL)
             a_hp = [u.hp for u in player_units]
             b_hp = [u.hp for u in opponent_units]
             log = []
@@ -421,7 +439,10 @@ def start_combat():
             # Send initial units state with synergies and trait definitions
             trait_definitions = [{'name': t['name'], 'type': t['type'], 'description': t.get('description', ''), 'thresholds': t['thresholds'], 'threshold_descriptions': t.get('threshold_descriptions', []), 'effects': t.get('modular_effects', t.get('effects', []))} for t in game_manager.data.traits]
             logger.info(f"start_combat: sending units_init for player {user_id}")
-            yield f"data: {json.dumps({'type': 'units_init', 'player_units': player_unit_info, 'opponent_units': opponent_unit_info, 'synergies': synergies_data, 'traits': trait_definitions, 'opponent': opponent_info, 'game_state': {'player_units': player_unit_info, 'opponent_units': opponent_unit_info}, 'seq': 0})}\n\n"
+            units_init = {'type': 'units_init', 'protocol': protocol, 'player_units': player_unit_info, 'opponent_units': opponent_unit_info, 'synergies': synergies_data, 'traits': trait_definitions, 'opponent': opponent_info, 'seq': 0}
+            if legacy_protocol:
+                units_init['game_state'] = {'player_units': player_unit_info, 'opponent_units': opponent_unit_info}
+            yield f"data: {json.dumps(units_init)}\n\n"
 
             # Start combat
             logger.info(f"start_combat: sending start event for player {user_id}")
@@ -429,23 +450,22 @@ def start_combat():
 
             # Combat callback for SSE streaming with timestamp
             def combat_event_handler(event_type: str, data: dict, event_time: float):
-                if event_type == 'state_snapshot':
-                    print(f"DEBUG: state_snapshot seq: {data.get('seq')}, timestamp: {data.get('timestamp')}, game_state keys: {list(data.get('game_state', {}).keys())}")
+                # Legacy game_state is built fresh for this event and
+                # serialized right away, so it needs no defensive copy
+                game_state = data.pop('game_state', None)
                 # Use the mapping helper to standardize payloads
                 payload = map_event_to_sse_payload(event_type, data)
                 if payload is None:
                     return []
                 payload['timestamp'] = float(event_time)
+                if game_state is not None:
+                    payload['game_state'] = game_state
                 return [json.dumps(payload)]
 
-            # Collect events with timestamps
-            events = []  # (event_type, data, event_time)
-            all_events_for_debug = []  # For debugging desyncs
-            def event_collector(event_type: str, data: dict):
+            def attach_game_state(event_type: str, data: dict):
                 # No manual syncing needed! Simulator already updated its units.
-                # Read authoritative state directly from simulator when available,
-                # otherwise fall back to the prepared player/opponent unit lists.
-                event_time = data.get('timestamp', 0.0)
+                # Called at emission time, so the simulator's state is the
+                # state this event produced.
                 try:
                     # CRITICAL: Use simulator's authoritative HP arrays (a_hp, b_hp)
                     # The simulator tracks HP separately from unit objects to avoid state mutation
@@ -453,16 +473,14 @@ def start_combat():
                     player_state = [u.to_dict(current_hp=simulator.a_hp[i]) for i, u in enumerate(simulator.team_a)]
                     opponent_state = [u.to_dict(current_hp=simulator.b_hp[i]) for i, u in enumerate(simulator.team_b)]
 
-                    # DEBUG: Log effects in snapshots
-                    for u_dict in player_state + opponent_state:
-                        if u_dict.get('effects'):
-                            print(f"[SNAPSHOT DEBUG] Unit {u_dict['id']} has {len(u_dict['effects'])} effects in snapshot")
-                        else:
-                            print(f"[SNAPSHOT DEBUG] Unit {u_dict['id']} has EMPTY effects in snapshot")
+                    # Log effects in snapshots
+                    if trace.enabled('snapshot'):
+                        for u_dict in player_state + opponent_state:
+                            trace.debug('snapshot', "Unit %s has %s effects in snapshot", u_dict['id'], len(u_dict.get('effects') or []))
                 except Exception as e:
                     # FALLBACK: Some fake/test simulators don't set team_a/team_b
                     # Log this to detect if we're hitting the buggy fallback path
-                    print(f"WARNING: event_collector falling back to stale HP! Exception: {e}")
+                    print(f"WARNING: attach_game_state falling back to stale HP! Exception: {e}")
                     import traceback
                     traceback.print_exc()
                     player_state = [u.to_dict() for u in player_units]
@@ -473,20 +491,13 @@ def start_combat():
                     'player_units': player_state,
                     'opponent_units': opponent_state,
                 }
-                events.append((event_type, data, event_time))
-
-                # Save for debugging (will be written to file after combat)
-                debug_event = {
-                    'type': event_type,
-                    **data
-                }
-                all_events_for_debug.append(debug_event)
 
-            # Run combat simulation using shared logic
-            result = simulator.simulate(player_units, opponent_units, event_collector, skip_per_round_buffs=True)
-
-            # Stream collected events. Apply any immediate gold rewards to player before income calc.
-            for event_type, data, event_time in events:
+            # Run combat simulation using shared logic, relaying each tick's
+            # events as soon as the simulator releases them. Apply any
+            # immediate gold rewards to player before income calc.
+            on_emit = attach_game_state if legacy_protocol else None
+            for event_type, data in simulator.simulate_iter(player_units, opponent_units, on_emit, skip_per_round_buffs=True):
+                event_time = data.get('timestamp', 0.0)
                 try:
                     if event_type == 'gold_reward' and data.get('side') == 'team_a':
                         amt = int(data.get('amount', 0) or 0)
@@ -497,6 +508,7 @@ def start_combat():
                 for chunk in combat_event_handler(event_type, data, event_time):
                     logger.debug(f"start_combat: yielding event {event_type} for player {user_id}")
                     yield f"data: {chunk}\n\n"
+            result = simulator.last_result
 
             # Combat result
 
@@ -510,12 +522,12 @@ def start_combat():
                 # Calculate buff amplifier for each unit
                 unit_amplifiers = {}
                 for ui in player.board:
-                    unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                    unit = game_manager.data.units_by_id.get(ui.unit_id)
                     if not unit:
                         continue
                     amplifier = 1.0
                     for trait_name, (count, tier) in player_synergies.items():
-                        trait_obj = next((t for t in game_manager.data.traits if t.get('name') == trait_name), None)
+                        trait_obj = game_manager.data.traits_by_name.get(trait_name)
                         if not trait_obj:
                             continue
                         idx = tier - 1
@@ -529,7 +541,7 @@ def start_combat():
                     unit_amplifiers[ui.instance_id] = amplifier
 
                 for trait_name, (count, tier) in player_synergies.items():
-                    trait_obj = next((t for t in game_manager.data.traits if t.get('name') == trait_name), None)
+                    trait_obj = game_manager.data.traits_by_name.get(trait_name)
                     if not trait_obj:
                         continue
                     idx = tier - 1
@@ -548,11 +560,11 @@ def start_combat():
                                 units_to_buff = player.board
                             elif target == 'trait':
                                 for ui in player.board:
-                                    unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                                    unit = game_manager.data.units_by_id.get(ui.unit_id)
                                     if unit and (trait_name in unit.factions or trait_name in unit.classes):
                                         units_to_buff.append(ui)
                             for ui in units_to_buff:
-                                unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                                unit = game_manager.data.units_by_id.get(ui.unit_id)
                                 if not unit:
                                     continue
                                 amplifier = unit_amplifiers.get(ui.instance_id, 1.0)
@@ -574,7 +586,7 @@ def start_combat():
                 
                 player_synergies = game_manager.get_board_synergies(player)
                 for trait_name, (count, tier) in player_synergies.items():
-                    trait_obj = next((t for t in game_manager.data.traits if t.get('name') == trait_name), None)
+                    trait_obj = game_manager.data.traits_by_name.get(trait_name)
                     if not trait_obj:
                         continue
                     idx = tier - 1
@@ -597,7 +609,7 @@ def start_combat():
                                         units_to_buff = player.board
                                     elif target == 'trait':
                                         for ui in player.board:
-                                            unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                                            unit = game_manager.data.units_by_id.get(ui.unit_id)
                                             if unit and (trait_name in unit.factions or trait_name in unit.classes):
                                                 units_to_buff.append(ui)
                                     
@@ -4,13 +4,13 @@ Game data endpoints - handlers for getting game data like units, traits, leaderb
 from flask import jsonify
 from pathlib import Path
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from .game_state_utils import run_async
 
 # Initialize services
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 
 
 def get_leaderboard_data(period: str = '24h'):
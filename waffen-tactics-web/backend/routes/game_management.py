@@ -9,7 +9,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'src'))
 
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from .game_state_utils import run_async, enrich_player_state
 from services.game_management_service import (
     get_player_state_data,
@@ -21,7 +21,7 @@ from services.game_management_service import (
 # Initialize services
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 
 
 def get_state(user_id):
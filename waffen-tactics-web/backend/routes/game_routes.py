@@ -29,7 +29,7 @@ load_dotenv(Path(__file__).parent.parent / '.env')
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'waffen-tactics' / 'src'))
 # Auth exchange endpoint moved to `routes.auth` (registered at `/auth/exchange`)
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from waffen_tactics.models.player_state import PlayerState
 
 # Import shared combat system
@@ -47,7 +47,7 @@ from .game_combat import start_combat
 HP_STACK_PER_STAR = 5  # default
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 game_bp = Blueprint('game', __name__)
 
 # Routes
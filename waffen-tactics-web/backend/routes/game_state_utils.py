@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Dict, Any
 from copy import deepcopy
 from waffen_tactics.models.player_state import PlayerState
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from waffen_tactics.services.shop import RARITY_ODDS_BY_LEVEL
 
 
@@ -34,16 +34,17 @@ def enrich_player_state(player: PlayerState) -> dict:
             return default
 
     state = player.to_dict()
+    game_manager = get_game_manager()
 
     # Compute synergies - include all traits with their counts
     synergies = {}
     try:
         # Get active synergies
-        active_synergies_dict = GameManager().get_board_synergies(player)
+        active_synergies_dict = game_manager.get_board_synergies(player)
         
         # Get all trait names from game data
         all_trait_names = set()
-        for trait in GameManager().data.traits:
+        for trait in game_manager.data.traits:
             all_trait_names.add(trait['name'])
         
         # Count units for each trait
@@ -54,7 +55,7 @@ def enrich_player_state(player: PlayerState) -> dict:
         seen_ids = set()
         unique_units = []
         for ui in player.board:
-            unit = next((u for u in GameManager().data.units if u.id == ui.unit_id), None)
+            unit = game_manager.data.units_by_id.get(ui.unit_id)
             if unit and ui.unit_id not in seen_ids:
                 seen_ids.add(ui.unit_id)
                 unique_units.append(unit)
@@ -85,7 +86,7 @@ def enrich_player_state(player: PlayerState) -> dict:
         buffed_board = {}
         for ui in player.board:
             instance_id = ui.instance_id
-            unit = next((u for u in GameManager().data.units if u.id == ui.unit_id), None)
+            unit = game_manager.data.units_by_id.get(ui.unit_id)
             if not unit:
                 print(f"⚠️ Unit {ui.unit_id} not found in data, skipping stats calculation")
                 continue
@@ -110,8 +111,8 @@ def enrich_player_state(player: PlayerState) -> dict:
             }
 
             # Apply synergies using SynergyEngine
-            buffed_stats = GameManager().synergy_engine.apply_stat_buffs(base_stats, unit, active_synergies)
-            buffed_stats = GameManager().synergy_engine.apply_dynamic_effects(unit, buffed_stats, active_synergies, player)
+            buffed_stats = game_manager.synergy_engine.apply_stat_buffs(base_stats, unit, active_synergies)
+            buffed_stats = game_manager.synergy_engine.apply_dynamic_effects(unit, buffed_stats, active_synergies, player)
             if buffed_stats is None:
                 buffed_stats = base_stats.copy()
 
@@ -139,7 +140,7 @@ def enrich_player_state(player: PlayerState) -> dict:
 
         # Also compute base stats for bench units (no synergies on bench)
         for ui in player.bench:
-            unit = next((u for u in GameManager().data.units if u.id == ui.unit_id), None)
+            unit = game_manager.data.units_by_id.get(ui.unit_id)
             if not unit:
                 continue
             star_level = ui.star_level
@@ -191,7 +192,7 @@ def enrich_player_state(player: PlayerState) -> dict:
             if not uid:
                 last_shop_detailed.append(None)
                 continue
-            unit = next((u for u in GameManager().data.units if u.id == uid), None)
+            unit = game_manager.data.units_by_id.get(uid)
             if not unit:
                 last_shop_detailed.append({'unit_id': uid})
                 continue
@@ -68,6 +68,8 @@ class CombatEventReconstructor:
         self.seed = None
         # Collect DoT tick/applied events per unit for targeted debugging
         self._dot_trace: Dict[str, List[Dict[str, Any]]] = {}
+        # Last full board seen (keyframe plus applied deltas), per side
+        self._snapshot_view: Dict[str, Dict[str, Dict[str, Any]]] = {'player_units': {}, 'opponent_units': {}}
 
     def initialize_from_snapshot(self, snapshot_data: Dict[str, Any]):
         """Initialize reconstruction from a state_snapshot event."""
@@ -95,6 +97,7 @@ class CombatEventReconstructor:
 
         self.reconstructed_player_units = {u['id']: normalize_unit(u) for u in snapshot_data['player_units']}
         self.reconstructed_opponent_units = {u['id']: normalize_unit(u) for u in snapshot_data['opponent_units']}
+        self._remember_snapshot(snapshot_data)
 
     def process_event(self, event_type: str, event_data: Dict[str, Any]):
         """Process a single event and update the reconstructed state."""
@@ -129,6 +132,8 @@ class CombatEventReconstructor:
             self._process_skill_cast_event(event_data)
         elif event_type == 'state_snapshot':
             self._process_state_snapshot_event(event_data)
+        elif event_type == 'state_delta':
+            self._process_state_delta_event(event_data)
         else:
             print(f"  Unhandled event type: {event_type}")
 
@@ -136,7 +141,7 @@ class CombatEventReconstructor:
         # validate it immediately. This handles emitters that include authoritative
         # `game_state` in non-`state_snapshot` events.
         try:
-            if event_type != 'state_snapshot':
+            if event_type not in ('state_snapshot', 'state_delta'):
                 gs = None
                 if isinstance(event_data.get('game_state'), dict):
                     gs = event_data.get('game_state')
@@ -570,10 +575,37 @@ class CombatEventReconstructor:
         # are reconstructed from `unit_stunned` events; do not create new
         # effects here.
 
+    def _remember_snapshot(self, snapshot_data: Dict[str, Any]):
+        for key in ('player_units', 'opponent_units'):
+            self._snapshot_view[key] = {
+                u['id']: dict(u, effects=list(u.get('effects') or []))
+                for u in snapshot_data.get(key, [])
+            }
+
+    def _process_state_delta_event(self, event_data: Dict[str, Any]):
+        """Apply a keyframe-policy state_delta and validate the resulting board.
+
+        Deltas only list changed units and fields, so they are merged into
+        the last full board seen and checked exactly like a state_snapshot.
+        """
+        snapshot = {
+            'timestamp': event_data.get('timestamp', 0),
+            'seq': event_data.get('seq', 'N/A'),
+        }
+        for key in ('player_units', 'opponent_units'):
+            view = self._snapshot_view[key]
+            for change in event_data.get(key, []):
+                unit = dict(view.get(change['id'], {}))
+                unit.update(change)
+                view[change['id']] = unit
+            snapshot[key] = list(view.values())
+        self._process_state_snapshot_event(snapshot)
+
     def _process_state_snapshot_event(self, event_data: Dict[str, Any]):
         # print(f"  Checking state_snapshot at seq {event_data.get('seq', 'N/A')}")
 
         current_time = event_data.get('timestamp', 0)
+        self._remember_snapshot(event_data)
 
         # Create snapshot copies for comparison
         snapshot_player_units = {
@@ -6,8 +6,10 @@ from typing import Dict, Any, Tuple, Optional, List, Callable
 from pathlib import Path
 
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import GameManager, get_game_manager
 from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.unit_templates import template_cache_for
+from waffen_tactics import trace
 from waffen_tactics.models.player_state import PlayerState
 import json
 from waffen_tactics.services.event_canonicalizer import emit_heal, emit_damage
@@ -45,7 +47,7 @@ GAME_CONFIG = _load_game_config()
 # Initialize services (these would be injected in a proper DI setup)
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 
 
 def _apply_persistent_buffs_from_kills(player: PlayerState, player_synergies: Dict[str, Tuple[int, int]], collected_stats_maps: Dict[str, Dict[str, int]], game_manager: GameManager):
@@ -60,7 +62,7 @@ def _apply_persistent_buffs_from_kills(player: PlayerState, player_synergies: Di
     """
     # Apply permanent buffs from kills (on_enemy_death with permanent_stat_buff)
     for trait_name, (count, tier) in player_synergies.items():
-        trait_obj = next((t for t in game_manager.data.traits if t.get('name') == trait_name), None)
+        trait_obj = game_manager.data.traits_by_name.get(trait_name)
         if not trait_obj:
             continue
         idx = tier - 1
@@ -83,7 +85,7 @@ def _apply_persistent_buffs_from_kills(player: PlayerState, player_synergies: Di
                             units_to_buff = player.board
                         elif target == 'trait':
                             for ui in player.board:
-                                unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                                unit = game_manager.data.units_by_id.get(ui.unit_id)
                                 if unit and (trait_name in unit.factions or trait_name in unit.classes):
                                     units_to_buff.append(ui)
 
@@ -138,21 +140,12 @@ def prepare_player_units_for_combat(user_id: str) -> Tuple[bool, str, Optional[T
     # Check if player has valid units
     valid_units = 0
     for ui in player.board:
-        unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+        unit = game_manager.data.units_by_id.get(ui.unit_id)
         if unit:
             valid_units += 1
     if valid_units == 0:
         return False, "No valid units on board", None
 
-    # Helper to read stat values whether `unit.stats` is a dict or an object
-    def stat_val(stats_obj, key, default):
-        try:
-            if isinstance(stats_obj, dict):
-                return stats_obj.get(key, default)
-            return getattr(stats_obj, key, default)
-        except Exception:
-            return default
-
     try:
         # Calculate player synergies
         player_synergies = game_manager.get_board_synergies(player)
@@ -161,8 +154,9 @@ def prepare_player_units_for_combat(user_id: str) -> Tuple[bool, str, Optional[T
         player_units = []
         player_unit_info = []  # For frontend display
 
-        # Compute active synergies for player board
-        player_active = game_manager.get_board_synergies(player)
+        # Active synergies for the player board drive the unit templates
+        player_active = player_synergies
+        templates = template_cache_for(game_manager.synergy_engine)
         for unit_instance in player.board:
             # Normalize unit_instance which may be an object, dict, or simple unit id string
             try:
@@ -188,74 +182,20 @@ def prepare_player_units_for_combat(user_id: str) -> Tuple[bool, str, Optional[T
                 # Surface malformed entries as explicit errors so they appear in logs
                 raise RuntimeError(f"Malformed unit entry in player.board: {unit_instance!r}") from e
 
-            unit = next((u for u in game_manager.data.units if u.id == unit_id_key), None)
+            unit = game_manager.data.units_by_id.get(unit_id_key)
             if unit:
-                # Prefer authoritative stats from game data (unit.stats)
-                base_stats = getattr(unit, 'stats', None)
-                if base_stats is not None:
-                    base_hp = stat_val(base_stats, 'hp', 80 + (unit.cost * 40))
-                    base_attack = stat_val(base_stats, 'attack', 20 + (unit.cost * 10))
-                    base_defense = stat_val(base_stats, 'defense', 5 + (unit.cost * 2))
-                    attack_speed = stat_val(base_stats, 'attack_speed', 0.8 + (unit.cost * 0.1))
-                    base_max_mana = stat_val(base_stats, 'max_mana', 100)
-                else:
-                    base_hp = 80 + (unit.cost * 40)
-                    base_attack = 20 + (unit.cost * 10)
-                    base_defense = 5 + (unit.cost * 2)
-                    attack_speed = 0.8 + (unit.cost * 0.1)
-                    base_max_mana = 100
-
-                hp = int(base_hp * (1.6 ** (star_level - 1)))
-                attack = int(base_attack * (1.4 ** (star_level - 1)))
-                defense = int(base_defense)
-                # Keep mana constant across star levels — do not multiply by star_level
-                max_mana = int(base_max_mana)
-
-                base_stats_dict = {'hp': hp, 'attack': attack, 'defense': defense, 'attack_speed': attack_speed}
-
-                # Apply synergies using SynergyEngine
-                buffed_stats = game_manager.synergy_engine.apply_stat_buffs(base_stats_dict, unit, player_active)
-                buffed_stats = game_manager.synergy_engine.apply_dynamic_effects(unit, buffed_stats, player_active, player)
-                if buffed_stats is None:
-                    buffed_stats = base_stats_dict.copy()
-
-                # Apply persistent buffs
-                for stat, value in unit_instance.persistent_buffs.items():
-                    if stat in buffed_stats:
-                        buffed_stats[stat] += value
-
+                # Star scaling, synergy and dynamic buffs and active effects are
+                # cached per (unit, star level, synergies, wins/losses)
+                template = templates.get(unit, star_level, player_active, player)
+                buffed_stats = template.buffed_stats(persistent_buffs)
                 hp = buffed_stats['hp']
-                attack = buffed_stats['attack']
-                defense = buffed_stats['defense']
-                attack_speed = buffed_stats['attack_speed']
-
-                # Get active effects
-                effects_for_unit = game_manager.synergy_engine.get_active_effects(unit, player_active)
+                max_mana = template.max_mana
 
                 # Add max_mana and current_mana to buffed_stats
                 buffed_stats['max_mana'] = max_mana
                 buffed_stats['current_mana'] = 0
 
-                combat_unit = CombatUnit(
-                    id=instance_id,
-                    name=unit.name,
-                    hp=hp,
-                    attack=attack,
-                    defense=defense,
-                    attack_speed=attack_speed,
-                    star_level=star_level,
-                    position=position,
-                    effects=effects_for_unit,
-                    max_mana=max_mana,
-                    mana_regen=stat_val(base_stats, 'mana_regen', 5),
-                    stats=base_stats,
-                    skill={
-                        'name': unit.skill.name,
-                        'description': unit.skill.description,
-                        'mana_cost': (unit.skill.mana_cost if getattr(unit.skill, 'mana_cost', None) is not None else max_mana),
-                        'effect': unit.skill.effect
-                    } if hasattr(unit, 'skill') and unit.skill else None
-                )
+                combat_unit = template.spawn(instance_id, position, buffed_stats)
                 # Set max_hp to buffed hp to prevent hp > max_hp issues
                 combat_unit.max_hp = hp
 
@@ -305,15 +245,6 @@ def prepare_opponent_units_for_combat(player: PlayerState) -> Tuple[List[CombatU
     opponent_wins = 0
     opponent_level = 1
 
-    # Helper to read stat values whether `unit.stats` is a dict or an object
-    def stat_val(stats_obj, key, default):
-        try:
-            if isinstance(stats_obj, dict):
-                return stats_obj.get(key, default)
-            return getattr(stats_obj, key, default)
-        except Exception:
-            return default
-
     try:
         # Get opponent from database unless we're in the configured initial bot rounds
         opponent_data = None
@@ -350,82 +281,33 @@ def prepare_opponent_units_for_combat(player: PlayerState) -> Tuple[List[CombatU
             opponent_team = opponent_data['board']
 
             # Compute opponent synergies
-            opponent_units_raw = [next((u for u in game_manager.data.units if u.id == ud['unit_id']), None) for ud in opponent_team]
+            opponent_units_raw = [game_manager.data.units_by_id.get(ud['unit_id']) for ud in opponent_team]
             opponent_active = game_manager.synergy_engine.compute([u for u in opponent_units_raw if u])
 
+            # Construct a lightweight PlayerState-like object for opponent so dynamic effects
+            # that rely on wins/losses have correct context.
+            try:
+                opponent_player = PlayerState(user_id=opponent_data.get('user_id', 0), username=opponent_name, level=opponent_level, wins=opponent_wins, losses=opponent_data.get('losses', 0))
+            except Exception:
+                opponent_player = None
+            templates = template_cache_for(game_manager.synergy_engine)
+
             # Build opponent units from team data
             for i, unit_data in enumerate(opponent_team):
-                unit = next((u for u in game_manager.data.units if u.id == unit_data['unit_id']), None)
+                unit = game_manager.data.units_by_id.get(unit_data['unit_id'])
                 if unit:
                     star_level = unit_data['star_level']
-                    base_stats_b = getattr(unit, 'stats', None)
-                    if base_stats_b is not None:
-                        base_hp = stat_val(base_stats_b, 'hp', 80 + (unit.cost * 40))
-                        base_attack = stat_val(base_stats_b, 'attack', 20 + (unit.cost * 10))
-                        base_defense = stat_val(base_stats_b, 'defense', 5 + (unit.cost * 2))
-                        attack_speed = stat_val(base_stats_b, 'attack_speed', 0.8 + (unit.cost * 0.1))
-                        base_max_mana_b = stat_val(base_stats_b, 'max_mana', 100)
-                    else:
-                        base_hp = 80 + (unit.cost * 40)
-                        base_attack = 20 + (unit.cost * 10)
-                        base_defense = 5 + (unit.cost * 2)
-                        attack_speed = 0.8 + (unit.cost * 0.1)
-                        base_max_mana_b = 100
-
-                    hp = int(base_hp * (1.6 ** (star_level - 1)))
-                    attack = int(base_attack * (1.4 ** (star_level - 1)))
-                    defense = int(base_defense)
-                    # Keep mana constant for opponents as well
-                    max_mana = int(base_max_mana_b)
-
-                    base_stats_dict_b = {'hp': hp, 'attack': attack, 'defense': defense, 'attack_speed': attack_speed}
-
-                    # Apply synergies using SynergyEngine
-                    buffed_stats_b = game_manager.synergy_engine.apply_stat_buffs(base_stats_dict_b, unit, opponent_active)
-                    # Construct a lightweight PlayerState-like object for opponent so dynamic effects
-                    # that rely on wins/losses have correct context.
-                    try:
-                        from waffen_tactics.models.player_state import PlayerState as _PS
-                        opponent_player = _PS(user_id=opponent_data.get('user_id', 0), username=opponent_name, level=opponent_level, wins=opponent_wins, losses=opponent_data.get('losses', 0))
-                    except Exception:
-                        opponent_player = None
-                    buffed_stats_b = game_manager.synergy_engine.apply_dynamic_effects(unit, buffed_stats_b, opponent_active, opponent_player)
-                    if buffed_stats_b is None:
-                        buffed_stats_b = base_stats_dict_b.copy()
-
-                    hp = buffed_stats_b['hp']
-                    attack = buffed_stats_b['attack']
-                    defense = buffed_stats_b['defense']
-                    attack_speed = buffed_stats_b['attack_speed']
-
-                    # Get active effects
-                    effects_b_for_unit = game_manager.synergy_engine.get_active_effects(unit, opponent_active)
+                    template = templates.get(unit, star_level, opponent_active, opponent_player)
+                    hp = template.stats['hp']
+                    attack_speed = template.stats['attack_speed']
+                    max_mana = template.max_mana
 
                     # Determine position: prefer explicit position from saved team data,
                     # otherwise place first 3 units in front and remaining in back to
                     # allow backline-targeting (target_backline) to work in matches.
                     pos = unit_data.get('position') if isinstance(unit_data, dict) and unit_data.get('position') else ('front' if i < 3 else 'back')
 
-                    combat_unit = CombatUnit(
-                        id=f'opp_{i}',
-                        name=unit.name,
-                        hp=hp,
-                        attack=attack,
-                        defense=defense,
-                        attack_speed=attack_speed,
-                        star_level=star_level,
-                        position=pos,
-                        effects=effects_b_for_unit,
-                        max_mana=max_mana,
-                        mana_regen=stat_val(base_stats_b, 'mana_regen', 5),
-                        stats=base_stats_b,
-                        skill={
-                            'name': unit.skill.name,
-                            'description': unit.skill.description,
-                            'mana_cost': (unit.skill.mana_cost if getattr(unit.skill, 'mana_cost', None) is not None else max_mana),
-                            'effect': unit.skill.effect
-                        } if hasattr(unit, 'skill') and unit.skill else None
-                    )
+                    combat_unit = template.spawn(f'opp_{i}', pos)
                     # Set max_hp to buffed hp to prevent hp > max_hp issues
                     combat_unit.max_hp = hp
                     opponent_units.append(combat_unit)
@@ -490,7 +372,46 @@ def prepare_opponent_units_for_combat(player: PlayerState) -> Tuple[List[CombatU
         raise
 
 
-def run_combat_simulation(player_units: List[CombatUnit], opponent_units: List[CombatUnit], event_callback: Optional[Callable] = None):
+def _sync_units_to_simulator_hp(simulator: CombatSimulator, player_units: List[CombatUnit], opponent_units: List[CombatUnit]):
+    """Update unit HP with final values from simulation via canonical emitters."""
+    for i, unit in enumerate(player_units):
+        try:
+            target_hp = int(simulator.a_hp[i])
+            try:
+                cur = int(getattr(unit, 'hp', 0))
+            except Exception:
+                cur = 0
+            if target_hp > cur:
+                emit_heal(None, unit, target_hp - cur, source=None, side=None)
+            elif target_hp < cur:
+                emit_damage(None, None, unit, raw_damage=(cur - target_hp), emit_event=False)
+            else:
+                # already equal — nothing to do (keep state authoritative
+                # and avoid bypassing emitter-based mutation).
+                pass
+        except Exception:
+            # Do not fall back to direct assignment; skip syncing this unit
+            pass
+    for i, unit in enumerate(opponent_units):
+        try:
+            target_hp = int(simulator.b_hp[i])
+            try:
+                cur = int(getattr(unit, 'hp', 0))
+            except Exception:
+                cur = 0
+            if target_hp > cur:
+                emit_heal(None, unit, target_hp - cur, source=None, side=None)
+            elif target_hp < cur:
+                emit_damage(None, None, unit, raw_damage=(cur - target_hp), emit_event=False)
+            else:
+                # already equal — no-op
+                pass
+        except Exception:
+            # Do not fall back to direct assignment; skip syncing this unit
+            pass
+
+
+def run_combat_simulation(player_units: List[CombatUnit], opponent_units: List[CombatUnit], event_callback: Optional[Callable] = None, mode: str = 'full'):
     """
     Run the combat simulation.
 
@@ -498,6 +419,8 @@ def run_combat_simulation(player_units: List[CombatUnit], opponent_units: List[C
         player_units: Player's combat units
         opponent_units: Opponent's combat units
         event_callback: Optional callback for processing events
+        mode: 'full' collects events; 'outcome' runs headless (no events,
+            no log) for offline evaluation
 
     Returns:
         Combat result dictionary
@@ -557,24 +480,26 @@ def run_combat_simulation(player_units: List[CombatUnit], opponent_units: List[C
         _reset_units_if_needed(opponent_units)
 
         # Run combat simulation using shared logic
-        simulator = CombatSimulator(dt=0.1, timeout=60)
+        simulator = CombatSimulator(dt=0.1, timeout=60, stall_window=CombatSimulator.STALL_WINDOW)
+
+        if mode == 'outcome':
+            result = simulator.simulate(player_units, opponent_units, mode='outcome')
+            result['events'] = []
+            _sync_units_to_simulator_hp(simulator, player_units, opponent_units)
+            return result
 
         # Collect events regardless of callback
         events = []
         import copy
 
         def event_collector(event_type: str, data: dict):
-            # Log incoming events for debugging (do this before deepcopy)
-            try:
-                # Print a concise line so test harness captures it
-                if isinstance(data, dict):
-                    keys = list(data.keys())
-                else:
-                    keys = type(data)
-                print(f"[EVENT_COLLECTOR] type={event_type} keys={keys}")
-                # Flag explicit attack events that are 'true' attacks (cause=='attack')
-                if event_type in ('attack', 'unit_attack') and isinstance(data, dict):
-                    try:
+            # Trace incoming events for debugging (do this before deepcopy)
+            if trace.enabled('events'):
+                try:
+                    keys = list(data.keys()) if isinstance(data, dict) else type(data)
+                    trace.debug('events', "type=%s keys=%s", event_type, keys)
+                    # Flag explicit attack events that are 'true' attacks (cause=='attack')
+                    if event_type in ('attack', 'unit_attack') and isinstance(data, dict):
                         cause = data.get('cause') or data.get('is_skill')
                         # prefer canonical damage fields
                         damage = data.get('applied_damage') or data.get('damage') or data.get('amount')
@@ -582,11 +507,9 @@ def run_combat_simulation(player_units: List[CombatUnit], opponent_units: List[C
                         target = data.get('target_id') or data.get('unit_id') or data.get('target_name')
                         # Distinguish skill-caused attacks vs basic attacks
                         tag = 'SKILL' if (str(cause).lower() in ('skill', 'true') or data.get('is_skill')) else 'TRUE'
-                        print(f"[EVENT_COLLECTOR ATTACK] type={event_type} tag={tag} cause={cause} damage={damage} attacker={attacker} target={target}")
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+                        trace.debug('events', "attack type=%s tag=%s cause=%s damage=%s attacker=%s target=%s", event_type, tag, cause, damage, attacker, target)
+                except Exception:
+                    pass
 
             # Collected events must be deep-copied to avoid later in-place
             # mutations of nested structures (e.g. unit.effects) by the
@@ -601,42 +524,7 @@ def run_combat_simulation(player_units: List[CombatUnit], opponent_units: List[C
         result = simulator.simulate(player_units, opponent_units, event_collector)
         result['events'] = events
 
-        # Update unit HP with final values from simulation via canonical emitters
-        for i, unit in enumerate(player_units):
-            try:
-                target_hp = int(simulator.a_hp[i])
-                try:
-                    cur = int(getattr(unit, 'hp', 0))
-                except Exception:
-                    cur = 0
-                if target_hp > cur:
-                    emit_heal(None, unit, target_hp - cur, source=None, side=None)
-                elif target_hp < cur:
-                    emit_damage(None, None, unit, raw_damage=(cur - target_hp), emit_event=False)
-                else:
-                    # already equal — nothing to do (keep state authoritative
-                    # and avoid bypassing emitter-based mutation).
-                    pass
-            except Exception:
-                # Do not fall back to direct assignment; skip syncing this unit
-                pass
-        for i, unit in enumerate(opponent_units):
-            try:
-                target_hp = int(simulator.b_hp[i])
-                try:
-                    cur = int(getattr(unit, 'hp', 0))
-                except Exception:
-                    cur = 0
-                if target_hp > cur:
-                    emit_heal(None, unit, target_hp - cur, source=None, side=None)
-                elif target_hp < cur:
-                    emit_damage(None, None, unit, raw_damage=(cur - target_hp), emit_event=False)
-                else:
-                    # already equal — no-op
-                    pass
-            except Exception:
-                # Do not fall back to direct assignment; skip syncing this unit
-                pass
+        _sync_units_to_simulator_hp(simulator, player_units, opponent_units)
 
         return result
 
@@ -674,12 +562,12 @@ def process_combat_results(player: PlayerState, result: Dict[str, Any], collecte
         # Calculate buff amplifier for each unit
         unit_amplifiers = {}
         for ui in player.board:
-            unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+            unit = game_manager.data.units_by_id.get(ui.unit_id)
             if not unit:
                 continue
             amplifier = 1.0
             for trait_name, (count, tier) in player_synergies.items():
-                trait_obj = next((t for t in game_manager.data.traits if t.get('name') == trait_name), None)
+                trait_obj = game_manager.data.traits_by_name.get(trait_name)
                 if not trait_obj:
                     continue
                 idx = tier - 1
@@ -693,7 +581,7 @@ def process_combat_results(player: PlayerState, result: Dict[str, Any], collecte
             unit_amplifiers[ui.instance_id] = amplifier
 
         for trait_name, (count, tier) in player_synergies.items():
-            trait_obj = next((t for t in game_manager.data.traits if t.get('name') == trait_name), None)
+            trait_obj = game_manager.data.traits_by_name.get(trait_name)
             if not trait_obj:
                 continue
             idx = tier - 1
@@ -712,11 +600,11 @@ def process_combat_results(player: PlayerState, result: Dict[str, Any], collecte
                         units_to_buff = player.board
                     elif target == 'trait':
                         for ui in player.board:
-                            unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                            unit = game_manager.data.units_by_id.get(ui.unit_id)
                             if unit and (trait_name in unit.factions or trait_name in unit.classes):
                                 units_to_buff.append(ui)
                     for ui in units_to_buff:
-                        unit = next((u for u in game_manager.data.units if u.id == ui.unit_id), None)
+                        unit = game_manager.data.units_by_id.get(ui.unit_id)
                         if not unit:
                             continue
                         amplifier = unit_amplifiers.get(ui.instance_id, 1.0)
@@ -6,13 +6,13 @@ from typing import Dict, Any, Tuple, Optional
 from pathlib import Path
 
 from waffen_tactics.services.database import DatabaseManager
-from waffen_tactics.services.game_manager import GameManager
+from waffen_tactics.services.game_manager import get_game_manager
 from waffen_tactics.models.player_state import PlayerState
 
 # Initialize services (these would be injected in a proper DI setup)
 DB_PATH = str(Path(__file__).parent.parent.parent.parent / 'waffen-tactics' / 'waffen_tactics_game.db')
 db_manager = DatabaseManager(DB_PATH)
-game_manager = GameManager()
+game_manager = get_game_manager()
 
 
 def _run_async(coro):
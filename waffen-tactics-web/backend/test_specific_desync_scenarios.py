@@ -75,9 +75,8 @@ def test_stun_skill_scenario():
 
     # Give Miki full mana to cast skill immediately
     miki_unit.mana = miki_unit.max_mana
-    miki_unit.current_mana = miki_unit.max_mana
 
-    print(f"   Miki mana: {miki_unit.current_mana}/{miki_unit.max_mana}")
+    print(f"   Miki mana: {miki_unit.mana}/{miki_unit.max_mana}")
     print(f"   Target: {target_data.name}")
 
     team_a = [miki_unit]
@@ -206,7 +205,7 @@ def test_defense_debuff_scenario():
         team_a = [unit]
         team_b = [target]
 
-        print(f"   Debuffer: {unit.name} (mana={unit.current_mana}/{unit.max_mana})")
+        print(f"   Debuffer: {unit.name} (mana={unit.mana}/{unit.max_mana})")
         print(f"   Target: {target.name} (defense={target.defense})")
 
         events = []
@@ -16,7 +16,7 @@ import json
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../waffen-tactics/src'))
 
 from waffen_tactics.services.combat_simulator import CombatSimulator
-from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.combat_unit import CombatUnit, _HP_WRITER
 from waffen_tactics.services.game_manager import GameManager
 import random
 
@@ -198,13 +198,13 @@ def test_persistence_between_combats():
         for unit, initial in zip(team_a, initial_a):
             # Use canonical setter to restore HP
             try:
-                unit._set_hp(initial['hp'], caller_module='event_canonicalizer')
+                unit._set_hp(initial['hp'], caller_module=_HP_WRITER)
             except Exception:
                 unit.hp = initial['hp']
             unit.attack = initial['attack']
             unit.defense = initial['defense']
             unit.attack_speed = initial['attack_speed']
-            unit.current_mana = 0
+            unit.mana = 0
             unit.shield = 0
             unit.effects = []
             unit._stunned = False
@@ -212,13 +212,13 @@ def test_persistence_between_combats():
 
         for unit, initial in zip(team_b, initial_b):
             try:
-                unit._set_hp(initial['hp'], caller_module='event_canonicalizer')
+                unit._set_hp(initial['hp'], caller_module=_HP_WRITER)
             except Exception:
                 unit.hp = initial['hp']
             unit.attack = initial['attack']
             unit.defense = initial['defense']
             unit.attack_speed = initial['attack_speed']
-            unit.current_mana = 0
+            unit.mana = 0
             unit.shield = 0
             unit.effects = []
             unit._stunned = False
@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../waffen-tact
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from unittest.mock import AsyncMock, MagicMock, patch
 from waffen_tactics.models.player_state import PlayerState
+from waffen_tactics.services.data_loader import GameData
 from waffen_tactics.services.combat_shared import CombatUnit
 from waffen_tactics.services.data_loader import load_game_data
 from services.combat_service import (
@@ -80,7 +81,7 @@ class TestCombatService(unittest.TestCase):
         # Setup mocks
         mock_db_manager.load_player = AsyncMock(return_value=self.mock_player)
         self.mock_player.board = [self.mock_unit_instance]
-        mock_game_manager.data.units = [self.mock_unit]
+        mock_game_manager.data = GameData(units=[self.mock_unit], traits=[], factions=[], classes=[])
         mock_game_manager.get_board_synergies.return_value = {"TestTrait": (1, 1)}
         mock_game_manager.synergy_engine.apply_stat_buffs.return_value = {
             'hp': 100, 'attack': 20, 'defense': 5, 'attack_speed': 0.8
@@ -157,7 +158,7 @@ class TestCombatService(unittest.TestCase):
             'board': [{'unit_id': 'unit_001', 'star_level': 1}]
         }
         mock_db_manager.get_random_opponent = AsyncMock(return_value=opponent_data)
-        mock_game_manager.data.units = [self.mock_unit]
+        mock_game_manager.data = GameData(units=[self.mock_unit], traits=[], factions=[], classes=[])
         mock_game_manager.synergy_engine.compute.return_value = {}
         mock_game_manager.synergy_engine.apply_stat_buffs.return_value = {
             'hp': 100, 'attack': 20, 'defense': 5, 'attack_speed': 0.8
@@ -312,7 +313,7 @@ class TestCombatService(unittest.TestCase):
         self.mock_unit_instance.persistent_buffs = {'hp': 50}
         self.mock_player.board = [self.mock_unit_instance]
         
-        mock_game_manager.data.units = [self.mock_unit]
+        mock_game_manager.data = GameData(units=[self.mock_unit], traits=[], factions=[], classes=[])
         
         # Mock synergies - Normik class giving +20% HP
         mock_game_manager.get_board_synergies.return_value = {"Normik": (2, 1)}  # 2 units, tier 1
@@ -358,7 +359,7 @@ class TestCombatService(unittest.TestCase):
         self.mock_unit_instance.persistent_buffs = {'hp': 100}
         self.mock_player.board = [self.mock_unit_instance]
         
-        mock_game_manager.data.units = [self.mock_unit]
+        mock_game_manager.data = GameData(units=[self.mock_unit], traits=[], factions=[], classes=[])
         
         # Mock synergies - higher tier Normik giving +40% HP
         mock_game_manager.get_board_synergies.return_value = {"Normik": (4, 2)}  # 4 units, tier 2
@@ -4,6 +4,7 @@ Tests for Game State Utils
 import unittest
 from unittest.mock import MagicMock, patch
 from waffen_tactics.models.player_state import PlayerState, UnitInstance
+from waffen_tactics.services.data_loader import GameData
 from routes.game_state_utils import enrich_player_state
 
 
@@ -59,14 +60,13 @@ class TestGameStateUtils(unittest.TestCase):
         self.mock_unit_instance.position = "front"
         self.mock_unit_instance.persistent_buffs = {}
 
-    @patch('routes.game_state_utils.GameManager')
+    @patch('routes.game_state_utils.get_game_manager')
     def test_enrich_player_state_hp_calculation_with_synergies_and_persistent_buffs(self, mock_game_manager_cls):
         """Test HP calculation in enrich_player_state with synergies and persistent buffs"""
         # Setup mocks
         mock_game_manager = MagicMock()
         mock_game_manager_cls.return_value = mock_game_manager
-        mock_game_manager.data.units = [self.mock_unit]
-        mock_game_manager.data.traits = [
+        mock_game_manager.data = GameData(units=[self.mock_unit], factions=[], classes=[], traits=[
             {
                 "name": "Normik",
                 "type": "class",
@@ -77,7 +77,7 @@ class TestGameStateUtils(unittest.TestCase):
                     {"type": "stat_buff", "stat": "hp", "value": 60, "is_percentage": True}
                 ]
             }
-        ]
+        ])
         
         # Mock synergies - 2 Normik units, tier 1 (+20% HP)
         mock_game_manager.get_board_synergies.return_value = {"Normik": (2, 1)}
@@ -118,14 +118,13 @@ class TestGameStateUtils(unittest.TestCase):
         expected_base_hp = 100  # 100 * (1.6^(1-1)) = 100
         self.assertEqual(base_stats.get('hp'), expected_base_hp)
 
-    @patch('routes.game_state_utils.GameManager')
+    @patch('routes.game_state_utils.get_game_manager')
     def test_enrich_player_state_hp_calculation_order_verification(self, mock_game_manager_cls):
         """Test that HP buffs are applied in correct order in enrich_player_state: base -> synergies -> persistent"""
         # Setup mocks
         mock_game_manager = MagicMock()
         mock_game_manager_cls.return_value = mock_game_manager
-        mock_game_manager.data.units = [self.mock_unit]
-        mock_game_manager.data.traits = [
+        mock_game_manager.data = GameData(units=[self.mock_unit], factions=[], classes=[], traits=[
             {
                 "name": "Normik",
                 "type": "class",
@@ -136,7 +135,7 @@ class TestGameStateUtils(unittest.TestCase):
                     {"type": "stat_buff", "stat": "hp", "value": 60, "is_percentage": True}
                 ]
             }
-        ]
+        ])
         
         # Mock synergies - 4 Normik units, tier 2 (+40% HP)
         mock_game_manager.get_board_synergies.return_value = {"Normik": (4, 2)}
@@ -170,14 +169,13 @@ class TestGameStateUtils(unittest.TestCase):
         expected_hp = 140 + 100
         self.assertEqual(buffed_stats.get('hp'), expected_hp)
 
-    @patch('routes.game_state_utils.GameManager')
+    @patch('routes.game_state_utils.get_game_manager')
     def test_enrich_player_state_bench_units_no_synergies_but_persistent_buffs(self, mock_game_manager_cls):
         """Test that bench units get persistent buffs but no synergies"""
         # Setup mocks
         mock_game_manager = MagicMock()
         mock_game_manager_cls.return_value = mock_game_manager
-        mock_game_manager.data.units = [self.mock_unit]
-        mock_game_manager.data.traits = []
+        mock_game_manager.data = GameData(units=[self.mock_unit], factions=[], classes=[], traits=[])
         
         # No synergies for bench
         mock_game_manager.get_board_synergies.return_value = {}
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from waffen_tactics.models.player_state import PlayerState
+from waffen_tactics.services.data_loader import GameData
 from services.combat_service import prepare_opponent_units_for_combat
 
 
@@ -46,7 +47,7 @@ class TestHighRoundOpponentSelection(unittest.TestCase):
         mock_db_manager.get_random_system_opponent = AsyncMock(return_value=opponent_data)
 
         # Setup game_manager units and synergy engine
-        mock_game_manager.data.units = [self.mock_unit]
+        mock_game_manager.data = GameData(units=[self.mock_unit], traits=[], factions=[], classes=[])
         mock_game_manager.synergy_engine.compute.return_value = {}
         mock_game_manager.synergy_engine.apply_stat_buffs.return_value = {'hp': 100, 'attack': 20, 'defense': 5, 'attack_speed': 0.8}
         mock_game_manager.synergy_engine.apply_dynamic_effects.return_value = {'hp': 100, 'attack': 20, 'defense': 5, 'attack_speed': 0.8}
@@ -78,7 +79,7 @@ class TestHighRoundOpponentSelection(unittest.TestCase):
         }
         mock_db_manager.get_random_system_opponent = AsyncMock(return_value=opponent_data)
 
-        mock_game_manager.data.units = [self.mock_unit]
+        mock_game_manager.data = GameData(units=[self.mock_unit], traits=[], factions=[], classes=[])
         mock_game_manager.synergy_engine.compute.return_value = {}
         mock_game_manager.synergy_engine.apply_stat_buffs.return_value = {'hp': 100, 'attack': 20, 'defense': 5, 'attack_speed': 0.8}
         mock_game_manager.synergy_engine.apply_dynamic_effects.return_value = {'hp': 100, 'attack': 20, 'defense': 5, 'attack_speed': 0.8}
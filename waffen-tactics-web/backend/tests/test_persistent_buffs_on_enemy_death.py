@@ -3,6 +3,7 @@ Tests for persistent buffs granted on enemy death
 """
 import unittest
 from unittest.mock import Mock, MagicMock
+from waffen_tactics.services.data_loader import GameData
 from services.combat_service import _apply_persistent_buffs_from_kills
 
 
@@ -27,14 +28,13 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit = Mock()
         mock_unit.id = 'test_unit'
         mock_unit.factions = ['TestTrait']
         mock_unit.classes = []
-        mock_game_manager.data.units = [mock_unit]
+        mock_game_manager.data = GameData(units=[mock_unit], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -83,14 +83,13 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit = Mock()
         mock_unit.id = 'percent_unit'
         mock_unit.factions = ['PercentTrait']
         mock_unit.classes = []
-        mock_game_manager.data.units = [mock_unit]
+        mock_game_manager.data = GameData(units=[mock_unit], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -139,10 +138,9 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data (not needed for team target)
-        mock_game_manager.data.units = []
+        mock_game_manager.data = GameData(units=[], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with multiple board units
         mock_player = Mock()
@@ -196,7 +194,6 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit_trait = Mock()
@@ -209,7 +206,7 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
         mock_unit_no_trait.factions = []
         mock_unit_no_trait.classes = []
 
-        mock_game_manager.data.units = [mock_unit_trait, mock_unit_no_trait]
+        mock_game_manager.data = GameData(units=[mock_unit_trait, mock_unit_no_trait], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -263,14 +260,13 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit = Mock()
         mock_unit.id = 'zero_unit'
         mock_unit.factions = ['ZeroTrait']
         mock_unit.classes = []
-        mock_game_manager.data.units = [mock_unit]
+        mock_game_manager.data = GameData(units=[mock_unit], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -319,14 +315,13 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit = Mock()
         mock_unit.id = 'mana_unit'
         mock_unit.factions = ['ManaTrait']
         mock_unit.classes = []
-        mock_game_manager.data.units = [mock_unit]
+        mock_game_manager.data = GameData(units=[mock_unit], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -375,14 +370,13 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
             }]
         }
         mock_game_manager = Mock()
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit = Mock()
         mock_unit.id = 'hp_percent_unit'
         mock_unit.factions = ['HpPercentTrait']
         mock_unit.classes = []
-        mock_game_manager.data.units = [mock_unit]
+        mock_game_manager.data = GameData(units=[mock_unit], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -431,14 +425,13 @@ class TestPersistentBuffsOnEnemyDeath(unittest.TestCase):
                 }]
             }]
         }
-        mock_game_manager.data.traits = [mock_trait]
 
         # Mock unit data
         mock_unit = Mock()
         mock_unit.id = 'attack_collect_unit'
         mock_unit.factions = ['AttackCollectTrait']
         mock_unit.classes = []
-        mock_game_manager.data.units = [mock_unit]
+        mock_game_manager.data = GameData(units=[mock_unit], traits=[mock_trait], factions=[], classes=[])
 
         # Mock player with board units
         mock_player = Mock()
@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from waffen_tactics.models.skill import Skill, Effect, EffectType, TargetType, SkillExecutionContext
 from waffen_tactics.services.skill_executor import skill_executor
-from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.combat_unit import CombatUnit, _HP_WRITER
 
 
 class SimpleStats:
@@ -61,7 +61,7 @@ def test_skill_heal_buff_and_shield_emit_events():
     ally = make_unit('a1', 'Ally', hp=10, max_mana=100)
     # Ensure ally has room to be healed (max_hp larger than current hp)
     ally.max_hp = 100
-    ally._set_hp(10, caller_module='event_canonicalizer')
+    ally._set_hp(10, caller_module=_HP_WRITER)
     enemy = make_unit('e1', 'Enemy', hp=100, max_mana=100)
 
     caster.mana = 100
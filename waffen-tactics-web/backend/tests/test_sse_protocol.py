@@ -0,0 +1,72 @@
+"""
+The 'delta' SSE protocol must replay like the legacy one while streaming far less
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'waffen-tactics', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.models.unit import Stats
+from services.combat_event_reconstructor import CombatEventReconstructor
+import routes.game_combat as gc
+
+
+def make_unit(id, name, hp=100, attack=20, max_mana=100, skill=None):
+    stats = Stats(attack=attack, hp=hp, defense=10, max_mana=max_mana, attack_speed=1.0, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=10, attack_speed=1.0, max_mana=max_mana, stats=stats, skill=skill)
+
+
+def teams():
+    skill = {'name': 'Bolt', 'effects': [{'type': 'damage', 'target': 'single_enemy', 'amount': 60}]}
+    team_a = [make_unit('a1', 'A1', hp=600, attack=35, max_mana=40, skill=skill), make_unit('a2', 'A2', hp=450, attack=25)]
+    team_b = [make_unit('b1', 'B1', hp=700, attack=30, max_mana=50, skill=skill), make_unit('b2', 'B2', hp=400, attack=20)]
+    return team_a, team_b
+
+
+def stream(legacy):
+    """Return the (type, payload) stream start_combat would send, JSON round-tripped"""
+    if legacy:
+        sim = CombatSimulator(dt=0.1, timeout=30, seed=3)
+    else:
+        sim = CombatSimulator(dt=0.1, timeout=30, seed=3, snapshot_policy='keyframe', keyframe_interval=gc.SSE_KEYFRAME_INTERVAL)
+
+    def attach_game_state(event_type, data):
+        data['game_state'] = {
+            'player_units': [u.to_dict(current_hp=sim.a_hp[i]) for i, u in enumerate(sim.team_a)],
+            'opponent_units': [u.to_dict(current_hp=sim.b_hp[i]) for i, u in enumerate(sim.team_b)],
+        }
+
+    out = []
+    for event_type, data in sim.simulate_iter(*teams(), attach_game_state if legacy else None):
+        payload = gc.map_event_to_sse_payload(event_type, data)
+        if payload is not None:
+            out.append((event_type, json.loads(json.dumps(payload, default=str))))
+    return out
+
+
+def replay(events):
+    reconstructor = CombatEventReconstructor()
+    reconstructor.initialize_from_snapshot(next(d for t, d in events if t == 'state_snapshot'))
+    for event_type, data in events:
+        reconstructor.process_event(event_type, data)
+    players, opponents = reconstructor.get_reconstructed_state()
+    return {uid: u['hp'] for uid, u in players.items()}, {uid: u['hp'] for uid, u in opponents.items()}
+
+
+def test_state_delta_is_mapped():
+    payload = gc.map_event_to_sse_payload('state_delta', {'player_units': [{'id': 'a1', 'hp': 5}], 'opponent_units': [], 'seq': 9, 'timestamp': 1.0})
+    assert payload == {'type': 'state_delta', 'player_units': [{'id': 'a1', 'hp': 5}], 'opponent_units': [], 'timestamp': 1.0, 'seq': 9}
+
+
+def test_delta_protocol_replays_like_legacy_with_less_data():
+    delta, legacy = stream(legacy=False), stream(legacy=True)
+    assert not any('game_state' in d for _, d in delta)
+    combat_events = lambda events: [(t, d['timestamp']) for t, d in events if t not in ('state_snapshot', 'state_delta')]
+    assert combat_events(delta) == combat_events(legacy)
+    # replay() raises AssertionError on any keyframe/delta mismatch
+    assert replay(delta) == replay(legacy)
+    size = lambda events: sum(len(json.dumps(d)) for _, d in events)
+    assert size(delta) * 5 < size(legacy)
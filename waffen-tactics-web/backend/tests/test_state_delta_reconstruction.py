@@ -0,0 +1,59 @@
+"""
+Keyframe/delta snapshots must replay through the reconstructor like full snapshots
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'waffen-tactics', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.models.unit import Stats
+from services.combat_event_reconstructor import CombatEventReconstructor
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, max_mana=100, skill=None):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, max_mana=max_mana, stats=stats, skill=skill)
+
+
+def simulate(policy):
+    skill = {'name': 'Bolt', 'effects': [{'type': 'damage', 'target': 'single_enemy', 'amount': 60}]}
+    team_a = [make_unit('a1', 'A1', hp=600, attack=35, max_mana=40, skill=skill), make_unit('a2', 'A2', hp=450, attack=25)]
+    team_b = [make_unit('b1', 'B1', hp=700, attack=30, max_mana=50, skill=skill), make_unit('b2', 'B2', hp=400, attack=20)]
+    events = []
+    sim = CombatSimulator(dt=0.1, timeout=30, seed=3, snapshot_policy=policy, keyframe_interval=1.5)
+    # Serialize at emit time like the SSE stream does
+    sim.simulate(team_a, team_b, event_callback=lambda t, d: events.append((t, json.loads(json.dumps(d, default=str)))))
+    return events
+
+
+def replay(events):
+    reconstructor = CombatEventReconstructor()
+    reconstructor.initialize_from_snapshot(next(d for t, d in events if t == 'state_snapshot'))
+    for event_type, data in events:
+        reconstructor.process_event(event_type, data)
+    players, opponents = reconstructor.get_reconstructed_state()
+    return {uid: u['hp'] for uid, u in players.items()}, {uid: u['hp'] for uid, u in opponents.items()}
+
+
+def test_keyframe_replay_matches_full_replay():
+    keyframe_events = simulate('keyframe')
+    full_events = simulate('full')
+    assert sum(1 for t, _ in keyframe_events if t == 'state_snapshot') < sum(1 for t, _ in full_events if t == 'state_snapshot')
+    # replay() raises AssertionError on any snapshot/delta mismatch
+    assert replay(keyframe_events) == replay(full_events)
+
+
+def test_state_delta_merges_into_last_keyframe():
+    events = simulate('keyframe')
+    assert any(t == 'state_delta' for t, _ in events)
+    reconstructor = CombatEventReconstructor()
+    keyframe = next(d for t, d in events if t == 'state_snapshot')
+    reconstructor.initialize_from_snapshot(keyframe)
+    delta = {'timestamp': 0.1, 'seq': 0, 'player_units': [{'id': 'a1', 'current_mana': 10}], 'opponent_units': []}
+    reconstructor.reconstructed_player_units['a1']['current_mana'] = 10
+    reconstructor.process_event('state_delta', delta)
+    assert reconstructor._snapshot_view['player_units']['a1']['current_mana'] == 10
+    assert reconstructor._snapshot_view['player_units']['a1']['hp'] == keyframe['player_units'][0]['hp']
@@ -224,9 +224,13 @@ export function useCombatOverlayLogic({ onClose, logEndRef }: UseCombatOverlayLo
     }
     */
 
-    // Compare with server if game_state present
-    if (event.game_state) {
-      const stateDesyncs = compareCombatStates(newState, event.game_state, event)
+    // Compare with server if game_state present (legacy protocol) or on
+    // state_snapshot keyframes (delta protocol)
+    const serverState = event.game_state ?? (event.type === 'state_snapshot' && event.player_units && event.opponent_units
+      ? { player_units: event.player_units, opponent_units: event.opponent_units }
+      : undefined)
+    if (serverState) {
+      const stateDesyncs = compareCombatStates(newState, serverState, event)
       stateDesyncs.forEach(pushDesync)
     }
 
@@ -132,7 +132,7 @@ class ShopView(View):
         # Add buy buttons for each unit
         for i, unit_id in enumerate(shop_units):
             if unit_id:  # Skip empty slots
-                unit = next((u for u in bot_instance.game_data.units if u.id == unit_id), None)
+                unit = bot_instance.game_data.units_by_id.get(unit_id)
                 if unit:
                     button = Button(
                         label=f"{unit.name} ({unit.cost}g)",
@@ -205,7 +205,7 @@ class BenchView(View):
             # Add select menu for units
             options = []
             for ui in bench_units[:25]:  # Discord limit
-                unit = next((u for u in bot_instance.game_data.units if u.id == ui.unit_id), None)
+                unit = bot_instance.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     options.append(discord.SelectOption(
@@ -323,7 +323,7 @@ class BoardView(View):
             # Add select menu
             options = []
             for ui in board_units[:25]:
-                unit = next((u for u in bot_instance.game_data.units if u.id == ui.unit_id), None)
+                unit = bot_instance.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     options.append(discord.SelectOption(
@@ -838,7 +838,7 @@ class WaffenTacticsBot:
         # Build opponent units
         opponent_units = []
         for unit_data in opponent_data['board']:
-            unit = next((u for u in self.game_data.units if u.id == unit_data['unit_id']), None)
+            unit = self.game_data.units_by_id.get(unit_data['unit_id'])
             if unit:
                 opponent_units.append(unit)
         
@@ -1028,7 +1028,7 @@ class WaffenTacticsBot:
         
         for i, unit_id in enumerate(player.last_shop):
             if unit_id:
-                unit = next((u for u in self.game_data.units if u.id == unit_id), None)
+                unit = self.game_data.units_by_id.get(unit_id)
                 if unit:
                     # Get base stats
                     stats = unit.stats
@@ -1050,7 +1050,7 @@ class WaffenTacticsBot:
         if player.bench:
             bench_preview = []
             for ui in player.bench[:5]:  # Show first 5
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     bench_preview.append(f"{unit.name} {stars}")
@@ -1065,7 +1065,7 @@ class WaffenTacticsBot:
         if player.board:
             board_preview = []
             for ui in player.board[:5]:  # Show first 5
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     board_preview.append(f"{unit.name} {stars}")
@@ -1143,7 +1143,7 @@ class WaffenTacticsBot:
                 unit_counts[(ui.unit_id, ui.star_level)] += 1
             
             for ui in player.bench:
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     # Calculate stats based on star level
@@ -1180,7 +1180,7 @@ class WaffenTacticsBot:
             class_counts = Counter()
             
             for ui in player.bench:
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     for faction in unit.factions:
                         faction_counts[faction] += 1
@@ -1204,7 +1204,7 @@ class WaffenTacticsBot:
         if player.board:
             board_preview = []
             for ui in player.board[:5]:  # Show first 5
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     board_preview.append(f"{unit.name} {stars}")
@@ -1244,7 +1244,7 @@ class WaffenTacticsBot:
             total_atk = 0
             
             for ui in player.board:
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     multiplier = ui.star_level
@@ -1277,7 +1277,7 @@ class WaffenTacticsBot:
         if player.bench:
             bench_preview = []
             for ui in player.bench[:5]:  # Show first 5
-                unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+                unit = self.game_data.units_by_id.get(ui.unit_id)
                 if unit:
                     stars = '⭐' * ui.star_level
                     bench_preview.append(f"{unit.name} {stars}")
@@ -1294,7 +1294,7 @@ class WaffenTacticsBot:
             synergy_lines = []
             for name, (count, tier) in synergies.items():
                 # Get trait info
-                trait = next((t for t in self.game_data.traits if t["name"] == name), None)
+                trait = self.game_data.traits_by_name.get(name)
                 if trait:
                     thresholds = trait["thresholds"]
                     next_threshold = None
@@ -1335,7 +1335,7 @@ class WaffenTacticsBot:
         # Build player units
         player_units = []
         for ui in player.board:
-            unit = next((u for u in self.game_data.units if u.id == ui.unit_id), None)
+            unit = self.game_data.units_by_id.get(ui.unit_id)
             if unit:
                 player_units.append(unit)
         
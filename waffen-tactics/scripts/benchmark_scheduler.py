@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Compare the 'tick' and 'event' schedulers on seeded headless combats.
+
+Usage: benchmark_scheduler.py [team_size ...] [--combats N] [--repeats N]
+
+For each team size, runs the same seeded matchups (random units, star 1-3,
+no synergies) with both schedulers in outcome mode and prints the processed
+ticks and the best wall time of ``--repeats`` runs.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO / "src"))
+
+from waffen_tactics.services.batch_simulation import TeamSpec, UnitSpec, build_team  # noqa: E402
+from waffen_tactics.services.combat_simulator import CombatSimulator  # noqa: E402
+from waffen_tactics.services.data_loader import get_game_data  # noqa: E402
+
+
+def make_jobs(size, combats):
+    ids = [u.id for u in get_game_data().units]
+    jobs = []
+    for seed in range(combats):
+        rng = random.Random(seed)
+        teams = [
+            TeamSpec(units=[UnitSpec(rng.choice(ids), rng.randint(1, 3), rng.choice(["front", "back"])) for _ in range(size)], synergies={})
+            for _ in range(2)
+        ]
+        jobs.append((teams[0], teams[1], seed))
+    return jobs
+
+
+def run(jobs, scheduler):
+    """Return (processed ticks, seconds) for one pass over ``jobs``."""
+    teams = [(build_team(a, "a"), build_team(b, "b"), seed) for a, b, seed in jobs]
+    ticks = 0
+    start = time.perf_counter()
+    for team_a, team_b, seed in teams:
+        sim = CombatSimulator(dt=0.1, timeout=60, seed=seed, scheduler=scheduler)
+        ticks += sim.simulate(team_a, team_b, mode="outcome")["ticks"]
+    return ticks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[1, 3, 10])
+    parser.add_argument("--combats", type=int, default=80)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>4} {'tick ticks':>10} {'event ticks':>11} {'tick s':>7} {'event s':>8} {'speedup':>7}")
+    for size in args.sizes:
+        jobs = make_jobs(size, args.combats)
+        best = {}
+        ticks = {}
+        for _ in range(args.repeats):
+            for scheduler in ("tick", "event"):
+                ticks[scheduler], seconds = run(jobs, scheduler)
+                best[scheduler] = min(best.get(scheduler, float("inf")), seconds)
+        print(f"{size:>4} {ticks['tick']:>10} {ticks['event']:>11} {best['tick']:>7.3f} {best['event']:>8.3f} {best['tick'] / best['event']:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
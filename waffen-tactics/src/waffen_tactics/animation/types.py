@@ -84,7 +84,7 @@ class AnimationEvent:
     @classmethod
     def from_trigger(cls, trigger: AnimationTrigger, seq: Optional[int] = None) -> 'AnimationEvent':
         """Create an AnimationEvent from an AnimationTrigger"""
-        import uuid
+        from ..core.types import make_event_id
         return cls(
             animation_id=trigger.animation_id,
             attacker_id=trigger.attacker_id,
@@ -92,7 +92,7 @@ class AnimationEvent:
             skill_name=trigger.skill_name,
             timestamp=trigger.timestamp,
             seq=seq,
-            event_id=str(uuid.uuid4())
+            event_id=make_event_id()
         )
 
 
@@ -40,7 +40,7 @@ async def load_bots(db_path: str):
 
 def demo_round():
     data = load_game_data()
-    shop = ShopService(data.units)
+    shop = ShopService.from_game_data(data)
     synergies = SynergyEngine(data.traits)
     combat = CombatSimulator()
     prog = ProgressionService()
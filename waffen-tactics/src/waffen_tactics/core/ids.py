@@ -0,0 +1,68 @@
+"""
+Cheap unique ids for combat events and effects
+
+Ids are ``<process tag>-<combat>:<seq>`` strings. The process tag is drawn
+from ``uuid4`` once per process (and again in forked children), so ids stay
+unique across workers and hosts; everything after it is a counter, so
+minting an id costs one ``next()`` and a short format instead of OS
+randomness per event.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import uuid
+from typing import Optional
+
+_process_tag = ''
+_combat_counter = itertools.count(1)
+_effect_counter = itertools.count(1)
+_event_counter = itertools.count(1)
+
+
+def _reset_process_tag():
+    global _process_tag, _combat_counter, _effect_counter, _event_counter
+    _process_tag = uuid.uuid4().hex[:12]
+    _combat_counter = itertools.count(1)
+    _effect_counter = itertools.count(1)
+    _event_counter = itertools.count(1)
+
+
+_reset_process_tag()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_process_tag)
+
+
+def new_combat_id() -> str:
+    """A process-unique combat id, e.g. ``'3f2a9c01d4e5-1a'``."""
+    return f"{_process_tag}-{next(_combat_counter):x}"
+
+
+def next_effect_id() -> str:
+    """A process-unique id for an effect instance (buff, shield, DoT...)."""
+    return f"{_process_tag}-e{next(_effect_counter):x}"
+
+
+def next_event_id() -> str:
+    """A process-unique id for an event minted outside any combat.
+
+    Uses the reserved combat number 0 (combats count from 1), e.g.
+    ``'3f2a9c01d4e5-0:7'``.
+    """
+    return f"{_process_tag}-0:{next(_event_counter)}"
+
+
+class EventIdGenerator:
+    """Mints ``<combat_id>:<seq>`` event ids for one combat.
+
+    Call the generator to get the next id; ``combat_id`` defaults to a
+    fresh ``new_combat_id()``.
+    """
+    __slots__ = ('combat_id', '_counter')
+
+    def __init__(self, combat_id: Optional[str] = None):
+        self.combat_id = combat_id or new_combat_id()
+        self._counter = itertools.count(1)
+
+    def __call__(self) -> str:
+        return f"{self.combat_id}:{next(self._counter)}"
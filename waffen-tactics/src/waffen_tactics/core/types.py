@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import List, Literal, TypedDict, Optional, Union
-import uuid
+
+from waffen_tactics.core.ids import next_event_id
 
 
 @dataclass(frozen=True)
@@ -50,4 +51,5 @@ Event = Union[UnitAttackEvent]
 
 
 def make_event_id() -> str:
-    return str(uuid.uuid4())
+    """Id for an event minted outside a simulator-owned generator"""
+    return next_event_id()
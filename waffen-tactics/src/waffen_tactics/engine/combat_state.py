@@ -1,10 +1,16 @@
 """
 CombatState class - encapsulates authoritative combat state management
 """
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import os
 
+from ..services.target_index import count_alive
+
+
+# Top-level unit fields carried by state deltas when they change
+DELTA_FIELDS = ('hp', 'max_hp', 'attack', 'defense', 'attack_speed', 'current_mana', 'max_mana', 'shield')
+
 
 class CombatState:
     """Encapsulates the authoritative state for combat simulation.
@@ -14,15 +20,19 @@ class CombatState:
     change notifications.
     """
 
-    def __init__(self, team_a: List['CombatUnit'], team_b: List['CombatUnit']):
+    def __init__(self, team_a: List['CombatUnit'], team_b: List['CombatUnit'], hp_arrays: Optional[Dict[str, List[int]]] = None):
         """Initialize combat state with teams.
 
         Args:
             team_a: First team units
             team_b: Second team units
+            hp_arrays: The simulator's authoritative HP lists
+                (``{'team_a': ..., 'team_b': ...}``, usually ``HpMirror``
+                instances); ``alive_counts`` reads their counters
         """
         self.team_a = team_a
         self.team_b = team_b
+        self.hp_arrays = hp_arrays
 
         # Initialize HP lists from unit current HP
         self.a_hp = [u.hp for u in team_a]
@@ -34,6 +44,21 @@ class CombatState:
         except Exception:
             self.a_mana = [0 for _ in team_a]
             self.b_mana = [0 for _ in team_b]
+        # Last state sent per unit id, used to build compact state deltas.
+        # Only maintained when ``track_deltas`` is set (keyframe snapshots).
+        self.track_deltas = False
+        self._sent: Dict[str, Tuple] = {}
+
+    @property
+    def alive_counts(self) -> Dict[str, int]:
+        """Units with HP above zero per side.
+
+        Read from the simulator's ``HpMirror`` counters when ``hp_arrays``
+        was given (O(1)), otherwise counted from this state's HP lists.
+        """
+        if self.hp_arrays is not None:
+            return {'team_a': count_alive(self.hp_arrays['team_a']), 'team_b': count_alive(self.hp_arrays['team_b'])}
+        return {'team_a': count_alive(self.a_hp), 'team_b': count_alive(self.b_hp)}
 
     @property
     def mana_arrays(self) -> Dict[str, List[int]]:
@@ -97,12 +122,61 @@ class CombatState:
             self.sync_mana_lists_from_units()
         except Exception:
             pass
+        player_units = [u.to_dict(self.a_hp[i], current_mana=self.a_mana[i]) for i, u in enumerate(self.team_a)]
+        opponent_units = [u.to_dict(self.b_hp[i], current_mana=self.b_mana[i]) for i, u in enumerate(self.team_b)]
+        if self.track_deltas:
+            # A full snapshot is the new baseline for subsequent deltas
+            for d in player_units + opponent_units:
+                self._sent[d['id']] = (tuple(d.get(f) for f in DELTA_FIELDS), tuple(d.get('effects') or ()))
         return {
-            'player_units': [u.to_dict(self.a_hp[i], current_mana=self.a_mana[i]) for i, u in enumerate(self.team_a)],
-            'opponent_units': [u.to_dict(self.b_hp[i], current_mana=self.b_mana[i]) for i, u in enumerate(self.team_b)],
+            'player_units': player_units,
+            'opponent_units': opponent_units,
+            'alive_counts': self.alive_counts,
             'timestamp': timestamp
         }
 
+    @staticmethod
+    def _unit_state(unit: 'CombatUnit', hp: int, mana: int) -> Tuple:
+        effects = getattr(unit, 'effects', None) or []
+        values = (hp, unit.max_hp, unit.attack, unit.defense, unit.attack_speed, mana, unit.max_mana, getattr(unit, 'shield', 0))
+        # Holding the effect objects lets tuple comparison short-circuit on
+        # identity; in-place edits (e.g. DoT ticks remaining) are only
+        # reported by the next keyframe
+        return values, tuple(effects)
+
+    def get_delta_data(self, timestamp: float) -> Dict[str, Any]:
+        """Generate a compact state_delta payload against the last sent state.
+
+        Each changed unit is listed as ``{'id': ..., <changed DELTA_FIELDS>}``
+        plus its full ``effects`` list when effects were added or removed.
+        Units with no change are omitted. The baseline is the last delta or
+        ``get_snapshot_data`` call made with ``track_deltas`` set.
+        """
+        self.sync_hp_lists_from_units()
+        try:
+            self.sync_mana_lists_from_units()
+        except Exception:
+            pass
+        delta = {'player_units': [], 'opponent_units': [], 'timestamp': timestamp}
+        for key, team, hp_list, mana_list in (
+            ('player_units', self.team_a, self.a_hp, self.a_mana),
+            ('opponent_units', self.team_b, self.b_hp, self.b_mana),
+        ):
+            for i, u in enumerate(team):
+                state = self._unit_state(u, hp_list[i], mana_list[i])
+                sent = self._sent.get(u.id)
+                if state == sent:
+                    continue
+                entry: Dict[str, Any] = {'id': u.id}
+                for field, value, old in zip(DELTA_FIELDS, state[0], sent[0] if sent else (None,) * len(DELTA_FIELDS)):
+                    if value != old:
+                        entry[field] = value
+                if sent is None or state[1] != sent[1]:
+                    entry['effects'] = list(u.effects)
+                delta[key].append(entry)
+                self._sent[u.id] = state
+        return delta
+
     def enforce_debug_assertions(self) -> None:
         """If debug invariants enabled via WAFFEN_DEBUG_INVARIANTS=1, raise AssertionError on inconsistencies."""
         try:
@@ -155,8 +229,9 @@ class CombatState:
         Returns:
             "team_a", "team_b", or None if no winner yet
         """
-        a_alive = sum(1 for h in self.a_hp if h > 0)
-        b_alive = sum(1 for h in self.b_hp if h > 0)
+        alive = self.alive_counts
+        a_alive = alive['team_a']
+        b_alive = alive['team_b']
 
         if a_alive > 0 and b_alive == 0:
             return "team_a"
@@ -168,11 +243,14 @@ class CombatState:
     def get_winner_by_total_hp(self) -> str:
         """Determine winner by total HP when timeout occurs.
 
+        Uses the simulator's ``hp_arrays`` when they were given.
+
         Returns:
             "team_a" or "team_b"
         """
-        sum_a = sum(max(0, h) for h in self.a_hp)
-        sum_b = sum(max(0, h) for h in self.b_hp)
+        a_hp, b_hp = (self.hp_arrays['team_a'], self.hp_arrays['team_b']) if self.hp_arrays is not None else (self.a_hp, self.b_hp)
+        sum_a = sum(max(0, h) for h in a_hp)
+        sum_b = sum(max(0, h) for h in b_hp)
         return "team_a" if sum_a >= sum_b else "team_b"
 
     def get_combat_result(self, winner: str, duration: float, winning_team: List['CombatUnit'], log: List[str]) -> Dict[str, Any]:
@@ -195,11 +273,12 @@ class CombatState:
             if hp_list[i] > 0:
                 surviving_star_sum += getattr(unit, 'star_level', 1)
 
+        alive = self.alive_counts
         return {
             'winner': winner,
             'duration': duration,
-            'team_a_survivors': sum(1 for h in self.a_hp if h > 0),
-            'team_b_survivors': sum(1 for h in self.b_hp if h > 0),
+            'team_a_survivors': alive['team_a'],
+            'team_b_survivors': alive['team_b'],
             'surviving_star_sum': surviving_star_sum,
             'log': log
         }
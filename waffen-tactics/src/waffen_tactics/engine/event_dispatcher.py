@@ -2,19 +2,21 @@
 EventDispatcher - handles event callback wrapping, sequencing, and payload normalization
 """
 from typing import List, Dict, Any, Callable, Optional
-import uuid
+
+from ..core.ids import EventIdGenerator
 
 
 class EventDispatcher:
     """Handles event emission with sequencing, mana deltas, and HP normalization."""
 
-    def __init__(self, team_a: List['CombatUnit'], team_b: List['CombatUnit'], a_hp: List[int], b_hp: List[int], initial_seq: int = 0, last_mana: Optional[Dict[str, int]] = None):
+    def __init__(self, team_a: List['CombatUnit'], team_b: List['CombatUnit'], a_hp: List[int], b_hp: List[int], initial_seq: int = 0, last_mana: Optional[Dict[str, int]] = None, event_ids: Optional[Callable[[], str]] = None):
         self.team_a = team_a
         self.team_b = team_b
         self.a_hp = a_hp
         self.b_hp = b_hp
         self._event_seq = initial_seq
         self._last_mana = last_mana or {}
+        self._event_ids = event_ids or EventIdGenerator()
 
     def wrap_callback(self, original_callback: Optional[Callable[[str, Dict[str, Any]], None]]) -> Optional[Callable[[str, Dict[str, Any]], None]]:
         """Wrap the event callback to add sequencing and enhancements."""
@@ -41,7 +43,7 @@ class EventDispatcher:
             if isinstance(payload, dict):
                 if seq_value is not None:
                     payload['seq'] = seq_value
-                payload['event_id'] = str(uuid.uuid4())
+                payload['event_id'] = self._event_ids()
                 # Ensure payloads emitted downstream include the event type
                 # so serialized dumps retain the type even when only the
                 # payload dict is recorded.
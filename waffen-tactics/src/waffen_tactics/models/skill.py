@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Callable
 from enum import Enum
+import random
 
 
 class TargetType(Enum):
@@ -82,13 +83,35 @@ class SkillExecutionContext:
     persistent_target: Optional[Any] = None  # For SINGLE_ENEMY_PERSISTENT targeting
     # Optional event callback from simulator so effect handlers can emit canonical events
     event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    # Per-simulation random stream (CombatSimulator.rng)
+    rng: Optional[random.Random] = None
+    # Whether the caster is on team_a; resolved by id on first use when None
+    caster_on_team_a: Optional[bool] = None
+
+    def get_rng(self):
+        """Random source for this execution.
+
+        An explicit ``random_seed`` wins (fresh ``Random`` per call, matching
+        the historical reseeding behaviour), then the simulator's ``rng``,
+        then the global ``random`` module.
+        """
+        if self.random_seed is not None:
+            return random.Random(self.random_seed)
+        if self.rng is not None:
+            return self.rng
+        return random
+
+    def _caster_is_on_team_a(self) -> bool:
+        if self.caster_on_team_a is None:
+            self.caster_on_team_a = any(u.id == self.caster.id for u in self.team_a)
+        return self.caster_on_team_a
 
     @property
     def caster_team(self) -> List[Any]:
         """Get the caster's team"""
-        return self.team_a if any(u.id == self.caster.id for u in self.team_a) else self.team_b
+        return self.team_a if self._caster_is_on_team_a() else self.team_b
 
     @property
     def enemy_team(self) -> List[Any]:
         """Get the enemy team"""
-        return self.team_b if any(u.id == self.caster.id for u in self.team_a) else self.team_a
+        return self.team_b if self._caster_is_on_team_a() else self.team_a
@@ -75,6 +75,44 @@ class CombatUnitStats:
     mana_on_attack: int = 10
 
 
+class CombatStatBlock:
+    """Mutable combat unit statistics.
+
+    Buffs and per-second effects change stats in the hot loop, so they are
+    updated in place on this slotted block instead of rebuilding a frozen
+    ``CombatUnitStats``. Use ``freeze()`` for an immutable view.
+    """
+    __slots__ = ('hp', 'attack', 'defense', 'attack_speed', 'max_mana', 'mana_regen', 'star_level', 'position', 'mana_on_attack')
+
+    def __init__(self, hp: int, attack: int, defense: int, attack_speed: float, max_mana: int, mana_regen: int = 0, star_level: int = 1, position: str = 'front', mana_on_attack: int = 10):
+        self.hp = hp
+        self.attack = attack
+        self.defense = defense
+        self.attack_speed = attack_speed
+        self.max_mana = max_mana
+        self.mana_regen = mana_regen
+        self.star_level = star_level
+        self.position = position
+        self.mana_on_attack = mana_on_attack
+
+    def get(self, key: str, default=None):
+        """Dict-like access, matching ``Stats.get``."""
+        return getattr(self, key, default)
+
+    def freeze(self) -> CombatUnitStats:
+        """Return an immutable copy of the current values."""
+        return CombatUnitStats(*(getattr(self, name) for name in self.__slots__))
+
+    def __eq__(self, other):
+        if not isinstance(other, CombatStatBlock):
+            return NotImplemented
+        return self.freeze() == other.freeze()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"CombatStatBlock({fields})"
+
+
 @dataclass(frozen=True)
 class CombatUnitSkill:
     """Immutable combat skill definition"""
@@ -83,7 +121,7 @@ class CombatUnitSkill:
     effect: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class CombatUnitState:
     """Mutable combat unit state"""
     current_hp: int
@@ -112,7 +150,7 @@ class CombatUnitState:
 
 
 # Computed stats cache - computed from effects
-@dataclass
+@dataclass(slots=True)
 class ComputedStats:
     """Computed passive values from effects"""
     lifesteal: float = 0.0
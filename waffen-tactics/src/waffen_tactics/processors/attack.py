@@ -6,6 +6,7 @@ import os
 from typing import List, Dict, Any, Callable, Optional, Tuple
 from ..engine.event_dispatcher import EventDispatcher
 from ..animation.system import get_animation_system
+from ..services.target_index import count_alive
 
 
 class CombatAttackProcessor:
@@ -809,7 +810,7 @@ class CombatAttackProcessor:
         )
 
         # Check if entire defending team is defeated
-        if all(hp <= 0 for hp in defending_hp):
+        if count_alive(defending_hp) == 0:
             return "team_a" if side == "team_a" else "team_b"
 
         return None
\ No newline at end of file
@@ -0,0 +1,459 @@
+"""
+Vectorized batch combat kernel - steps thousands of headless combats at once
+
+A NumPy struct-of-arrays port of the ``CombatSimulator`` tick loop for the
+subset of combat that Monte Carlo sweeps mostly exercise: basic attacks,
+mana on attack and mana regeneration, and skills made only of raw damage
+effects and flat timed ``buff`` effects (attack, defense or attack speed on
+the caster or its team, reverted on expiry). Synergy stat buffs are already
+folded into the unit stats by the team builders, so they need no special
+handling here.
+
+Coverage of the shipped unit data (``load_game_data``): 6 of the 52 unit
+skills run here (4 damage-only, 2 with flat self buffs). Heals, shields,
+debuffs, DoTs, percentage buffs and trait effects still fall back to the
+scalar engine.
+
+Every array is shaped ``[B, U]`` (matchups x unit slots, padded with empty
+slots). Ticks and unit slots are stepped sequentially so the attack order
+matches the scalar engine; all per-unit work is vectorized across B.
+Matchups using anything else are reported as unsupported so callers can run
+them on the scalar engine instead.
+"""
+import bisect
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - only this fast path needs it
+    np = None
+
+from ..models.skill import EffectType, Skill, TargetType
+from .combat_unit import CombatUnit
+
+
+# Basic attack damage lands this long after the swing (see CombatAttackProcessor)
+ATTACK_DELAY = 0.2
+
+# Skill effect target codes used in the effect tables (0 = no effect)
+_TARGET_CODES = {
+    TargetType.SINGLE_ENEMY: 1,
+    TargetType.SINGLE_ENEMY_PERSISTENT: 2,
+    TargetType.ENEMY_TEAM: 3,
+    TargetType.ENEMY_FRONT: 4,
+    TargetType.SELF: 5,
+    TargetType.ALLY_TEAM: 6,
+}
+_DAMAGE_TARGETS = (TargetType.SINGLE_ENEMY, TargetType.SINGLE_ENEMY_PERSISTENT, TargetType.ENEMY_TEAM, TargetType.ENEMY_FRONT)
+_BUFF_TARGETS = (TargetType.SELF, TargetType.ALLY_TEAM)
+
+# Stat codes of flat buff effects in the effect tables (0 = damage effect)
+_BUFF_STATS = {'attack': 1, 'defense': 2, 'attack_speed': 3}
+
+
+def is_available() -> bool:
+    """Return True when numpy is installed and the kernel can run."""
+    return np is not None
+
+
+def _resolve_skill(unit: CombatUnit) -> Optional[Skill]:
+    """Resolve the Skill object a cast would execute, like ``_process_skill_cast``."""
+    skill = unit.skill
+    if isinstance(skill, dict):
+        if 'effects' in skill:
+            return Skill.from_dict(skill)
+        effect = skill.get('effect')
+        if isinstance(effect, dict):
+            if 'skill' in effect:
+                return effect['skill']
+            skill_dict = {k: v for k, v in skill.items() if k != 'effect'}
+            skill_dict['effects'] = [effect]
+            skill_dict['mana_cost'] = skill.get('cost', 0)
+            return Skill.from_dict(skill_dict)
+        return effect
+    if hasattr(skill, 'effects'):
+        return skill
+    return None
+
+
+def _buff_unsupported_reason(effect) -> Optional[str]:
+    """Return why a skill ``buff`` effect is not a flat timed stat buff, or None."""
+    params = effect.params
+    if effect.target not in _BUFF_TARGETS:
+        return f"buff target {effect.target.value!r}"
+    if params.get('stat') not in _BUFF_STATS:
+        return f"buff stat {params.get('stat')!r}"
+    if params.get('value_type', 'flat') != 'flat':
+        return f"{params.get('value_type')} buff"
+    if not isinstance(params.get('value', 0), (int, float)):
+        return "non-numeric buff value"
+    duration = params.get('duration', 0)
+    if not isinstance(duration, (int, float)) or duration <= 0:
+        return "untimed buff"
+    return None
+
+
+def unsupported_reason(unit: CombatUnit) -> Optional[str]:
+    """Return why the kernel cannot simulate ``unit``, or None if it can."""
+    for effect in getattr(unit, 'effects', None) or []:
+        if not isinstance(effect, dict) or effect.get('type') != 'mana_regen':
+            kind = effect.get('type') if isinstance(effect, dict) else effect
+            return f"{unit.id}: effect {kind!r}"
+    if getattr(unit, 'hp_regen_per_sec', 0.0):
+        return f"{unit.id}: hp regeneration"
+    if getattr(unit, 'damage_reduction', 0.0):
+        return f"{unit.id}: damage reduction"
+    computed = getattr(unit, '_computed_stats', None)
+    if computed is not None and getattr(computed, 'lifesteal', 0.0):
+        return f"{unit.id}: lifesteal"
+    if getattr(unit, 'shield', 0):
+        return f"{unit.id}: shield"
+    if not unit.skill:
+        return None
+    skill = _resolve_skill(unit)
+    if skill is None or not hasattr(skill, 'effects'):
+        return f"{unit.id}: unrecognized skill format"
+    for effect in skill.effects:
+        if effect.type == EffectType.DAMAGE:
+            if effect.target not in _DAMAGE_TARGETS:
+                return f"{unit.id}: skill target {effect.target.value!r}"
+        elif effect.type == EffectType.BUFF:
+            reason = _buff_unsupported_reason(effect)
+            if reason:
+                return f"{unit.id}: {reason}"
+        else:
+            return f"{unit.id}: skill effect {effect.type.value!r}"
+    mana_cost = skill.mana_cost if skill.mana_cost is not None else unit.max_mana
+    if mana_cost > unit.max_mana:
+        return f"{unit.id}: mana cost above max mana"
+    return None
+
+
+def matchup_unsupported_reason(team_a: Sequence[CombatUnit], team_b: Sequence[CombatUnit]) -> Optional[str]:
+    """Return why a matchup must use the scalar engine, or None if the kernel handles it."""
+    for unit in list(team_a) + list(team_b):
+        reason = unsupported_reason(unit)
+        if reason:
+            return reason
+    return None
+
+
+class _SideArrays:
+    """Struct-of-arrays state for one side of every matchup in the batch."""
+
+    def __init__(self, teams: List[Sequence[CombatUnit]], slots: int, max_effects: int):
+        shape = (len(teams), slots)
+        self.exists = np.zeros(shape, dtype=bool)
+        self.front = np.zeros(shape, dtype=bool)
+        self.hp = np.zeros(shape, dtype=np.int64)
+        self.attack = np.zeros(shape, dtype=np.float64)
+        self.defense = np.zeros(shape, dtype=np.float64)
+        self.attack_speed = np.zeros(shape, dtype=np.float64)
+        self.interval = np.full(shape, np.inf)
+        self.last_attack = np.zeros(shape, dtype=np.float64)
+        self.mana = np.zeros(shape, dtype=np.int64)
+        self.max_mana = np.zeros(shape, dtype=np.int64)
+        self.mana_on_attack = np.zeros(shape, dtype=np.int64)
+        self.mana_regen = np.zeros(shape, dtype=np.float64)
+        self.mana_acc = np.zeros(shape, dtype=np.float64)
+        self.has_skill = np.zeros(shape, dtype=bool)
+        self.mana_cost = np.zeros(shape, dtype=np.int64)
+        self.effect_target = np.zeros(shape + (max_effects,), dtype=np.int8)
+        self.effect_amount = np.zeros(shape + (max_effects,), dtype=np.int64)
+        self.effect_stat = np.zeros(shape + (max_effects,), dtype=np.int8)
+        self.effect_duration = np.zeros(shape + (max_effects,), dtype=np.float64)
+        # expires_at -> [stat, matchup, slot] flat buff deltas to revert then
+        self.reverts: Dict[float, 'np.ndarray'] = {}
+
+        for b, team in enumerate(teams):
+            for u, unit in enumerate(team):
+                self.exists[b, u] = True
+                self.front[b, u] = unit.position != 'back'
+                self.hp[b, u] = int(unit.hp)
+                self.attack[b, u] = unit.attack
+                self.defense[b, u] = unit.defense
+                self.attack_speed[b, u] = unit.attack_speed
+                if unit.attack_speed > 0:
+                    self.interval[b, u] = 1.0 / unit.attack_speed
+                self.last_attack[b, u] = unit.last_attack_time
+                self.mana[b, u] = int(unit.mana)
+                self.max_mana[b, u] = int(unit.max_mana)
+                self.mana_on_attack[b, u] = int(getattr(unit.stats, 'mana_on_attack', 0))
+                self.mana_regen[b, u] = getattr(unit.stats, 'mana_regen', 0) + sum(
+                    float(e.get('value', 0)) for e in unit.effects if e.get('type') == 'mana_regen'
+                )
+                self.mana_acc[b, u] = getattr(unit, '_mana_regen_accumulator', 0.0)
+                if unit.skill:
+                    skill = _resolve_skill(unit)
+                    self.has_skill[b, u] = True
+                    self.mana_cost[b, u] = skill.mana_cost if skill.mana_cost is not None else unit.max_mana
+                    for e, effect in enumerate(skill.effects):
+                        self.effect_target[b, u, e] = _TARGET_CODES[effect.target]
+                        if effect.type == EffectType.BUFF:
+                            # emit_stat_buff applies int(round(value)) for flat buffs
+                            self.effect_stat[b, u, e] = _BUFF_STATS[effect.params['stat']]
+                            self.effect_amount[b, u, e] = int(round(effect.params.get('value', 0)))
+                            self.effect_duration[b, u, e] = effect.params['duration']
+                        else:
+                            self.effect_amount[b, u, e] = effect.params.get('amount', 0)
+
+        # HP as seen by target selection. Like the simulator's a_hp/b_hp lists
+        # it trails skill damage on non-primary targets until the next tick.
+        self.hp_view = self.hp.copy()
+
+    def add_stat(self, stat: int, rows: 'np.ndarray', delta: 'np.ndarray'):
+        """Add ``delta`` (``[rows, slots]``) to the flat-buffable ``stat``."""
+        if stat == _BUFF_STATS['attack']:
+            self.attack[rows] += delta
+        elif stat == _BUFF_STATS['defense']:
+            self.defense[rows] += delta
+        else:
+            speed = self.attack_speed[rows] + delta
+            self.attack_speed[rows] = speed
+            with np.errstate(divide='ignore'):
+                self.interval[rows] = np.where(speed > 0, 1.0 / speed, np.inf)
+
+    def expire_buffs(self, t: float, live: 'np.ndarray'):
+        """Revert the flat buffs expiring by ``t`` on living units, like
+        ``_process_effect_expiration_for_team`` (dead units keep them)."""
+        for expires_at in [key for key in self.reverts if t >= key]:
+            deltas = self.reverts.pop(expires_at)
+            alive = live[:, None] & (self.hp_view > 0)
+            rows = np.arange(alive.shape[0])
+            for stat in _BUFF_STATS.values():
+                delta = np.where(alive, deltas[stat - 1], 0)
+                if delta.any():
+                    self.add_stat(stat, rows, -delta)
+
+
+def _time_grid(dt: float, timeout: float) -> List[float]:
+    """Tick times exactly as the simulator's ``round(time + dt, 10)`` produces them."""
+    times = [0.0]
+    while times[-1] < timeout:
+        times.append(round(times[-1] + float(dt), 10))
+    return times
+
+
+def _pick(mask: 'np.ndarray', rng: 'np.random.Generator') -> 'np.ndarray':
+    """Pick one True column per row of ``mask`` uniformly at random."""
+    counts = mask.sum(axis=1)
+    k = np.floor(rng.random(len(mask)) * counts)
+    return np.argmax(mask.cumsum(axis=1) > k[:, None], axis=1)
+
+
+def _apply_buffs(caster: _SideArrays, rows: 'np.ndarray', u: int, e: int, t: float):
+    """Apply effect ``e`` of slot ``u``'s skill where it is a flat buff and schedule its revert."""
+    stats = caster.effect_stat[rows, u, e]
+    codes = caster.effect_target[rows, u, e]
+    amounts = caster.effect_amount[rows, u, e]
+    durations = caster.effect_duration[rows, u, e]
+    alive = (caster.hp[rows] > 0) & caster.exists[rows]
+    self_only = np.zeros(alive.shape, dtype=bool)
+    self_only[:, u] = True
+    targets = np.where((codes == _TARGET_CODES[TargetType.ALLY_TEAM])[:, None], alive, self_only)
+    for stat in _BUFF_STATS.values():
+        for duration in np.unique(durations[stats == stat]):
+            picked = (stats == stat) & (durations == duration)
+            delta = np.where(targets & picked[:, None], amounts[:, None], 0)
+            if not delta.any():
+                continue
+            caster.add_stat(stat, rows, delta)
+            expires_at = t + float(duration)
+            if expires_at not in caster.reverts:
+                caster.reverts[expires_at] = np.zeros((len(_BUFF_STATS),) + caster.hp.shape, dtype=np.int64)
+            caster.reverts[expires_at][stat - 1, rows] += delta
+
+
+def _cast_skills(caster: _SideArrays, enemy: _SideArrays, rows: 'np.ndarray', u: int, rng: 'np.random.Generator', t: float):
+    """Apply the skill of slot ``u`` for ``rows``: raw damage (ignores defense) and flat buffs."""
+    caster.mana[rows, u] = np.clip(caster.mana[rows, u] - caster.mana_cost[rows, u], 0, caster.max_mana[rows, u])
+    persistent = np.full(len(rows), -1)
+    for e in range(caster.effect_target.shape[2]):
+        if caster.effect_stat[rows, u, e].any():
+            _apply_buffs(caster, rows, u, e, t)
+        codes = caster.effect_target[rows, u, e]
+        amounts = caster.effect_amount[rows, u, e]
+        hp = enemy.hp[rows]
+        alive = (hp > 0) & enemy.exists[rows]
+        hit = np.zeros(hp.shape, dtype=bool)
+
+        single = (codes == _TARGET_CODES[TargetType.SINGLE_ENEMY]) & (amounts > 0)
+        if single.any():
+            # Falls back to any enemy when none is alive, like SkillExecutor
+            candidates = np.where(alive.any(axis=1)[:, None], alive, enemy.exists[rows])
+            idx = np.nonzero(single)[0]
+            hit[idx, _pick(candidates[idx], rng)] = True
+
+        sticky = (codes == _TARGET_CODES[TargetType.SINGLE_ENEMY_PERSISTENT]) & (amounts > 0) & alive.any(axis=1)
+        if sticky.any():
+            idx = np.nonzero(sticky)[0]
+            current = persistent[idx]
+            keep = (current >= 0) & alive[idx, np.maximum(current, 0)]
+            redraw = idx[~keep]
+            if len(redraw):
+                persistent[redraw] = _pick(alive[redraw], rng)
+            hit[idx, persistent[idx]] = True
+
+        team = (codes == _TARGET_CODES[TargetType.ENEMY_TEAM]) & (amounts > 0)
+        hit |= alive & team[:, None]
+
+        front = (codes == _TARGET_CODES[TargetType.ENEMY_FRONT]) & (amounts > 0)
+        hit |= alive & (alive.cumsum(axis=1) <= 3) & front[:, None]
+
+        enemy.hp[rows] = np.where(hit, np.maximum(0, hp - amounts[:, None]), hp)
+
+
+def simulate_batch(
+    matchups: Sequence[Tuple[Sequence[CombatUnit], Sequence[CombatUnit]]],
+    dt: float = 0.1,
+    timeout: float = 60,
+    seed: Any = None,
+) -> Tuple[List[Optional[Dict[str, Any]]], Dict[int, str]]:
+    """Simulate many matchups of prepared CombatUnits in lockstep.
+
+    Results use the ``simulate_many`` shape (without ``seed``). With
+    ``WAFFEN_DETERMINISTIC_TARGETING`` set and no single-target skills they
+    match ``CombatSimulator`` exactly; random choices come from one NumPy
+    generator seeded with ``seed``, so they agree with the scalar engine in
+    distribution only.
+
+    Returns:
+        ``(results, unsupported)`` - ``results[i]`` is None for every index in
+        ``unsupported``, which maps matchup index -> reason so callers can
+        fall back to the scalar engine for those.
+    """
+    if np is None:
+        raise ImportError("The vectorized combat kernel requires numpy")
+
+    unsupported: Dict[int, str] = {}
+    supported: List[int] = []
+    for i, (team_a, team_b) in enumerate(matchups):
+        reason = matchup_unsupported_reason(team_a, team_b)
+        if reason:
+            unsupported[i] = reason
+        else:
+            supported.append(i)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(matchups)
+    if not supported:
+        return results, unsupported
+
+    teams = [[matchups[i][0] for i in supported], [matchups[i][1] for i in supported]]
+    slots = max(1, max(len(t) for side in teams for t in side))
+    max_effects = 1
+    for side in teams:
+        for team in side:
+            for unit in team:
+                if unit.skill:
+                    max_effects = max(max_effects, len(_resolve_skill(unit).effects))
+    sides = [_SideArrays(teams[0], slots, max_effects), _SideArrays(teams[1], slots, max_effects)]
+
+    deterministic = os.getenv('WAFFEN_DETERMINISTIC_TARGETING', '0') in ('1', 'true', 'True')
+    rng = np.random.default_rng(seed)
+    batch = len(supported)
+    live = np.ones(batch, dtype=bool)
+    winner = np.zeros(batch, dtype=np.int8)
+    times = _time_grid(dt, timeout)
+    duration = np.full(batch, times[-1])
+    # tick index -> damage landing on [side, matchup, slot] at that tick
+    pending: Dict[int, 'np.ndarray'] = {}
+
+    def deliver(damage):
+        for side, dmg in zip(sides, damage):
+            hit = dmg > 0
+            side.hp = np.where(hit, np.maximum(0, side.hp - dmg), side.hp)
+            side.hp_view = np.where(hit, side.hp, side.hp_view)
+
+    def settle(t):
+        # A wiped-out side ends its combat at once (team_b checked first,
+        # like CombatSimulator._wiped_out_winner)
+        for s in (0, 1):
+            wiped = live & ~(sides[1 - s].hp_view > 0).any(axis=1)
+            live[wiped] = False
+            winner[wiped] = s
+            duration[wiped] = t
+
+    for n, t in enumerate(times[:-1]):
+        # Mana regeneration; also re-syncs the targeting view like _process_regeneration
+        for side in sides:
+            regen = live[:, None] & (side.mana_regen > 0)
+            acc = side.mana_acc + side.mana_regen * dt
+            part = np.where(regen, np.floor(acc + 1e-10), 0.0)
+            part = np.where(part > 0, part, 0.0)
+            side.mana_acc = np.where(regen, acc - part, side.mana_acc)
+            side.mana = np.where(regen, np.clip(side.mana + part.astype(np.int64), 0, side.max_mana), side.mana)
+            side.hp_view = np.where(live[:, None], side.hp, side.hp_view)
+
+        if n in pending:
+            deliver(pending.pop(n))
+        for side in sides:
+            if side.reverts:
+                side.expire_buffs(t, live)
+        settle(t)
+
+        land = bisect.bisect_left(times, round(t + ATTACK_DELAY, 10))
+        for s in (0, 1):
+            attacker, defender = sides[s], sides[1 - s]
+            for u in range(slots):
+                ready = live & (attacker.hp_view[:, u] > 0) & (t - attacker.last_attack[:, u] >= attacker.interval[:, u])
+                if not ready.any():
+                    continue
+                rows = np.nonzero(ready)[0]
+                alive = defender.hp_view[rows] > 0
+                has_target = alive.any(axis=1)
+
+                # An attacker with nothing left to hit ends its combat
+                done = rows[~has_target]
+                live[done] = False
+                winner[done] = s
+                duration[done] = t
+
+                rows, alive = rows[has_target], alive[has_target]
+                if not len(rows):
+                    continue
+                front = alive & defender.front[rows]
+                preferred = np.where(front.any(axis=1)[:, None], front, alive & ~defender.front[rows])
+                target = np.argmax(preferred, axis=1) if deterministic else _pick(preferred, rng)
+
+                gain = attacker.mana_on_attack[rows, u]
+                casts = attacker.has_skill[rows, u] & (attacker.mana[rows, u] + gain >= attacker.max_mana[rows, u])
+                attacker.mana[rows, u] = np.clip(attacker.mana[rows, u] + gain, 0, attacker.max_mana[rows, u])
+
+                basic = ~casts
+                if basic.any():
+                    b_rows, b_target = rows[basic], target[basic]
+                    raw = attacker.attack[b_rows, u] * 100.0 / (100.0 + defender.defense[b_rows, b_target])
+                    damage = np.maximum(1, np.trunc(raw).astype(np.int64))
+                    if land not in pending:
+                        pending[land] = np.zeros((2, batch, slots), dtype=np.int64)
+                    pending[land][1 - s, b_rows, b_target] += damage
+
+                if casts.any():
+                    c_rows, c_target = rows[casts], target[casts]
+                    _cast_skills(attacker, defender, c_rows, u, rng, t)
+                    defender.hp_view[c_rows, c_target] = defender.hp[c_rows, c_target]
+
+                attacker.last_attack[rows, u] = t
+            settle(t)
+
+        if not live.any():
+            break
+
+    # Damage still in flight lands after the combat ends, as in the final flush
+    for n in sorted(pending):
+        deliver(pending[n])
+
+    for row, index in enumerate(supported):
+        team_a, team_b = matchups[index]
+        a_hp = [int(hp) for hp in sides[0].hp_view[row, :len(team_a)]]
+        b_hp = [int(hp) for hp in sides[1].hp_view[row, :len(team_b)]]
+        results[index] = {
+            'winner': 'team_b' if winner[row] == 1 else 'team_a',
+            'duration': float(duration[row]),
+            'timeout': float(duration[row]) >= timeout,
+            'team_a_survivors': sum(1 for hp in a_hp if hp > 0),
+            'team_b_survivors': sum(1 for hp in b_hp if hp > 0),
+            'team_a_hp': a_hp,
+            'team_b_hp': b_hp,
+        }
+    return results, unsupported
@@ -0,0 +1,185 @@
+"""
+Batch combat simulation - runs many headless combats across a process pool
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import batch_kernel
+from .combat_simulator import CombatSimulator
+from .combat_unit import CombatUnit
+from .data_loader import GameData, get_game_data
+from .synergy import SynergyEngine
+from .unit_templates import template_cache_for
+
+
+@dataclass(frozen=True)
+class UnitSpec:
+    """A unit on a team spec: template id, star level and board line."""
+    unit_id: str
+    star_level: int = 1
+    position: str = 'front'
+
+
+@dataclass
+class TeamSpec:
+    """Lightweight, picklable description of a team.
+
+    ``synergies`` maps trait name -> (count, tier) like
+    ``SynergyEngine.compute``; when ``None`` it is computed from the units.
+    """
+    units: List[UnitSpec] = field(default_factory=list)
+    synergies: Optional[Dict[str, Tuple[int, int]]] = None
+
+
+TeamLike = Union[TeamSpec, Sequence[Union[UnitSpec, Tuple, str]]]
+
+
+# Per-process cache: every worker builds its lookups once over the shared GameData
+_worker_context: Optional[Tuple[GameData, SynergyEngine, Dict[str, Any]]] = None
+
+
+def _get_worker_context() -> Tuple[GameData, SynergyEngine, Dict[str, Any]]:
+    global _worker_context
+    if _worker_context is None:
+        data = get_game_data()
+        _worker_context = (data, SynergyEngine(data.traits), data.units_by_id)
+    return _worker_context
+
+
+def _init_worker():
+    _get_worker_context()
+
+
+def _coerce_team(team: TeamLike) -> TeamSpec:
+    if isinstance(team, TeamSpec):
+        return team
+    units = []
+    for entry in team:
+        if isinstance(entry, UnitSpec):
+            units.append(entry)
+        elif isinstance(entry, str):
+            units.append(UnitSpec(entry))
+        else:
+            units.append(UnitSpec(*entry))
+    return TeamSpec(units=units)
+
+
+def build_team(spec: TeamSpec, prefix: str) -> List[CombatUnit]:
+    """Build combat-ready units for a team spec using the cached GameData.
+
+    Units are spawned from the worker's ``UnitTemplateCache``, so star
+    scaling, synergy stat buffs and synergy effects are computed once per
+    (unit, star, synergies) the same way web combat does. Batch units keep
+    their ``Skill`` object and no passive mana regen.
+    """
+    _, synergy_engine, units_by_id = _get_worker_context()
+    units = []
+    for unit_spec in spec.units:
+        unit = units_by_id.get(unit_spec.unit_id)
+        if unit is None:
+            raise ValueError(f"Unknown unit id: {unit_spec.unit_id}")
+        units.append(unit)
+
+    active = spec.synergies if spec.synergies is not None else synergy_engine.compute(units)
+    templates = template_cache_for(synergy_engine)
+    team = []
+    for i, (unit_spec, unit) in enumerate(zip(spec.units, units)):
+        combat_unit = templates.get(unit, unit_spec.star_level, active).spawn(
+            f"{prefix}_{i}", unit_spec.position, skill=unit.skill, mana_regen=0,
+        )
+        # Set max_hp to buffed hp to prevent hp > max_hp issues
+        combat_unit.max_hp = combat_unit.hp
+        team.append(combat_unit)
+    return team
+
+
+def _run_matchup(job: Tuple[TeamSpec, TeamSpec, Optional[int], float, float, str]) -> Dict[str, Any]:
+    team_a_spec, team_b_spec, seed, dt, timeout, scheduler = job
+    team_a = build_team(team_a_spec, 'a')
+    team_b = build_team(team_b_spec, 'b')
+    sim = CombatSimulator(dt=dt, timeout=timeout, scheduler=scheduler, seed=seed)
+    result = sim.simulate(team_a, team_b, mode='outcome')
+    return {
+        'seed': seed,
+        'winner': result['winner'],
+        'duration': result['duration'],
+        'timeout': result['timeout'],
+        'team_a_survivors': result['team_a_survivors'],
+        'team_b_survivors': result['team_b_survivors'],
+        'team_a_hp': list(sim.a_hp),
+        'team_b_hp': list(sim.b_hp),
+    }
+
+
+def _run_jobs(jobs: List[Tuple], workers: Optional[int], chunksize: Optional[int]) -> List[Dict[str, Any]]:
+    if workers is not None and workers <= 1:
+        return [_run_matchup(job) for job in jobs]
+
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_run_matchup, jobs, chunksize=chunksize))
+
+
+def _run_vectorized(jobs: List[Tuple], workers: Optional[int], chunksize: Optional[int]) -> List[Dict[str, Any]]:
+    seeds = [job[2] for job in jobs]
+    teams = [(build_team(a, 'a'), build_team(b, 'b')) for a, b, *_ in jobs]
+    _, _, _, dt, timeout, _ = jobs[0]
+    kernel_seed = None if any(seed is None for seed in seeds) else seeds
+    results, unsupported = batch_kernel.simulate_batch(teams, dt=dt, timeout=timeout, seed=kernel_seed)
+
+    fallback = sorted(unsupported)
+    for index, result in zip(fallback, _run_jobs([jobs[i] for i in fallback], workers, chunksize)):
+        results[index] = dict(result, vectorized=False)
+    for index, result in enumerate(results):
+        if index not in unsupported:
+            results[index] = dict(result, seed=seeds[index], vectorized=True)
+    return results
+
+
+def simulate_many(
+    matchups: Iterable[Tuple[TeamLike, TeamLike]],
+    seeds: Optional[Sequence[Optional[int]]] = None,
+    workers: Optional[int] = None,
+    dt: float = 0.1,
+    timeout: float = 60,
+    scheduler: str = 'event',
+    chunksize: Optional[int] = None,
+    vectorized: bool = False,
+) -> List[Dict[str, Any]]:
+    """Run many headless combats, optionally across a process pool.
+
+    Args:
+        matchups: (team_a, team_b) pairs. A team is a ``TeamSpec`` or a
+            sequence of ``UnitSpec`` / ``(unit_id, star_level, position)``
+            tuples / unit ids.
+        seeds: Per-matchup RNG seed (defaults to the matchup index), so each
+            result is reproducible on its own regardless of worker layout.
+        workers: Number of worker processes. ``None`` uses all cores;
+            ``0``/``1`` runs in the calling process.
+        dt, timeout, scheduler: Passed to ``CombatSimulator``.
+        chunksize: Matchups sent to a worker per round-trip.
+        vectorized: Step supported matchups together in the NumPy batch
+            kernel (``batch_kernel``) and run the rest on the scalar engine.
+            Each result then carries ``vectorized`` telling which engine
+            produced it. Kernel randomness is seeded from ``seeds`` but does
+            not replay the scalar engine's random choices.
+
+    Returns:
+        One compact result dict per matchup, in input order.
+    """
+    pairs = [(_coerce_team(a), _coerce_team(b)) for a, b in matchups]
+    if seeds is None:
+        seeds = list(range(len(pairs)))
+    elif len(seeds) != len(pairs):
+        raise ValueError(f"Expected {len(pairs)} seeds, got {len(seeds)}")
+    jobs = [(a, b, seed, dt, timeout, scheduler) for (a, b), seed in zip(pairs, seeds)]
+
+    if vectorized and jobs:
+        if not batch_kernel.is_available():
+            raise ImportError("simulate_many(vectorized=True) requires numpy")
+        return _run_vectorized(jobs, workers, chunksize)
+    return _run_jobs(jobs, workers, chunksize)
@@ -10,9 +10,9 @@ class CombatSimulator:
     """Wrapper that adapts Unit objects to shared combat system"""
     
     def __init__(self):
-        self.shared_sim = SharedCombatSimulator(dt=0.1, timeout=120)
+        self.shared_sim = SharedCombatSimulator(dt=0.1, timeout=120, stall_window=SharedCombatSimulator.STALL_WINDOW)
     
-    def simulate(self, team_a: List[Unit], team_b: List[Unit], timeout: int = 120, event_callback=None, round_number: int = 1) -> Dict[str, any]:
+    def simulate(self, team_a: List[Unit], team_b: List[Unit], timeout: int = 120, event_callback=None, round_number: int = 1, mode: str = 'full') -> Dict[str, any]:
         """
         Simulate combat using shared logic
         
@@ -53,4 +53,4 @@ class CombatSimulator:
         
         # Use shared simulator
         self.shared_sim.timeout = timeout
-        return self.shared_sim.simulate(team_a_combat, team_b_combat, event_callback, round_number)
+        return self.shared_sim.simulate(team_a_combat, team_b_combat, event_callback, round_number, mode=mode)
@@ -2,10 +2,15 @@
 Combat attack processor - handles attack logic and damage calculation
 """
 import random
-import os
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from .event_canonicalizer import emit_mana_update
 from .event_canonicalizer import emit_mana_change
+from .effect_index import effects_of_type
+from .combat_log import record
+from .pending_action import PendingAction
+from .target_index import HpMirror, deterministic_targeting_enabled
+from .skill_plan import skill_plan_for
+from .. import trace
 
 
 class CombatAttackProcessor:
@@ -91,12 +96,14 @@ class CombatAttackProcessor:
                 new_hp = max(0, old_hp - int(damage))
                 # print(f"[HP DEBUG] ts={time:.9f} side={side} target={defending_team[target_idx].id}:{defending_team[target_idx].name} old_hp={old_hp} -> new_hp={new_hp} cause=attack damage={damage}")
 
+                outcome_only = getattr(self, '_outcome_only', False)
+
                 # Log and callback
-                msg = f"[{time:.2f}s] {side.upper()[0]}:{unit.name} hits {'A' if side == 'team_b' else 'B'}:{defending_team[target_idx].name} for {damage}, hp={defending_hp[target_idx]}"
-                log.append(msg)
+                if not outcome_only:
+                    record(log, 'attack', unit, defending_team[target_idx], damage, defending_hp[target_idx], time=time)
 
                 # Emit animation_start immediately so UI can play animation
-                if event_callback:
+                if event_callback and not outcome_only:
                     event_callback('animation_start', {
                         'type': 'animation_start',
                         'animation_id': 'basic_attack',
@@ -110,168 +117,12 @@ class CombatAttackProcessor:
 
                 # Schedule unit_attack and mana_update with a UI delay (0.2s)
                 attack_ts = round(time + 0.2, 10)
-                def make_action(attacker, target_obj, dmg, side_val, deliver_ts, old_hp_val, new_hp_val, target_idx_arg=None, compute_ts=None):
-                    def action():
-                        from .event_canonicalizer import emit_damage, emit_unit_died
-                        results = []
-                        dmg_payload = None
-                        # Prepare hp_arrays and unit side/index for atomic updates when running under simulator
-                        hp_arrays = None
-                        unit_index = None
-                        unit_side = None
-                        try:
-                            if hasattr(self, 'a_hp') and hasattr(self, 'b_hp'):
-                                hp_arrays = {'team_a': self.a_hp, 'team_b': self.b_hp}
-                                # target_idx_arg references index inside defending_team
-                                unit_index = int(target_idx_arg) if target_idx_arg is not None else None
-                                # target side is opposite of attacker side
-                                unit_side = 'team_b' if side_val == 'team_a' else 'team_a'
-                        except Exception:
-                            hp_arrays = None
-
-                        # Apply canonical damage mutation without emitting the builtin 'attack' event
-                        dmg_payload = emit_damage(None, attacker, target_obj, raw_damage=dmg, shield_absorbed=0, damage_type=getattr(attacker, 'damage_type', 'physical'), side=side_val, timestamp=deliver_ts, cause='attack', emit_event=False, hp_arrays=hp_arrays, unit_index=unit_index, unit_side=unit_side)
-
-                        # Build unit_attack payload with authoritative HP fields
-                        ua = {
-                            'attacker_id': getattr(attacker, 'id', None),
-                            'attacker_name': getattr(attacker, 'name', None),
-                            'target_id': getattr(target_obj, 'id', None),
-                            'target_name': getattr(target_obj, 'name', None),
-                            'damage': int(dmg) if dmg is not None else 0,
-                            'damage_type': getattr(attacker, 'damage_type', 'physical'),
-                            'pre_hp': None,
-                            'post_hp': None,
-                            'applied_damage': int(dmg) if dmg is not None else 0,
-                            'is_skill': False,
-                            'side': side_val,
-                            'timestamp': deliver_ts,
-                        }
-
-                        # Fill HP info preferentially from dmg_payload
-                        if isinstance(dmg_payload, dict):
-                            ua['pre_hp'] = dmg_payload.get('pre_hp')
-                            ua['post_hp'] = dmg_payload.get('post_hp')
-                            ua['applied_damage'] = dmg_payload.get('applied_damage', ua['applied_damage'])
-                            # Ensure backward-compatible authoritative HP fields
-                            ua['target_hp'] = dmg_payload.get('target_hp', ua.get('post_hp'))
-                            ua['target_max_hp'] = dmg_payload.get('target_max_hp', getattr(target_obj, 'max_hp', None))
-                        else:
-                            ua['pre_hp'] = old_hp_val
-                            ua['post_hp'] = getattr(target_obj, 'hp', new_hp_val)
-                            ua['target_hp'] = ua['post_hp']
-                            ua['target_max_hp'] = getattr(target_obj, 'max_hp', None)
-
-                        # Warn if canonical dmg_payload is missing authoritative fields
-                        try:
-                            missing = []
-                            if isinstance(dmg_payload, dict):
-                                if 'post_hp' not in dmg_payload:
-                                    missing.append('post_hp')
-                                # some emitters may use 'unit_id' rather than 'target_id'
-                                if dmg_payload.get('unit_id') is None and ua.get('target_id') is None:
-                                    missing.append('target_id')
-                            else:
-                                # dmg_payload not a dict (unexpected) — warn
-                                missing.append('dmg_payload_not_dict')
-                            if missing:
-                                print(f"[MAKE_ACTION WARN] missing_fields={missing} attacker={getattr(attacker,'id',None)} target={getattr(target_obj,'id',None)} deliver_ts={deliver_ts} dmg_payload={dmg_payload}")
-                        except Exception:
-                            pass
-
-                        results.append(('unit_attack', ua))
-
-                        # DEBUG: log dmg_payload contents to help trace missing unit_died
-                        try:
-                            print(f"[MAKE_ACTION DEBUG] dmg_payload={dmg_payload}")
-                        except Exception:
-                            pass
-
-                        # If the canonical damage resulted in death, prepare unit_died
-                        # payload and process on-death effects via the modular effect
-                        # processor into the local results list so they are emitted
-                        # in-order by the simulator sink.
-                        if isinstance(dmg_payload, dict) and dmg_payload.get('post_hp') == 0:
-                            try:
-                                # Mark unit as dead and get canonical died payload
-                                died = emit_unit_died(None, target_obj, side=side_val, timestamp=deliver_ts, unit_hp=dmg_payload.get('pre_hp'), hp_arrays=hp_arrays, unit_index=unit_index, unit_side=unit_side)
-                                print(f"[MAKE_ACTION DEBUG] emit_unit_died returned: {died}")
-                                if died:
-                                    results.append(('unit_died', died))
-
-                                # If we have a modular_effect_processor available on self,
-                                # execute ON_ENEMY_DEATH and ON_ALLY_DEATH triggers using
-                                # a local collector that appends events to results so that
-                                # they are emitted in-order by the sink.
-                                try:
-                                    from .modular_effect_processor import TriggerType
-                                    if hasattr(self, 'modular_effect_processor') and self.modular_effect_processor:
-                                        def _local_collector(ev_type, ev_payload):
-                                            results.append((ev_type, ev_payload))
-
-                                        # Build context similar to CombatEffectProcessor
-                                        context = {
-                                            'current_unit': attacker,
-                                            'all_units': attacking_team + defending_team,
-                                            'enemy_units': defending_team,
-                                            'ally_units': attacking_team,
-                                            'collected_stats': getattr(attacker, 'collected_stats', {}),
-                                            # Use the original compute timestamp so modular triggers
-                                            # see the time the attack was computed (animation_start),
-                                            # matching legacy behavior and test expectations.
-                                            'current_time': compute_ts if compute_ts is not None else deliver_ts,
-                                            'side': side_val,
-                                            'player': attacker,
-                                            'target_unit': target_obj,
-                                            'killer_unit': attacker,
-                                            'triggered_rewards': set(),
-                                        }
-
-                                        # Process ON_ENEMY_DEATH
-                                        try:
-                                            self.modular_effect_processor.process_trigger(TriggerType.ON_ENEMY_DEATH, context, _local_collector)
-                                        except Exception:
-                                            pass
-
-                                        # Process ON_ALLY_DEATH
-                                        try:
-                                            ally_ctx = {
-                                                    'all_units': attacking_team + defending_team,
-                                                    'enemy_units': attacking_team,
-                                                    'ally_units': defending_team,
-                                                    'current_time': compute_ts if compute_ts is not None else deliver_ts,
-                                                    'side': 'team_b' if side_val == 'team_a' else 'team_a',
-                                                    'dead_ally': target_obj,
-                                                    'triggered_rewards': set(),
-                                                }
-                                            self.modular_effect_processor.process_trigger(TriggerType.ON_ALLY_DEATH, ally_ctx, _local_collector)
-                                        except Exception:
-                                            pass
-                                except Exception:
-                                    pass
-                            except Exception as e:
-                                print(f"[MAKE_ACTION ERROR] emit_unit_died raised: {e}")
-
-                        # Emit mana_update snapshot for attacker at deliver_ts
-                        mu = {
-                            'unit_id': getattr(attacker, 'id', None),
-                            'unit_name': getattr(attacker, 'name', None),
-                            'current_mana': getattr(attacker, 'mana', None),
-                            'max_mana': getattr(attacker, 'max_mana', None),
-                            'unit_hp': getattr(attacker, 'hp', None),  # AUTHORITATIVE: current HP
-                            'side': side_val,
-                            'timestamp': deliver_ts,
-                        }
-                        results.append(('mana_update', mu))
-                        return results
-                    return action
 
                 # If running under CombatSimulator, use scheduler; otherwise emit immediately
                 if hasattr(self, 'schedule_event') and event_callback:
-                    action_callable = make_action(unit, defending_team[target_idx], damage, side, attack_ts, old_hp, new_hp, target_idx_arg=target_idx, compute_ts=time)
-                    # Schedule for delivery at attack_ts
-                    # note: CombatSimulator.schedule_event will handle the heap
-                    self.schedule_event(attack_ts, action_callable)
+                    # Schedule for delivery at attack_ts; the simulator resolves
+                    # the record via _resolve_pending_attack
+                    self.schedule_event(attack_ts, PendingAction.attack(side, i, target_idx, damage, attack_ts, time, old_hp, new_hp))
                 else:
                     # No scheduler available - emit immediate unit_attack
                     if event_callback:
@@ -322,7 +173,7 @@ class CombatAttackProcessor:
                             timestamp=time,
                             current_hp=attacking_hp[i]  # Use authoritative HP from list
                         )
-                        log.append(f"{unit.name} lifesteals {heal}")
+                        record(log, 'lifesteal', unit, None, heal)
 
                 # Mana gain: per attack — apply via canonical emitter (mutates state)
                 amount = int(getattr(unit.stats, 'mana_on_attack', 0))
@@ -362,6 +213,177 @@ class CombatAttackProcessor:
 
         return None
 
+    def _resolve_pending_attack(self, action: PendingAction) -> List[Tuple[str, Dict[str, Any]]]:
+        """Land a scheduled basic attack; returns the events to emit in order."""
+        from .event_canonicalizer import emit_damage, emit_unit_died
+        side_val = action.side
+        unit_side = 'team_b' if side_val == 'team_a' else 'team_a'
+        attacking_team = self.team_a if side_val == 'team_a' else self.team_b
+        defending_team = self.team_b if side_val == 'team_a' else self.team_a
+        attacker = attacking_team[action.attacker_idx]
+        target_obj = defending_team[action.target_idx]
+        dmg = action.damage
+        deliver_ts = action.deliver_ts
+        # Modular triggers see the time the attack was computed (animation_start)
+        trigger_ts = action.compute_ts if action.compute_ts is not None else deliver_ts
+        hp_arrays = self._hp_arrays
+        unit_index = action.target_idx
+        results = []
+
+        # Apply canonical damage mutation without emitting the builtin 'attack' event
+        dmg_payload = emit_damage(None, attacker, target_obj, raw_damage=dmg, shield_absorbed=0, damage_type=getattr(attacker, 'damage_type', 'physical'), side=side_val, timestamp=deliver_ts, cause='attack', emit_event=False, hp_arrays=hp_arrays, unit_index=unit_index, unit_side=unit_side)
+
+        if self._outcome_only:
+            # Headless: apply death and on-death triggers only
+            if isinstance(dmg_payload, dict) and dmg_payload.get('post_hp') == 0:
+                try:
+                    emit_unit_died(None, target_obj, side=side_val, timestamp=deliver_ts, unit_hp=dmg_payload.get('pre_hp'), hp_arrays=hp_arrays, unit_index=unit_index, unit_side=unit_side)
+                    self._process_attack_death_triggers(attacker, target_obj, attacking_team, defending_team, side_val, trigger_ts, lambda *_: None, all_units=self._all_units[side_val])
+                except Exception:
+                    pass
+            return results
+
+        # Build unit_attack payload with authoritative HP fields
+        ua = {
+            'attacker_id': getattr(attacker, 'id', None),
+            'attacker_name': getattr(attacker, 'name', None),
+            'target_id': getattr(target_obj, 'id', None),
+            'target_name': getattr(target_obj, 'name', None),
+            'damage': int(dmg) if dmg is not None else 0,
+            'damage_type': getattr(attacker, 'damage_type', 'physical'),
+            'pre_hp': None,
+            'post_hp': None,
+            'applied_damage': int(dmg) if dmg is not None else 0,
+            'is_skill': False,
+            'side': side_val,
+            'timestamp': deliver_ts,
+        }
+
+        # Fill HP info preferentially from dmg_payload
+        if isinstance(dmg_payload, dict):
+            ua['pre_hp'] = dmg_payload.get('pre_hp')
+            ua['post_hp'] = dmg_payload.get('post_hp')
+            ua['applied_damage'] = dmg_payload.get('applied_damage', ua['applied_damage'])
+            # Ensure backward-compatible authoritative HP fields
+            ua['target_hp'] = dmg_payload.get('target_hp', ua.get('post_hp'))
+            ua['target_max_hp'] = dmg_payload.get('target_max_hp', getattr(target_obj, 'max_hp', None))
+        else:
+            ua['pre_hp'] = action.old_hp
+            ua['post_hp'] = getattr(target_obj, 'hp', action.new_hp)
+            ua['target_hp'] = ua['post_hp']
+            ua['target_max_hp'] = getattr(target_obj, 'max_hp', None)
+
+        # Warn if canonical dmg_payload is missing authoritative fields
+        if trace.enabled('attack', trace.WARNING):
+            missing = []
+            if isinstance(dmg_payload, dict):
+                if 'post_hp' not in dmg_payload:
+                    missing.append('post_hp')
+                # some emitters may use 'unit_id' rather than 'target_id'
+                if dmg_payload.get('unit_id') is None and ua.get('target_id') is None:
+                    missing.append('target_id')
+            else:
+                # dmg_payload not a dict (unexpected) — warn
+                missing.append('dmg_payload_not_dict')
+            if missing:
+                trace.warning('attack', "missing_fields=%s action=%r dmg_payload=%s", missing, action, dmg_payload)
+
+        results.append(('unit_attack', ua))
+
+        # Log dmg_payload contents to help trace missing unit_died
+        trace.debug('attack', "dmg_payload=%s", dmg_payload)
+
+        # If the canonical damage resulted in death, prepare unit_died
+        # payload and process on-death effects via the modular effect
+        # processor into the local results list so they are emitted
+        # in-order by the simulator sink.
+        if isinstance(dmg_payload, dict) and dmg_payload.get('post_hp') == 0:
+            try:
+                # Mark unit as dead and get canonical died payload
+                died = emit_unit_died(None, target_obj, side=side_val, timestamp=deliver_ts, unit_hp=dmg_payload.get('pre_hp'), hp_arrays=hp_arrays, unit_index=unit_index, unit_side=unit_side)
+                trace.debug('attack', "emit_unit_died returned: %s", died)
+                if died:
+                    results.append(('unit_died', died))
+
+                # Execute ON_ENEMY_DEATH and ON_ALLY_DEATH triggers into
+                # the local results list so they are emitted in-order
+                # by the simulator sink.
+                def _local_collector(ev_type, ev_payload):
+                    results.append((ev_type, ev_payload))
+
+                self._process_attack_death_triggers(attacker, target_obj, attacking_team, defending_team, side_val, trigger_ts, _local_collector, all_units=self._all_units[side_val])
+            except Exception as e:
+                trace.error('attack', "emit_unit_died raised: %s", e)
+
+        # Emit mana_update snapshot for attacker at deliver_ts
+        mu = {
+            'unit_id': getattr(attacker, 'id', None),
+            'unit_name': getattr(attacker, 'name', None),
+            'current_mana': getattr(attacker, 'mana', None),
+            'max_mana': getattr(attacker, 'max_mana', None),
+            'unit_hp': getattr(attacker, 'hp', None),  # AUTHORITATIVE: current HP
+            'side': side_val,
+            'timestamp': deliver_ts,
+        }
+        results.append(('mana_update', mu))
+        return results
+
+    def _process_attack_death_triggers(
+        self,
+        attacker: 'CombatUnit',
+        target: 'CombatUnit',
+        attacking_team: List['CombatUnit'],
+        defending_team: List['CombatUnit'],
+        side: str,
+        current_time: float,
+        collector: Callable[[str, Dict[str, Any]], None],
+        all_units: Optional[List['CombatUnit']] = None
+    ):
+        """Run modular ON_ENEMY_DEATH / ON_ALLY_DEATH triggers for a basic-attack kill."""
+        if all_units is None:
+            all_units = attacking_team + defending_team
+        try:
+            from .modular_effect_processor import TriggerType
+            if not (hasattr(self, 'modular_effect_processor') and self.modular_effect_processor):
+                return
+            # Build context similar to CombatEffectProcessor
+            context = {
+                'current_unit': attacker,
+                'all_units': all_units,
+                'enemy_units': defending_team,
+                'ally_units': attacking_team,
+                'collected_stats': getattr(attacker, 'collected_stats', {}),
+                'current_time': current_time,
+                'side': side,
+                'player': attacker,
+                'target_unit': target,
+                'killer_unit': attacker,
+                'triggered_rewards': set(),
+            }
+
+            # Process ON_ENEMY_DEATH
+            try:
+                self.modular_effect_processor.process_trigger(TriggerType.ON_ENEMY_DEATH, context, collector)
+            except Exception:
+                pass
+
+            # Process ON_ALLY_DEATH
+            try:
+                ally_ctx = {
+                        'all_units': all_units,
+                        'enemy_units': attacking_team,
+                        'ally_units': defending_team,
+                        'current_time': current_time,
+                        'side': 'team_b' if side == 'team_a' else 'team_a',
+                        'dead_ally': target,
+                        'triggered_rewards': set(),
+                    }
+                self.modular_effect_processor.process_trigger(TriggerType.ON_ALLY_DEATH, ally_ctx, collector)
+            except Exception:
+                pass
+        except Exception:
+            pass
+
     def _select_target(
         self,
         attacking_team: List['CombatUnit'],
@@ -370,51 +392,59 @@ class CombatAttackProcessor:
         defending_hp: List[int],
         attacker_idx: int
     ) -> Optional[int]:
-        """Select a target for the attacking unit at index attacker_idx."""
+        """Select a target for the attacking unit at index attacker_idx.
+
+        Under the simulator ``defending_hp`` is an ``HpMirror`` whose
+        ``TargetIndex`` keeps the alive lines, and the attacker's targeting
+        policy was resolved at combat start. Other callers fall back to
+        scanning the teams.
+        """
+        if isinstance(defending_hp, HpMirror) and isinstance(attacking_hp, HpMirror) and defending_hp.targets is not None and attacking_hp.targets is not None and defending_hp.targets.team is defending_team:
+            index = defending_hp.targets
+            policy = attacking_hp.targets.policies[attacker_idx]
+            candidates = index.preferred(policy.prefer_back)
+            if not candidates:
+                return None
+            if policy.least_hp:
+                return index.least_hp(policy.prefer_back)
+            if self._deterministic_targeting:
+                return candidates[0]
+            return getattr(self, 'rng', random).choice(candidates)
+
         unit = attacking_team[attacker_idx]
-        
+
         # Find alive targets and split by line
-        front_targets = [(j, defending_team[j].defense) for j in range(len(defending_team)) if defending_hp[j] > 0 and defending_team[j].position == 'front']
-        back_targets = [(j, defending_team[j].defense) for j in range(len(defending_team)) if defending_hp[j] > 0 and defending_team[j].position == 'back']
+        front_targets = [j for j in range(len(defending_team)) if defending_hp[j] > 0 and defending_team[j].position == 'front']
+        back_targets = [j for j in range(len(defending_team)) if defending_hp[j] > 0 and defending_team[j].position == 'back']
 
         # Default ordering: front line first then back line
-        targets = front_targets + back_targets
         # If unit has a 'target_backline' effect, prefer backline targets first
-        has_backline = False
-        for e in getattr(unit, 'effects', []) or []:
-            if isinstance(e, dict) and e.get('type') == 'target_backline':
-                has_backline = True
-                break
-            if isinstance(e, str) and e == 'target_backline':
-                has_backline = True
-                break
-        if has_backline:
-            targets = back_targets + front_targets
+        has_backline = bool(effects_of_type(unit, 'target_backline'))
+        targets = back_targets + front_targets if has_backline else front_targets + back_targets
         if not targets:
             return None
 
-        # Feature flag: when WAFFEN_DETERMINISTIC_TARGETING=1 the selection is deterministic
-        # Default behaviour (when the var is not set) is to select randomly within the preferred line.
-        DETERMINISTIC_TARGETING = os.getenv('WAFFEN_DETERMINISTIC_TARGETING', '0') in ('1', 'true', 'True')
-
         # Target selection override: if attacker has 'target_least_hp', pick alive target with least current HP
-        if any(e.get('type') == 'target_least_hp' for e in getattr(unit, 'effects', [])):
-            target_idx = min([t[0] for t in targets], key=lambda idx: defending_hp[idx])
+        if effects_of_type(unit, 'target_least_hp'):
+            return min(targets, key=lambda idx: defending_hp[idx])
+        # Deterministic override: first in priority order. Otherwise (default)
+        # pick a random target within the preferred line.
+        if self._deterministic_targeting:
+            return targets[0]
+        if has_backline:
+            preferred = back_targets if back_targets else front_targets
         else:
-            # Deterministic override: when the env var is set we pick the first-in-priority list.
-            # Otherwise (default) pick a random target within the preferred line.
-            if DETERMINISTIC_TARGETING:
-                target_idx = targets[0][0]
-            else:
-                if has_backline:
-                    preferred = back_targets if back_targets else front_targets
-                else:
-                    preferred = front_targets if front_targets else back_targets
-
-                candidate_list = preferred if preferred else targets
-                target_idx = random.choice([t[0] for t in candidate_list])
-
-        return target_idx
+            preferred = front_targets if front_targets else back_targets
+        return getattr(self, 'rng', random).choice(preferred)
+
+    @property
+    def _deterministic_targeting(self) -> bool:
+        # Feature flag WAFFEN_DETERMINISTIC_TARGETING=1: pick the first
+        # target in priority order. The simulator resolves it once per combat.
+        resolved = getattr(self, '_resolved_deterministic_targeting', None)
+        if resolved is None:
+            return deterministic_targeting_enabled()
+        return resolved
 
     def _process_skill_cast(
         self,
@@ -451,54 +481,27 @@ class CombatAttackProcessor:
         if log is None:
             log = []
         skill = caster.skill
-        log.append(f"[{time:.2f}s] {caster.name} casts {skill.get('name', getattr(skill, 'name', '<skill>'))}!")
-
-        # New skill system: if the stored `skill` is a wrapper dict containing
-        # a Skill object under ['effect']['skill'], delegate to the SkillExecutor
-        # so effects like `delay` and `damage_over_time` are executed correctly.
-        new_skill = None
-        if isinstance(skill, dict):
-            if 'effects' in skill:
-                # Convert dict to Skill object
-                from ..models.skill import Skill
-                new_skill = Skill.from_dict(skill)
-            elif 'effect' in skill:
-                # Old format: 'effect' contains a single effect dict
-                # New format: 'effect' contains {'skill': Skill}
-                # Convert to new format
-                effect = skill['effect']
-                if isinstance(effect, dict):
-                    if 'skill' in effect:
-                        # New format
-                        new_skill = effect['skill']
-                    else:
-                        # Old format: convert single effect to list
-                        skill_dict = skill.copy()
-                        skill_dict['effects'] = [effect]
-                        skill_dict['mana_cost'] = skill.get('cost', 0)
-                        del skill_dict['effect']
-                        from ..models.skill import Skill
-                        new_skill = Skill.from_dict(skill_dict)
-                else:
-                    # effect is already a skill object or something else
-                    new_skill = effect
-            else:
-                new_skill = skill.get('effect', {}).get('skill')
-        elif hasattr(skill, 'effects'):
-            new_skill = skill
+        record(log, 'cast', caster, None, None, skill.get('name', getattr(skill, 'name', '<skill>')), time=time)
 
-        if new_skill is not None:
+        # Skills are compiled once into a SkillPlan (cached on the shared
+        # template Skill and on the unit) and run by the SkillExecutor so
+        # effects like `delay` and `damage_over_time` execute correctly.
+        plan = skill_plan_for(caster)
+        if plan is not None:
             from .skill_executor import skill_executor
             from ..models.skill import SkillExecutionContext
+            # team_a is always the caster's own team here
             ctx = SkillExecutionContext(
                 caster=caster,
                 team_a=getattr(self, 'team_a', []) if side == 'team_a' else getattr(self, 'team_b', []),
                 team_b=getattr(self, 'team_b', []) if side == 'team_a' else getattr(self, 'team_a', []),
                 combat_time=time,
-                event_callback=event_callback
+                event_callback=event_callback,
+                rng=getattr(self, 'rng', None),
+                caster_on_team_a=True
             )
-            skill_events = skill_executor.execute_skill(new_skill, ctx)
-            if event_callback and skill_events:
+            skill_events = skill_executor.execute_skill(plan, ctx)
+            if event_callback and skill_events and not getattr(self, '_outcome_only', False):
                 for event_type, event_data in skill_events:
                     if isinstance(event_data, dict):
                         merged = {'type': event_type}
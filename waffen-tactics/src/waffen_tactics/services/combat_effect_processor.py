@@ -5,6 +5,8 @@ import random
 from typing import List, Dict, Any, Callable, Optional
 from .effect_processor import EffectProcessor
 from .modular_effect_processor import TriggerType
+from .combat_log import record
+from .. import trace
 from .event_canonicalizer import (
     emit_stat_buff,
     emit_regen_gain,
@@ -43,10 +45,8 @@ class CombatEffectProcessor:
             return
         defending_side = 'team_a' if side == 'team_b' else 'team_b'
 
-        try:
-            print(f"[ENTER _process_unit_death] killer={getattr(killer,'id',None)} target={getattr(target,'id',None)} event_callback_set={event_callback is not None}")
-        except Exception:
-            pass
+        trace.debug('death', "process_unit_death killer=%s target=%s event_callback_set=%s",
+                    getattr(killer, 'id', None), getattr(target, 'id', None), event_callback is not None)
 
         # Prevent duplicate processing for the same death within a simulation tick
         if getattr(target, '_death_processed', False):
@@ -148,17 +148,22 @@ class CombatEffectProcessor:
         except Exception:
             pass
 
-        try:
-            print(f"[DEATH DEBUG] emitted unit_died for {getattr(target,'id',None)}; attacking_team_len={len(attacking_team) if attacking_team is not None else 'None'}; attacking_ids={[getattr(u,'id',None) for u in (attacking_team or [])]}")
-        except Exception:
-            pass
+        if trace.enabled('death'):
+            trace.debug('death', "emitted unit_died for %s; attacking_ids=%s",
+                        getattr(target, 'id', None), [getattr(u, 'id', None) for u in (attacking_team or [])])
+
+        # The simulator's per-side unit list carries the trigger subscription
+        # index; it has the same attacking-then-defending order
+        all_units = getattr(self, '_all_units', {}).get(side)
+        if all_units is None or attacking_team is not getattr(self, side, None):
+            all_units = attacking_team + defending_team
 
         # Use modular effect processor for ON_ENEMY_DEATH triggers
         if hasattr(self, 'modular_effect_processor') and self.modular_effect_processor and killer:
             # Prepare context for enemy death
             context = {
                 'current_unit': killer,
-                'all_units': attacking_team + defending_team,
+                'all_units': all_units,
                 'enemy_units': defending_team,
                 'ally_units': attacking_team,
                 'collected_stats': getattr(killer, 'collected_stats', {}),
@@ -187,7 +192,7 @@ class CombatEffectProcessor:
 
             # Process ON_ALLY_DEATH effects once for the death event
             context = {
-                'all_units': attacking_team + defending_team,
+                'all_units': all_units,
                 'enemy_units': attacking_team,
                 'ally_units': defending_team,
                 'current_time': time,
@@ -230,7 +235,7 @@ class CombatEffectProcessor:
     ):
         """Apply reward from an effect."""
         chance = effect.get('chance', 100)
-        if random.randint(1, 100) > chance:
+        if getattr(self, 'rng', random).randint(1, 100) > chance:
             return
         reward = effect.get('reward')
         target = effect.get('target', 'self')
@@ -291,16 +296,11 @@ class CombatEffectProcessor:
         effect: Optional[Dict[str, Any]] = None
     ):
         """Apply list of actions from an effect."""
-        try:
-            print(f"[APPLY_ACTIONS] unit={getattr(unit,'id',None)} actions={actions} event_callback_set={event_callback is not None}")
-        except Exception:
-            pass
+        trace.debug('effects', "apply_actions unit=%s actions=%s event_callback_set=%s",
+                    getattr(unit, 'id', None), actions, event_callback is not None)
         for action in actions:
             action_type = action.get('type')
-            try:
-                print(f"[APPLY_ACTIONS] action_type={action_type} action={action}")
-            except Exception:
-                pass
+            trace.debug('effects', "apply_actions action_type=%s action=%s", action_type, action)
             if action_type == 'stat_buff':
                 self._apply_stat_buff(unit, action, hp_list, unit_idx, time, log, event_callback, side, attacking_team, defending_team, attacking_hp, defending_hp)
             elif action_type in ('kill_buff', 'collect_stat'):
@@ -461,10 +461,7 @@ class CombatEffectProcessor:
         defending_hp: Optional[List[int]] = None
     ):
         """Apply stat buff from an effect."""
-        try:
-            print(f"[STAT_APPLY] unit={getattr(unit,'id',None)} effect={effect}")
-        except Exception:
-            pass
+        trace.debug('stat_buff', "stat_apply unit=%s effect=%s", getattr(unit, 'id', None), effect)
         # Try to use new handlers first for supported stats
         supported_stats = {'attack', 'defense', 'hp', 'attack_speed', 'mana_regen'}
         effect_stats = set(effect.get('stats', []))
@@ -683,7 +680,7 @@ class CombatEffectProcessor:
                         heal_amt = int(team[target_idx].max_hp * (heal_pct / 100.0))
                         old_hp = hp_list[target_idx]
                         hp_list[target_idx] = min(team[target_idx].max_hp, hp_list[target_idx] + heal_amt)
-                        log.append(f"{unit.name} heals {team[target_idx].name} for {heal_amt} (ally hp below {thresh}%)")
+                        record(log, 'ally_heal', unit, team[target_idx], heal_amt, thresh)
                         if event_callback:
                             emit_heal(event_callback, team[target_idx], heal_amt, source=None, side=side, timestamp=time, current_hp=old_hp)
                         eff['_triggered'] = True
@@ -719,7 +716,7 @@ class CombatEffectProcessor:
                             add = int(buff_amount)
                         old_hp = a_hp[idx_u]
                         a_hp[idx_u] = min(u.max_hp, a_hp[idx_u] + add)
-                        log.append(f"{u.name} +{add} HP (per round buff)")
+                        record(log, 'round_hp', u, None, add)
                         if event_callback and add > 0:
                             emit_heal(event_callback, u, add, source=None, side='team_a', timestamp=time, current_hp=old_hp)
 
@@ -741,6 +738,6 @@ class CombatEffectProcessor:
                             add = int(buff_amount)
                         old_hp = b_hp[idx_u]
                         b_hp[idx_u] = min(u.max_hp, b_hp[idx_u] + add)
-                        log.append(f"{u.name} +{add} HP (per round buff)")
+                        record(log, 'round_hp', u, None, add)
                         if event_callback and add > 0:
                             emit_heal(event_callback, u, add, source=None, side='team_b', timestamp=time, current_hp=old_hp)
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Combat log - compact structured combat log rendered to text on demand
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Entry layout: (time, kind, actor_idx, target_idx, amount, detail)
+LogEntry = Tuple[float, str, Optional[int], Optional[int], Any, Tuple[Any, ...]]
+
+# Text templates per entry kind. Fields: t (time), a/A (actor name/side),
+# b/B (target name/side), n (amount), d (detail tuple).
+TEMPLATES: Dict[str, str] = {
+    'attack': "[{t:.2f}s] {A}:{a} hits {B}:{b} for {n}, hp={d[0]}",
+    'lifesteal': "{a} lifesteals {n}",
+    'cast': "[{t:.2f}s] {a} casts {d[0]}!",
+    'regen_hp': "{a} regenerates +{n} HP (regen over time)",
+    'regen_mana': "{a} regenerates +{n} Mana",
+    'hp_sync': "[COMBAT_STATE SYNC] {a} {d[0]}: {d[1]} -> {n} (unit.hp={n})",
+    'buff_attack': "{a} +{n} Atak (per second)",
+    'buff_defense': "{a} +{n} Defense (per second)",
+    'buff_attack_speed': "{a} gains +{n:.2f} Attack Speed (per second)",
+    'buff_hp': "{a} {n:+d} HP (per second)",
+    'round_hp': "{a} {n:+d} HP (per round buff)",
+    'ally_heal': "{a} heals {b} for {n} (ally hp below {d[0]}%)",
+    'dot': "{a} takes {n} {d[0]} damage from DoT",
+    'stat_revert': "{a} stat {d[0]} reverted by {n} (effect expired)",
+    'shield_revert': "{a} shield reverted by {n} (effect expired)",
+    'text': "{d[0]}",
+}
+
+
+def render_entry(kind: str, actor: Any = None, target: Any = None, amount: Any = None, detail: Tuple[Any, ...] = (), time: float = 0.0, actor_side: str = '', target_side: str = '') -> str:
+    return TEMPLATES[kind].format(
+        t=time, a=getattr(actor, 'name', actor), A=actor_side,
+        b=getattr(target, 'name', target), B=target_side, n=amount, d=detail,
+    )
+
+
+def record(log: Any, kind: str, actor: Any = None, target: Any = None, amount: Any = None, *detail: Any, time: Optional[float] = None):
+    """Add an entry to ``log``.
+
+    A ``CombatLog`` stores the compact tuple; plain lists (processor unit
+    tests, legacy callers) get the rendered line appended immediately.
+    """
+    if isinstance(log, CombatLog):
+        log.record(kind, actor, target, amount, *detail, time=time)
+    elif log is not None:
+        log.append(render_entry(kind, actor, target, amount, detail, time or 0.0))
+
+
+class CombatLog(list):
+    """Combat log whose items are ``(time, kind, actor_idx, target_idx, amount, detail)`` tuples.
+
+    Units are referenced by index into ``team_a + team_b``; units not on
+    either team are appended to the index on first use. Entries are only
+    rendered to text when read: indexing, slicing, iterating and
+    ``json.dumps`` yield strings, ``entries`` yields the raw tuples.
+    ``time`` stamps entries recorded without an explicit time; the
+    simulator advances it every tick.
+    """
+
+    def __init__(self, team_a: Iterable[Any] = (), team_b: Iterable[Any] = ()):
+        super().__init__()
+        team_a, team_b = list(team_a), list(team_b)
+        self.units: List[Any] = team_a + team_b
+        self.team_a_size = len(team_a)
+        self._index = {id(u): i for i, u in enumerate(self.units)}
+        self.time = 0.0
+
+    def _ref(self, unit: Any) -> Optional[int]:
+        if unit is None:
+            return None
+        idx = self._index.get(id(unit))
+        if idx is None:
+            idx = self._index[id(unit)] = len(self.units)
+            self.units.append(unit)
+        return idx
+
+    def record(self, kind: str, actor: Any = None, target: Any = None, amount: Any = None, *detail: Any, time: Optional[float] = None):
+        list.append(self, (self.time if time is None else time, kind, self._ref(actor), self._ref(target), amount, detail))
+
+    def append(self, text: str):
+        """Store a pre-rendered line (rare messages, legacy callers)."""
+        list.append(self, (self.time, 'text', None, None, None, (text,)))
+
+    @property
+    def entries(self) -> List[LogEntry]:
+        """The raw entry tuples."""
+        return list(list.__iter__(self))
+
+    def _side(self, idx: Optional[int]) -> str:
+        if idx is None:
+            return ''
+        return 'A' if idx < self.team_a_size else 'B'
+
+    def render(self, entry: LogEntry) -> str:
+        time, kind, actor_idx, target_idx, amount, detail = entry
+        actor = self.units[actor_idx] if actor_idx is not None else None
+        target = self.units[target_idx] if target_idx is not None else None
+        return render_entry(kind, actor, target, amount, detail, time, self._side(actor_idx), self._side(target_idx))
+
+    def kind_counts(self) -> Dict[str, int]:
+        """Number of entries per kind, without rendering anything."""
+        counts: Dict[str, int] = {}
+        for entry in list.__iter__(self):
+            counts[entry[1]] = counts.get(entry[1], 0) + 1
+        return counts
+
+    def lines(self) -> List[str]:
+        """Render every entry."""
+        return [self.render(e) for e in list.__iter__(self)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.render(e) for e in list.__getitem__(self, index)]
+        return self.render(list.__getitem__(self, index))
+
+    def __iter__(self):
+        for entry in list.__iter__(self):
+            yield self.render(entry)
+
+    def __reversed__(self):
+        for entry in list.__reversed__(self):
+            yield self.render(entry)
+
+    def __contains__(self, text) -> bool:
+        return any(line == text for line in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, list):
+            return self.lines() == list(other)
+        return NotImplemented
+
+    def __ne__(self, other) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CombatLog({len(self)} entries)"
@@ -5,6 +5,8 @@ from ..models.unit import Unit
 from ..services.synergy import SynergyEngine
 from ..services.combat_shared import CombatSimulator as SharedCombatSimulator, CombatUnit
 from ..services.combat import CombatSimulator
+from ..services.combat_log import CombatLog
+from ..services.unit_templates import template_cache_for
 from ..services.data_loader import GameData
 import logging
 import copy
@@ -20,15 +22,17 @@ class CombatManager:
         self.data = data
         self.synergy_engine = synergy_engine
 
-    def start_combat(self, player: PlayerState, opponent_board: List[Unit], opponent_info: Optional[Dict] = None) -> Dict:
+    def start_combat(self, player: PlayerState, opponent_board: List[Unit], opponent_info: Optional[Dict] = None, mode: str = 'full') -> Dict:
         """
         Simulate combat between player board and opponent
         Returns combat result with winner, log, etc.
+
+        Pass ``mode='outcome'`` for headless evaluation (no combat log).
         """
         # Convert player board to Units
         player_units = []
         for ui in player.board:
-            unit = next((u for u in self.data.units if u.id == ui.unit_id), None)
+            unit = self.data.units_by_id.get(ui.unit_id)
             if unit:
                 player_units.append(unit)
 
@@ -46,22 +50,17 @@ class CombatManager:
         try:
             active_synergies = self.synergy_engine.compute(player_units)
 
+            templates = template_cache_for(self.synergy_engine)
+
             team_a_combat = []
             for ui in player.board:
-                unit = next((u for u in self.data.units if u.id == ui.unit_id), None)
+                unit = self.data.units_by_id.get(ui.unit_id)
                 if not unit:
                     continue
 
-                # Apply buffs using SynergyEngine
-                # Calculate base stats with star scaling
-                base_hp = int(unit.stats.hp * (1.6 ** (ui.star_level - 1)))
-                base_attack = int(unit.stats.attack * (1.4 ** (ui.star_level - 1)))
-                base_defense = int(unit.stats.defense)
-                base_attack_speed = float(unit.stats.attack_speed)
-                
-                base_stats = {'hp': base_hp, 'attack': base_attack, 'defense': base_defense, 'attack_speed': base_attack_speed}
-                buffed_stats = self.synergy_engine.apply_stat_buffs(base_stats, unit, active_synergies)
-                buffed_stats = self.synergy_engine.apply_dynamic_effects(unit, buffed_stats, active_synergies, player)
+                # Star-scaled stats with synergy/dynamic buffs and active effects
+                template = templates.get(unit, ui.star_level, active_synergies, player)
+                buffed_stats = dict(template.stats)
 
                 # Apply persistent buffs after synergies (consistent with UI)
                 if ui.persistent_buffs:
@@ -70,15 +69,7 @@ class CombatManager:
                     buffed_stats['defense'] += int(ui.persistent_buffs.get('defense', 0))
                     buffed_stats['attack_speed'] += ui.persistent_buffs.get('attack_speed', 0)
 
-                hp = buffed_stats['hp']
-                attack = buffed_stats['attack']
-                defense = buffed_stats['defense']
-                attack_speed = buffed_stats['attack_speed']
-
-                # Get active effects
-                effects_a = self.synergy_engine.get_active_effects(unit, active_synergies)
-
-                team_a_combat.append(CombatUnit(id=f"a_{ui.instance_id}", name=unit.name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects_a, max_mana=unit.stats.max_mana, stats=unit.stats, position=ui.position, base_stats=base_stats, star_level=ui.star_level))
+                team_a_combat.append(template.spawn(f"a_{ui.instance_id}", ui.position, buffed_stats, max_mana=unit.stats.max_mana, mana_regen=0, skill=None))
 
             # Opponent team
             opponent_units = [u for u in opponent_board]
@@ -107,16 +98,19 @@ class CombatManager:
                 team_b_combat.append(CombatUnit(id=f"b_{i}", name=u.name, hp=hp_b, attack=attack_b, defense=defense_b, attack_speed=attack_speed_b, effects=effects_b, max_mana=u.stats.max_mana, stats=u.stats, position='front', base_stats={'hp': hp_b, 'attack': attack_b, 'defense': defense_b, 'attack_speed': attack_speed_b, 'max_mana': u.stats.max_mana}, star_level=1))
 
             shared = CombatSimulator()
-            result = shared.simulate(team_a_combat, team_b_combat, timeout=120, event_callback=None, round_number=player.round_number)
+            result = shared.simulate(team_a_combat, team_b_combat, timeout=120, event_callback=None, round_number=player.round_number, mode=mode)
         except Exception as e:
             bot_logger.error(f"[COMBAT] Error in simulation: {e}")
             # Create empty teams for fallback
             team_a_combat = []
             team_b_combat = []
             shared = CombatSimulator()
-            result = shared.simulate(team_a_combat, team_b_combat, timeout=120, event_callback=None, round_number=player.round_number)
+            result = shared.simulate(team_a_combat, team_b_combat, timeout=120, event_callback=None, round_number=player.round_number, mode=mode)
 
-        bot_logger.info(f"[COMBAT] Result: {result['winner']}, Duration: {result.get('duration', 0):.1f}s, Log lines: {len(result.get('log', []))}")
+        combat_log = result.get('log', [])
+        bot_logger.info(f"[COMBAT] Result: {result['winner']}, Duration: {result.get('duration', 0):.1f}s, Log lines: {len(combat_log)}")
+        if isinstance(combat_log, CombatLog) and bot_logger.isEnabledFor(logging.DEBUG):
+            bot_logger.debug(f"[COMBAT] Log entries by kind: {combat_log.kind_counts()}")
 
         # Calculate damage and normalize winner
         if result['winner'] == 'team_a':
@@ -3,6 +3,19 @@ Combat per-second buff processor - handles buffs applied every second
 """
 from typing import List, Dict, Any, Callable, Optional
 from .event_canonicalizer import emit_stat_buff, emit_hp_regen, emit_mana_change
+from .effect_index import effects_of_type, effects_of_types
+from .combat_log import record
+
+
+def _buff_amplifier(unit) -> float:
+    """Strongest ``buff_amplifier`` multiplier on ``unit`` (at least 1)."""
+    mult = 1.0
+    for beff in effects_of_type(unit, 'buff_amplifier'):
+        try:
+            mult = max(mult, float(beff.get('multiplier', 1)))
+        except Exception:
+            pass
+    return mult
 
 
 class CombatPerSecondBuffProcessor:
@@ -16,37 +29,40 @@ class CombatPerSecondBuffProcessor:
         b_hp: List[int],
         time: float,
         log: List[str],
-        event_callback: Optional[Callable[[str, Dict[str, Any]], None]]
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]],
+        steps: int = 1
     ):
-        """Apply per-second buffs for both teams."""
+        """Apply per-second buffs for both teams.
+
+        ``steps`` > 1 is only used by the event scheduler to catch up on
+        skipped ticks; it scales flat ``mana_regen`` effects and must not be
+        combined with units carrying ``per_second_buff`` effects.
+        """
         # Team A buffs
         for idx_u, u in enumerate(team_a):
-            for eff in getattr(u, 'effects', []):
+            effects = effects_of_types(u, 'per_second_buff', 'mana_regen')
+            if not effects:
+                continue
+            # Buff amplifier on this unit
+            mult = _buff_amplifier(u)
+            for eff in effects:
                 if eff.get('type') == 'per_second_buff':
                     stat = eff.get('stat')
                     val = eff.get('value', 0)
                     is_pct = eff.get('is_percentage', False)
-                    # Check for buff amplifier on this unit
-                    mult = 1.0
-                    for beff in getattr(u, 'effects', []):
-                        if beff.get('type') == 'buff_amplifier':
-                            try:
-                                mult = max(mult, float(beff.get('multiplier', 1)))
-                            except Exception:
-                                pass
                     if stat == 'attack':
                         if is_pct:
                             add = int(u.attack * (val / 100.0) * mult)
                         else:
                             add = int(val * mult)
-                        log.append(f"{u.name} +{add} Atak (per second)")
+                        record(log, 'buff_attack', u, None, add)
                         emit_stat_buff(event_callback, u, 'attack', add, value_type='flat', duration=None, permanent=False, source=None, side='team_a', timestamp=time, cause='per_second_buff')
                     if stat == 'defense':
                         if is_pct:
                             add = int(u.defense * (val / 100.0) * mult)
                         else:
                             add = int(val * mult)
-                        log.append(f"{u.name} +{add} Defense (per second)")
+                        record(log, 'buff_defense', u, None, add)
                         emit_stat_buff(event_callback, u, 'defense', add, value_type='flat', duration=None, permanent=False, source=None, side='team_a', timestamp=time, cause='per_second_buff')
                     if stat == 'attack_speed':
                         if is_pct:
@@ -54,15 +70,8 @@ class CombatPerSecondBuffProcessor:
                         else:
                             add = float(val)
                         # apply any buff amplifier present
-                        amp = 1.0
-                        for beff in getattr(u, 'effects', []):
-                            if beff.get('type') == 'buff_amplifier':
-                                try:
-                                    amp = max(amp, float(beff.get('multiplier', 1)))
-                                except Exception:
-                                    pass
-                        add = add * amp
-                        log.append(f"{u.name} gains +{add:.2f} Attack Speed (per second)")
+                        add = add * mult
+                        record(log, 'buff_attack_speed', u, None, add)
                         emit_stat_buff(event_callback, u, 'attack_speed', add, value_type='flat', duration=None, permanent=False, source=None, side='team_a', timestamp=time, cause='per_second_buff')
                     if stat == 'hp':
                         if is_pct:
@@ -78,7 +87,7 @@ class CombatPerSecondBuffProcessor:
                         old_hp = int(a_hp[idx_u])
                         a_hp[idx_u] = min(u.max_hp, a_hp[idx_u] + add)
                         new_hp = int(a_hp[idx_u])
-                        log.append(f"{u.name} {add:+d} HP (per second)")
+                        record(log, 'buff_hp', u, None, add)
                         # print(f"[HP DEBUG] ts={time:.9f} side=team_a target={u.id}:{u.name} old_hp={old_hp} -> new_hp={new_hp} cause=per_second_buff add={add}")
                         if event_callback:
                             emit_hp_regen(event_callback, u, add, side='team_a', timestamp=time, current_hp=old_hp)
@@ -86,8 +95,10 @@ class CombatPerSecondBuffProcessor:
                 elif eff.get('type') == 'mana_regen':
                     # Handle mana regeneration
                     regen_amount = eff.get('value', 0)
+                    if steps > 1:
+                        regen_amount = int(regen_amount) * steps
                     if regen_amount > 0:
-                        log.append(f"{u.name} regenerates +{regen_amount} Mana")
+                        record(log, 'regen_mana', u, None, regen_amount)
                         if event_callback:
                             combat_state = getattr(self, '_combat_state', None)
                             if combat_state is not None:
@@ -97,32 +108,29 @@ class CombatPerSecondBuffProcessor:
 
         # Team B buffs
         for idx_u, u in enumerate(team_b):
-            for eff in getattr(u, 'effects', []):
+            effects = effects_of_types(u, 'per_second_buff', 'mana_regen')
+            if not effects:
+                continue
+            # Buff amplifier on this unit
+            mult_b = _buff_amplifier(u)
+            for eff in effects:
                 if eff.get('type') == 'per_second_buff':
                     stat = eff.get('stat')
                     val = eff.get('value', 0)
                     is_pct = eff.get('is_percentage', False)
-                    # Check for buff amplifier on this unit
-                    mult_b = 1.0
-                    for beff2 in getattr(u, 'effects', []):
-                        if beff2.get('type') == 'buff_amplifier':
-                            try:
-                                mult_b = max(mult_b, float(beff2.get('multiplier', 1)))
-                            except Exception:
-                                pass
                     if stat == 'attack':
                         if is_pct:
                             add = int(u.attack * (val / 100.0) * mult_b)
                         else:
                             add = int(val * mult_b)
-                        log.append(f"{u.name} +{add} Atak (per second)")
+                        record(log, 'buff_attack', u, None, add)
                         emit_stat_buff(event_callback, u, 'attack', add, value_type='flat', duration=None, permanent=False, source=None, side='team_b', timestamp=time, cause='per_second_buff')
                     if stat == 'defense':
                         if is_pct:
                             add = int(u.defense * (val / 100.0) * mult_b)
                         else:
                             add = int(val * mult_b)
-                        log.append(f"{u.name} +{add} Defense (per second)")
+                        record(log, 'buff_defense', u, None, add)
                         emit_stat_buff(event_callback, u, 'defense', add, value_type='flat', duration=None, permanent=False, source=None, side='team_b', timestamp=time, cause='per_second_buff')
                     if stat == 'attack_speed':
                         if is_pct:
@@ -130,15 +138,8 @@ class CombatPerSecondBuffProcessor:
                         else:
                             add = float(val)
                         # apply any buff amplifier present
-                        amp = 1.0
-                        for beff in getattr(u, 'effects', []):
-                            if beff.get('type') == 'buff_amplifier':
-                                try:
-                                    amp = max(amp, float(beff.get('multiplier', 1)))
-                                except Exception:
-                                    pass
-                        add = add * amp
-                        log.append(f"{u.name} gains +{add:.2f} Attack Speed (per second)")
+                        add = add * mult_b
+                        record(log, 'buff_attack_speed', u, None, add)
                         emit_stat_buff(event_callback, u, 'attack_speed', add, value_type='flat', duration=None, permanent=False, source=None, side='team_b', timestamp=time, cause='per_second_buff')
                     if stat == 'hp':
                         if is_pct:
@@ -154,7 +155,7 @@ class CombatPerSecondBuffProcessor:
                         old_hp_b = int(b_hp[idx_u])
                         b_hp[idx_u] = min(u.max_hp, b_hp[idx_u] + add)
                         new_hp_b = int(b_hp[idx_u])
-                        log.append(f"{u.name} {add:+d} HP (per second)")
+                        record(log, 'buff_hp', u, None, add)
                         # print(f"[HP DEBUG] ts={time:.9f} side=team_b target={u.id}:{u.name} old_hp={old_hp_b} -> new_hp={new_hp_b} cause=per_second_buff add={add}")
                         if event_callback:
                             emit_hp_regen(event_callback, u, add, side='team_b', timestamp=time, current_hp=old_hp_b)
@@ -162,8 +163,10 @@ class CombatPerSecondBuffProcessor:
                 elif eff.get('type') == 'mana_regen':
                     # Handle mana regeneration
                     regen_amount = eff.get('value', 0)
+                    if steps > 1:
+                        regen_amount = int(regen_amount) * steps
                     if regen_amount > 0:
-                        log.append(f"{u.name} regenerates +{regen_amount} Mana")
+                        record(log, 'regen_mana', u, None, regen_amount)
                         if event_callback:
                             combat_state = getattr(self, '_combat_state', None)
                             if combat_state is not None:
@@ -3,6 +3,8 @@ Combat regeneration processor - handles HP and mana regeneration over time
 """
 from typing import List, Dict, Any, Callable, Optional
 from .event_canonicalizer import emit_heal, emit_mana_change
+from .effect_index import effects_of_type
+from .combat_log import record
 import math
 
 
@@ -18,9 +20,15 @@ class CombatRegenerationProcessor:
         time: float,
         log: List[str],
         dt: float,
-        event_callback: Optional[Callable[[str, Dict[str, Any]], None]]
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]],
+        steps: int = 1
     ):
-        """Apply HP and mana regeneration for both teams."""
+        """Apply HP and mana regeneration for both teams.
+
+        ``steps`` replays the accumulator math for that many consecutive
+        ticks of length ``dt`` and emits the summed gain once. The event
+        scheduler uses it to catch up on ticks it skipped.
+        """
         # Team A regen
         for idx_u, u in enumerate(team_a):
             # HP regeneration
@@ -34,32 +42,40 @@ class CombatRegenerationProcessor:
                         u._hp_regen_accumulator = float(u._state.hp_regen_accumulator)
                     else:
                         u._hp_regen_accumulator = 0.0
-                u._hp_regen_accumulator += heal
-                int_heal = int(u._hp_regen_accumulator)
+                int_heal = 0
+                for _ in range(steps):
+                    u._hp_regen_accumulator += heal
+                    part = int(u._hp_regen_accumulator)
+                    if part > 0:
+                        u._hp_regen_accumulator -= part
+                        int_heal += part
                 if int_heal > 0:
-                    u._hp_regen_accumulator -= int_heal
                     old_hp = int(a_hp[idx_u])
                     a_hp[idx_u] = min(u.max_hp, a_hp[idx_u] + int_heal)
                     new_hp = int(a_hp[idx_u])
-                    log.append(f"{u.name} regenerates +{int_heal} HP (regen over time)")
+                    record(log, 'regen_hp', u, None, int_heal)
                     # print(f"[HP DEBUG] ts={time:.9f} side=team_a target={u.id}:{u.name} old_hp={old_hp} -> new_hp={new_hp} cause=regen int_heal={int_heal}")
                     if event_callback:
                         emit_heal(event_callback, u, int_heal, source=None, side='team_a', timestamp=time, current_hp=old_hp)
 
             # Mana regeneration (include trait/effect-based bonuses)
             base_mana_regen = getattr(u.stats, 'mana_regen', 0)
-            effect_bonus = sum(float(e.get('value', 0)) for e in getattr(u, 'effects', []) if e.get('type') == 'mana_regen')
+            effect_bonus = sum(float(e.get('value', 0)) for e in effects_of_type(u, 'mana_regen'))
             total_mana_regen = base_mana_regen + effect_bonus
             if total_mana_regen > 0:
                 mana_gain = total_mana_regen * dt
                 # accumulate fractional mana gain
                 if not hasattr(u, '_mana_regen_accumulator'):
                     u._mana_regen_accumulator = 0.0
-                u._mana_regen_accumulator += mana_gain
-                int_mana = math.floor(u._mana_regen_accumulator + 1e-10)
+                int_mana = 0
+                for _ in range(steps):
+                    u._mana_regen_accumulator += mana_gain
+                    part = math.floor(u._mana_regen_accumulator + 1e-10)
+                    if part > 0:
+                        u._mana_regen_accumulator -= part
+                        int_mana += part
                 if int_mana > 0:
-                    u._mana_regen_accumulator -= int_mana
-                    log.append(f"{u.name} regenerates +{int_mana} Mana")
+                    record(log, 'regen_mana', u, None, int_mana)
                     # Apply mana change via canonical emitter (it mutates state and emits)
                     combat_state = getattr(self, '_combat_state', None)
                     if combat_state is not None:
@@ -78,31 +94,39 @@ class CombatRegenerationProcessor:
                         u._hp_regen_accumulator = float(u._state.hp_regen_accumulator)
                     else:
                         u._hp_regen_accumulator = 0.0
-                u._hp_regen_accumulator += heal_b
-                int_heal_b = int(u._hp_regen_accumulator)
+                int_heal_b = 0
+                for _ in range(steps):
+                    u._hp_regen_accumulator += heal_b
+                    part = int(u._hp_regen_accumulator)
+                    if part > 0:
+                        u._hp_regen_accumulator -= part
+                        int_heal_b += part
                 if int_heal_b > 0:
-                    u._hp_regen_accumulator -= int_heal_b
                     old_hp_b = int(b_hp[idx_u])
                     b_hp[idx_u] = min(u.max_hp, b_hp[idx_u] + int_heal_b)
                     new_hp_b = int(b_hp[idx_u])
-                    log.append(f"{u.name} regenerates +{int_heal_b} HP (regen over time)")
+                    record(log, 'regen_hp', u, None, int_heal_b)
                     # print(f"[HP DEBUG] ts={time:.9f} side=team_b target={u.id}:{u.name} old_hp={old_hp_b} -> new_hp={new_hp_b} cause=regen int_heal={int_heal_b}")
                     if event_callback:
                         emit_heal(event_callback, u, int_heal_b, source=None, side='team_b', timestamp=time, current_hp=old_hp_b)
 
             # Mana regeneration (include trait/effect-based bonuses)
             base_mana_regen_b = getattr(u.stats, 'mana_regen', 0)
-            effect_bonus_b = sum(float(e.get('value', 0)) for e in getattr(u, 'effects', []) if e.get('type') == 'mana_regen')
+            effect_bonus_b = sum(float(e.get('value', 0)) for e in effects_of_type(u, 'mana_regen'))
             total_mana_regen_b = base_mana_regen_b + effect_bonus_b
             if total_mana_regen_b > 0:
                 mana_gain_b = total_mana_regen_b * dt
                 if not hasattr(u, '_mana_regen_accumulator'):
                     u._mana_regen_accumulator = 0.0
-                u._mana_regen_accumulator += mana_gain_b
-                int_mana_b = math.floor(u._mana_regen_accumulator + 1e-10)
+                int_mana_b = 0
+                for _ in range(steps):
+                    u._mana_regen_accumulator += mana_gain_b
+                    part = math.floor(u._mana_regen_accumulator + 1e-10)
+                    if part > 0:
+                        u._mana_regen_accumulator -= part
+                        int_mana_b += part
                 if int_mana_b > 0:
-                    u._mana_regen_accumulator -= int_mana_b
-                    log.append(f"{u.name} regenerates +{int_mana_b} Mana")
+                    record(log, 'regen_mana', u, None, int_mana_b)
                     # Apply mana change via canonical emitter (it mutates state and emits)
                     combat_state = getattr(self, '_combat_state', None)
                     if combat_state is not None:
@@ -113,12 +137,12 @@ class CombatRegenerationProcessor:
         # Sync HP lists to unit.hp for all units to ensure consistency
         for idx_u, u in enumerate(team_a):
             if a_hp[idx_u] != u.hp:
-                log.append(f"[COMBAT_STATE SYNC] {u.name} a_hp[{idx_u}]: {a_hp[idx_u]} -> {u.hp} (unit.hp={u.hp})")
+                record(log, 'hp_sync', u, None, u.hp, f"a_hp[{idx_u}]", a_hp[idx_u])
                 a_hp[idx_u] = u.hp
 
         for idx_u, u in enumerate(team_b):
             if b_hp[idx_u] != u.hp:
-                log.append(f"[COMBAT_STATE SYNC] {u.name} b_hp[{idx_u}]: {b_hp[idx_u]} -> {u.hp} (unit.hp={u.hp})")
+                record(log, 'hp_sync', u, None, u.hp, f"b_hp[{idx_u}]", b_hp[idx_u])
                 b_hp[idx_u] = u.hp
 
         # Optional debug invariant: ensure combat_state (if present) is consistent
@@ -1,15 +1,24 @@
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import functools
 import itertools
 import heapq
-import uuid
+import math
+import random
 
 from .combat_unit import CombatUnit
+from .effect_index import EffectIndex, discard_effect, effects_of_type, expiring_effects
+from .combat_log import CombatLog, record
+from .pending_action import PendingAction
+from .target_index import HpMirror, TargetIndex, deterministic_targeting_enabled
+from .progress_monitor import ProgressMonitor
 from .combat_attack_processor import CombatAttackProcessor
 from .combat_effect_processor import CombatEffectProcessor
 from .combat_regeneration_processor import CombatRegenerationProcessor
 from .combat_per_second_buff_processor import CombatPerSecondBuffProcessor
 from .modular_effect_processor import ModularEffectProcessor
+from ..core.ids import EventIdGenerator
 from ..engine.combat_state import CombatState
+from .. import trace
 
 
 class CombatSimulator:
@@ -26,6 +35,7 @@ class CombatSimulator:
         self._scheduled = []  # heap of (deliver_at, counter, action)
         self._schedule_counter = itertools.count()
         self._event_seq = 0
+        self._event_ids = EventIdGenerator()
         self._current_time = 0.0
 
     def _enqueue_scheduled_event(self, deliver_at: float, event_type: str, payload: Dict[str, Any]):
@@ -98,7 +108,7 @@ class _EventSink:
             # only store payloads (without the separate event_type) retain it.
             if 'type' not in data:
                 data['type'] = event_type
-            data['event_id'] = str(uuid.uuid4())
+            data['event_id'] = self.simulator._event_ids()
             # Ensure mana_update payloads always include 'amount' for schema consistency
             if event_type == 'mana_update' and 'amount' not in data:
                 data['amount'] = 0
@@ -127,7 +137,7 @@ class _EventSink:
                     if hp_list[target_idx] <= team[target_idx].max_hp * (thresh / 100.0):
                         heal_amt = int(team[target_idx].max_hp * (heal_pct / 100.0))
                         hp_list[target_idx] = min(team[target_idx].max_hp, hp_list[target_idx] + heal_amt)
-                        log.append(f"{unit.name} heals {team[target_idx].name} for {heal_amt} (ally hp below {thresh}%)")
+                        record(log, 'ally_heal', unit, team[target_idx], heal_amt, thresh)
                         if event_callback:
                             from .event_canonicalizer import emit_heal
                             emit_heal(event_callback, team[target_idx], heal_amt, source=None, side=side, timestamp=time)
@@ -199,7 +209,7 @@ class _SimpleEventSink:
             # only store payloads (without the separate event_type) retain it.
             if 'type' not in data:
                 data['type'] = event_type
-            data['event_id'] = str(uuid.uuid4())
+            data['event_id'] = self.sim._event_ids()
             # Ensure mana_update payloads always include 'amount' for schema consistency
             if event_type == 'mana_update' and 'amount' not in data:
                 data['amount'] = 0
@@ -214,42 +224,295 @@ class _SimpleEventSink:
             return
 
 
+class _OutcomeEventSink:
+    """Sink used by ``mode='outcome'``: drops every event.
+
+    ``emit`` stays a truthy callable so emitters and processors take the
+    same code paths as in full mode (combat semantics are unchanged); only
+    seq/event_id assignment, scheduling of payload-only events and collector
+    routing are skipped.
+    """
+    def __init__(self, sim):
+        self.sim = sim
+
+    def emit(self, event_type, payload):
+        return
+
+
+class _DiscardLog(CombatLog):
+    """Combat log that drops every entry (outcome mode, ``combat_log=False``)."""
+
+    def record(self, *args, **kwargs):
+        return
+
+    def append(self, item):
+        return
+
+
 class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegenerationProcessor, CombatPerSecondBuffProcessor):
     """Shared CombatSimulator combining processors and providing scheduling helpers.
 
     This class exposes the processing methods (skill casts, unit death, regen,
     per-second buffs) via multiple inheritance from processor classes and
     implements a minimal scheduler surface required by tests.
+
+    ``scheduler`` selects how simulated time advances:
+
+    - ``'tick'`` (default): run every processor on every ``dt`` step.
+    - ``'event'``: jump over ticks on which nothing can happen (no attack
+      ready, no DoT tick or effect expiry due, no scheduled delivery). Time
+      stays on the same ``dt`` grid and regeneration for skipped ticks is
+      replayed on the next processed tick, so winner, HP and duration match
+      ``'tick'``. Due times come from heaps kept current by unit listeners,
+      so finding the next tick does not rescan the board. Fewer
+      ``state_snapshot`` events are emitted. Sparse boards skip most ticks;
+      on crowded boards (an attack due nearly every tick) the gain is small.
+
+    ``simulate(..., mode='outcome')`` runs the same combat headless: no
+    events reach the callback, no log lines or snapshots are built and the
+    result carries an empty ``log``. Use it when only the winner, survivors
+    and duration matter (offline evaluation, balance scripts).
+
+    ``snapshot_policy`` controls the per-tick ``state_snapshot`` events:
+
+    - ``'full'`` (default, compatibility): a full-board snapshot every tick.
+    - ``'keyframe'``: a full snapshot every ``keyframe_interval`` seconds
+      and, on the ticks between, a ``state_delta`` event listing only the
+      units whose hp/mana/shield/stats or effect list changed (see
+      ``CombatState.get_delta_data``). Ticks without changes emit nothing.
+
+    The result's ``log`` is a ``CombatLog``: compact
+    ``(time, kind, actor_idx, target_idx, amount, detail)`` entries that are
+    rendered to text only when read. ``combat_log=False`` skips logging
+    entirely and returns an empty ``log``.
+
+    Delivered events carry ``event_id`` ``'<combat_id>:<n>'`` (see
+    ``waffen_tactics.core.ids``); each ``simulate`` call gets a fresh
+    ``combat_id``.
+
+    ``simulate_iter`` is the streaming entry point: a generator yielding
+    ``(event_type, payload)`` tick by tick while the combat runs, so callers
+    can relay events without collecting the whole combat first.
+
+    ``stall_window`` (seconds, off by default) ends combats that stopped
+    progressing: when neither side's total HP reached a new low nor lost a
+    unit for that long (see ``ProgressMonitor``), the combat ends with the
+    ``CombatState.get_winner_by_total_hp`` tie-break instead of running to
+    ``timeout``. The result then has ``stalemate=True`` and ``ticks_saved``
+    set to the ``dt`` ticks left before the timeout. ``STALL_WINDOW`` is the
+    window the game uses.
+
+    The result's ``ticks`` counts the ticks the main loop processed (the
+    ``'event'`` scheduler's skipped ticks are not included).
+
+    ``seed`` / ``rng`` give the simulation its own ``random.Random`` stream.
+    Target selection, skill targeting, trigger chance rolls and random stat
+    picks all draw from it, so a combat is reproducible from the seed alone
+    without touching global random state. Without either, the global
+    ``random`` module is used (legacy behaviour).
     """
-    def __init__(self, dt: float = 0.1, timeout: int = 120, modular_effect_processor=None):
+    SCHEDULERS = ('tick', 'event')
+    MODES = ('full', 'outcome')
+    SNAPSHOT_POLICIES = ('full', 'keyframe')
+    # Stall window used by the game's combat entry points
+    STALL_WINDOW = 10.0
+    # Guard against float noise when comparing grid times with due times
+    _EVENT_EPSILON = 1e-9
+
+    def __init__(self, dt: float = 0.1, timeout: int = 120, modular_effect_processor=None, scheduler: str = 'tick', seed: Optional[int] = None, rng: Optional[random.Random] = None, snapshot_policy: str = 'full', keyframe_interval: float = 1.0, combat_log: bool = True, stall_window: Optional[float] = None):
+        if scheduler not in self.SCHEDULERS:
+            raise ValueError(f"Unknown scheduler {scheduler!r}; expected one of {self.SCHEDULERS}")
+        if snapshot_policy not in self.SNAPSHOT_POLICIES:
+            raise ValueError(f"Unknown snapshot policy {snapshot_policy!r}; expected one of {self.SNAPSHOT_POLICIES}")
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self.rng = rng if rng is not None else random
         # Ensure we have a modular effect processor available by default
         if modular_effect_processor is None:
-            modular_effect_processor = ModularEffectProcessor()
+            modular_effect_processor = ModularEffectProcessor(rng=rng)
+        elif rng is not None:
+            modular_effect_processor.rng = rng
         # Initialize processors that require construction
         CombatEffectProcessor.__init__(self, modular_effect_processor=modular_effect_processor)
         # Basic simulator state
         self.dt = dt
         self.timeout = timeout
+        self.scheduler = scheduler
+        self.snapshot_policy = snapshot_policy
+        self.combat_log = combat_log
+        self.keyframe_interval = keyframe_interval
+        self.stall_window = stall_window
+        self._outcome_only = False
         self._scheduled = []
         self._schedule_counter = itertools.count()
+        # Timed-effect queue: heap of (due_time, counter, side, unit_index,
+        # effect) for DoT ticks and expirations, fed by each unit's EffectIndex
+        # listener. Entries are never removed early; a stale entry only
+        # makes its unit be rescanned once (lazy deletion).
+        self._timed_effects = []
+        self._timed_dues = {}
+        self._untracked_units = set()
+        # Event scheduler state (see _next_due_time): heap of (attack_due,
+        # counter, side, unit_index) fed by each unit's timing_listener, with
+        # the same lazy deletion; units whose HP was written since the mirror
+        # last matched; dead units taken off the heap; units carrying
+        # per_second_buff effects; and units without the hooks, which are
+        # scanned every time. Regen for skipped ticks is replayed over
+        # _catch_up_steps ticks on the next processed one.
+        self._attack_dues = []
+        self._hp_unsynced = set()
+        self._idle_attackers = set()
+        self._per_second_units = set()
+        self._unhooked_units = set()
+        self._catch_up_steps = 1
         self._event_seq = 0
+        # Event ids are '<combat_id>:<n>'; simulate() starts a new combat id
+        self._event_ids = EventIdGenerator()
         self._current_time = 0.0
+        # Result dict of the last finished simulate()/simulate_iter() run
+        self.last_result = None
         # Simulator team placeholders (may be set by simulate)
         self.team_a = []
         self.team_b = []
         self.a_hp = []
         self.b_hp = []
+        # Per-combat lookups for pending attacks (set by simulate)
+        self._hp_arrays = {'team_a': self.a_hp, 'team_b': self.b_hp}
+        self._all_units = {'team_a': [], 'team_b': []}
+
+    @property
+    def combat_id(self) -> str:
+        """Id of the current (or last) combat; prefix of its event ids."""
+        return self._event_ids.combat_id
 
     def _enqueue_scheduled_event(self, deliver_at: float, event_type: str, payload: Dict[str, Any]):
+        self.schedule_event(deliver_at, PendingAction.event(deliver_at, event_type, payload))
+
+    def schedule_event(self, deliver_at: float, action):
+        """Queue ``action`` (a ``PendingAction`` or a legacy callable) for ``deliver_at``."""
         cnt = next(self._schedule_counter)
-        def action():
-            return [(event_type, payload)]
         heapq.heappush(self._scheduled, (deliver_at, cnt, action))
 
-    # compatibility wrapper used by processors
-    def schedule_event(self, deliver_at: float, action_callable):
-        cnt = next(self._schedule_counter)
-        heapq.heappush(self._scheduled, (deliver_at, cnt, action_callable))
+    def pending_actions(self) -> List[Any]:
+        """Queued actions in delivery order (for debugging/checkpointing)."""
+        return [action for _, _, action in sorted(self._scheduled, key=lambda entry: entry[:2])]
+
+    def _run_pending_action(self, action, sink):
+        """Resolve one scheduled action and emit its events through ``sink``."""
+        if isinstance(action, PendingAction):
+            if action.kind == PendingAction.ATTACK:
+                results = self._resolve_pending_attack(action)
+            elif action.kind == PendingAction.EVENT:
+                results = ((action.event_type, action.payload),)
+            else:
+                raise ValueError(f"Unknown pending action kind {action.kind!r}")
+        else:
+            results = action()
+            if isinstance(results, dict):
+                results = [('scheduled_event', results)]
+        if results:
+            for ev_type, ev_payload in results:
+                sink.emit(ev_type, ev_payload)
+
+    def _wiped_out_winner(self) -> Optional[str]:
+        """The winning side once the other has no unit above zero HP, else None."""
+        if self.b_hp.alive == 0:
+            return 'team_a'
+        if self.a_hp.alive == 0:
+            return 'team_b'
+        return None
+
+    def _track_timed_effect(self, side: int, index: int, effect: Any):
+        """Queue the next DoT tick / expiry of ``effect`` on the timed-effect heap."""
+        if not isinstance(effect, dict):
+            return
+        if effect.get('type') == 'per_second_buff':
+            self._per_second_units.add((side, index))
+        next_tick = effect.get('next_tick_time', 0) if effect.get('type') == 'damage_over_time' else None
+        dues = (next_tick, effect.get('expires_at'))
+        if dues == (None, None):
+            return
+        # Reassigning a unit's effect list replays every effect; skip the
+        # ones whose due times are already queued
+        known = self._timed_dues.get(id(effect))
+        if known is not None and known[0] is effect and known[1] == dues:
+            return
+        self._timed_dues[id(effect)] = (effect, dues)
+        for due in dues:
+            if due is not None:
+                heapq.heappush(self._timed_effects, (due, next(self._schedule_counter), side, index, effect))
+
+    def _timed_entry_is_live(self, entry) -> bool:
+        """Whether a timed-effect entry still refers to a due time on a live unit."""
+        due, _, side, index, effect = entry
+        team, hp_list = (self.team_a, self.a_hp) if side == 0 else (self.team_b, self.b_hp)
+        unit = team[index]
+        if hp_list[index] <= 0 or getattr(unit, '_dead', False):
+            return False
+        if not any(e is effect for e in effects_of_type(unit, effect.get('type'))):
+            return False
+        if effect.get('type') == 'damage_over_time' and effect.get('next_tick_time', 0) == due:
+            return True
+        return effect.get('expires_at') == due
+
+    def _push_attack_due(self, side: int, index: int):
+        """Queue the time the unit's next attack becomes ready."""
+        unit = (self.team_a, self.team_b)[side][index]
+        speed = unit.attack_speed
+        if speed > 0:
+            heapq.heappush(self._attack_dues, (unit.last_attack_time + 1.0 / speed, next(self._schedule_counter), side, index))
+
+    def _unit_timing_changed(self, side: int, index: int, what: str):
+        """``CombatUnit.timing_listener`` hook installed for the event scheduler."""
+        if what == 'hp':
+            self._hp_unsynced.add((side, index))
+        else:
+            self._push_attack_due(side, index)
+
+    def _start_timed_tracking(self):
+        self._timed_effects = []
+        self._timed_dues = {}
+        self._untracked_units = set()
+        self._attack_dues = []
+        self._hp_unsynced = set()
+        self._idle_attackers = set()
+        self._per_second_units = set()
+        self._unhooked_units = set()
+        self._catch_up_steps = 1
+        for side, team in enumerate((self.team_a, self.team_b)):
+            for i, unit in enumerate(team):
+                effects = getattr(unit, 'effects', None)
+                if isinstance(effects, EffectIndex):
+                    effects.listen(functools.partial(self._track_timed_effect, side, i))
+                else:
+                    # Test doubles with plain effect lists are scanned every tick
+                    self._untracked_units.add((side, i))
+                if self.scheduler != 'event':
+                    continue
+                if isinstance(unit, CombatUnit) and isinstance(effects, EffectIndex):
+                    unit.timing_listener = functools.partial(self._unit_timing_changed, side, i)
+                    self._push_attack_due(side, i)
+                else:
+                    self._unhooked_units.add((side, i))
+
+    def _stop_timed_tracking(self):
+        for unit in self.team_a + self.team_b:
+            effects = getattr(unit, 'effects', None)
+            if isinstance(effects, EffectIndex):
+                effects.listen(None)
+            if isinstance(unit, CombatUnit):
+                unit.timing_listener = None
+
+    def _pop_due_timed_units(self, time: float) -> Tuple[List[int], List[int]]:
+        """Pop every timed-effect entry due at ``time``; return the unit indices per side."""
+        due = (set(), set())
+        while self._timed_effects and self._timed_effects[0][0] <= time:
+            _, _, side, index, _ = heapq.heappop(self._timed_effects)
+            due[side].add(index)
+        for side, index in self._untracked_units:
+            due[side].add(index)
+        # Sorted so ticks/expirations keep the team-order emission of a full scan
+        return sorted(due[0]), sorted(due[1])
 
     def _process_dot_for_team(
         self,
@@ -258,19 +521,22 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
         time: float = 0.0,
         log: Optional[List[str]] = None,
         event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
-        side: str = 'team_a'
+        side: str = 'team_a',
+        indices: Optional[List[int]] = None
     ):
         """Process damage over time effects for a single team (simulator-level).
 
         Implements canonical DoT tick emission, HP mutation via `emit_damage_over_time_tick`,
-        and expiration via `emit_damage_over_time_expired`.
+        and expiration via `emit_damage_over_time_expired`. ``indices``
+        restricts processing to the given units (all units when ``None``).
         """
         if hp_list is None:
             hp_list = [getattr(u, 'hp', 0) for u in team]
         if log is None:
             log = []
 
-        for i, unit in enumerate(team):
+        for i in range(len(team)) if indices is None else indices:
+            unit = team[i]
             # Skip dead units - check both HP and _dead attribute for consistency
             if hp_list[i] <= 0 or getattr(unit, '_dead', False):
                 continue
@@ -279,9 +545,7 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
                 continue
 
             effects_to_remove = []
-            for j, effect in enumerate(list(unit.effects)):
-                if effect.get('type') != 'damage_over_time':
-                    continue
+            for effect in effects_of_type(unit, 'damage_over_time'):
                 next_tick = effect.get('next_tick_time', 0)
                 if time < next_tick:
                     continue
@@ -298,22 +562,20 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
                 authoritative_hp = int(getattr(unit, 'hp', hp_list[i]))
                 hp_list[i] = max(0, authoritative_hp)
 
-                log.append(f"{unit.name} takes {int(damage)} {damage_type} damage from DoT")
+                record(log, 'dot', unit, None, int(damage), damage_type)
 
                 ticks_remaining = int(effect.get('ticks_remaining', 0)) - 1
                 if ticks_remaining > 0:
                     interval = effect.get('interval', 1.0)
                     effect['ticks_remaining'] = ticks_remaining
                     effect['next_tick_time'] = time + interval
+                    self._track_timed_effect(0 if side == 'team_a' else 1, i, effect)
                 else:
-                    effects_to_remove.append(j)
+                    effects_to_remove.append(effect)
                     emit_damage_over_time_expired(event_callback, unit, effect.get('id'), unit_hp=hp_list[i], side=side, timestamp=time)
 
-            for j in reversed(effects_to_remove):
-                try:
-                    unit.effects.pop(j)
-                except Exception:
-                    pass
+            for effect in effects_to_remove:
+                discard_effect(unit, effect)
 
         return
 
@@ -324,7 +586,8 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
         time: float = 0.0,
         log: Optional[List[str]] = None,
         event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
-        side: str = 'team_a'
+        side: str = 'team_a',
+        indices: Optional[List[int]] = None
     ):
         """Process effect expiration for a single team (simulator-level).
 
@@ -332,13 +595,15 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
         1. Reverts stat changes using applied_delta
         2. Emits effect_expired event
         3. Removes the effect from the unit
+        ``indices`` restricts processing to the given units (all when ``None``).
         """
         if hp_list is None:
             hp_list = [getattr(u, 'hp', 0) for u in team]
         if log is None:
             log = []
 
-        for i, unit in enumerate(team):
+        for i in range(len(team)) if indices is None else indices:
+            unit = team[i]
             # Skip dead units - check both HP and _dead attribute for consistency
             if hp_list[i] <= 0 or getattr(unit, '_dead', False):
                 continue
@@ -347,7 +612,7 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
                 continue
 
             effects_to_remove = []
-            for j, effect in enumerate(list(unit.effects)):
+            for effect in expiring_effects(unit):
                 expires_at = effect.get('expires_at')
                 if expires_at is None or time < expires_at:
                     continue
@@ -364,33 +629,30 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
                             new_hp = max(0, old_hp - applied_delta)
                             setattr(unit, stat, new_hp)
                             hp_list[i] = new_hp  # Update HP list
-                            log.append(f"{unit.name} stat {stat} reverted by {-applied_delta} (effect expired)")
+                            record(log, 'stat_revert', unit, None, -applied_delta, stat)
                         else:
                             old_val = getattr(unit, stat, 0)
                             new_val = old_val - applied_delta
                             setattr(unit, stat, new_val)
-                            log.append(f"{unit.name} stat {stat} reverted by {-applied_delta} (effect expired)")
+                            record(log, 'stat_revert', unit, None, -applied_delta, stat)
                 elif effect_type == 'shield':
                     applied_amount = effect.get('applied_amount', 0)
                     if applied_amount:
                         old_shield = getattr(unit, 'shield', 0)
                         new_shield = max(0, old_shield - applied_amount)
                         setattr(unit, 'shield', new_shield)
-                        log.append(f"{unit.name} shield reverted by {-applied_amount} (effect expired)")
+                        record(log, 'shield_revert', unit, None, -applied_amount)
 
                 # Emit effect_expired event
                 from .event_canonicalizer import emit_effect_expired
                 emit_effect_expired(event_callback, unit, effect.get('id'), unit_hp=hp_list[i], side=side, timestamp=time)
 
                 # Mark effect for removal
-                effects_to_remove.append(j)
+                effects_to_remove.append(effect)
 
             # Remove expired effects
-            for j in reversed(effects_to_remove):
-                try:
-                    unit.effects.pop(j)
-                except Exception:
-                    pass
+            for effect in effects_to_remove:
+                discard_effect(unit, effect)
 
         return
 
@@ -398,14 +660,148 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
         current = getattr(self, '_current_time', 0.0)
         while self._scheduled and self._scheduled[0][0] <= current:
             _, _, action = heapq.heappop(self._scheduled)
-            results = action()
-            if isinstance(results, dict):
-                results = [('scheduled_event', results)]
-            if results:
-                for ev_type, ev_payload in results:
-                    sink.emit(ev_type, ev_payload)
+            self._run_pending_action(action, sink)
+
+    def _next_due_time(self, skip_per_round_buffs: bool = False) -> float:
+        """Return the earliest time at which a tick can change combat state.
+
+        Considers attack readiness, DoT ticks, effect expiry and the
+        scheduled-event heap. Units with ``per_second_buff`` effects mutate
+        stats on every tick, so their presence disables skipping. So does a
+        unit whose HP differs from its mirror entry (e.g. a secondary skill
+        target): the next tick's regen step syncs it, and a kill it carries
+        must end the combat on that tick, as in the tick loop.
+
+        Hooked units are read from the due-time heaps and the sets their
+        listeners maintain; only units without the hooks are scanned.
+        """
+        teams = (self.team_a, self.team_b)
+        hp_lists = (self.a_hp, self.b_hp)
+        if not skip_per_round_buffs and self._per_second_units:
+            for key in list(self._per_second_units):
+                if effects_of_type(teams[key[0]][key[1]], 'per_second_buff'):
+                    return float('-inf')
+                self._per_second_units.discard(key)
+        if self._hp_unsynced:
+            for key in list(self._hp_unsynced):
+                side, i = key
+                if teams[side][i].hp != hp_lists[side][i]:
+                    return float('-inf')
+                self._hp_unsynced.discard(key)
+
+        due = self._scheduled[0][0] if self._scheduled else float('inf')
+        # Drop stale entries so removed effects do not cut a skip short
+        while self._timed_effects and not self._timed_entry_is_live(self._timed_effects[0]):
+            heapq.heappop(self._timed_effects)
+        if self._timed_effects:
+            due = min(due, self._timed_effects[0][0])
+
+        # Units revived since they left the attack heap go back on it
+        if self._idle_attackers:
+            for key in list(self._idle_attackers):
+                if hp_lists[key[0]][key[1]] > 0:
+                    self._idle_attackers.discard(key)
+                    self._push_attack_due(*key)
+        attack_dues = self._attack_dues
+        while attack_dues:
+            attack_due, _, side, i = attack_dues[0]
+            if hp_lists[side][i] <= 0:
+                heapq.heappop(attack_dues)
+                self._idle_attackers.add((side, i))
+                continue
+            unit = teams[side][i]
+            speed = unit.attack_speed
+            if speed <= 0 or unit.last_attack_time + 1.0 / speed != attack_due:
+                # Superseded: the listener queued the unit's current due time
+                heapq.heappop(attack_dues)
+                continue
+            due = min(due, attack_due)
+            break
+
+        for side, i in self._unhooked_units:
+            unit = teams[side][i]
+            hp_list = hp_lists[side]
+            if not skip_per_round_buffs and effects_of_type(unit, 'per_second_buff'):
+                return float('-inf')
+            if unit.hp != hp_list[i]:
+                return float('-inf')
+            if hp_list[i] <= 0:
+                continue
+            if unit.attack_speed > 0:
+                due = min(due, unit.last_attack_time + 1.0 / unit.attack_speed)
+            if getattr(unit, '_dead', False) or (side, i) not in self._untracked_units:
+                continue
+            for e in effects_of_type(unit, 'damage_over_time'):
+                due = min(due, e.get('next_tick_time', 0))
+            for e in expiring_effects(unit):
+                expires_at = e.get('expires_at')
+                if expires_at is not None:
+                    due = min(due, expires_at)
+        return due
+
+    def _skip_idle_ticks(self, time: float, skip_per_round_buffs: bool = False) -> float:
+        """Jump ``time`` along the ``dt`` grid to the next tick something is due.
+
+        The skipped ticks (plus the one jumped to) are recorded in
+        ``_catch_up_steps`` so that tick's regeneration and flat
+        ``mana_regen`` replay them in one step. Returns the new tick time.
+        """
+        target = min(self._next_due_time(skip_per_round_buffs) - self._EVENT_EPSILON, self.timeout)
+        if time >= target:
+            return time
+        # Grid time k ticks ahead, rounded like the tick loop's time steps
+        dt = float(self.dt)
+        steps = max(1, math.ceil((target - time) / dt))
+        while steps > 1 and round(time + (steps - 1) * dt, 10) >= target:
+            steps -= 1
+        while round(time + steps * dt, 10) < target:
+            steps += 1
+        self._catch_up_steps = steps + 1
+        return round(time + steps * dt, 10)
+
+    def simulate(self, team_a, team_b, event_callback=None, round_number: int = 1, skip_per_round_buffs: bool = False, mode: str = 'full'):
+        steps = self._simulation_steps(team_a, team_b, event_callback, round_number, skip_per_round_buffs, mode)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                self.last_result = done.value
+                return done.value
+
+    def simulate_iter(self, team_a, team_b, event_callback=None, round_number: int = 1, skip_per_round_buffs: bool = False):
+        """Run a full-mode combat, yielding ``(event_type, payload)`` as it goes.
+
+        Events are handed out at the end of every tick, in delivery order:
+        scheduled events are released only once they fall due, so the stream
+        and its ``seq`` numbers match what ``simulate`` passes its callback.
+        ``event_callback`` (optional) still sees each event at emission time,
+        while the simulator state reflects that moment. The result dict is
+        the generator's return value and is also stored as ``last_result``.
+        """
+        pending = []
+
+        def relay(event_type, data):
+            if event_callback is not None:
+                event_callback(event_type, data)
+            pending.append((event_type, data))
 
-    def simulate(self, team_a, team_b, event_callback=None, round_number: int = 1, skip_per_round_buffs: bool = False):
+        steps = self._simulation_steps(team_a, team_b, relay, round_number, skip_per_round_buffs, 'full')
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                self.last_result = done.value
+                yield from pending
+                return done.value
+            yield from pending
+            pending.clear()
+
+    def _simulation_steps(self, team_a, team_b, event_callback, round_number: int, skip_per_round_buffs: bool, mode: str):
+        """Run a combat as a generator that pauses after every tick; returns the result dict."""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown simulation mode {mode!r}; expected one of {self.MODES}")
+        self._outcome_only = mode == 'outcome'
+        self._event_ids = EventIdGenerator()
         # Prepare event callback
         if event_callback is None:
             def noop(*a, **k):
@@ -417,6 +813,14 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
         self.team_b = list(team_b)
         self.a_hp = [int(getattr(u, 'hp', 0)) for u in self.team_a]
         self.b_hp = [int(getattr(u, 'hp', 0)) for u in self.team_b]
+        # Targeting: alive-line indexes fed by HP mirror writes, policies
+        # and the deterministic flag resolved once per combat
+        self.a_hp = HpMirror(self.a_hp)
+        self.b_hp = HpMirror(self.b_hp)
+        self._target_index = {'team_a': TargetIndex(self.team_a, self.a_hp), 'team_b': TargetIndex(self.team_b, self.b_hp)}
+        self._resolved_deterministic_targeting = deterministic_targeting_enabled()
+        self._hp_arrays = {'team_a': self.a_hp, 'team_b': self.b_hp}
+        self._all_units = {'team_a': self.team_a + self.team_b, 'team_b': self.team_b + self.team_a}
         # (mana mirrors are managed by CombatState)
 
         # ensure unit runtime fields exist
@@ -426,14 +830,26 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
             if not hasattr(u, 'last_attack_time'):
                 u.last_attack_time = 0.0
 
-        log = []
         time = 0.0
-        sink = _EventSink(self, event_callback)
+        if self._outcome_only:
+            log = _DiscardLog()
+            sink = _OutcomeEventSink(self)
+            # Headless runs never reach the caller's callback
+            event_callback = sink.emit
+        else:
+            log = CombatLog(self.team_a, self.team_b) if self.combat_log else _DiscardLog()
+            sink = _EventSink(self, event_callback)
         # route events through sink.emit so seq/event_id and scheduling are applied
         proc_cb = sink.emit
 
         # create combat state snapshot helper
-        self._combat_state = CombatState(self.team_a, self.team_b)
+        self._combat_state = CombatState(self.team_a, self.team_b, hp_arrays=self._hp_arrays)
+        self._combat_state.track_deltas = self.snapshot_policy == 'keyframe'
+        next_keyframe = 0.0
+        self._start_timed_tracking()
+        # Death triggers only visit units subscribed to them
+        if self.modular_effect_processor is not None:
+            self.modular_effect_processor.subscribe_units(self._all_units['team_a'], self._all_units['team_b'])
 
         # Apply per-round buffs
         for idx_u, u in enumerate(self.team_a):
@@ -449,7 +865,7 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
                             add = int(val * round_number)
                         old_hp = int(self.a_hp[idx_u])
                         self.a_hp[idx_u] = min(u.max_hp, self.a_hp[idx_u] + add)
-                        log.append(f"{u.name} {add:+d} HP (per round buff)")
+                        record(log, 'round_hp', u, None, add)
                         if event_callback:
                             from .event_canonicalizer import emit_heal
                             emit_heal(event_callback, u, add, source=None, side='team_a', timestamp=0.0, current_hp=old_hp)
@@ -467,7 +883,7 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
                             add = int(val * round_number)
                         old_hp = int(self.b_hp[idx_u])
                         self.b_hp[idx_u] = min(u.max_hp, self.b_hp[idx_u] + add)
-                        log.append(f"{u.name} {add:+d} HP (per round buff)")
+                        record(log, 'round_hp', u, None, add)
                         if event_callback:
                             from .event_canonicalizer import emit_heal
                             emit_heal(event_callback, u, add, source=None, side='team_b', timestamp=0.0, current_hp=old_hp)
@@ -476,43 +892,83 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
         proc_cb('animation_start', {'timestamp': 0.0})
 
         winner = None
+        stalemate = False
+        ticks = 0
+        monitor = ProgressMonitor(self.stall_window, self.a_hp, self.b_hp) if self.stall_window else None
         # Main loop
         while time < self.timeout:
             self._current_time = time
+            log.time = time
+            ticks += 1
 
-            # Per-second buffs and regen
+            # Per-second buffs and regen (replaying any ticks the event
+            # scheduler skipped to get here)
+            steps, self._catch_up_steps = self._catch_up_steps, 1
             if not skip_per_round_buffs:
-                self._process_per_second_buffs(self.team_a, self.team_b, self.a_hp, self.b_hp, time, log, proc_cb)
-            self._process_regeneration(self.team_a, self.team_b, self.a_hp, self.b_hp, time, log, self.dt, proc_cb)
+                self._process_per_second_buffs(self.team_a, self.team_b, self.a_hp, self.b_hp, time, log, proc_cb, steps=steps)
+            self._process_regeneration(self.team_a, self.team_b, self.a_hp, self.b_hp, time, log, self.dt, proc_cb, steps=steps)
 
             # Deliver any scheduled events due now
             self._deliver_scheduled_events(sink)
 
-            # Process damage-over-time effects for both teams (emit ticks and expirations)
-            self._process_dot_for_team(self.team_a, self.a_hp, time, log, proc_cb, 'team_a')
-            self._process_dot_for_team(self.team_b, self.b_hp, time, log, proc_cb, 'team_b')
-
-            # Process effect expiration for both teams (revert stats and emit expirations)
-            self._process_effect_expiration_for_team(self.team_a, self.a_hp, time, log, proc_cb, 'team_a')
-            self._process_effect_expiration_for_team(self.team_b, self.b_hp, time, log, proc_cb, 'team_b')
+            # Process damage-over-time effects and effect expiration for the
+            # units with something due on the timed-effect queue
+            due_a, due_b = self._pop_due_timed_units(time)
+            if due_a or due_b:
+                self._process_dot_for_team(self.team_a, self.a_hp, time, log, proc_cb, 'team_a', due_a)
+                self._process_dot_for_team(self.team_b, self.b_hp, time, log, proc_cb, 'team_b', due_b)
+                self._process_effect_expiration_for_team(self.team_a, self.a_hp, time, log, proc_cb, 'team_a', due_a)
+                self._process_effect_expiration_for_team(self.team_b, self.b_hp, time, log, proc_cb, 'team_b', due_b)
+
+            # Emit a state snapshot for reconstructors and replay tests;
+            # between keyframes only the units that changed are sent
+            if not self._outcome_only and getattr(self, '_combat_state', None) is not None:
+                if self.snapshot_policy == 'full' or time >= next_keyframe - self._EVENT_EPSILON:
+                    snap = self._combat_state.get_snapshot_data(time)
+                    proc_cb('state_snapshot', snap)
+                    next_keyframe = time + self.keyframe_interval
+                else:
+                    delta = self._combat_state.get_delta_data(time)
+                    if delta['player_units'] or delta['opponent_units']:
+                        proc_cb('state_delta', delta)
 
-            # Emit a state snapshot for reconstructors and replay tests
-            if getattr(self, '_combat_state', None) is not None:
-                snap = self._combat_state.get_snapshot_data(time)
-                proc_cb('state_snapshot', snap)
+            # A side wiped out by landed attacks, DoT or expiry ends the combat now
+            winner = self._wiped_out_winner()
+            if winner:
+                break
 
             # Team A attacks
-            winner = self._process_team_attacks(self.team_a, self.team_b, self.a_hp, self.b_hp, time, log, proc_cb, 'team_a')
+            winner = self._process_team_attacks(self.team_a, self.team_b, self.a_hp, self.b_hp, time, log, proc_cb, 'team_a') or self._wiped_out_winner()
             if winner:
                 break
 
             # Team B attacks
-            winner = self._process_team_attacks(self.team_b, self.team_a, self.b_hp, self.a_hp, time, log, proc_cb, 'team_b')
+            winner = self._process_team_attacks(self.team_b, self.team_a, self.b_hp, self.a_hp, time, log, proc_cb, 'team_b') or self._wiped_out_winner()
             if winner:
                 break
 
+            # No progress for a whole stall window: settle on total HP
+            if monitor is not None and monitor.observe(time, self.a_hp, self.b_hp):
+                winner = self._combat_state.get_winner_by_total_hp()
+                stalemate = True
+                trace.info('sim', "stalemate at t=%s (no progress since t=%s); winner by total hp: %s", time, monitor.last_progress, winner)
+                break
+
             # advance time
             time = round(time + float(self.dt), 10)
+            if self.scheduler == 'event':
+                time = self._skip_idle_ticks(time, skip_per_round_buffs)
+            yield
+
+        # A jump that reached the timeout still owes the skipped ticks their regen
+        if self._catch_up_steps > 1:
+            steps, self._catch_up_steps = self._catch_up_steps - 1, 1
+            last_idle = round(time - float(self.dt), 10)
+            self._current_time = last_idle
+            log.time = last_idle
+            if not skip_per_round_buffs:
+                self._process_per_second_buffs(self.team_a, self.team_b, self.a_hp, self.b_hp, last_idle, log, proc_cb, steps=steps)
+            self._process_regeneration(self.team_a, self.team_b, self.a_hp, self.b_hp, last_idle, log, self.dt, proc_cb, steps=steps)
 
         # Final delivery of any scheduled events up to timeout
         self._current_time = time
@@ -531,19 +987,22 @@ class CombatSimulator(CombatAttackProcessor, CombatEffectProcessor, CombatRegene
             # the simulator current time. Let errors propagate so callers
             # can see problems during finalization.
             self._current_time = deliver_at
-            results = action()
-            if isinstance(results, dict):
-                results = [('scheduled_event', results)]
-            if results:
-                for ev_type, ev_payload in results:
-                    sink.emit(ev_type, ev_payload)
+            self._run_pending_action(action, sink)
+
+        self._stop_timed_tracking()
+        if self.modular_effect_processor is not None:
+            self.modular_effect_processor.unsubscribe_units()
 
         # Build summary
-        team_a_survivors = sum(1 for hp in self.a_hp if hp > 0)
-        team_b_survivors = sum(1 for hp in self.b_hp if hp > 0)
-        # Debug: expose final authoritative HP arrays for replay verification
-        print(f"[SIM FINAL HP] a_hp={self.a_hp} b_hp={self.b_hp}")
-        return {'winner': winner or 'team_a', 'duration': time, 'team_a_survivors': team_a_survivors, 'team_b_survivors': team_b_survivors, 'log': log, 'timeout': time >= self.timeout}
+        team_a_survivors = self.a_hp.alive
+        team_b_survivors = self.b_hp.alive
+        if self._outcome_only or not self.combat_log:
+            log = []
+        else:
+            # Expose final authoritative HP arrays for replay verification
+            trace.debug('sim', "final hp a_hp=%s b_hp=%s", self.a_hp, self.b_hp)
+        ticks_saved = int(round((self.timeout - time) / self.dt)) if stalemate else 0
+        return {'winner': winner or 'team_a', 'duration': time, 'team_a_survivors': team_a_survivors, 'team_b_survivors': team_b_survivors, 'log': log, 'timeout': time >= self.timeout, 'stalemate': stalemate, 'ticks_saved': ticks_saved, 'ticks': ticks}
 
 
 # Provide test-suite compatible EventSink symbol
@@ -1,17 +1,59 @@
 """
 CombatUnit class - represents a unit in combat
 """
-from typing import List, Dict, Any, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import copy
+import os
+import sys
 import traceback
-from ..models.unit import CombatUnitStats, CombatUnitState, CombatUnitSkill, ComputedStats, Skill
+from ..models.unit import CombatStatBlock, CombatUnitStats, CombatUnitState, CombatUnitSkill, ComputedStats, Skill
+from .effect_index import EffectIndex
+
+
+# Capability for HP writes. Only the canonical emitters (event_canonicalizer)
+# import it and pass it to `_set_hp` as `caller_module`; checking it is a
+# single identity comparison, so the guarantee costs nothing per write.
+_HP_WRITER = object()
+
+# Debug aid: WAFFEN_DEBUG_HP_WRITES=1 additionally walks the call stack on
+# every HP write to verify it originates in event_canonicalizer.
+_DEBUG_HP_WRITES = os.getenv('WAFFEN_DEBUG_HP_WRITES', '0') in ('1', 'true', 'True')
+
+
+def _assert_canonical_hp_writer() -> None:
+    """Debug-only check that an HP write comes from event_canonicalizer."""
+    frame = sys._getframe(2)
+    for _ in range(5):
+        if frame is None:
+            break
+        if 'event_canonicalizer' in frame.f_globals.get('__name__', ''):
+            return
+        frame = frame.f_back
+    raise PermissionError('HP write outside event_canonicalizer (WAFFEN_DEBUG_HP_WRITES)')
 
 
 class CombatUnit:
     """Lightweight unit representation for combat with effect hooks"""
+    # No `__dict__`: the runtime flags processors attach are declared here
+    # too. They stay unset until first written, so the existing
+    # `hasattr` / `getattr(u, name, default)` probes behave as before.
+    __slots__ = (
+        '_stats', '_state', '_computed_stats', 'skill', 'id', 'name', 'timing_listener',
+        # death handling (event_canonicalizer, combat_effect_processor)
+        '_dead', '_death_processed',
+        # stun (event_canonicalizer.emit_unit_stunned)
+        '_stunned', 'stunned_expires_at',
+        # fractional regen carried between ticks (combat_regeneration_processor)
+        '_hp_regen_accumulator', '_mana_regen_accumulator',
+        # compiled skill cache (skill_plan.skill_plan_for)
+        '_skill_plan',
+        # permanent buff totals (modular/combat effect processors)
+        'permanent_buffs_applied',
+    )
+
     def __init__(self, id: str, name: str, hp: int, attack: int, defense: int, attack_speed: float, effects: Optional[List[Dict[str, Any]]] = None, max_mana: int = 100, skill: Optional[Union[Dict[str, Any], Skill]] = None, mana_regen: int = 0, stats: Optional['Stats'] = None, star_level: int = 1, position: str = 'front', base_stats: Optional[Dict[str, float]] = None):
-        # Create immutable stats
-        self._stats = CombatUnitStats(
+        # Mutable stat block - buffs update it in place
+        self._stats = CombatStatBlock(
             hp=stats.hp if stats else hp,
             attack=attack,
             defense=defense,
@@ -27,7 +69,7 @@ class CombatUnit:
         self._state = CombatUnitState(
             current_hp=hp,
             current_mana=0,
-            effects=effects or []
+            effects=EffectIndex(effects or [])
         )
         
         # Convert skill to dict if it's a Skill object
@@ -47,6 +89,11 @@ class CombatUnit:
         # Computed stats cache
         self._computed_stats = ComputedStats.from_effects(self._state.effects)
 
+        # Called with 'hp' or 'attack' when current HP or the attack timing
+        # (last_attack_time / attack_speed) changes; the event scheduler
+        # keeps its due-time heap current through it
+        self.timing_listener: Optional[Callable[[str], None]] = None
+
     @property
     def effects(self):
         return self._state.effects
@@ -73,7 +120,7 @@ class CombatUnit:
             'attack_speed': self._stats.attack_speed,
             'star_level': self._stats.star_level,
             'position': self._stats.position,
-            'effects': self._state.effects,
+            'effects': list(self._state.effects),
             'current_mana': mana,
             'max_mana': self._stats.max_mana,
             'shield': self._state.shield,
@@ -107,28 +154,26 @@ class CombatUnit:
         """Update cached values from effects"""
         self._computed_stats = ComputedStats.from_effects(self._state.effects)
 
-    def _set_hp(self, value: int, caller_module: str = None) -> None:
-        """Centralized HP setter — clips value to [0, max_hp].
+    def _set_hp(self, value: int, caller_module: Any = None) -> None:
+        """Centralized HP setter — the only HP mutation path.
 
-        Callers should prefer this method when mutating HP so the unit
-        implementation can keep a single place for validation and future
-        instrumentation (logging, invariants, permissions).
+        Canonical emitters pass the module's `_HP_WRITER` capability as
+        `caller_module`; any other caller is rejected.
         """
+        if caller_module is not _HP_WRITER:
+            raise PermissionError("HP can only be set through the canonical emitters (event_canonicalizer)")
+        if _DEBUG_HP_WRITES:
+            _assert_canonical_hp_writer()
         try:
             v = int(value)
         except Exception:
             return
-        # Only allow canonical module to set HP in production paths. Tests
-        # and compatibility code may still call the property setter which
-        # routes here without a caller_module; allow that for now.
-        if caller_module is not None and caller_module != 'event_canonicalizer':
-            raise PermissionError("HP can only be set by event_canonicalizer when caller_module is provided")
-
         # Allow temporarily setting current HP beyond the immutable stats hp
         # during initialization or when callers set hp before updating max_hp.
         # Clamping to max_hp should occur when max_hp is explicitly changed.
-        new_hp = max(0, v)
-        self._state.current_hp = new_hp
+        self._state.current_hp = v if v > 0 else 0
+        if self.timing_listener is not None:
+            self.timing_listener('hp')
 
     @property
     def hp(self) -> int:
@@ -136,25 +181,9 @@ class CombatUnit:
 
     @hp.setter
     def hp(self, value: int):
-        # Route assignments through centralized setter for validation and
-        # future instrumentation. Only allow direct property assignment
-        # when invoked from the canonical emitter/service (`event_canonicalizer`).
-        # Other call sites must call the canonical emitters so events carry
-        # authoritative HP.
-        import inspect
-
-        stack = inspect.stack()
-        try:
-            for fr in stack[1:6]:
-                mod = inspect.getmodule(fr.frame)
-                if mod and 'event_canonicalizer' in getattr(mod, '__name__', ''):
-                    # Authorized caller — forward caller identity to _set_hp
-                    self._set_hp(value, caller_module='event_canonicalizer')
-                    return
-        finally:
-            # avoid reference cycles
-            del stack
-
+        # Direct assignment is never a canonical write: the emitters in
+        # event_canonicalizer call `_set_hp` with the write capability so
+        # events always carry authoritative HP.
         raise PermissionError('Direct HP assignment is restricted; use canonical emitters (event_canonicalizer) to mutate HP')
 
     @property
@@ -172,9 +201,26 @@ class CombatUnit:
 
     @effects.setter
     def effects(self, value: List[Dict[str, Any]]):
+        # Keep the per-type/trigger buckets: wrap plain lists in an EffectIndex
+        if not isinstance(value, EffectIndex):
+            value = EffectIndex(value or [])
+        # Carry the simulator's timed-effect listener over to the new list
+        listener = getattr(self._state.effects, 'listener', None)
+        if listener is not None and value.listener is None:
+            value.listen(listener)
+        # ...and the trigger subscription listener, which must hear about the swap
+        trigger_listener = getattr(self._state.effects, 'trigger_listener', None)
+        if trigger_listener is not None and value.trigger_listener is None:
+            value.trigger_listener = trigger_listener
+            trigger_listener()
         self._state.effects = value
         self._update_caches()
 
+    @property
+    def effect_index(self) -> EffectIndex:
+        """The unit's effects bucketed by type and trigger (same object as `effects`)."""
+        return self._state.effects
+
     @property
     def shield(self) -> int:
         return self._state.shield
@@ -190,6 +236,8 @@ class CombatUnit:
     @last_attack_time.setter
     def last_attack_time(self, value: float):
         self._state.last_attack_time = value
+        if self.timing_listener is not None:
+            self.timing_listener('attack')
 
     @property
     def kills(self) -> int:
@@ -221,18 +269,7 @@ class CombatUnit:
 
     @max_hp.setter
     def max_hp(self, value: int):
-        # For effects that modify max_hp, we need to update the immutable stats
-        # This is a bit of a hack, but since max_hp changes are rare, we'll recreate the stats
-        self._stats = CombatUnitStats(
-            hp=value,
-            attack=self._stats.attack,
-            defense=self._stats.defense,
-            attack_speed=self._stats.attack_speed,
-            max_mana=self._stats.max_mana,
-            mana_regen=self._stats.mana_regen,
-            star_level=self._stats.star_level,
-            position=self._stats.position
-        )
+        self._stats.hp = value
 
     @property
     def attack_speed(self) -> float:
@@ -240,18 +277,9 @@ class CombatUnit:
 
     @attack_speed.setter
     def attack_speed(self, value: float):
-        # For effects that modify attack_speed, we need to update the immutable stats
-        self._stats = CombatUnitStats(
-            hp=self._stats.hp,
-            attack=self._stats.attack,
-            defense=self._stats.defense,
-            attack_speed=value,
-            max_mana=self._stats.max_mana,
-            mana_regen=self._stats.mana_regen,
-            star_level=self._stats.star_level,
-            position=self._stats.position,
-            mana_on_attack=self._stats.mana_on_attack
-        )
+        self._stats.attack_speed = value
+        if self.timing_listener is not None:
+            self.timing_listener('attack')
 
     @property
     def attack(self) -> int:
@@ -259,18 +287,7 @@ class CombatUnit:
 
     @attack.setter
     def attack(self, value: int):
-        # For effects that modify attack, we need to update the immutable stats
-        self._stats = CombatUnitStats(
-            hp=self._stats.hp,
-            attack=value,
-            defense=self._stats.defense,
-            attack_speed=self._stats.attack_speed,
-            max_mana=self._stats.max_mana,
-            mana_regen=self._stats.mana_regen,
-            star_level=self._stats.star_level,
-            position=self._stats.position,
-            mana_on_attack=self._stats.mana_on_attack
-        )
+        self._stats.attack = value
 
     @property
     def defense(self) -> int:
@@ -278,18 +295,7 @@ class CombatUnit:
 
     @defense.setter
     def defense(self, value: int):
-        # For effects that modify defense, we need to update the immutable stats
-        self._stats = CombatUnitStats(
-            hp=self._stats.hp,
-            attack=self._stats.attack,
-            defense=value,
-            attack_speed=self._stats.attack_speed,
-            max_mana=self._stats.max_mana,
-            mana_regen=self._stats.mana_regen,
-            star_level=self._stats.star_level,
-            position=self._stats.position,
-            mana_on_attack=self._stats.mana_on_attack
-        )
+        self._stats.defense = value
 
     @property
     def max_mana(self) -> int:
@@ -297,18 +303,7 @@ class CombatUnit:
 
     @max_mana.setter
     def max_mana(self, value: int):
-        # Update immutable stats object with new max_mana
-        self._stats = CombatUnitStats(
-            hp=self._stats.hp,
-            attack=self._stats.attack,
-            defense=self._stats.defense,
-            attack_speed=self._stats.attack_speed,
-            max_mana=int(value),
-            mana_regen=self._stats.mana_regen,
-            star_level=self._stats.star_level,
-            position=self._stats.position,
-            mana_on_attack=self._stats.mana_on_attack,
-        )
+        self._stats.max_mana = int(value)
 
     @property
     def mana_regen(self) -> int:
@@ -323,7 +318,7 @@ class CombatUnit:
 
 
     @property
-    def stats(self) -> 'CombatUnitStats':
+    def stats(self) -> CombatStatBlock:
         return self._stats
 
     @stats.setter
@@ -358,17 +353,21 @@ class CombatUnit:
         except Exception:
             mana_on_attack = self._stats.mana_on_attack
 
-        self._stats = CombatUnitStats(
-            hp=int(hp),
-            attack=int(attack),
-            defense=int(defense),
-            attack_speed=float(attack_speed),
-            max_mana=int(max_mana),
-            mana_regen=int(mana_regen),
-            star_level=self._stats.star_level,
-            position=self._stats.position,
-            mana_on_attack=int(mana_on_attack),
-        )
+        block = self._stats
+        block.hp = int(hp)
+        block.attack = int(attack)
+        block.defense = int(defense)
+        block.attack_speed = float(attack_speed)
+        block.max_mana = int(max_mana)
+        block.mana_regen = int(mana_regen)
+        block.mana_on_attack = int(mana_on_attack)
+        if self.timing_listener is not None:
+            self.timing_listener('attack')
+
+    @property
+    def frozen_stats(self) -> CombatUnitStats:
+        """Immutable view of the current stats, for snapshots."""
+        return self._stats.freeze()
 
     def is_alive(self) -> bool:
         return self._state.current_hp > 0
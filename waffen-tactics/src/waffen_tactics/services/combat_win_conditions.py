@@ -3,15 +3,17 @@ Combat win conditions processor - handles win condition checking and combat fini
 """
 from typing import List, Dict, Any, Optional
 
+from .target_index import count_alive
+
 
 class CombatWinConditionsProcessor:
     """Handles win condition checking and combat result formatting"""
 
     def _check_win_conditions(self, a_hp: List[int], b_hp: List[int]) -> Optional[str]:
         """Check if either team has won. Returns winner or None."""
-        if all(h <= 0 for h in b_hp):
+        if count_alive(b_hp) == 0:
             return "team_a"
-        if all(h <= 0 for h in a_hp):
+        if count_alive(a_hp) == 0:
             return "team_b"
         return None
 
@@ -26,8 +28,8 @@ class CombatWinConditionsProcessor:
     ) -> Dict[str, Any]:
         """Format and return combat result."""
         # Count survivors
-        survivors_a = sum(1 for hp in a_hp if hp > 0)
-        survivors_b = sum(1 for hp in b_hp if hp > 0)
+        survivors_a = count_alive(a_hp)
+        survivors_b = count_alive(b_hp)
         
         return {
             "winner": winner,
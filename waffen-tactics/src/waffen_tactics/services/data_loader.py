@@ -1,10 +1,13 @@
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from waffen_tactics.models.unit import Unit, Stats, Skill
 from waffen_tactics.models.skill import Skill as NewSkill, Effect, TargetType, EffectType
 from waffen_tactics.services.skill_parser import skill_parser
+from waffen_tactics.services.skill_plan import compile_skill
 
 DATA_FILE = Path(__file__).resolve().parents[3] / "units.json"
 TRAITS_FILE = Path(__file__).resolve().parents[3] / "traits.json"
@@ -20,11 +23,36 @@ _default_new_skill = NewSkill(
 DEFAULT_SKILL = Skill(name="Basic Skill", description="Deals bonus damage to a random target.", effect={'skill': _default_new_skill})
 
 class GameData:
+    """Loaded game content. Collections are tuples: one instance is shared
+    process-wide (see ``get_game_data``), so nobody may reshape it.
+
+    Lookups go through frozen indexes built once here instead of scanning
+    ``units``/``traits``: ``units_by_id``, ``traits_by_name``,
+    ``units_by_trait`` (faction or class name -> units) and
+    ``units_by_cost`` (also used by ``ShopService.from_game_data``). On
+    duplicate keys the first entry wins, as with the ``next(...)`` scans
+    they replace.
+    """
     def __init__(self, units: List[Unit], traits: List[Dict[str, Any]], factions: List[str], classes: List[str]):
-        self.units = units
-        self.traits = traits
-        self.factions = factions
-        self.classes = classes
+        self.units = tuple(units)
+        self.traits = tuple(traits)
+        self.factions = tuple(factions)
+        self.classes = tuple(classes)
+        units_by_id: Dict[str, Unit] = {}
+        units_by_trait: Dict[str, List[Unit]] = {}
+        units_by_cost: Dict[int, List[Unit]] = {}
+        for u in self.units:
+            units_by_id.setdefault(u.id, u)
+            for name in dict.fromkeys(list(u.factions) + list(u.classes)):
+                units_by_trait.setdefault(name, []).append(u)
+            units_by_cost.setdefault(u.cost, []).append(u)
+        traits_by_name: Dict[str, Dict[str, Any]] = {}
+        for t in self.traits:
+            traits_by_name.setdefault(t.get('name'), t)
+        self.units_by_id: Mapping[str, Unit] = MappingProxyType(units_by_id)
+        self.traits_by_name: Mapping[str, Dict[str, Any]] = MappingProxyType(traits_by_name)
+        self.units_by_trait: Mapping[str, Tuple[Unit, ...]] = MappingProxyType({k: tuple(v) for k, v in units_by_trait.items()})
+        self.units_by_cost: Mapping[int, Tuple[Unit, ...]] = MappingProxyType({k: tuple(v) for k, v in units_by_cost.items()})
 
 
 def build_stats_for_cost(cost: int) -> Stats:
@@ -105,6 +133,8 @@ def load_game_data() -> GameData:
             skill = build_skill_for_cost(cost)
             logging.warning(f"Using default skill for unit {u.get('id')} (cost {cost})")
         # No mana_cost on skill definitions anymore — mana is always unit max_mana
+        # Compile the cast plan once; every CombatUnit of this template shares it
+        compile_skill(skill.effect['skill'])
 
         units.append(Unit.from_json(u, stats, skill, role_color))
     
@@ -112,3 +142,21 @@ def load_game_data() -> GameData:
     factions = data.get("factions", [])
     classes = data.get("classes", [])
     return GameData(units=units, traits=traits, factions=factions, classes=classes)
+
+
+_shared_game_data: Optional[GameData] = None
+_shared_game_data_lock = threading.Lock()
+
+
+def get_game_data() -> GameData:
+    """Return the process-wide GameData, loading it on first use.
+
+    Every caller shares the same instance; treat it as read-only. Use
+    ``load_game_data()`` for a private, freshly parsed copy.
+    """
+    global _shared_game_data
+    if _shared_game_data is None:
+        with _shared_game_data_lock:
+            if _shared_game_data is None:
+                _shared_game_data = load_game_data()
+    return _shared_game_data
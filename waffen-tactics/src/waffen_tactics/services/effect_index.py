@@ -0,0 +1,238 @@
+"""
+Effect index - a unit's effect list bucketed by effect type and trigger
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Bucket for effects carrying an ``expires_at`` timestamp
+EXPIRING = '__expiring__'
+
+
+class EffectIndex(list):
+    """A ``list`` of effects that keeps per-type and per-trigger buckets.
+
+    Every list mutation updates the buckets, so processors can ask for the
+    effects they care about (``by_type('damage_over_time')``) instead of
+    scanning every effect each tick. Buckets preserve list order. Effects
+    are bucketed by the ``type``/``trigger``/``expires_at`` they carry when
+    added; string effects (e.g. ``'target_backline'``) are bucketed as
+    their own type.
+
+    ``listener`` (see ``listen``) is called with every effect as it is
+    added, which lets the simulator track timed effects without scanning.
+    ``trigger_listener`` is called (without arguments) whenever an effect
+    carrying a ``trigger`` is added or removed, so trigger subscription
+    indexes know when to refresh.
+    """
+
+    def __init__(self, effects: Iterable[Any] = ()):
+        super().__init__(effects)
+        self.listener: Optional[Callable[[Any], None]] = None
+        self.trigger_listener: Optional[Callable[[], None]] = None
+        self._reindex()
+
+    def listen(self, listener: Optional[Callable[[Any], None]]):
+        """Install ``listener`` and replay the current effects to it."""
+        self.listener = listener
+        if listener is not None:
+            for effect in self:
+                listener(effect)
+
+    # --- queries -----------------------------------------------------
+
+    def by_type(self, effect_type: str) -> List[Any]:
+        """Effects of ``effect_type``, in list order."""
+        bucket = self._types.get(effect_type)
+        return list(bucket.values()) if bucket else []
+
+    def by_trigger(self, trigger: str) -> List[Any]:
+        """Effects with ``trigger``, in list order."""
+        bucket = self._triggers.get(trigger)
+        return list(bucket.values()) if bucket else []
+
+    def by_types(self, *effect_types: str) -> List[Any]:
+        """Effects of any of ``effect_types``, in list order."""
+        entries = []
+        for effect_type in effect_types:
+            bucket = self._types.get(effect_type)
+            if bucket:
+                entries.extend(bucket.items())
+        if len(effect_types) > 1:
+            entries.sort(key=lambda entry: entry[0])
+        return [effect for _, effect in entries]
+
+    def expiring(self) -> List[Any]:
+        """Effects that carry an ``expires_at`` timestamp, in list order."""
+        return self.by_type(EXPIRING)
+
+    def has_type(self, effect_type: str) -> bool:
+        return bool(self._types.get(effect_type))
+
+    # --- bookkeeping -------------------------------------------------
+
+    @staticmethod
+    def _keys(effect: Any):
+        if isinstance(effect, dict):
+            return effect.get('type'), effect.get('trigger'), effect.get('expires_at') is not None
+        return (effect if isinstance(effect, str) else None), None, False
+
+    def _add(self, seq: int, effect: Any):
+        effect_type, trigger, expiring = self._keys(effect)
+        self._types.setdefault(effect_type, {})[seq] = effect
+        if trigger is not None:
+            self._triggers.setdefault(trigger, {})[seq] = effect
+            if self.trigger_listener is not None:
+                self.trigger_listener()
+        if expiring:
+            self._types.setdefault(EXPIRING, {})[seq] = effect
+        if self.listener is not None:
+            self.listener(effect)
+
+    def _discard(self, seq: int, effect: Any):
+        effect_type, trigger, expiring = self._keys(effect)
+        for buckets, key in ((self._types, effect_type), (self._triggers, trigger), (self._types, EXPIRING if expiring else None)):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.pop(seq, None)
+        if trigger is not None and self.trigger_listener is not None:
+            self.trigger_listener()
+
+    def _reindex(self):
+        # _seqs runs parallel to the list; sequence numbers only grow, so
+        # bucket dicts (insertion ordered) stay in list order on append.
+        self._types: Dict[Any, Dict[int, Any]] = {}
+        self._triggers: Dict[Any, Dict[int, Any]] = {}
+        self._seqs = list(range(len(self)))
+        self._next_seq = len(self)
+        for seq, effect in zip(self._seqs, self):
+            self._add(seq, effect)
+        # Bulk mutations may drop trigger effects without a _discard
+        if self.trigger_listener is not None:
+            self.trigger_listener()
+
+    def _push(self, effect: Any):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs.append(seq)
+        self._add(seq, effect)
+
+    # --- list mutators -----------------------------------------------
+
+    def append(self, effect: Any):
+        super().append(effect)
+        self._push(effect)
+
+    def extend(self, effects: Iterable[Any]):
+        for effect in effects:
+            self.append(effect)
+
+    def __iadd__(self, effects: Iterable[Any]):
+        self.extend(effects)
+        return self
+
+    def pop(self, index: int = -1):
+        effect = super().pop(index)
+        self._discard(self._seqs.pop(index), effect)
+        return effect
+
+    def remove(self, effect: Any):
+        self.pop(self.index(effect))
+
+    def clear(self):
+        super().clear()
+        self._reindex()
+
+    def insert(self, index: int, effect: Any):
+        super().insert(index, effect)
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def __imul__(self, count: int):
+        super().__imul__(count)
+        self._reindex()
+        return self
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self):
+        super().reverse()
+        self._reindex()
+
+    def discard(self, effect: Any) -> bool:
+        """Remove ``effect`` by identity; returns False when it is absent."""
+        for position, candidate in enumerate(self):
+            if candidate is effect:
+                self.pop(position)
+                return True
+        return False
+
+    def copy(self) -> 'EffectIndex':
+        # Copies start without listeners
+        return self.__class__(self)
+
+    def __reduce__(self):
+        # Rebuild buckets on copy/pickle instead of restoring them
+        return (self.__class__, (list(self),))
+
+
+def effects_of_type(unit: Any, effect_type: str) -> List[Any]:
+    """Effects of ``effect_type`` on ``unit``; scans plain lists on test doubles."""
+    effects = getattr(unit, 'effects', None)
+    if isinstance(effects, EffectIndex):
+        return effects.by_type(effect_type)
+    return [e for e in effects or [] if (e.get('type') if isinstance(e, dict) else e) == effect_type]
+
+
+def effects_of_types(unit: Any, *effect_types: str) -> List[Any]:
+    """Effects of any of ``effect_types`` on ``unit``, in list order."""
+    effects = getattr(unit, 'effects', None)
+    if isinstance(effects, EffectIndex):
+        return effects.by_types(*effect_types)
+    return [e for e in effects or [] if (e.get('type') if isinstance(e, dict) else e) in effect_types]
+
+
+def effects_with_trigger(unit: Any, trigger: str) -> List[Any]:
+    """Effects with ``trigger`` on ``unit``; scans plain lists on test doubles."""
+    effects = getattr(unit, 'effects', None)
+    if isinstance(effects, EffectIndex):
+        return effects.by_trigger(trigger)
+    return [e for e in effects or [] if isinstance(e, dict) and e.get('trigger') == trigger]
+
+
+def expiring_effects(unit: Any) -> List[Any]:
+    """Effects on ``unit`` that carry an ``expires_at`` timestamp."""
+    effects = getattr(unit, 'effects', None)
+    if isinstance(effects, EffectIndex):
+        return effects.expiring()
+    return [e for e in effects or [] if isinstance(e, dict) and e.get('expires_at') is not None]
+
+
+def add_effect(unit: Any, effect: Any):
+    """Append ``effect`` to ``unit.effects`` in place (buckets and listeners
+    see just the new effect); creates the list on units without one."""
+    effects = getattr(unit, 'effects', None)
+    if effects is None:
+        unit.effects = [effect]
+    else:
+        effects.append(effect)
+
+
+def discard_effect(unit: Any, effect: Any) -> bool:
+    """Remove ``effect`` (by identity) from ``unit.effects``."""
+    effects = getattr(unit, 'effects', None)
+    if isinstance(effects, EffectIndex):
+        return effects.discard(effect)
+    for position, candidate in enumerate(effects or []):
+        if candidate is effect:
+            effects.pop(position)
+            return True
+    return False
@@ -1,6 +1,7 @@
 """
 Effect Handlers - Registry and base classes for skill effects
 """
+import inspect
 from typing import Dict, Any, List, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from waffen_tactics.models.skill import Effect, EffectType, SkillExecutionContext
@@ -10,7 +11,14 @@ if TYPE_CHECKING:
 
 
 class EffectHandler(ABC):
-    """Base class for effect handlers"""
+    """Base class for effect handlers
+
+    Handlers are synchronous: ``execute`` runs to completion and returns
+    its events. Effects that take time (delay) advance
+    ``context.combat_time`` instead of suspending, and composite effects
+    (repeat, conditional) run their nested effects inline through
+    ``execute_nested``.
+    """
 
     @abstractmethod
     def execute(self, effect: Effect, context: SkillExecutionContext, target: 'CombatUnit') -> List[Dict[str, Any]]:
@@ -34,11 +42,29 @@ class EffectHandler(ABC):
 
 # Registry of effect handlers
 _effect_handlers: Dict[EffectType, EffectHandler] = {}
+# Bumped on every registration so compiled skill plans can detect stale handlers
+_registry_version = 0
 
 
 def register_effect_handler(effect_type: EffectType, handler: EffectHandler):
-    """Register an effect handler"""
+    """Register an effect handler
+
+    Raises:
+        TypeError: if the handler is not an ``EffectHandler`` or its
+            ``execute`` is a coroutine function
+    """
+    global _registry_version
+    if not isinstance(handler, EffectHandler):
+        raise TypeError(f"Effect handler for {effect_type} must be an EffectHandler, got {type(handler).__name__}")
+    if inspect.iscoroutinefunction(handler.execute) or inspect.isasyncgenfunction(handler.execute):
+        raise TypeError(f"Effect handler {type(handler).__name__}.execute must be synchronous")
     _effect_handlers[effect_type] = handler
+    _registry_version += 1
+
+
+def registry_version() -> int:
+    """Number of handler registrations so far"""
+    return _registry_version
 
 
 def get_effect_handler(effect_type: EffectType) -> EffectHandler:
@@ -46,6 +72,20 @@ def get_effect_handler(effect_type: EffectType) -> EffectHandler:
     return _effect_handlers.get(effect_type)
 
 
+def execute_nested(effect: Effect, context: SkillExecutionContext, target: 'CombatUnit') -> List[Dict[str, Any]]:
+    """Run a nested effect inline and return its events
+
+    Unknown effect types produce a ``skill_error`` event rather than raising.
+    """
+    handler = _effect_handlers.get(effect.type)
+    if handler is None:
+        return [('skill_error', {
+            'caster_id': context.caster.id,
+            'error': f'Unknown effect type: {effect.type}'
+        })]
+    return handler.execute(effect, context, target) or []
+
+
 def get_registered_effect_types() -> List[EffectType]:
     """Get list of registered effect types"""
     return list(_effect_handlers.keys())
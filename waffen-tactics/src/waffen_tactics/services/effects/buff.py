@@ -5,7 +5,6 @@ from typing import Dict, Any, List
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType
 from waffen_tactics.services.effects import EffectHandler, register_effect_handler
 from waffen_tactics.services.event_canonicalizer import emit_stat_buff
-import random
 
 
 class BuffHandler(EffectHandler):
@@ -25,8 +24,7 @@ class BuffHandler(EffectHandler):
         # and reconstruction are deterministic and consistent.
         if stat == 'random':
             choices = ['defense', 'attack', 'attack_speed']
-            rng = random.Random(context.random_seed) if getattr(context, 'random_seed', None) is not None else random
-            stat = rng.choice(choices)
+            stat = context.get_rng().choice(choices)
 
         # Create buff effect
         buff_effect = {
@@ -2,15 +2,14 @@
 Conditional Effect Handler - Handles conditional effects in skills
 """
 from typing import Dict, Any, List
-import asyncio
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType
-from waffen_tactics.services.effects import EffectHandler, register_effect_handler, get_effect_handler
+from waffen_tactics.services.effects import EffectHandler, register_effect_handler, execute_nested
 
 
 class ConditionalHandler(EffectHandler):
     """Handles conditional effects"""
 
-    async def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
+    def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
         """Execute conditional effect"""
         condition = effect.params.get('condition', {})
         effects = effect.params.get('effects', [])
@@ -43,28 +42,13 @@ class ConditionalHandler(EffectHandler):
                     params=nested_params
                 )
 
-                # Get handler for nested effect
-                handler = get_effect_handler(nested_effect.type)
-                if handler:
-                    # Execute nested effect (handler may be sync or async)
-                    try:
-                        nested_result = handler.execute(nested_effect, context, target)
-                        if asyncio.iscoroutine(nested_result):
-                            nested_events = await nested_result
-                        else:
-                            nested_events = nested_result
-                        if nested_events:
-                            events.extend(nested_events)
-                    except Exception as e:
-                        events.append(('skill_error', {
-                            'caster_id': context.caster.id,
-                            'error': f'Error executing nested effect: {str(e)}'
-                        }))
-                else:
-                    # Log error for unknown effect type
+                # Run the nested effect inline on the same target
+                try:
+                    events.extend(execute_nested(nested_effect, context, target))
+                except Exception as e:
                     events.append(('skill_error', {
                         'caster_id': context.caster.id,
-                        'error': f'Unknown effect type: {nested_effect.type}'
+                        'error': f'Error executing nested effect: {str(e)}'
                     }))
 
             except Exception as e:
@@ -118,8 +102,7 @@ class ConditionalHandler(EffectHandler):
         elif condition_type == 'random':
             # Random chance
             chance = condition.get('chance', 50)
-            import random
-            return random.randint(1, 100) <= chance
+            return context.get_rng().randint(1, 100) <= chance
 
         # Default to false for unknown conditions
         return False
@@ -2,6 +2,7 @@
 Damage Effect Handler - Handles damage effects in skills
 """
 from typing import Dict, Any, List
+from waffen_tactics import trace
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType
 from waffen_tactics.services.effects import EffectHandler, register_effect_handler
 from waffen_tactics.services.event_canonicalizer import emit_damage
@@ -33,10 +34,7 @@ class DamageHandler(EffectHandler):
             emit_event=False,  # Don't auto-emit, we'll emit as unit_attack
         )
 
-        try:
-            print(f"[DAMAGE DEBUG] damage payload timestamp={payload.get('timestamp', None)} attacker={getattr(context.caster,'id',None)} target={getattr(target,'id',None)} amount={amount}")
-        except Exception:
-            raise
+        trace.debug('damage', "damage payload timestamp=%s attacker=%s target=%s amount=%s", payload.get('timestamp'), getattr(context.caster, 'id', None), getattr(target, 'id', None), amount)
 
         # Add is_skill marker to payload
         payload['is_skill'] = True
@@ -2,15 +2,16 @@
 Damage Over Time Effect Handler - Handles damage over time effects in skills
 """
 from typing import Dict, Any, List
-import uuid
+from waffen_tactics.core.ids import next_effect_id
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType
 from waffen_tactics.services.effects import EffectHandler, register_effect_handler
+from waffen_tactics.services.effect_index import add_effect
 
 
 class DamageOverTimeHandler(EffectHandler):
     """Handles damage over time effects"""
 
-    async def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
+    def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
         """Execute damage over time effect"""
         damage = effect.params.get('damage', 0)
         duration = effect.params.get('duration', 0)
@@ -28,7 +29,7 @@ class DamageOverTimeHandler(EffectHandler):
         # Create damage over time effect
         # Create a canonical DoT effect object with id and expires_at so
         # snapshots and reconstructor can reason about expiry deterministically.
-        dot_id = str(uuid.uuid4())
+        dot_id = next_effect_id()
         next_tick = context.combat_time + interval
         expires_at = context.combat_time + duration
         dot_effect = {
@@ -45,9 +46,7 @@ class DamageOverTimeHandler(EffectHandler):
         }
 
         # Add to target's effects
-        if not hasattr(target, 'effects'):
-            target.effects = []
-        target.effects.append(dot_effect)
+        add_effect(target, dot_effect)
 
         # Generate initial event
         # Emit an applied event that includes the canonical effect id and expiry
@@ -5,13 +5,12 @@ from typing import Dict, Any, List
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType
 from waffen_tactics.services.effects import EffectHandler, register_effect_handler
 from waffen_tactics.services.event_canonicalizer import emit_stat_buff
-import random
 
 
 class DebuffHandler(EffectHandler):
     """Handles debuff effects"""
 
-    async def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
+    def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
         """Execute debuff effect"""
         stat = effect.params.get('stat')
         value = effect.params.get('value', 0)
@@ -25,9 +24,7 @@ class DebuffHandler(EffectHandler):
         # and reconstruction are deterministic and consistent.
         if stat == 'random':
             choices = ['defense', 'attack', 'attack_speed']
-            if getattr(context, 'random_seed', None) is not None:
-                random.seed(context.random_seed)
-            stat = random.choice(choices)
+            stat = context.get_rng().choice(choices)
 
         # Debuff values should be negative (server resolves sign)
         try:
@@ -1,8 +1,8 @@
 """
 Delay Effect Handler - Handles timing delays in skills
 """
-import asyncio
 from typing import Dict, Any, List
+from waffen_tactics import trace
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType
 from waffen_tactics.services.effects import EffectHandler, register_effect_handler
 
@@ -16,10 +16,7 @@ class DelayHandler(EffectHandler):
 
         if duration > 0:
             # Advance combat time
-            try:
-                print(f"[DELAY DEBUG] before={getattr(context,'combat_time',None)} dur={duration} target={getattr(target,'id',None)}")
-            except Exception:
-                pass
+            trace.debug('delay', "before=%s dur=%s target=%s", getattr(context, 'combat_time', None), duration, getattr(target, 'id', None))
             context.combat_time += duration
             # Prevent caster from auto-attacking during the delay window by
             # moving its last_attack_time forward to the delayed time. This
@@ -31,10 +28,7 @@ class DelayHandler(EffectHandler):
                     setattr(caster, 'last_attack_time', context.combat_time)
             except Exception:
                 pass
-            try:
-                print(f"[DELAY DEBUG] after={getattr(context,'combat_time',None)}")
-            except Exception:
-                pass
+            trace.debug('delay', "after=%s", getattr(context, 'combat_time', None))
 
         return []  # Delay doesn't generate events
 
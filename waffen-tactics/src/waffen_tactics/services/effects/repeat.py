@@ -1,17 +1,15 @@
 """
 Repeat Effect Handler - Handles repeating effects in skills
 """
-import asyncio
-import random
 from typing import Dict, Any, List
 from waffen_tactics.models.skill import Effect, SkillExecutionContext, EffectType, TargetType
-from waffen_tactics.services.effects import EffectHandler, register_effect_handler, get_effect_handler
+from waffen_tactics.services.effects import EffectHandler, register_effect_handler, execute_nested
 
 
 class RepeatHandler(EffectHandler):
     """Handles repeat effects"""
 
-    async def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
+    def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
         """Execute repeat effect"""
         count = effect.params.get('count', 1)
         effects = effect.params.get('effects', [])
@@ -19,41 +17,30 @@ class RepeatHandler(EffectHandler):
         if count <= 0 or not effects:
             return []
 
+        # Parse nested effects once; a malformed entry fails every repetition
+        parsed = []
+        for nested_effect_data in effects:
+            try:
+                parsed.append(Effect(
+                    type=nested_effect_data.get('type'),
+                    target=nested_effect_data.get('target', 'self'),
+                    params=nested_effect_data  # Put all data in params, like Skill.from_dict does
+                ))
+            except Exception as e:
+                parsed.append(e)
+
         events = []
 
         # Execute the nested effects 'count' times
         for i in range(count):
-            for nested_effect_data in effects:
+            for nested_effect in parsed:
                 try:
-                    # Parse nested effect
-                    nested_effect = Effect(
-                        type=nested_effect_data.get('type'),
-                        target=nested_effect_data.get('target', 'self'),
-                        params=nested_effect_data  # Put all data in params, like Skill.from_dict does
-                    )
+                    if isinstance(nested_effect, Exception):
+                        raise nested_effect
 
                     # Resolve targets for the nested effect (don't use the repeat's target)
-                    nested_targets = self._get_targets_for_nested_effect(nested_effect.target, context)
-
-                    # Execute on each target
-                    for nested_target in nested_targets:
-                        # Get handler for nested effect
-                        handler = get_effect_handler(nested_effect.type)
-                        if handler:
-                            # Execute nested effect (handle both sync and async)
-                            result = handler.execute(nested_effect, context, nested_target)
-                            if asyncio.iscoroutine(result):
-                                nested_events = await result
-                            else:
-                                nested_events = result
-                            if nested_events:
-                                events.extend(nested_events)
-                        else:
-                            # Log error for unknown effect type
-                            events.append(('skill_error', {
-                                'caster_id': context.caster.id,
-                                'error': f'Unknown effect type: {nested_effect.type}'
-                            }))
+                    for nested_target in self._get_targets_for_nested_effect(nested_effect.target, context):
+                        events.extend(execute_nested(nested_effect, context, nested_target))
 
                 except Exception as e:
                     # Log error for malformed nested effect
@@ -85,8 +72,7 @@ class RepeatHandler(EffectHandler):
             if not alive_enemies:
                 return []
             
-            rng = random.Random(context.random_seed) if getattr(context, 'random_seed', None) is not None else random
-            return [rng.choice(alive_enemies)]
+            return [context.get_rng().choice(alive_enemies)]
 
         elif target_enum == TargetType.SINGLE_ENEMY_PERSISTENT:
             # Same enemy for all effects in this skill execution
@@ -103,8 +89,7 @@ class RepeatHandler(EffectHandler):
             if not alive_enemies:
                 return []
             
-            rng = random.Random(context.random_seed) if getattr(context, 'random_seed', None) is not None else random
-            context.persistent_target = rng.choice(alive_enemies)
+            context.persistent_target = context.get_rng().choice(alive_enemies)
             return [context.persistent_target]
 
         elif target_enum == TargetType.ENEMY_TEAM:
@@ -10,7 +10,7 @@ from waffen_tactics.services.event_canonicalizer import emit_unit_stunned
 class StunHandler(EffectHandler):
     """Handles stun effects"""
 
-    async def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
+    def execute(self, effect: Effect, context: SkillExecutionContext, target) -> List[Dict[str, Any]]:
         """Execute stun effect using canonical emit_unit_stunned"""
         duration = effect.params.get('duration', 0)
 
@@ -1,7 +1,11 @@
 import time as _time
-import uuid
 from typing import Optional, Dict, Any, Callable, List
 
+from .combat_unit import _HP_WRITER
+from .effect_index import add_effect
+from .. import trace
+from ..core.ids import next_effect_id
+
 
 def _now_ts():
     return _time.time()
@@ -21,10 +25,7 @@ def emit_stat_buff(
     cause: Optional[str] = None,
 ):
     ts = timestamp if timestamp is not None else _now_ts()
-    try:
-        print(f"[EMIT_STAT_BUFF] recipient={getattr(recipient,'id',None)} stat={stat} value={value} event_callback_set={event_callback is not None}")
-    except Exception:
-        pass
+    trace.debug('stat_buff', "recipient=%s stat=%s value=%s event_callback_set=%s", getattr(recipient, 'id', None), stat, value, event_callback is not None)
 
     # Ensure recipient.effects exists
     if not hasattr(recipient, 'effects') or recipient.effects is None:
@@ -40,11 +41,13 @@ def emit_stat_buff(
 
     # CRITICAL: Generate effect_id for ALL stat buffs (even instant ones)
     # This ensures frontend can always track effects with proper IDs
-    effect_id = str(uuid.uuid4())
+    effect_id = next_effect_id()
 
     # Apply immediate numeric mutation when appropriate
     # CRITICAL: Always calculate delta for ALL stats (needed for reconstructor)
     delta = None
+    # Whether `delta` was actually added to a recipient attribute
+    applied = False
     try:
         if stat in ('attack', 'defense'):
             if value_type == 'percentage':
@@ -56,6 +59,7 @@ def emit_stat_buff(
             else:
                 # For temporary buffs with no handler system, we still apply immediate numeric change
                 setattr(recipient, stat, getattr(recipient, stat, 0) + delta)
+            applied = True
         elif stat == 'hp':
             # delegate hp changes to emit_heal for canonical emission
             if value_type == 'percentage':
@@ -68,7 +72,7 @@ def emit_stat_buff(
                 # No silent fallback: require recipient to support canonical setter
                 _val = min(getattr(recipient, 'max_hp', getattr(recipient, 'hp', 0)), getattr(recipient, 'hp', 0) + delta)
                 if hasattr(recipient, '_set_hp'):
-                    recipient._set_hp(_val, caller_module='event_canonicalizer')
+                    recipient._set_hp(_val, caller_module=_HP_WRITER)
                 else:
                     raise RuntimeError('emit_stat_buff: recipient does not support canonical HP mutation')
         elif stat in ('attack_speed', 'lifesteal', 'damage_reduction', 'hp_regen_per_sec'):
@@ -79,6 +83,7 @@ def emit_stat_buff(
             else:
                 delta = int(round(float(value)))
             setattr(recipient, stat, cur + delta)
+            applied = True
         elif stat in ('max_hp', 'max_mana', 'current_mana'):
             # int fields
             if value_type == 'percentage':
@@ -86,6 +91,7 @@ def emit_stat_buff(
             else:
                 delta = int(round(value))
             setattr(recipient, stat, getattr(recipient, stat, 0) + delta)
+            applied = True
         else:
             # Unknown/custom stats - still calculate delta for event
             if value_type == 'percentage':
@@ -115,8 +121,12 @@ def emit_stat_buff(
             'permanent': permanent,
             'source': getattr(source, 'id', None) if source is not None else None,
             'expires_at': (ts + duration) if (duration and duration > 0) else None,
+            # What expiry subtracts to revert the numeric mutation above;
+            # hp buffs (healed through emit_heal) and stats the recipient
+            # could not take are not reverted
+            'applied_delta': delta if applied else None,
         }
-        recipient.effects = list(getattr(recipient, 'effects', [])) + [effect]
+        add_effect(recipient, effect)
 
     payload = {
         'unit_id': getattr(recipient, 'id', None),
@@ -140,13 +150,12 @@ def emit_stat_buff(
 
     if event_callback:
         try:
-            print(f"[EMIT_STAT_BUFF] calling callback for recipient={getattr(recipient,'id',None)}")
+            trace.debug('stat_buff', "calling callback for recipient=%s", getattr(recipient, 'id', None))
             event_callback('stat_buff', payload)
-            print(f"[EMIT_STAT_BUFF] callback returned for recipient={getattr(recipient,'id',None)}")
+            trace.debug('stat_buff', "callback returned for recipient=%s", getattr(recipient, 'id', None))
         except Exception:
             # Don't let event emission break simulation
-            print(f"[EMIT_STAT_BUFF] callback raised for recipient={getattr(recipient,'id',None)}")
-            pass
+            trace.info('stat_buff', "callback raised for recipient=%s", getattr(recipient, 'id', None))
 
     return payload
 
@@ -179,7 +188,7 @@ def emit_heal(
         new = min(max_hp, cur + add)
         # apply mutation to recipient via canonical setter only
         if hasattr(recipient, '_set_hp'):
-            recipient._set_hp(new, caller_module='event_canonicalizer')
+            recipient._set_hp(new, caller_module=_HP_WRITER)
         else:
             raise RuntimeError('emit_heal: recipient does not support canonical HP mutation')
     except Exception:
@@ -408,7 +417,7 @@ def emit_unit_died(
             # enforce HP changes only via canonical helpers
             try:
                 if hasattr(recipient, '_set_hp'):
-                    recipient._set_hp(0, caller_module='event_canonicalizer')
+                    recipient._set_hp(0, caller_module=_HP_WRITER)
                 else:
                     raise RuntimeError('emit_unit_died: recipient does not support canonical HP mutation')
             except Exception:
@@ -472,7 +481,7 @@ def emit_unit_heal(
         # apply mutation to target (canonical setter when available)
         # apply mutation to target via canonical setter only
         if hasattr(target, '_set_hp'):
-            target._set_hp(new, caller_module='event_canonicalizer')
+            target._set_hp(new, caller_module=_HP_WRITER)
         else:
             raise RuntimeError('emit_unit_heal: target does not support canonical HP mutation')
         # Debug logging for mrozu
@@ -544,7 +553,7 @@ def emit_hp_regen(
         # apply mutation to recipient.hp
         # apply mutation to recipient via canonical setter only
         if hasattr(recipient, '_set_hp'):
-            recipient._set_hp(new, caller_module='event_canonicalizer')
+            recipient._set_hp(new, caller_module=_HP_WRITER)
         else:
             raise RuntimeError('emit_hp_regen: recipient does not support canonical HP mutation')
     except Exception:
@@ -673,12 +682,8 @@ def emit_unit_stunned(
         expires_at = ts + float(duration) if duration and duration > 0 else None
         setattr(target, '_stunned', True)
         setattr(target, 'stunned_expires_at', expires_at)
-        # attach effect object for client recompute
-        if not hasattr(target, 'effects') or target.effects is None:
-            target.effects = []
         # Generate unique effect ID for tracking
-        import uuid
-        effect_id = str(uuid.uuid4())
+        effect_id = next_effect_id()
 
         eff = {
             'id': effect_id,
@@ -687,7 +692,8 @@ def emit_unit_stunned(
             'source': getattr(source, 'id', None) if source is not None else None,
             'expires_at': expires_at,
         }
-        target.effects = list(getattr(target, 'effects', [])) + [eff]
+        # attach effect object for client recompute
+        add_effect(target, eff)
     except Exception:
         pass
 
@@ -727,14 +733,11 @@ def emit_shield_applied(
     ts = timestamp if timestamp is not None else _now_ts()
 
     # CRITICAL: Generate effect_id for ALL shield effects (same as stat_buff fix)
-    effect_id = str(uuid.uuid4())
+    effect_id = next_effect_id()
 
     try:
         cur = int(getattr(recipient, 'shield', 0) or 0)
         recipient.shield = cur + int(amount)
-        # attach effect
-        if not hasattr(recipient, 'effects') or recipient.effects is None:
-            recipient.effects = []
         expires_at = ts + float(duration) if duration and duration > 0 else None
         eff = {
             'id': effect_id,  # CRITICAL: Include effect_id in effect object
@@ -744,7 +747,8 @@ def emit_shield_applied(
             'source': getattr(source, 'id', None) if source is not None else None,
             'expires_at': expires_at,
         }
-        recipient.effects = list(getattr(recipient, 'effects', [])) + [eff]
+        # attach effect
+        add_effect(recipient, eff)
     except Exception:
         expires_at = ts + float(duration) if duration and duration > 0 else None
 
@@ -823,7 +827,7 @@ def emit_damage(
 
     # Mutate HP only here via canonical setter; let exceptions propagate
     if hasattr(target, '_set_hp'):
-        target._set_hp(post_hp, caller_module='event_canonicalizer')
+        target._set_hp(post_hp, caller_module=_HP_WRITER)
     else:
         raise RuntimeError('emit_damage: target does not support canonical HP mutation')
 
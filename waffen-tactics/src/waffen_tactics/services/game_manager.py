@@ -2,7 +2,7 @@
 from typing import Optional, List, Tuple, Dict
 from ..models.player_state import PlayerState, UnitInstance
 from ..models.unit import Unit
-from ..services.data_loader import load_game_data, GameData
+from ..services.data_loader import get_game_data, GameData
 from ..services.shop import ShopService
 from ..services.synergy import SynergyEngine
 from ..services.combat import CombatSimulator
@@ -11,18 +11,24 @@ from ..services.unit_manager import UnitManager
 from ..services.combat_manager import CombatManager
 import random
 import logging
+import threading
 from copy import deepcopy
 
 bot_logger = logging.getLogger('waffen_tactics')
 
 
 class GameManager:
-    """Manages game state and player actions"""
+    """Manages game state and player actions
+
+    Holds no per-player state, so one instance can serve every request
+    (see ``get_game_manager``). ``data`` defaults to the shared GameData
+    registry; ``shop_service`` and ``synergy_engine`` can be injected.
+    """
     
-    def __init__(self):
-        self.data = load_game_data()
-        self.shop_service = ShopService(self.data.units, self.data.traits)
-        self.synergy_engine = SynergyEngine(self.data.traits)
+    def __init__(self, data: Optional[GameData] = None, shop_service: Optional[ShopService] = None, synergy_engine: Optional[SynergyEngine] = None):
+        self.data = data if data is not None else get_game_data()
+        self.shop_service = shop_service if shop_service is not None else ShopService.from_game_data(self.data)
+        self.synergy_engine = synergy_engine if synergy_engine is not None else SynergyEngine(self.data.traits)
         self.unit_manager = UnitManager(self.data)
         self.combat_manager = CombatManager(self.data, self.synergy_engine)
     
@@ -83,15 +89,29 @@ class GameManager:
         # Convert UnitInstances to Units
         board_units = []
         for ui in player.board:
-            unit = next((u for u in self.data.units if u.id == ui.unit_id), None)
+            unit = self.data.units_by_id.get(ui.unit_id)
             if unit:
                 board_units.append(unit)
         
         return self.synergy_engine.compute(board_units)
     
-    def start_combat(self, player: PlayerState, opponent_board: List[Unit], opponent_info: Optional[Dict] = None) -> dict:
+    def start_combat(self, player: PlayerState, opponent_board: List[Unit], opponent_info: Optional[Dict] = None, mode: str = 'full') -> dict:
         """
         Simulate combat between player board and opponent
         Returns combat result with winner, log, etc.
         """
-        return self.combat_manager.start_combat(player, opponent_board, opponent_info)
+        return self.combat_manager.start_combat(player, opponent_board, opponent_info, mode=mode)
+
+
+_shared_game_manager: Optional[GameManager] = None
+_shared_game_manager_lock = threading.Lock()
+
+
+def get_game_manager() -> GameManager:
+    """Return the process-wide GameManager built on the shared GameData."""
+    global _shared_game_manager
+    if _shared_game_manager is None:
+        with _shared_game_manager_lock:
+            if _shared_game_manager is None:
+                _shared_game_manager = GameManager()
+    return _shared_game_manager
@@ -2,9 +2,12 @@
 Modular effect processor for trait effects system
 """
 from enum import Enum
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
 import random
 
+from .. import trace
+from .effect_index import EffectIndex
+
 # Import emit functions
 from .event_canonicalizer import (
     emit_stat_buff, emit_heal, emit_mana_update, emit_gold_reward,
@@ -68,10 +71,10 @@ class EffectConditions:
         self.round_triggered = False
         self.ever_triggered = False
 
-    def should_trigger(self, context: Dict[str, Any]) -> bool:
+    def should_trigger(self, context: Dict[str, Any], rng=None) -> bool:
         """Check if conditions are met for triggering"""
         # Chance check
-        if random.randint(1, 100) > self.chance_percent:
+        if (rng or random).randint(1, 100) > self.chance_percent:
             return False
 
         # Once ever check
@@ -464,15 +467,15 @@ class ModularEffect:
         self.conditions = conditions
         self.rewards = rewards
 
-    def should_trigger(self, context: Dict[str, Any]) -> bool:
+    def should_trigger(self, context: Dict[str, Any], rng=None) -> bool:
         """Check if this effect should trigger"""
-        return self.conditions.should_trigger(context)
+        return self.conditions.should_trigger(context, rng)
 
-    def execute(self, context: Dict[str, Any], event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    def execute(self, context: Dict[str, Any], event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None, rng=None) -> Dict[str, Any]:
         """Execute the effect and return results"""
         results = {"events": []}
 
-        if self.should_trigger(context):
+        if self.should_trigger(context, rng):
             self.conditions.mark_triggered()
 
             for reward in self.rewards:
@@ -510,31 +513,114 @@ class ModularEffect:
         return ModularEffect(trigger, conditions, rewards)
 
 
+def _scan_trigger_effects(units: Iterable[Any], trigger: str):
+    """Yield ``(unit, effect)`` for every unit effect with ``trigger``, in list order."""
+    for unit in units:
+        if hasattr(unit, 'effects') and unit.effects:
+            for effect in unit.effects:
+                if effect.get('trigger') == trigger:
+                    yield unit, effect
+
+
+class TriggerSubscriptions:
+    """Unit-level trigger effects of one ``all_units`` list, indexed by trigger.
+
+    ``subscribers(trigger)`` lists the ``(unit, effect)`` pairs in the order
+    a scan of ``units`` and their effects visits them, so chance rolls and
+    ``trigger_once`` dedup happen in the same order. The index is rebuilt
+    lazily after ``invalidate``.
+    """
+    __slots__ = ('units', '_by_trigger')
+
+    def __init__(self, units: List[Any]):
+        self.units = units
+        self._by_trigger: Optional[Dict[str, List[Tuple[Any, Dict[str, Any]]]]] = None
+
+    def invalidate(self):
+        self._by_trigger = None
+
+    def subscribers(self, trigger: str) -> List[Tuple[Any, Dict[str, Any]]]:
+        if self._by_trigger is None:
+            by_trigger: Dict[str, List[Tuple[Any, Dict[str, Any]]]] = {}
+            for unit in self.units:
+                for effect in unit.effects:
+                    if isinstance(effect, dict) and effect.get('trigger') is not None:
+                        by_trigger.setdefault(effect['trigger'], []).append((unit, effect))
+            self._by_trigger = by_trigger
+        return self._by_trigger.get(trigger, [])
+
+
 class ModularEffectProcessor:
     """Processor for managing and triggering modular effects"""
 
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         self.active_effects: Dict[str, ModularEffect] = {}
+        # Registered effects bucketed by trigger, in registration order
+        self._effects_by_trigger: Dict[TriggerType, Dict[str, ModularEffect]] = {}
+        # Unit trigger subscriptions keyed by id() of the indexed all_units list
+        self._subscriptions: Dict[int, TriggerSubscriptions] = {}
+        # Random source for chance rolls; the simulator shares its own stream
+        self.rng = rng if rng is not None else random
 
     def register_effect(self, effect_id: str, effect: ModularEffect):
         """Register an effect"""
         self.active_effects[effect_id] = effect
+        self._reindex_registered()
 
     def unregister_effect(self, effect_id: str):
         """Unregister an effect"""
         self.active_effects.pop(effect_id, None)
+        self._reindex_registered()
+
+    def _reindex_registered(self):
+        self._effects_by_trigger = {}
+        for effect_id, effect in self.active_effects.items():
+            self._effects_by_trigger.setdefault(effect.trigger, {})[effect_id] = effect
+
+    def subscribe_units(self, *unit_lists: List[Any]):
+        """Index the unit-level trigger effects of each ``all_units`` list.
+
+        Call at combat start with the exact list objects later passed as
+        ``context['all_units']``; ``process_trigger`` then visits only the
+        subscribers of a trigger. Units report effect changes through their
+        ``EffectIndex``; lists holding units with plain effect lists are
+        left unindexed and scanned as before.
+        """
+        self.unsubscribe_units()
+        for units in unit_lists:
+            if not all(isinstance(getattr(u, 'effects', None), EffectIndex) for u in units):
+                continue
+            self._subscriptions[id(units)] = TriggerSubscriptions(units)
+            for unit in units:
+                unit.effects.trigger_listener = self._invalidate_subscriptions
+
+    def unsubscribe_units(self):
+        """Drop the subscription indexes and detach their effect listeners."""
+        for subscriptions in self._subscriptions.values():
+            for unit in subscriptions.units:
+                effects = getattr(unit, 'effects', None)
+                if getattr(effects, 'trigger_listener', None) == self._invalidate_subscriptions:
+                    effects.trigger_listener = None
+        self._subscriptions = {}
+
+    def _invalidate_subscriptions(self):
+        for subscriptions in self._subscriptions.values():
+            subscriptions.invalidate()
+
+    def _trigger_subscribers(self, trigger: TriggerType, all_units: List[Any]):
+        subscriptions = self._subscriptions.get(id(all_units))
+        if subscriptions is not None and subscriptions.units is all_units:
+            return subscriptions.subscribers(trigger.value)
+        return _scan_trigger_effects(all_units, trigger.value)
 
     def process_trigger(self, trigger: TriggerType, context: Dict[str, Any], event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """Process a trigger and return results"""
         results = {"events": []}
         
         # First, process registered active effects
-        for effect_id, effect in self.active_effects.items():
-            if effect.trigger == trigger and effect.should_trigger(context):
-                try:
-                    print(f"[MOD_EFFECT] registered effect candidate id={effect_id} trigger={trigger} context_time={context.get('current_time')}")
-                except Exception:
-                    pass
+        for effect_id, effect in self._effects_by_trigger.get(trigger, {}).items():
+            if effect.should_trigger(context, self.rng):
+                trace.debug('effects', "registered effect candidate id=%s trigger=%s context_time=%s", effect_id, trigger, context.get('current_time'))
                 # Respect per-context dedup for trigger_once. Use the trigger
                 # name as the dedup key when the effect's conditions specify
                 # `trigger_once`, so that registered effects and unit-level
@@ -552,11 +638,8 @@ class ModularEffectProcessor:
                 if context.get('triggered_rewards', set()) and effect_key in context['triggered_rewards']:
                     continue
 
-                effect_result = effect.execute(context, event_callback)
-                try:
-                    print(f"[MOD_EFFECT] executed registered effect id={effect_id} produced_events={len(effect_result.get('events', []))}")
-                except Exception:
-                    pass
+                effect_result = effect.execute(context, event_callback, self.rng)
+                trace.debug('effects', "executed registered effect id=%s produced_events=%s", effect_id, len(effect_result.get('events', [])))
                 results["events"].extend(effect_result.get("events", []))
                 # If effect has trigger_once semantics, mark it in context
                 try:
@@ -567,72 +650,67 @@ class ModularEffectProcessor:
                 except Exception:
                     pass
         
-        # Also process effects directly from units in the context
+        # Also process effects directly from units in the context, visiting
+        # only the subscribers of this trigger
         all_units = context.get('all_units', [])
-        for unit in all_units:
-            if hasattr(unit, 'effects') and unit.effects:
-                for effect in unit.effects:
-                    if effect.get('trigger') == trigger.value:
-                        # Skip processing effects on the unit that just died for
-                        # on_ally_death / on_enemy_death triggers — only surviving
-                        # units should react to a death event.
-                        try:
-                            dead_ally = context.get('dead_ally') if context is not None else None
-                            target_unit = context.get('target_unit') if context is not None else None
-                            if dead_ally is not None and (unit is dead_ally or getattr(unit, 'id', None) == getattr(dead_ally, 'id', None)):
-                                continue
-                            if target_unit is not None and (unit is target_unit or getattr(unit, 'id', None) == getattr(target_unit, 'id', None)):
-                                continue
-                        except Exception:
-                            pass
-                        # Check conditions
-                        conditions = effect.get('conditions', {})
-                        chance_percent = conditions.get('chance_percent', 100)
-                        trigger_once = conditions.get('trigger_once', False)
-                        
-                        # Check chance
-                        if random.randint(1, 100) > chance_percent:
-                            continue
-                        
-                        # Check trigger_once
-                        # For legacy behavior, trigger_once is deduplicated across
-                        # the entire death event (one reward per death), so use
-                        # the trigger name as the key. This ensures multiple
-                        # surviving units with the same trait don't each emit
-                        # a reward for the same death.
-                        if trigger_once:
-                            effect_key = f"{trigger.value}"
-                        else:
-                            # Non-trigger_once effects are allowed per-unit.
-                            effect_key = f"{unit.id}_{effect.get('trigger')}_{id(effect)}"
+        for unit, effect in self._trigger_subscribers(trigger, all_units):
+            # Skip processing effects on the unit that just died for
+            # on_ally_death / on_enemy_death triggers — only surviving
+            # units should react to a death event.
+            try:
+                dead_ally = context.get('dead_ally') if context is not None else None
+                target_unit = context.get('target_unit') if context is not None else None
+                if dead_ally is not None and (unit is dead_ally or getattr(unit, 'id', None) == getattr(dead_ally, 'id', None)):
+                    continue
+                if target_unit is not None and (unit is target_unit or getattr(unit, 'id', None) == getattr(target_unit, 'id', None)):
+                    continue
+            except Exception:
+                pass
+            # Check conditions
+            conditions = effect.get('conditions', {})
+            chance_percent = conditions.get('chance_percent', 100)
+            trigger_once = conditions.get('trigger_once', False)
+            
+            # Check chance
+            if self.rng.randint(1, 100) > chance_percent:
+                continue
+            
+            # Check trigger_once
+            # For legacy behavior, trigger_once is deduplicated across
+            # the entire death event (one reward per death), so use
+            # the trigger name as the key. This ensures multiple
+            # surviving units with the same trait don't each emit
+            # a reward for the same death.
+            if trigger_once:
+                effect_key = f"{trigger.value}"
+            else:
+                # Non-trigger_once effects are allowed per-unit.
+                effect_key = f"{unit.id}_{effect.get('trigger')}_{id(effect)}"
+
+            if trigger_once and context.get('triggered_rewards', set()) and effect_key in context['triggered_rewards']:
+                continue
+            
+            # Process rewards
+            rewards = effect.get('rewards', [])
+            original_current_unit = context.get('current_unit')
+            context['current_unit'] = unit
+            try:
+                for reward in rewards:
+                    trace.debug('effects', "unit=%s processing reward=%s trigger_once=%s effect_key=%s", getattr(unit, 'id', None), reward.get('type'), trigger_once, effect_key)
+                    reward_result = self._process_reward(reward, context, event_callback)
+                    results["events"].extend(reward_result.get("events", []))
+            finally:
+                if original_current_unit is not None:
+                    context['current_unit'] = original_current_unit
+                else:
+                    context.pop('current_unit', None)
+            
+            # Mark as triggered for trigger_once
+            if trigger_once:
+                if 'triggered_rewards' not in context:
+                    context['triggered_rewards'] = set()
+                context['triggered_rewards'].add(effect_key)
 
-                        if trigger_once and context.get('triggered_rewards', set()) and effect_key in context['triggered_rewards']:
-                            continue
-                        
-                        # Process rewards
-                        rewards = effect.get('rewards', [])
-                        original_current_unit = context.get('current_unit')
-                        context['current_unit'] = unit
-                        try:
-                            for reward in rewards:
-                                    try:
-                                        print(f"[MOD_EFFECT] unit={getattr(unit,'id',None)} processing reward={reward.get('type')} trigger_once={trigger_once} effect_key={effect_key}")
-                                    except Exception:
-                                        pass
-                                    reward_result = self._process_reward(reward, context, event_callback)
-                                    results["events"].extend(reward_result.get("events", []))
-                        finally:
-                            if original_current_unit is not None:
-                                context['current_unit'] = original_current_unit
-                            else:
-                                context.pop('current_unit', None)
-                        
-                        # Mark as triggered for trigger_once
-                        if trigger_once:
-                            if 'triggered_rewards' not in context:
-                                context['triggered_rewards'] = set()
-                            context['triggered_rewards'].add(effect_key)
-        
         return results
 
     def _process_reward(self, reward: Dict[str, Any], context: Dict[str, Any], event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
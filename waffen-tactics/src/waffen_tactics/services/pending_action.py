@@ -0,0 +1,54 @@
+"""
+Pending actions - typed records for work queued on the simulator scheduler
+"""
+from typing import Any, Dict, Optional
+
+
+class PendingAction:
+    """A scheduled unit of work, resolved by ``CombatSimulator._run_pending_action``.
+
+    Kinds:
+
+    - ``'attack'``: deliver a basic attack. Units are referenced by index
+      into the attacker's (``side``) and defender's teams; ``compute_ts`` is
+      when the attack was computed, ``deliver_ts`` when damage lands.
+    - ``'event'``: deliver ``payload`` as an ``event_type`` event.
+
+    Records hold no closures, so the pending queue can be inspected and
+    serialized (``to_dict``) mid-combat.
+    """
+    __slots__ = ('kind', 'deliver_ts', 'side', 'attacker_idx', 'target_idx', 'damage', 'compute_ts', 'old_hp', 'new_hp', 'event_type', 'payload')
+
+    ATTACK = 'attack'
+    EVENT = 'event'
+
+    def __init__(self, kind: str, deliver_ts: float, side: Optional[str] = None, attacker_idx: Optional[int] = None, target_idx: Optional[int] = None, damage: int = 0, compute_ts: Optional[float] = None, old_hp: Optional[int] = None, new_hp: Optional[int] = None, event_type: Optional[str] = None, payload: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.deliver_ts = deliver_ts
+        self.side = side
+        self.attacker_idx = attacker_idx
+        self.target_idx = target_idx
+        self.damage = damage
+        self.compute_ts = compute_ts
+        self.old_hp = old_hp
+        self.new_hp = new_hp
+        self.event_type = event_type
+        self.payload = payload
+
+    @classmethod
+    def attack(cls, side: str, attacker_idx: int, target_idx: int, damage: int, deliver_ts: float, compute_ts: float, old_hp: int, new_hp: int) -> 'PendingAction':
+        return cls(cls.ATTACK, deliver_ts, side=side, attacker_idx=attacker_idx, target_idx=target_idx, damage=damage, compute_ts=compute_ts, old_hp=old_hp, new_hp=new_hp)
+
+    @classmethod
+    def event(cls, deliver_ts: float, event_type: str, payload: Dict[str, Any]) -> 'PendingAction':
+        return cls(cls.EVENT, deliver_ts, event_type=event_type, payload=payload)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PendingAction':
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return f"PendingAction({self.to_dict()!r})"
@@ -0,0 +1,45 @@
+"""
+Progress monitor - notices combats whose HP totals stopped trending toward a result
+"""
+from typing import List
+
+from .target_index import count_alive
+
+
+class ProgressMonitor:
+    """Tracks whether a combat is still heading toward a result.
+
+    Progress is a side's total HP reaching a new low, or a side losing a
+    unit. A combat in which neither happened for ``window`` seconds of
+    simulated time is stalled: regen or shields absorb everything that is
+    dealt, so running on to the timeout only burns ticks.
+
+    HP that drops and recovers (burst damage healed back) is not progress;
+    only a lower low than any seen before is. Slow but steady grinding
+    keeps setting new lows and is never cut short.
+    """
+    __slots__ = ('window', 'last_progress', '_lowest', '_alive')
+
+    def __init__(self, window: float, a_hp: List[int], b_hp: List[int], start: float = 0.0):
+        self.window = window
+        self.last_progress = start
+        self._lowest = [sum(a_hp), sum(b_hp)]
+        self._alive = [count_alive(a_hp), count_alive(b_hp)]
+
+    def observe(self, time: float, a_hp: List[int], b_hp: List[int]) -> bool:
+        """Record the HP state at ``time``; return True once the combat has stalled."""
+        progressed = False
+        for side, hp in enumerate((a_hp, b_hp)):
+            total = sum(hp)
+            if total < self._lowest[side]:
+                self._lowest[side] = total
+                progressed = True
+            alive = count_alive(hp)
+            if alive < self._alive[side]:
+                self._alive[side] = alive
+                progressed = True
+        if progressed:
+            self.last_progress = time
+            return False
+        return time - self.last_progress >= self.window
+
@@ -1,7 +1,8 @@
 import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple
 from waffen_tactics.models.unit import Unit
 from waffen_tactics.models.player_state import PlayerState
+from waffen_tactics.services.data_loader import GameData
 
 RARITY_ODDS_BY_LEVEL = {
     1: {1: 100},
@@ -17,11 +18,25 @@ RARITY_ODDS_BY_LEVEL = {
 }
 
 class ShopService:
-    def __init__(self, units: List[Unit], traits: List[Dict] = None):
-        self.units_by_cost: Dict[int, List[Unit]] = {}
-        for u in units:
-            self.units_by_cost.setdefault(u.cost, []).append(u)
+    def __init__(self, units: List[Unit], traits: List[Dict] = None,
+                 units_by_cost: Optional[Mapping[int, Sequence[Unit]]] = None,
+                 traits_by_name: Optional[Mapping[str, Dict]] = None):
+        if units_by_cost is None:
+            units_by_cost = {}
+            for u in units:
+                units_by_cost.setdefault(u.cost, []).append(u)
+        self.units_by_cost: Mapping[int, Sequence[Unit]] = units_by_cost
         self.traits = traits or []
+        if traits_by_name is None:
+            traits_by_name = {}
+            for t in self.traits:
+                traits_by_name.setdefault(t.get('name'), t)
+        self.traits_by_name: Mapping[str, Dict] = traits_by_name
+
+    @classmethod
+    def from_game_data(cls, data: GameData) -> 'ShopService':
+        """Shop over ``data`` reusing its ``units_by_cost``/``traits_by_name`` indexes."""
+        return cls(data.units, data.traits, units_by_cost=data.units_by_cost, traits_by_name=data.traits_by_name)
 
     def roll(self, level: int, count: int = 5) -> List[Unit]:
         odds = RARITY_ODDS_BY_LEVEL.get(level, RARITY_ODDS_BY_LEVEL[max(RARITY_ODDS_BY_LEVEL)])
@@ -73,7 +88,7 @@ class ShopService:
         free_reroll = False
         free_reason = None
         for trait_name, (count, tier) in active_synergies.items():
-            trait_obj = next((t for t in self.traits if t.get('name') == trait_name), None)
+            trait_obj = self.traits_by_name.get(trait_name)
             if not trait_obj:
                 continue
             idx = tier - 1
@@ -1,12 +1,11 @@
 """
 Skill Executor - Executes skills during combat
 """
-import asyncio
-import time
-import random
-from typing import List, Any, Dict, Optional
-from waffen_tactics.models.skill import Skill, Effect, SkillExecutionContext, EffectType, TargetType
-from waffen_tactics.services.effects import get_effect_handler
+from typing import List, Any, Dict, Union
+from waffen_tactics.models.skill import Skill, Effect, SkillExecutionContext, TargetType
+from waffen_tactics.services.event_canonicalizer import emit_mana_change
+from waffen_tactics.services.skill_plan import PlanStep, SkillPlan, compile_skill, target_selector
+from waffen_tactics import trace
 
 
 class SkillExecutionError(Exception):
@@ -20,27 +19,26 @@ class SkillExecutor:
     def __init__(self):
         self.effect_handlers = {}
 
-    def execute_skill(self, skill: Skill, context: SkillExecutionContext) -> List[Dict[str, Any]]:
+    def execute_skill(self, skill: Union[Skill, SkillPlan], context: SkillExecutionContext) -> List[Dict[str, Any]]:
         """
         Execute a skill and return list of events generated
 
         Args:
-            skill: The skill to execute
+            skill: The skill to execute, or its precompiled ``SkillPlan``
             context: Execution context with caster and teams
 
         Returns:
             List of combat events generated by the skill
         """
+        plan = skill if isinstance(skill, SkillPlan) else compile_skill(skill) if isinstance(skill, Skill) else SkillPlan(skill)
         events = []
 
         try:
             # Determine required mana to cast.
             # Prefer explicit skill.mana_cost if present (back-compat for tests/data),
             # otherwise use caster's max_mana as the single source of truth.
-            required_mana = None
-            if getattr(skill, 'mana_cost', None) is not None:
-                required_mana = skill.mana_cost
-            else:
+            required_mana = plan.mana_cost
+            if required_mana is None:
                 required_mana = getattr(context.caster, 'max_mana', None) or getattr(context.caster, 'stats', {}).get('max_mana', None)
             if required_mana is None:
                 # Fallback to 100 if somehow missing
@@ -51,17 +49,16 @@ class SkillExecutor:
                 raise SkillExecutionError(f"Insufficient mana: {context.caster.get_mana()} < {required_mana}")
 
             # Deduct mana (consume full bar) - use canonical emitter
-            from waffen_tactics.services.event_canonicalizer import emit_mana_change
-            print(f"[SKILL_EXEC] casting {skill.name} at combat_time={context.combat_time}")
-            
+            trace.debug('skills', "casting %s at combat_time=%s", plan.name, context.combat_time)
+
             # Use canonical emitter for mana change
             def event_callback(event_type, payload):
                 events.append((event_type, payload))
-            
-            side = 'team_a' if any(u.id == context.caster.id for u in context.team_a) else 'team_b'
-            emit_mana_change(event_callback, context.caster, 
+
+            side = 'team_a' if context.caster_team is context.team_a else 'team_b'
+            emit_mana_change(event_callback, context.caster,
                            -required_mana,  # Negative amount for mana cost
-                           side=side, 
+                           side=side,
                            timestamp=context.combat_time,
                            include_snapshot=True)
 
@@ -70,24 +67,19 @@ class SkillExecutor:
             # Emit skill_cast at the canonical combat_time (no additional delay)
             target_id = None
             target_name = None
-            damage = None
-            if len(skill.effects) == 1:
-                effect = skill.effects[0]
-                if effect.target == TargetType.SINGLE_ENEMY:
-                    # For single enemy target, determine the target
-                    targets = self._get_targets(effect.target, context)
-                    if targets:
-                        target_id = targets[0].id
-                        target_name = targets[0].name
-                        if effect.type == EffectType.DAMAGE:
-                            damage = effect.params.get('amount')
-                elif effect.type == EffectType.DAMAGE:
-                    # For other targets, still include damage if it's a damage effect
-                    damage = effect.params.get('amount')
+            damage = plan.announce_damage
+            if plan.announce_target is not None:
+                targets = plan.announce_target(context)
+                if targets:
+                    target_id = targets[0].id
+                    target_name = targets[0].name
+                else:
+                    # Single-target skills only report damage for a real target
+                    damage = None
             events.append(('skill_cast', {
                 'caster_id': context.caster.id,
                 'caster_name': context.caster.name,
-                'skill_name': skill.name,
+                'skill_name': plan.name,
                 'target_id': target_id,
                 'target_name': target_name,
                 'damage': damage,
@@ -95,115 +87,50 @@ class SkillExecutor:
             }))
 
             # Execute effects sequentially (effects come after skill_cast)
-            for effect in skill.effects:
-                effect_events = self._execute_effect(effect, context)
-                print(f"[SKILL_EXEC] effect {effect.type} returned {effect_events}")
+            for step in plan.steps:
+                effect_events = self._run_step(step, context)
+                trace.debug('skills', "effect %s returned %s", step.effect.type, effect_events)
                 events.extend(effect_events)
 
         except Exception as e:
-            raise SkillExecutionError(f"Failed to execute skill {skill.name}: {e}")
+            raise SkillExecutionError(f"Failed to execute skill {plan.name}: {e}")
 
         return events
 
     def _execute_effect(self, effect: Effect, context: SkillExecutionContext) -> List[Dict[str, Any]]:
         """Execute a single effect"""
+        return self._run_step(PlanStep(effect), context)
+
+    def _run_step(self, step: PlanStep, context: SkillExecutionContext) -> List[Dict[str, Any]]:
+        """Run one plan step on each of its targets"""
         events = []
 
         # Get targets for this effect
-        targets = self._get_targets(effect.target, context)
+        targets = step.select(context)
 
-        # Get effect handler
-        handler = get_effect_handler(effect.type)
+        handler = step.handler
         if not handler:
-            raise SkillExecutionError(f"No handler found for effect type: {effect.type}")
+            raise SkillExecutionError(f"No handler found for effect type: {step.effect.type}")
 
         # Execute effect on targets
         for target in targets:
             try:
-                # Call the handler - it may be sync or async
-                result = handler.execute(effect, context, target)
-                # If a coroutine is returned, run it to completion
-                if asyncio.iscoroutine(result):
-                    loop = asyncio.new_event_loop()
-                    try:
-                        effect_events = loop.run_until_complete(result)
-                    finally:
-                        loop.close()
-                else:
-                    effect_events = result
+                # Handlers are synchronous (enforced by the registry)
+                effect_events = handler.execute(step.effect, context, target)
 
                 # Extend events if the handler returned a list
                 if effect_events:
                     events.extend(effect_events)
             except Exception as e:
                 # Log error but continue with other targets
-                print(f"Error executing effect {effect.type} on target {getattr(target, 'id', '<unknown>')}: {e}")
+                print(f"Error executing effect {step.effect.type} on target {getattr(target, 'id', '<unknown>')}: {e}")
                 continue
 
         return events
 
     def _get_targets(self, target_type: TargetType, context: SkillExecutionContext) -> List[Any]:
         """Get list of targets for an effect"""
-        caster = context.caster
-        caster_team = context.caster_team
-        enemy_team = context.enemy_team
-
-        if target_type == TargetType.SELF:
-            return [caster]
-
-        elif target_type == TargetType.SINGLE_ENEMY:
-            # Random enemy - prefer alive targets but fall back to any enemy
-            alive_enemies = [u for u in enemy_team if getattr(u, 'hp', 0) > 0]
-            candidates = alive_enemies if alive_enemies else list(enemy_team)
-
-            # If there truly are no enemies at all, return empty
-            if not candidates:
-                return []
-
-            # Use random_seed for deterministic behavior if provided
-            if context.random_seed is not None:
-                random.seed(context.random_seed)
-            return [random.choice(candidates)]
-
-        elif target_type == TargetType.SINGLE_ENEMY_PERSISTENT:
-            # Same enemy for all effects in this skill execution
-            if context.persistent_target is not None:
-                # Check if target is still alive
-                if context.persistent_target.hp > 0:
-                    return [context.persistent_target]
-                else:
-                    # Target died, clear it
-                    context.persistent_target = None
-            
-            # Choose new persistent target
-            alive_enemies = [u for u in enemy_team if u.hp > 0]
-            if not alive_enemies:
-                return []
-            
-            # Use random_seed for deterministic behavior if provided
-            if context.random_seed is not None:
-                random.seed(context.random_seed)
-            context.persistent_target = random.choice(alive_enemies)
-            return [context.persistent_target]
-
-        elif target_type == TargetType.ENEMY_TEAM:
-            return [u for u in enemy_team if u.hp > 0]
-
-        elif target_type == TargetType.ENEMY_FRONT:
-            # Front line: first 3 units or fewer
-            alive_enemies = [u for u in enemy_team if u.hp > 0]
-            return alive_enemies[:3]
-
-        elif target_type == TargetType.ALLY_TEAM:
-            return [u for u in caster_team if u.hp > 0]
-
-        elif target_type == TargetType.ALLY_FRONT:
-            # Front line: first 3 units or fewer
-            alive_allies = [u for u in caster_team if u.hp > 0]
-            return alive_allies[:3]
-
-        else:
-            return []
+        return target_selector(target_type)(context)
 
 
 # Global executor instance
@@ -0,0 +1,194 @@
+"""
+Skill plans - skills compiled once into executable handler/target steps
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from waffen_tactics.models.skill import Effect, EffectType, Skill, SkillExecutionContext, TargetType
+from waffen_tactics.services import effects as effect_registry
+from waffen_tactics import trace
+
+
+# --- target selectors --------------------------------------------------
+
+def _select_self(context: SkillExecutionContext) -> List[Any]:
+    return [context.caster]
+
+
+def _select_single_enemy(context: SkillExecutionContext) -> List[Any]:
+    # Random enemy - prefer alive targets but fall back to any enemy
+    enemy_team = context.enemy_team
+    candidates = [u for u in enemy_team if getattr(u, 'hp', 0) > 0] or list(enemy_team)
+    if not candidates:
+        return []
+    return [context.get_rng().choice(candidates)]
+
+
+def _select_single_enemy_persistent(context: SkillExecutionContext) -> List[Any]:
+    # Same enemy for all effects in this skill execution
+    if context.persistent_target is not None:
+        if context.persistent_target.hp > 0:
+            return [context.persistent_target]
+        # Target died, clear it
+        context.persistent_target = None
+    alive_enemies = [u for u in context.enemy_team if u.hp > 0]
+    if not alive_enemies:
+        return []
+    context.persistent_target = context.get_rng().choice(alive_enemies)
+    return [context.persistent_target]
+
+
+def _select_enemy_team(context: SkillExecutionContext) -> List[Any]:
+    return [u for u in context.enemy_team if u.hp > 0]
+
+
+def _select_enemy_front(context: SkillExecutionContext) -> List[Any]:
+    # Front line: first 3 alive units or fewer
+    return [u for u in context.enemy_team if u.hp > 0][:3]
+
+
+def _select_ally_team(context: SkillExecutionContext) -> List[Any]:
+    return [u for u in context.caster_team if u.hp > 0]
+
+
+def _select_ally_front(context: SkillExecutionContext) -> List[Any]:
+    return [u for u in context.caster_team if u.hp > 0][:3]
+
+
+def _select_none(context: SkillExecutionContext) -> List[Any]:
+    return []
+
+
+TARGET_SELECTORS: Dict[TargetType, Callable[[SkillExecutionContext], List[Any]]] = {
+    TargetType.SELF: _select_self,
+    TargetType.SINGLE_ENEMY: _select_single_enemy,
+    TargetType.SINGLE_ENEMY_PERSISTENT: _select_single_enemy_persistent,
+    TargetType.ENEMY_TEAM: _select_enemy_team,
+    TargetType.ENEMY_FRONT: _select_enemy_front,
+    TargetType.ALLY_TEAM: _select_ally_team,
+    TargetType.ALLY_FRONT: _select_ally_front,
+}
+
+
+def target_selector(target_type: TargetType) -> Callable[[SkillExecutionContext], List[Any]]:
+    return TARGET_SELECTORS.get(target_type, _select_none)
+
+
+# --- plans -------------------------------------------------------------
+
+class PlanStep:
+    """One effect of a plan: the effect, its handler and its target selector.
+
+    ``handler`` is ``None`` when no handler is registered for the effect
+    type; running the step then fails like an unknown effect always did.
+    ``valid`` is the handler's ``validate_params`` verdict at compile time.
+    """
+    __slots__ = ('effect', 'handler', 'select', 'valid')
+
+    def __init__(self, effect: Effect):
+        self.effect = effect
+        self.handler = effect_registry.get_effect_handler(effect.type)
+        self.select = target_selector(effect.target)
+        self.valid = self.handler is not None and self.handler.validate_params(effect)
+
+
+class SkillPlan:
+    """A ``Skill`` compiled for casting.
+
+    ``announce_target`` / ``announce_damage`` precompute what the
+    ``skill_cast`` event reports: single-effect skills aimed at a single
+    enemy name their target, single damage effects their amount.
+    """
+    __slots__ = ('skill', 'name', 'mana_cost', 'steps', 'announce_target', 'announce_damage', 'registry_version')
+
+    def __init__(self, skill: Skill):
+        self.skill = skill
+        self.name = skill.name
+        self.mana_cost = getattr(skill, 'mana_cost', None)
+        self.steps: Tuple[PlanStep, ...] = tuple(PlanStep(effect) for effect in skill.effects)
+        self.registry_version = effect_registry.registry_version()
+        self.announce_target = None
+        self.announce_damage = None
+        if len(self.steps) == 1:
+            effect = self.steps[0].effect
+            if effect.target == TargetType.SINGLE_ENEMY:
+                self.announce_target = self.steps[0].select
+            if effect.type == EffectType.DAMAGE:
+                self.announce_damage = effect.params.get('amount')
+        for step in self.steps:
+            if not step.valid:
+                trace.info('skills', "skill %s: effect %s has invalid params %s", self.name, step.effect.type, step.effect.params)
+
+    @property
+    def stale(self) -> bool:
+        """Whether effect handlers were (re)registered after compilation."""
+        return self.registry_version != effect_registry.registry_version()
+
+
+def compile_skill(skill: Skill) -> SkillPlan:
+    """Return the plan for ``skill``, compiling it on first use.
+
+    The plan is cached on the ``Skill`` object, so every unit built from
+    the same template (which share the parsed ``Skill``) shares one plan.
+    """
+    plan = skill.__dict__.get('_plan')
+    if plan is None or plan.stale:
+        plan = SkillPlan(skill)
+        skill.__dict__['_plan'] = plan
+    return plan
+
+
+def resolve_skill(skill: Any) -> Optional[Skill]:
+    """Normalize the skill shapes stored on ``CombatUnit.skill`` into a ``Skill``.
+
+    Accepted shapes: a ``Skill``; a dict with ``effects`` (JSON form); a
+    wrapper dict whose ``effect`` is ``{'skill': Skill}`` (game data); a
+    legacy dict whose ``effect`` is a single effect dict.
+    """
+    if isinstance(skill, Skill):
+        return skill
+    if isinstance(skill, dict):
+        if 'effects' in skill:
+            return Skill.from_dict(skill)
+        if 'effect' in skill:
+            effect = skill['effect']
+            if isinstance(effect, dict):
+                if 'skill' in effect:
+                    return effect['skill']
+                # Old format: a single effect dict
+                skill_dict = skill.copy()
+                skill_dict['effects'] = [effect]
+                skill_dict['mana_cost'] = skill.get('cost', 0)
+                del skill_dict['effect']
+                return Skill.from_dict(skill_dict)
+            # effect is already a skill object or something else
+            return effect
+        return None
+    if hasattr(skill, 'effects'):
+        return skill
+    return None
+
+
+def skill_plan_for(unit: Any) -> Optional[SkillPlan]:
+    """The compiled plan for ``unit.skill``, cached on the unit.
+
+    The cache is keyed on the ``skill`` object itself, so reassigning
+    ``unit.skill`` recompiles on the next cast.
+    """
+    source = getattr(unit, 'skill', None)
+    # Only trust a real (source, plan) tuple so mocks do not fabricate a cache entry
+    cached = getattr(unit, '_skill_plan', None)
+    if isinstance(cached, tuple) and cached[0] is source and not (cached[1] is not None and cached[1].stale):
+        return cached[1]
+    skill = resolve_skill(source)
+    if isinstance(skill, Skill):
+        plan = compile_skill(skill)
+    elif skill is not None and hasattr(skill, 'effects'):
+        # Skill-like object that cannot carry a cached plan
+        plan = SkillPlan(skill)
+    else:
+        plan = None
+    try:
+        unit._skill_plan = (source, plan)
+    except AttributeError:
+        pass
+    return plan
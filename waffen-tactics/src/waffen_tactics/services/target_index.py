@@ -0,0 +1,209 @@
+"""
+Target index - incrementally maintained alive front/back lines for targeting
+"""
+import bisect
+import heapq
+import os
+from typing import Any, List, NamedTuple, Optional
+
+from .effect_index import effects_of_type
+
+
+def deterministic_targeting_enabled() -> bool:
+    """Whether WAFFEN_DETERMINISTIC_TARGETING asks for first-in-priority targets."""
+    return os.getenv('WAFFEN_DETERMINISTIC_TARGETING', '0') in ('1', 'true', 'True')
+
+
+class TargetPolicy(NamedTuple):
+    """How a unit picks its basic-attack target, resolved at combat start."""
+    prefer_back: bool = False
+    least_hp: bool = False
+
+    @classmethod
+    def for_unit(cls, unit: Any) -> 'TargetPolicy':
+        return cls(bool(effects_of_type(unit, 'target_backline')), bool(effects_of_type(unit, 'target_least_hp')))
+
+
+class HpMirror(list):
+    """Simulator HP list that counts living units and reports writes to its ``TargetIndex``.
+
+    Reads stay plain list reads. Item assignment keeps ``alive`` (entries
+    above zero) current, so win checks are O(1), and notifies ``targets``
+    so deaths, revivals and HP changes update the alive lines and heaps.
+    Deaths (``emit_unit_died``), damage, heals and revives all write
+    through these lists.
+    """
+    __slots__ = ('targets', 'alive')
+
+    def __init__(self, values=()):
+        super().__init__(values)
+        self.targets: Optional['TargetIndex'] = None
+        self.alive = sum(1 for hp in self if hp > 0)
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            list.__setitem__(self, i, value)
+            self.alive = sum(1 for hp in self if hp > 0)
+            if self.targets is not None:
+                self.targets.rebuild()
+            return
+        old = list.__getitem__(self, i)
+        list.__setitem__(self, i, value)
+        if value != old:
+            if (old > 0) != (value > 0):
+                self.alive += 1 if value > 0 else -1
+            if self.targets is not None:
+                self.targets.hp_changed(i if i >= 0 else i + len(self), old, value)
+
+    def _resized(self):
+        # Length changes are rare (never during combat); recount and reindex
+        self.alive = sum(1 for hp in self if hp > 0)
+        if self.targets is not None and len(self) == len(self.targets.team):
+            self.targets.rebuild()
+
+    def append(self, value):
+        list.append(self, value)
+        self._resized()
+
+    def extend(self, values):
+        list.extend(self, values)
+        self._resized()
+
+    def __iadd__(self, values):
+        list.extend(self, values)
+        self._resized()
+        return self
+
+    def insert(self, i, value):
+        list.insert(self, i, value)
+        self._resized()
+
+    def pop(self, i=-1):
+        value = list.pop(self, i)
+        self._resized()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._resized()
+
+    def clear(self):
+        list.clear(self)
+        self._resized()
+
+    def __delitem__(self, i):
+        list.__delitem__(self, i)
+        self._resized()
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def count_alive(hp: List[int]) -> int:
+    """Entries of ``hp`` above zero; O(1) for an ``HpMirror``."""
+    if isinstance(hp, HpMirror):
+        return hp.alive
+    return sum(1 for h in hp if h > 0)
+
+
+class TargetIndex:
+    """Alive front/back unit indices of one team, in index order.
+
+    Both lines are sorted lists updated only when a unit dies, revives
+    (via ``HpMirror`` writes) or moves (``reposition``), so picking a
+    target is a list lookup instead of a team scan. ``least_hp`` keeps a
+    lazily pruned heap keyed on ``(hp, line rank, index)`` per line
+    preference, which gives the same tie-breaking as scanning the
+    front-then-back (or back-then-front) order.
+
+    ``policies`` holds the ``TargetPolicy`` of this team's own units.
+    """
+
+    def __init__(self, team: List[Any], hp: HpMirror):
+        self.team = team
+        self.hp = hp
+        self.policies = [TargetPolicy.for_unit(u) for u in team]
+        hp.targets = self
+        self._heaps = {}
+        self.rebuild()
+
+    @staticmethod
+    def _line_of(unit: Any) -> Optional[str]:
+        # Units outside the front/back lines are never targeted
+        position = getattr(unit, 'position', None)
+        return position if position in ('front', 'back') else None
+
+    def rebuild(self):
+        self._lines = [self._line_of(u) for u in self.team]
+        self.front = [j for j, line in enumerate(self._lines) if line == 'front' and self.hp[j] > 0]
+        self.back = [j for j, line in enumerate(self._lines) if line == 'back' and self.hp[j] > 0]
+        for prefer_back in list(self._heaps):
+            self._build_heap(prefer_back)
+
+    @property
+    def alive(self) -> int:
+        return len(self.front) + len(self.back)
+
+    def _line_list(self, idx: int) -> Optional[List[int]]:
+        line = self._lines[idx]
+        if line is None:
+            return None
+        return self.back if line == 'back' else self.front
+
+    def hp_changed(self, idx: int, old: int, new: int):
+        if self._lines[idx] is None:
+            return
+        if (old > 0) != (new > 0):
+            line = self._line_list(idx)
+            if new > 0:
+                bisect.insort(line, idx)
+            else:
+                line.remove(idx)
+        if new > 0:
+            for prefer_back, heap in self._heaps.items():
+                heapq.heappush(heap, (new, self._rank(idx, prefer_back), idx))
+                if len(heap) > 4 * len(self.team) + 16:
+                    self._build_heap(prefer_back)
+
+    def reposition(self, idx: int):
+        """Refresh unit ``idx``'s line after its ``position`` changed."""
+        line = self._line_of(self.team[idx])
+        if line == self._lines[idx]:
+            return
+        alive = self.hp[idx] > 0
+        if alive and self._lines[idx] is not None:
+            self._line_list(idx).remove(idx)
+        self._lines[idx] = line
+        if alive and line is not None:
+            bisect.insort(self._line_list(idx), idx)
+            for prefer_back, heap in self._heaps.items():
+                heapq.heappush(heap, (self.hp[idx], self._rank(idx, prefer_back), idx))
+
+    def _rank(self, idx: int, prefer_back: bool) -> int:
+        return 0 if (self._lines[idx] == 'back') == prefer_back else 1
+
+    def _build_heap(self, prefer_back: bool):
+        heap = [(self.hp[j], self._rank(j, prefer_back), j) for j in self.front + self.back]
+        heapq.heapify(heap)
+        self._heaps[prefer_back] = heap
+
+    # --- selection ---------------------------------------------------
+
+    def preferred(self, prefer_back: bool) -> List[int]:
+        """Alive indices of the preferred line, or the other line when it is empty."""
+        if prefer_back:
+            return self.back or self.front
+        return self.front or self.back
+
+    def least_hp(self, prefer_back: bool) -> Optional[int]:
+        heap = self._heaps.get(prefer_back)
+        if heap is None:
+            self._build_heap(prefer_back)
+            heap = self._heaps[prefer_back]
+        hp = self.hp
+        while heap:
+            value, rank, idx = heap[0]
+            if value == hp[idx] and value > 0 and rank == self._rank(idx, prefer_back):
+                return idx
+            heapq.heappop(heap)
+        return None
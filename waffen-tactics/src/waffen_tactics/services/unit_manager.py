@@ -25,7 +25,7 @@ class UnitManager:
             return False, "Ta jednostka nie jest w sklepie!"
 
         # Get unit cost
-        unit = next((u for u in self.data.units if u.id == unit_id), None)
+        unit = self.data.units_by_id.get(unit_id)
         if not unit:
             return False, "Nie znaleziono jednostki!"
 
@@ -91,7 +91,7 @@ class UnitManager:
             return False, "Nie znaleziono jednostki!"
         
         # Get unit data
-        unit = next((u for u in self.data.units if u.id == unit_instance.unit_id), None)
+        unit = self.data.units_by_id.get(unit_instance.unit_id)
         if not unit:
             return False, "Błąd danych jednostki!"
         
@@ -104,7 +104,7 @@ class UnitManager:
         extra_xp = 0
         if active_synergies:
             for trait_name, (count, tier) in active_synergies.items():
-                trait_obj = next((t for t in self.data.traits if t.get('name') == trait_name), None)
+                trait_obj = self.data.traits_by_name.get(trait_name)
                 if not trait_obj:
                     continue
                 effects = trait_obj.get('modular_effects', [])
@@ -186,7 +186,7 @@ class UnitManager:
         player.board.append(unit_instance)
         bot_logger.info(f"[GM_MOVE_TO_BOARD] Moved successfully to {position}! New state - Board: {len(player.board)}, Bench: {len(player.bench)}")
 
-        unit = next((u for u in self.data.units if u.id == unit_instance.unit_id), None)
+        unit = self.data.units_by_id.get(unit_instance.unit_id)
         stars = '⭐' * unit_instance.star_level
         return True, f"{unit.name} {stars} na planszy ({position})!"
 
@@ -220,7 +220,7 @@ class UnitManager:
         player.bench.append(unit_instance)
         bot_logger.info(f"[GM_MOVE_TO_BENCH] Moved successfully! New state - Board: {len(player.board)}, Bench: {len(player.bench)}")
 
-        unit = next((u for u in self.data.units if u.id == unit_instance.unit_id), None)
+        unit = self.data.units_by_id.get(unit_instance.unit_id)
         stars = '⭐' * unit_instance.star_level
         return True, f"{unit.name} {stars} na ławce!"
 
@@ -259,7 +259,7 @@ class UnitManager:
         unit_instance.position = position
         bot_logger.info(f"[GM_SWITCH_LINE] Switched {unit_instance.unit_id} from {old_position} to {position}")
 
-        unit = next((u for u in self.data.units if u.id == unit_instance.unit_id), None)
+        unit = self.data.units_by_id.get(unit_instance.unit_id)
         stars = '⭐' * unit_instance.star_level
         return True, f"{unit.name} {stars} przeniesiony do linii {position}!"
 
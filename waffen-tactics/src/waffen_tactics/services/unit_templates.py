@@ -0,0 +1,163 @@
+"""
+Unit templates - combat-ready stats and effects cached per unit configuration
+"""
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from .combat_unit import CombatUnit
+
+
+def _stat(stats_obj, key, default):
+    """Read a stat whether ``unit.stats`` is a dict, an object or missing"""
+    if stats_obj is None:
+        return default
+    try:
+        if isinstance(stats_obj, dict):
+            return stats_obj.get(key, default)
+        return getattr(stats_obj, key, default)
+    except Exception:
+        return default
+
+
+class UnitTemplate:
+    """A unit's combat-ready configuration: star-scaled stats with synergy
+    and dynamic buffs applied, its active trait effects and skill.
+
+    Templates are shared between combats and must not be mutated; ``spawn``
+    hands every ``CombatUnit`` its own copies.
+    """
+    __slots__ = ('unit', 'star_level', 'base_stats', 'stats', 'effects', 'max_mana', 'mana_regen', 'skill')
+
+    def __init__(self, unit, star_level: int, base_stats: Dict[str, float], stats: Dict[str, float], effects: Tuple[Any, ...], max_mana: int, mana_regen: int, skill: Optional[Dict[str, Any]]):
+        self.unit = unit
+        self.star_level = star_level
+        self.base_stats = base_stats
+        self.stats = stats
+        self.effects = effects
+        self.max_mana = max_mana
+        self.mana_regen = mana_regen
+        self.skill = skill
+
+    def buffed_stats(self, persistent_buffs: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Return a fresh copy of the template stats with ``persistent_buffs`` added"""
+        stats = dict(self.stats)
+        for stat, value in (persistent_buffs or {}).items():
+            if stat in stats:
+                stats[stat] += value
+        return stats
+
+    def spawn(self, id: str, position: str = 'front', stats: Optional[Dict[str, float]] = None, **overrides) -> CombatUnit:
+        """Build a ``CombatUnit`` from this template.
+
+        ``stats`` replaces the template stats (e.g. after persistent buffs);
+        ``overrides`` are passed straight to ``CombatUnit``.
+        """
+        stats = self.stats if stats is None else stats
+        kwargs = {
+            'name': self.unit.name,
+            'hp': stats['hp'],
+            'attack': stats['attack'],
+            'defense': stats['defense'],
+            'attack_speed': stats['attack_speed'],
+            'star_level': self.star_level,
+            'effects': list(self.effects),
+            'max_mana': self.max_mana,
+            'mana_regen': self.mana_regen,
+            'stats': getattr(self.unit, 'stats', None),
+            'skill': dict(self.skill) if self.skill else None,
+            'base_stats': dict(self.base_stats),
+        }
+        kwargs.update(overrides)
+        return CombatUnit(id=id, position=position, **kwargs)
+
+
+class UnitTemplateCache:
+    """Builds ``UnitTemplate``s through a ``SynergyEngine`` and memoizes them.
+
+    Templates are keyed by ``(unit id, star level, active synergies, (wins,
+    losses))``: everything ``apply_stat_buffs``, ``apply_dynamic_effects`` and
+    ``get_active_effects`` read. The synergies are keyed in their own order
+    because it decides the order of the effect list. Per-instance persistent
+    buffs are left out of the key and applied on top by the caller.
+    """
+
+    def __init__(self, synergy_engine, maxsize: int = 4096):
+        self.synergy_engine = synergy_engine
+        self.maxsize = maxsize
+        self._templates: Dict[tuple, UnitTemplate] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def clear(self):
+        self._templates.clear()
+
+    def get(self, unit, star_level: int, active_synergies: Dict[str, Tuple[int, int]], player=None) -> UnitTemplate:
+        """Return the template for ``unit`` at ``star_level`` under ``active_synergies``.
+
+        ``player`` supplies the wins/losses dynamic effects scale with; None
+        counts as 0/0, as in ``apply_dynamic_effects``.
+        """
+        wins = int(getattr(player, 'wins', 0) or 0)
+        losses = int(getattr(player, 'losses', 0) or 0)
+        signature = tuple((name, tuple(value)) for name, value in active_synergies.items())
+        key = (unit.id, star_level, signature, (wins, losses))
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            return template
+        self.misses += 1
+        template = self._build(unit, star_level, active_synergies, player)
+        if len(self._templates) >= self.maxsize:
+            self._templates.clear()
+        self._templates[key] = template
+        return template
+
+    def _build(self, unit, star_level: int, active_synergies, player) -> UnitTemplate:
+        engine = self.synergy_engine
+        stats_obj = getattr(unit, 'stats', None)
+        base_stats = {
+            'hp': int(_stat(stats_obj, 'hp', 80 + (unit.cost * 40)) * (1.6 ** (star_level - 1))),
+            'attack': int(_stat(stats_obj, 'attack', 20 + (unit.cost * 10)) * (1.4 ** (star_level - 1))),
+            'defense': int(_stat(stats_obj, 'defense', 5 + (unit.cost * 2))),
+            'attack_speed': float(_stat(stats_obj, 'attack_speed', 0.8 + (unit.cost * 0.1))),
+        }
+        # Mana stays constant across star levels
+        max_mana = int(_stat(stats_obj, 'max_mana', 100))
+
+        stats = engine.apply_stat_buffs(base_stats, unit, active_synergies)
+        stats = engine.apply_dynamic_effects(unit, stats, active_synergies, player)
+        stats = dict(stats) if stats is not None else dict(base_stats)
+        effects = tuple(engine.get_active_effects(unit, active_synergies))
+
+        skill = getattr(unit, 'skill', None)
+        skill_dict = {
+            'name': skill.name,
+            'description': skill.description,
+            'mana_cost': (skill.mana_cost if getattr(skill, 'mana_cost', None) is not None else max_mana),
+            'effect': skill.effect
+        } if skill else None
+
+        return UnitTemplate(
+            unit=unit,
+            star_level=star_level,
+            base_stats=base_stats,
+            stats=stats,
+            effects=effects,
+            max_mana=max_mana,
+            mana_regen=_stat(stats_obj, 'mana_regen', 5),
+            skill=skill_dict,
+        )
+
+
+_caches: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def template_cache_for(synergy_engine) -> UnitTemplateCache:
+    """Return the template cache bound to ``synergy_engine``, creating it on first use"""
+    cache = _caches.get(synergy_engine)
+    if cache is None:
+        cache = _caches[synergy_engine] = UnitTemplateCache(synergy_engine)
+    return cache
@@ -0,0 +1,126 @@
+"""
+Trace - category- and level-gated debug output for combat hot paths
+
+Tracing is off unless enabled, and a disabled call costs a dict lookup:
+messages are %-formatted (or built by a callable) only when they will be
+written. Enable categories with the ``WAFFEN_TRACE`` environment variable
+or ``configure``::
+
+    WAFFEN_TRACE=skills,damage          # debug level for two categories
+    WAFFEN_TRACE=all:info,attack:debug  # info everywhere, debug for attacks
+
+Categories used by the engine and web backend:
+
+- ``stat_buff``: stat buff application (``emit_stat_buff`` and effect actions)
+- ``effects``: modular effect registration/execution, trigger rewards and
+  the actions applied for each triggered effect
+- ``skills``: skill casts and per-effect results in ``SkillExecutor``
+- ``damage``: skill damage payloads
+- ``delay``: ``DelayHandler`` combat-time advances
+- ``attack``: scheduled basic-attack damage/death actions (warnings for
+  incomplete damage payloads, errors from death handling)
+- ``death``: unit death processing and ``unit_died`` emission
+- ``sim``: end-of-simulation summaries (final HP arrays)
+- ``snapshot``: per-unit effect counts in web combat snapshots
+- ``events``: every event reaching the web combat event collector
+- ``sse``: mapped ``unit_attack``/``animation_start`` payloads streamed over SSE
+
+Hot call sites with expensive arguments should guard with ``enabled``.
+"""
+import os
+import sys
+from typing import Any, Callable, Dict, Optional, Union
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+
+# Category -> minimum level written; 'all' applies to unlisted categories
+_thresholds: Dict[str, int] = {}
+
+
+def _write_stdout(line: str):
+    sys.stdout.write(line + '\n')
+
+
+_writer: Callable[[str], None] = _write_stdout
+
+
+def configure(spec: Optional[str] = None):
+    """Replace the enabled categories from a ``WAFFEN_TRACE``-style spec.
+
+    ``spec`` is a comma separated list of ``category`` or
+    ``category:level`` entries; ``None`` or ``''`` disables tracing.
+    """
+    _thresholds.clear()
+    for entry in (spec or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        category, _, level = entry.partition(':')
+        set_level(category.strip(), level.strip() or DEBUG)
+
+
+def set_level(category: str, level: Union[int, str, None] = DEBUG):
+    """Enable ``category`` at ``level`` (``None`` disables it)."""
+    if level is None:
+        _thresholds.pop(category, None)
+        return
+    if isinstance(level, str):
+        if level.lower() not in LEVELS:
+            raise ValueError(f"Unknown trace level {level!r}; expected one of {tuple(LEVELS)}")
+        level = LEVELS[level.lower()]
+    _thresholds[category] = level
+
+
+def set_writer(writer: Optional[Callable[[str], None]] = None):
+    """Send trace lines to ``writer`` (stdout when ``None``)."""
+    global _writer
+    _writer = writer or _write_stdout
+
+
+def enabled(category: str, level: int = DEBUG) -> bool:
+    """Whether a ``category`` message at ``level`` would be written."""
+    if not _thresholds:
+        return False
+    threshold = _thresholds.get(category, _thresholds.get('all'))
+    return threshold is not None and level >= threshold
+
+
+def trace(category: str, message: Union[str, Callable[[], str]], *args: Any, level: int = DEBUG):
+    """Write ``[category] message`` if enabled.
+
+    ``message`` is %-formatted with ``args``, or called when it is a
+    callable, only after the category/level check passes.
+    """
+    if not enabled(category, level):
+        return
+    if callable(message):
+        text = message()
+    elif args:
+        text = message % args
+    else:
+        text = message
+    _writer(f"[{category}] {text}")
+
+
+def debug(category: str, message: Union[str, Callable[[], str]], *args: Any):
+    trace(category, message, *args, level=DEBUG)
+
+
+def info(category: str, message: Union[str, Callable[[], str]], *args: Any):
+    trace(category, message, *args, level=INFO)
+
+
+def warning(category: str, message: Union[str, Callable[[], str]], *args: Any):
+    trace(category, message, *args, level=WARNING)
+
+
+def error(category: str, message: Union[str, Callable[[], str]], *args: Any):
+    trace(category, message, *args, level=ERROR)
+
+
+configure(os.getenv('WAFFEN_TRACE'))
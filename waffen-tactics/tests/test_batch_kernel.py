@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from waffen_tactics.services.batch_kernel import simulate_batch, unsupported_reason
+from waffen_tactics.services.batch_simulation import TeamSpec, UnitSpec, simulate_many, _get_worker_context, _coerce_team, build_team
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, effects=None, max_mana=100, skill=None, position='front', mana_regen=0):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10, mana_regen=mana_regen)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects or [], max_mana=max_mana, stats=stats, skill=skill, position=position)
+
+
+def random_buff(rng):
+    stat, value = rng.choice([('attack', rng.randint(5, 40)), ('defense', rng.randint(5, 40)), ('attack_speed', rng.choice([0.4, 1, 2]))])
+    return {'type': 'buff', 'target': rng.choice(['self', 'ally_team']), 'stat': stat, 'value': value,
+            'value_type': 'flat', 'duration': rng.choice([1, 2.5, 4])}
+
+
+def random_teams(seed, with_skills, with_buffs=False):
+    rng = random.Random(seed)
+
+    def unit(id):
+        skill = None
+        if with_skills:
+            target = rng.choice(['enemy_team', 'enemy_front'])
+            skill = {'name': 'Nova', 'effects': [{'type': 'damage', 'target': target, 'amount': rng.randint(20, 120)}]}
+            if with_buffs:
+                skill['effects'] = rng.choice([[random_buff(rng)], [random_buff(rng), *skill['effects']]])
+        return make_unit(
+            id, id, hp=rng.randint(200, 900), attack=rng.randint(15, 80), defense=rng.randint(0, 40),
+            attack_speed=rng.choice([0.5, 0.8, 1.0, 1.2, 1.5]), max_mana=rng.choice([30, 50, 80, 120]),
+            skill=skill, position=rng.choice(['front', 'back']), mana_regen=rng.choice([0, 4, 5]),
+        )
+
+    return [unit(f"a{i}") for i in range(rng.randint(1, 8))], [unit(f"b{i}") for i in range(rng.randint(1, 8))]
+
+
+def scalar_outcome(team_a, team_b, timeout=60):
+    sim = CombatSimulator(dt=0.1, timeout=timeout)
+    result = sim.simulate(team_a, team_b, mode='outcome')
+    return (result['winner'], result['duration'], result['timeout'], list(sim.a_hp), list(sim.b_hp))
+
+
+@pytest.mark.parametrize('with_skills,with_buffs', [(False, False), (True, False), (True, True)])
+def test_kernel_matches_scalar_engine_with_deterministic_targeting(with_skills, with_buffs):
+    seeds = range(40)
+    results, unsupported = simulate_batch([random_teams(s, with_skills, with_buffs) for s in seeds], dt=0.1, timeout=60)
+
+    assert unsupported == {}
+    for seed, result in zip(seeds, results):
+        expected = scalar_outcome(*random_teams(seed, with_skills, with_buffs))
+        assert (result['winner'], result['duration'], result['timeout'], result['team_a_hp'], result['team_b_hp']) == expected
+
+
+def test_kernel_matches_scalar_engine_on_real_units():
+    # 1v1 keeps single-target skills deterministic, so results match exactly
+    data, _, _ = _get_worker_context()
+
+    def team(unit_id, star):
+        return build_team(TeamSpec(units=[UnitSpec(unit_id, star)], synergies={}), 'a')
+
+    supported = [u.id for u in data.units if unsupported_reason(team(u.id, 1)[0]) is None]
+    assert {'hyodo888', 'un4given'} <= set(supported)
+    pairs = [(a, b, star) for a in supported for b in supported for star in (1, 3)]
+    results, unsupported = simulate_batch([(team(a, star), team(b, 1)) for a, b, star in pairs], dt=0.1, timeout=60)
+
+    assert unsupported == {}
+    for (a, b, star), result in zip(pairs, results):
+        expected = scalar_outcome(team(a, star), team(b, 1))
+        assert (result['winner'], result['duration'], result['timeout'], result['team_a_hp'], result['team_b_hp']) == expected
+
+
+def test_kernel_reverts_flat_buffs_on_expiry():
+    # b1 casts once at t=0: +400 defense on its team for 2.5s, so a1's swings
+    # at t=1 and t=2 deal 20 instead of 100; from t=3 the buff is reverted
+    guard = {'name': 'Guard', 'effects': [{'type': 'buff', 'target': 'ally_team', 'stat': 'defense', 'value': 400, 'value_type': 'flat', 'duration': 2.5}]}
+
+    def teams():
+        a = [make_unit("a1", "A1", hp=5000, attack=100, defense=0)]
+        b = [make_unit("b1", "B1", hp=5000, attack=1, defense=0, skill=dict(guard)),
+             make_unit("b2", "B2", hp=5000, attack=1, defense=0)]
+        b[0].mana = 90
+        return a, b
+
+    results, unsupported = simulate_batch([teams()], dt=0.1, timeout=8)
+    result = results[0]
+    assert unsupported == {}
+    assert result['team_b_hp'] == [5000 - (20 + 20 + 5 * 100), 5000]
+    assert (result['winner'], result['duration'], result['timeout'], result['team_a_hp'], result['team_b_hp']) == scalar_outcome(*teams(), timeout=8)
+
+
+def test_kernel_reports_timeout():
+    a = [make_unit("a1", "A1", hp=5000, attack=1, defense=0)]
+    b = [make_unit("b1", "B1", hp=5000, attack=1, defense=0)]
+    results, _ = simulate_batch([(a, b)], dt=0.1, timeout=5)
+    assert results[0]['timeout'] is True
+    assert results[0]['winner'] == 'team_a'
+    assert results[0]['team_a_survivors'] == 1 and results[0]['team_b_survivors'] == 1
+
+
+def test_kernel_reports_unsupported_matchups():
+    plain = ([make_unit("a1", "A1")], [make_unit("b1", "B1")])
+    with_effect = ([make_unit("a1", "A1", effects=[{'type': 'target_backline'}])], [make_unit("b1", "B1")])
+    heal_skill = {'name': 'Mend', 'effects': [{'type': 'heal', 'target': 'self', 'amount': 30}]}
+    with_heal = ([make_unit("a1", "A1")], [make_unit("b1", "B1", skill=heal_skill)])
+    pct_skill = {'name': 'Rally', 'effects': [{'type': 'buff', 'target': 'self', 'stat': 'attack', 'value': 20, 'value_type': 'percentage', 'duration': 3}]}
+    with_pct_buff = ([make_unit("a1", "A1", skill=pct_skill)], [make_unit("b1", "B1")])
+
+    results, unsupported = simulate_batch([plain, with_effect, with_heal, with_pct_buff])
+
+    assert set(unsupported) == {1, 2, 3}
+    assert 'target_backline' in unsupported[1]
+    assert 'heal' in unsupported[2]
+    assert 'percentage buff' in unsupported[3]
+    assert results[0] is not None and all(r is None for r in results[1:])
+
+
+def test_unsupported_reason_accepts_mana_regen_effects():
+    assert unsupported_reason(make_unit("a1", "A1", effects=[{'type': 'mana_regen', 'value': 3}])) is None
+
+
+def test_simulate_many_vectorized_falls_back_to_scalar_engine():
+    data, _, _ = _get_worker_context()
+    supported = [u.id for u in data.units if unsupported_reason(build_team(_coerce_team([u.id]), 'a')[0]) is None]
+    unsupported = [u.id for u in data.units if u.id not in supported]
+    assert supported and unsupported
+    matchups = [
+        ([(supported[0], 2)], [supported[-1]]),
+        ([unsupported[0]], [supported[0]]),
+    ]
+
+    results = simulate_many(matchups, seeds=[5, 6], workers=1, vectorized=True)
+    scalar = simulate_many(matchups, seeds=[5, 6], workers=1)
+
+    assert [r['vectorized'] for r in results] == [True, False]
+    assert [r['seed'] for r in results] == [5, 6]
+    assert {k: v for k, v in results[1].items() if k != 'vectorized'} == scalar[1]
+    assert results[0]['winner'] in ('team_a', 'team_b')
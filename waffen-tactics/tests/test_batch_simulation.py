@@ -0,0 +1,64 @@
+import pytest
+
+from waffen_tactics.services.batch_simulation import TeamSpec, UnitSpec, build_team, simulate_many, _get_worker_context
+
+
+@pytest.fixture(scope='module')
+def unit_ids():
+    data, _, _ = _get_worker_context()
+    return [u.id for u in data.units]
+
+
+@pytest.fixture
+def matchups(unit_ids):
+    pairs = []
+    for i in range(6):
+        team_a = [(unit_ids[(i + k) % len(unit_ids)], 1 + k % 2, 'front' if k < 2 else 'back') for k in range(4)]
+        team_b = TeamSpec(units=[UnitSpec(unit_ids[(3 * i + k) % len(unit_ids)], 2) for k in range(4)])
+        pairs.append((team_a, team_b))
+    return pairs
+
+
+def test_simulate_many_inline_is_reproducible(matchups):
+    first = simulate_many(matchups, seeds=[10, 11, 12, 13, 14, 15], workers=1)
+    second = simulate_many(matchups, seeds=[10, 11, 12, 13, 14, 15], workers=1)
+    assert first == second
+    assert [r['seed'] for r in first] == [10, 11, 12, 13, 14, 15]
+    assert all(r['winner'] in ('team_a', 'team_b') for r in first)
+
+
+def test_simulate_many_pool_matches_inline(matchups):
+    inline = simulate_many(matchups, workers=1)
+    pooled = simulate_many(matchups, workers=2)
+    assert pooled == inline
+
+
+def test_simulate_many_rejects_mismatched_seeds(matchups):
+    with pytest.raises(ValueError):
+        simulate_many(matchups, seeds=[1], workers=1)
+
+
+def test_build_team_applies_star_scaling(unit_ids):
+    one_star = build_team(TeamSpec(units=[UnitSpec(unit_ids[0], 1)], synergies={}), 'a')[0]
+    two_star = build_team(TeamSpec(units=[UnitSpec(unit_ids[0], 2, 'back')], synergies={}), 'a')[0]
+    assert two_star.max_hp > one_star.max_hp
+    assert two_star.position == 'back'
+
+
+def test_build_team_rejects_unknown_unit():
+    with pytest.raises(ValueError):
+        build_team(TeamSpec(units=[UnitSpec('no_such_unit')]), 'a')
+
+
+def test_build_team_spawns_from_template_cache(unit_ids):
+    from waffen_tactics.services.unit_templates import template_cache_for
+    _, engine, _ = _get_worker_context()
+    cache = template_cache_for(engine)
+    spec = TeamSpec(units=[UnitSpec(unit_ids[0], 2), UnitSpec(unit_ids[0], 2)], synergies={})
+    first = build_team(spec, 'a')
+    hits = cache.hits
+    second = build_team(spec, 'b')
+    assert cache.hits == hits + 2
+    assert [u.hp for u in second] == [u.hp for u in first]
+    assert second[0].max_hp == second[0].hp
+    assert second[0].effects is not second[1].effects
@@ -37,6 +37,7 @@ def mock_combat_unit():
     unit.hp_regen_per_sec = 0.0
     unit.lifesteal = 0.0
     unit.damage_reduction = 0.0
+    unit._dead = False
     return unit
 
 
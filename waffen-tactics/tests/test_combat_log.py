@@ -0,0 +1,65 @@
+"""Tests for the structured, lazily rendered combat log"""
+import json
+
+from waffen_tactics.services.combat_log import CombatLog, record, render_entry
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+
+
+def _teams():
+    a = [CombatUnit(id='a1', name='Alpha', hp=800, attack=60, defense=5, attack_speed=1.0)]
+    b = [CombatUnit(id='b1', name='Bravo', hp=600, attack=50, defense=5, attack_speed=1.0)]
+    return a, b
+
+
+def test_entries_render_like_legacy_strings():
+    a, b = _teams()
+    log = CombatLog(a, b)
+    log.time = 1.5
+    record(log, 'attack', a[0], b[0], 55, 600)
+    record(log, 'buff_hp', a[0], None, -3)
+    record(log, 'ally_heal', a[0], b[0], 12, 30)
+    log.append('free text')
+
+    assert log[0] == "[1.50s] A:Alpha hits B:Bravo for 55, hp=600"
+    assert log[1] == "Alpha -3 HP (per second)"
+    assert log[2] == "Alpha heals Bravo for 12 (ally hp below 30%)"
+    assert log[-1] == 'free text'
+    assert log[-2:] == ["Alpha heals Bravo for 12 (ally hp below 30%)", 'free text']
+    assert list(log) == log.lines()
+    assert log.kind_counts() == {'attack': 1, 'buff_hp': 1, 'ally_heal': 1, 'text': 1}
+
+
+def test_entries_store_tuples_and_render_lazily():
+    a, b = _teams()
+    log = CombatLog(a, b)
+    record(log, 'dot', b[0], None, 7, 'fire')
+    # Renders with the unit's name at read time, not at record time
+    b[0].name = 'Renamed'
+    assert log.entries == [(0.0, 'dot', 1, None, 7, ('fire',))]
+    assert log[0] == "Renamed takes 7 fire damage from DoT"
+    assert json.loads(json.dumps(log)) == ["Renamed takes 7 fire damage from DoT"]
+
+
+def test_record_into_plain_list_appends_text():
+    a, b = _teams()
+    log = []
+    record(log, 'lifesteal', a[0], None, 4)
+    assert log == ["Alpha lifesteals 4"]
+    assert render_entry('regen_mana', a[0], amount=2) == "Alpha regenerates +2 Mana"
+
+
+def test_simulator_returns_combat_log():
+    a, b = _teams()
+    result = CombatSimulator(dt=0.1, timeout=10, seed=1).simulate(a, b)
+    log = result['log']
+    assert isinstance(log, CombatLog) and isinstance(log, list)
+    assert len(log) > 0
+    assert all(isinstance(line, str) for line in log)
+    assert any('hits' in line for line in log)
+
+
+def test_simulator_combat_log_disabled():
+    a, b = _teams()
+    result = CombatSimulator(dt=0.1, timeout=10, seed=1, combat_log=False).simulate(a, b)
+    assert result['log'] == []
+    assert result['winner'] in ('team_a', 'team_b')
@@ -9,8 +9,7 @@ from waffen_tactics.models.unit import Unit, Stats, Skill
 
 @pytest.fixture
 def mock_data():
-    """Mock GameData with some test units"""
-    data = Mock(spec=GameData)
+    """GameData with some test units"""
     # Create test units
     test_units = [
         Unit("test_unit_1", "Test Unit 1", 1, ["Trait1"], ["Class1"],
@@ -20,8 +19,7 @@ def mock_data():
              Stats(attack=60, hp=120, defense=15, max_mana=100, attack_speed=1.1),
              Skill("Test Skill 2", "test2", 100, {"type": "heal", "amount": 30}))
     ]
-    data.units = test_units
-    return data
+    return GameData(units=test_units, traits=[], factions=[], classes=[])
 
 
 @pytest.fixture
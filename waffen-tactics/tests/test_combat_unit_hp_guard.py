@@ -0,0 +1,45 @@
+import pytest
+
+from waffen_tactics.services import combat_unit
+from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.event_canonicalizer import emit_damage, emit_heal
+
+
+def make_unit():
+    return CombatUnit(id="u1", name="U1", hp=100, attack=10, defense=5, attack_speed=1.0)
+
+
+def test_direct_hp_assignment_is_rejected():
+    unit = make_unit()
+    with pytest.raises(PermissionError):
+        unit.hp = 50
+    assert unit.hp == 100
+
+
+def test_canonical_emitters_mutate_hp():
+    unit = make_unit()
+    emit_damage(None, None, unit, raw_damage=30, emit_event=False)
+    assert unit.hp == 70
+    emit_heal(None, unit, 10)
+    assert unit.hp == 80
+
+
+def test_set_hp_requires_the_write_capability():
+    unit = make_unit()
+    for caller_module in ('some_processor', 'event_canonicalizer', None):
+        with pytest.raises(PermissionError):
+            unit._set_hp(1, caller_module=caller_module)
+    with pytest.raises(PermissionError):
+        unit._set_hp(1)
+    assert unit.hp == 100
+    unit._set_hp(-5, caller_module=combat_unit._HP_WRITER)
+    assert unit.hp == 0
+
+
+def test_debug_checker_rejects_writes_outside_canonicalizer(monkeypatch):
+    monkeypatch.setattr(combat_unit, '_DEBUG_HP_WRITES', True)
+    unit = make_unit()
+    emit_damage(None, None, unit, raw_damage=25, emit_event=False)
+    assert unit.hp == 75
+    with pytest.raises(PermissionError):
+        unit._set_hp(10, caller_module=combat_unit._HP_WRITER)
@@ -0,0 +1,61 @@
+import dataclasses
+
+import pytest
+
+from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit():
+    stats = Stats(attack=20, hp=100, defense=10, max_mana=80, attack_speed=1.0, mana_on_attack=7)
+    return CombatUnit(id="u1", name="U1", hp=100, attack=20, defense=10, attack_speed=1.0, max_mana=80, stats=stats)
+
+
+def test_stat_setters_mutate_block_in_place():
+    unit = make_unit()
+    block = unit.stats
+    unit.attack = 35
+    unit.defense = 4
+    unit.attack_speed = 1.5
+    unit.max_mana = 60
+    unit.max_hp = 250
+    assert unit.stats is block
+    assert (block.attack, block.defense, block.attack_speed, block.max_mana, block.hp) == (35, 4, 1.5, 60, 250)
+
+
+def test_max_hp_setter_keeps_mana_on_attack():
+    unit = make_unit()
+    unit.max_hp = 300
+    assert unit.stats.mana_on_attack == 7
+
+
+def test_frozen_stats_is_an_immutable_snapshot():
+    unit = make_unit()
+    snapshot = unit.frozen_stats
+    unit.attack = 99
+    assert snapshot.attack == 20
+    assert unit.frozen_stats.attack == 99
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.attack = 1
+
+
+def test_stats_setter_copies_values():
+    unit = make_unit()
+    other = make_unit()
+    other.attack = 55
+    unit.stats = other.stats
+    assert unit.attack == 55
+    assert unit.stats is not other.stats
+
+
+def test_runtime_flags_are_slots_without_instance_dict():
+    unit = make_unit()
+    assert not hasattr(unit, '__dict__')
+    # Unset until a processor writes them, like the old dict-backed flags
+    assert not hasattr(unit, 'permanent_buffs_applied')
+    assert getattr(unit, '_dead', False) is False
+    unit._dead = True
+    unit._mana_regen_accumulator = 0.5
+    assert (unit._dead, unit._mana_regen_accumulator) == (True, 0.5)
+    with pytest.raises(AttributeError):
+        unit.not_a_declared_flag = 1
@@ -15,6 +15,20 @@ class TestDataLoader(unittest.TestCase):
         self.assertGreater(u.stats.attack, 0)
         self.assertGreater(u.stats.attack_speed, 0.0)
 
+    def test_indexes_match_scans(self):
+        data = load_game_data()
+        for u in data.units:
+            self.assertIs(data.units_by_id[u.id], next(x for x in data.units if x.id == u.id))
+            self.assertIn(u, data.units_by_cost[u.cost])
+            for name in list(u.factions) + list(u.classes):
+                self.assertIn(u, data.units_by_trait[name])
+        for t in data.traits:
+            self.assertIs(data.traits_by_name[t['name']], next(x for x in data.traits if x.get('name') == t['name']))
+        self.assertEqual(sum(len(v) for v in data.units_by_cost.values()), len(data.units))
+        self.assertIsInstance(data.units_by_trait[data.units[0].factions[0]], tuple)
+        with self.assertRaises(TypeError):
+            data.units_by_id['new'] = data.units[0]
+
     def test_stats_scale_with_cost(self):
         s1 = build_stats_for_cost(1)
         s5 = build_stats_for_cost(5)
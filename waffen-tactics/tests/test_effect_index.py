@@ -0,0 +1,118 @@
+import copy
+import pickle
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.effect_index import EffectIndex, effects_of_type, expiring_effects
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, effects=None, max_mana=100):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects or [], max_mana=max_mana, stats=stats)
+
+
+def test_buckets_follow_list_mutations():
+    dot = {'type': 'damage_over_time', 'id': 'd1', 'expires_at': 3.0}
+    buff = {'type': 'per_second_buff', 'stat': 'attack', 'value': 2}
+    trig = {'type': 'on_enemy_death', 'trigger': 'on_enemy_death'}
+    index = EffectIndex([dot, 'target_backline'])
+    index.append(buff)
+    index += [trig]
+
+    assert index.by_type('damage_over_time') == [dot]
+    assert index.by_type('target_backline') == ['target_backline']
+    assert index.by_trigger('on_enemy_death') == [trig]
+    assert index.expiring() == [dot]
+
+    index.remove(dot)
+    assert index.by_type('damage_over_time') == [] and index.expiring() == []
+    assert index.pop(0) == 'target_backline'
+    assert not index.has_type('target_backline')
+    assert index.discard(buff) is True and index.discard(buff) is False
+    assert list(index) == [trig]
+
+
+def test_by_types_preserves_list_order():
+    effects = [{'type': 'mana_regen', 'n': 0}, {'type': 'per_second_buff', 'n': 1}, {'type': 'mana_regen', 'n': 2}]
+    index = EffectIndex(effects)
+    assert [e['n'] for e in index.by_types('per_second_buff', 'mana_regen')] == [0, 1, 2]
+    index.insert(0, {'type': 'per_second_buff', 'n': -1})
+    assert [e['n'] for e in index.by_types('per_second_buff', 'mana_regen')] == [-1, 0, 1, 2]
+
+
+def test_unit_setter_reassignment_reindexes():
+    unit = make_unit('a', 'A', effects=[{'type': 'target_least_hp'}])
+    assert isinstance(unit.effects, EffectIndex)
+    unit.effects = list(unit.effects) + [{'type': 'stun', 'expires_at': 1.5}]
+    assert isinstance(unit.effects, EffectIndex)
+    assert effects_of_type(unit, 'target_least_hp') == [{'type': 'target_least_hp'}]
+    assert expiring_effects(unit) == [{'type': 'stun', 'expires_at': 1.5}]
+
+
+def test_emitters_extend_the_existing_index():
+    from waffen_tactics.services.event_canonicalizer import emit_shield_applied, emit_stat_buff, emit_unit_stunned
+
+    unit = make_unit('a', 'A', effects=[{'type': 'target_least_hp'}])
+    index = unit.effects
+    added, trigger_calls = [], []
+    index.listen(added.append)
+    index.trigger_listener = lambda: trigger_calls.append(1)
+    added.clear()
+    snapshot = unit.to_dict()
+
+    emit_stat_buff(None, unit, 'attack', 5, duration=3.0, timestamp=1.0)
+    emit_unit_stunned(None, unit, 1.0, timestamp=1.0)
+    emit_shield_applied(None, unit, 20, duration=2.0, timestamp=1.0)
+
+    assert unit.effects is index
+    assert [e['type'] for e in added] == ['buff', 'stun', 'shield']
+    assert trigger_calls == []
+    assert [e['type'] for e in expiring_effects(unit)] == ['buff', 'stun', 'shield']
+    # Snapshots taken earlier keep the effects they were taken with
+    assert snapshot['effects'] == [{'type': 'target_least_hp'}]
+
+
+def test_copy_and_pickle_rebuild_buckets():
+    index = EffectIndex([{'type': 'damage_over_time', 'id': 'd1'}])
+    for clone in (copy.deepcopy(index), pickle.loads(pickle.dumps(index)), index.copy()):
+        assert isinstance(clone, EffectIndex)
+        assert clone.by_type('damage_over_time') == [{'type': 'damage_over_time', 'id': 'd1'}]
+        clone.append({'type': 'damage_over_time', 'id': 'd2'})
+        assert len(clone.by_type('damage_over_time')) == 2
+    assert len(index.by_type('damage_over_time')) == 1
+
+
+def test_helpers_scan_plain_lists_on_test_doubles():
+    class Double:
+        effects = [{'type': 'mana_regen', 'value': 1}, 'target_backline', {'type': 'stun', 'expires_at': 2.0}]
+
+    assert effects_of_type(Double, 'target_backline') == ['target_backline']
+    assert expiring_effects(Double) == [{'type': 'stun', 'expires_at': 2.0}]
+
+
+def test_dot_ticks_and_expires_through_index():
+    dot = {'type': 'damage_over_time', 'id': 'dot1', 'damage': 5, 'damage_type': 'magic', 'interval': 1.0,
+           'ticks_remaining': 2, 'total_ticks': 2, 'next_tick_time': 0.5, 'source_id': 'b1'}
+    unit = make_unit('a1', 'A1', hp=500, attack=0, effects=[dot])
+    enemy = make_unit('b1', 'B1', hp=500, attack=0)
+    events = []
+    CombatSimulator(dt=0.1, timeout=4).simulate([unit], [enemy], event_callback=lambda t, d: events.append((t, d)))
+
+    assert [t for t, _ in events if t == 'damage_over_time_tick'] == ['damage_over_time_tick'] * 2
+    assert unit.effects.by_type('damage_over_time') == []
+
+
+def test_expired_buffs_revert_only_applied_stats():
+    from waffen_tactics.services.event_canonicalizer import emit_stat_buff
+
+    unit = make_unit('a1', 'A1', hp=500, attack=30)
+    enemy = make_unit('b1', 'B1', hp=500, attack=0)
+    emit_stat_buff(None, unit, 'attack', 15, duration=1.0, timestamp=0.0)
+    # lifesteal is read-only on CombatUnit: nothing is applied, so nothing is reverted
+    emit_stat_buff(None, unit, 'lifesteal', 10, duration=1.0, timestamp=0.0)
+    assert unit.attack == 45
+    assert [e.get('applied_delta') for e in expiring_effects(unit)] == [15, None]
+
+    CombatSimulator(dt=0.1, timeout=2).simulate([unit], [enemy])
+    assert unit.attack == 30
+    assert expiring_effects(unit) == []
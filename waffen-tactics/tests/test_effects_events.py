@@ -46,15 +46,14 @@ def test_buff_handler_event_shape():
     assert payload['stat'] == 'attack'
 
 
-@pytest.mark.asyncio
-async def test_debuff_handler_event_shape():
+def test_debuff_handler_event_shape():
     caster = DummyUnit('caster2', 'Caster2')
     target = DummyUnit('target2', 'Target2')
     context = SkillExecutionContext(caster=caster, team_a=[caster], team_b=[target])
 
     effect = Effect(type=EffectType.DEBUFF, target=TargetType.SELF, params={'stat': 'attack', 'value': -15, 'duration': 4, 'value_type': 'flat'})
     handler = DebuffHandler()
-    events = await handler.execute(effect, context, target)
+    events = handler.execute(effect, context, target)
 
     assert len(target.effects) == 1
     e = target.effects[0]
@@ -70,3 +69,32 @@ async def test_debuff_handler_event_shape():
     assert ev_type == 'stat_buff'
     assert payload['unit_id'] == target.id
     assert payload['stat'] == 'attack'
+
+
+def test_registry_rejects_async_handlers():
+    from waffen_tactics.services.effects import EffectHandler, register_effect_handler
+
+    class AsyncHandler(EffectHandler):
+        async def execute(self, effect, context, target):
+            return []
+
+    with pytest.raises(TypeError):
+        register_effect_handler(EffectType.DELAY, AsyncHandler())
+    with pytest.raises(TypeError):
+        register_effect_handler(EffectType.DELAY, object())
+
+
+def test_repeat_runs_nested_effects_inline():
+    from waffen_tactics.services.effects.repeat import RepeatHandler
+
+    caster = DummyUnit('caster3', 'Caster3')
+    target = DummyUnit('target3', 'Target3')
+    target.hp = 100
+    context = SkillExecutionContext(caster=caster, team_a=[caster], team_b=[target])
+
+    nested = [{'type': 'debuff', 'target': 'single_enemy', 'stat': 'attack', 'value': 5, 'duration': 2}, {'type': 'bogus'}]
+    effect = Effect(type=EffectType.REPEAT, params={'count': 2, 'effects': nested})
+    events = RepeatHandler().execute(effect, context, caster)
+
+    assert [e[0] for e in events] == ['stat_buff', 'skill_error', 'stat_buff', 'skill_error']
+    assert len(target.effects) == 2
@@ -2,6 +2,7 @@ import pytest
 
 from waffen_tactics.models.player_state import PlayerState, UnitInstance
 from waffen_tactics.models.unit import Unit, Stats, Skill
+from waffen_tactics.services.data_loader import GameData
 
 
 def test_enrich_player_state_applies_win_scaling(monkeypatch):
@@ -43,7 +44,7 @@ def test_enrich_player_state_applies_win_scaling(monkeypatch):
     ]
 
     # Build fake GameManager used inside enrich_player_state
-    class FakeData:
+    class FakeData(GameData):
         def __init__(self):
             # Unit with known base stats
             self.units = [
@@ -58,6 +59,7 @@ def test_enrich_player_state_applies_win_scaling(monkeypatch):
                 )
             ]
             self.traits = traits
+            super().__init__(self.units, self.traits, [], [])
 
     class FakeGM:
         def __init__(self):
@@ -73,8 +75,8 @@ def test_enrich_player_state_applies_win_scaling(monkeypatch):
                     units.append(u)
             return self.synergy_engine.compute(units)
 
-    # Monkeypatch GameManager used inside enrich_player_state
-    monkeypatch.setattr(gsu, 'GameManager', FakeGM)
+    # Monkeypatch the GameManager factory used inside enrich_player_state
+    monkeypatch.setattr(gsu, 'get_game_manager', FakeGM)
 
     # Create player with one board unit and 3 wins
     player = PlayerState(user_id=1)
@@ -157,7 +159,7 @@ def test_enrich_player_state_applies_static_synergy_buffs(monkeypatch):
     traits = traits_data['traits']
 
     # Create fake units with XN Waffen faction
-    class FakeData:
+    class FakeData(GameData):
         def __init__(self):
             self.units = [
                 Unit(
@@ -189,6 +191,7 @@ def test_enrich_player_state_applies_static_synergy_buffs(monkeypatch):
                 )
             ]
             self.traits = traits
+            super().__init__(self.units, self.traits, [], [])
 
     class FakeGM:
         def __init__(self):
@@ -203,8 +206,8 @@ def test_enrich_player_state_applies_static_synergy_buffs(monkeypatch):
                     units.append(u)
             return self.synergy_engine.compute(units)
 
-    # Monkeypatch GameManager
-    monkeypatch.setattr(gsu, 'GameManager', FakeGM)
+    # Monkeypatch the GameManager factory
+    monkeypatch.setattr(gsu, 'get_game_manager', FakeGM)
 
     # Create player with 3 XN Waffen units
     player = PlayerState(user_id=1)
@@ -266,7 +269,7 @@ def test_enrich_player_state_applies_xn_kgb_attack_buff(monkeypatch):
     traits = traits_data['traits']
 
     # Create fake units with XN KGB faction
-    class FakeData:
+    class FakeData(GameData):
         def __init__(self):
             self.units = [
                 Unit(
@@ -298,6 +301,7 @@ def test_enrich_player_state_applies_xn_kgb_attack_buff(monkeypatch):
                 )
             ]
             self.traits = traits
+            super().__init__(self.units, self.traits, [], [])
 
     class FakeGM:
         def __init__(self):
@@ -312,8 +316,8 @@ def test_enrich_player_state_applies_xn_kgb_attack_buff(monkeypatch):
                     units.append(u)
             return self.synergy_engine.compute(units)
 
-    # Monkeypatch GameManager
-    monkeypatch.setattr(gsu, 'GameManager', FakeGM)
+    # Monkeypatch the GameManager factory
+    monkeypatch.setattr(gsu, 'get_game_manager', FakeGM)
 
     # Create player with 3 XN KGB units
     player = PlayerState(user_id=1)
@@ -372,7 +376,7 @@ def test_enrich_player_state_applies_streamers_flat_buffs(monkeypatch):
     traits = traits_data['traits']
 
     # Create fake units with Streamer faction
-    class FakeData:
+    class FakeData(GameData):
         def __init__(self):
             self.units = [
                 Unit(
@@ -395,6 +399,7 @@ def test_enrich_player_state_applies_streamers_flat_buffs(monkeypatch):
                 )
             ]
             self.traits = traits
+            super().__init__(self.units, self.traits, [], [])
 
     class FakeGM:
         def __init__(self):
@@ -409,8 +414,8 @@ def test_enrich_player_state_applies_streamers_flat_buffs(monkeypatch):
                     units.append(u)
             return self.synergy_engine.compute(units)
 
-    # Monkeypatch GameManager
-    monkeypatch.setattr(gsu, 'GameManager', FakeGM)
+    # Monkeypatch the GameManager factory
+    monkeypatch.setattr(gsu, 'get_game_manager', FakeGM)
 
     # Create player with 2 Streamer units
     player = PlayerState(user_id=1)
@@ -469,7 +474,7 @@ def test_enrich_player_state_applies_konfident_class_buff(monkeypatch):
     traits = traits_data['traits']
 
     # Create fake units with Konfident class
-    class FakeData:
+    class FakeData(GameData):
         def __init__(self):
             self.units = [
                 Unit(
@@ -492,6 +497,7 @@ def test_enrich_player_state_applies_konfident_class_buff(monkeypatch):
                 )
             ]
             self.traits = traits
+            super().__init__(self.units, self.traits, [], [])
 
     class FakeGM:
         def __init__(self):
@@ -506,8 +512,8 @@ def test_enrich_player_state_applies_konfident_class_buff(monkeypatch):
                     units.append(u)
             return self.synergy_engine.compute(units)
 
-    # Monkeypatch GameManager
-    monkeypatch.setattr(gsu, 'GameManager', FakeGM)
+    # Monkeypatch the GameManager factory
+    monkeypatch.setattr(gsu, 'get_game_manager', FakeGM)
 
     # Create player with 2 Konfident units
     player = PlayerState(user_id=1)
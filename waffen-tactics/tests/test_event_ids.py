@@ -0,0 +1,65 @@
+"""Tests for per-combat event ids and process-wide effect ids"""
+import os
+
+import pytest
+
+from waffen_tactics.core.ids import EventIdGenerator, new_combat_id, next_effect_id
+from waffen_tactics.core.types import make_event_id
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+
+
+def _teams():
+    a = [CombatUnit(id='a1', name='Alpha', hp=500, attack=60, defense=5, attack_speed=1.0)]
+    b = [CombatUnit(id='b1', name='Bravo', hp=400, attack=50, defense=5, attack_speed=1.0)]
+    return a, b
+
+
+def test_generator_ids_are_combat_scoped_and_sequential():
+    ids = EventIdGenerator('c1')
+    assert [ids(), ids(), ids()] == ['c1:1', 'c1:2', 'c1:3']
+    assert EventIdGenerator().combat_id != EventIdGenerator().combat_id
+
+
+def test_module_level_ids_are_unique():
+    assert new_combat_id() != new_combat_id()
+    assert next_effect_id() != next_effect_id()
+    assert make_event_id() != make_event_id()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_module_level_ids_are_unique_across_forks():
+    parent = (make_event_id(), new_combat_id(), next_effect_id())
+    children = []
+    for _ in range(2):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, ' '.join((make_event_id(), new_combat_id(), next_effect_id())).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            children.append(tuple(f.read().split()))
+        os.waitpid(pid, 0)
+
+    minted = [parent, *children]
+    for kind in range(3):
+        assert len({ids[kind] for ids in minted}) == 3
+
+
+def test_simulator_events_carry_combat_prefixed_ids():
+    sim = CombatSimulator(dt=0.1, timeout=10, seed=3)
+    events = []
+    a, b = _teams()
+    sim.simulate(a, b, lambda t, d: events.append(d))
+    first_combat = sim.combat_id
+
+    ids = [e['event_id'] for e in events]
+    assert len(ids) == len(set(ids))
+    assert all(eid.startswith(first_combat + ':') for eid in ids)
+
+    events.clear()
+    a, b = _teams()
+    sim.simulate(a, b, lambda t, d: events.append(d))
+    assert sim.combat_id != first_combat
+    assert events[0]['event_id'] == f"{sim.combat_id}:1"
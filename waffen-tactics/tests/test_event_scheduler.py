@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.data_loader import load_game_data
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, effects=None, max_mana=100):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects or [], max_mana=max_mana, stats=stats)
+
+
+def build_team(data, rng, prefix, size):
+    team = []
+    for i, u in enumerate(rng.sample(data.units, size)):
+        team.append(CombatUnit(
+            id=f"{prefix}_{i}", name=u.name, hp=u.stats.hp, attack=u.stats.attack,
+            defense=u.stats.defense, attack_speed=u.stats.attack_speed,
+            max_mana=u.stats.max_mana, skill=u.skill, stats=u.stats,
+            position=rng.choice(['front', 'back']),
+        ))
+    return team
+
+
+def run_matchup(data, seed, scheduler):
+    rng = random.Random(seed)
+    team_a = build_team(data, rng, 'a', rng.randint(1, 10))
+    team_b = build_team(data, rng, 'b', rng.randint(1, 10))
+    random.seed(seed)
+    sim = CombatSimulator(dt=0.1, timeout=60, scheduler=scheduler)
+    result = sim.simulate(team_a, team_b, event_callback=lambda *_: None)
+    return (
+        result['winner'],
+        result['duration'],
+        [u.hp for u in team_a],
+        [u.hp for u in team_b],
+        [u.mana for u in team_a + team_b],
+    )
+
+
+@pytest.fixture(scope='module')
+def game_data():
+    return load_game_data()
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_event_scheduler_matches_tick_loop(game_data, seed):
+    assert run_matchup(game_data, seed, 'event') == run_matchup(game_data, seed, 'tick')
+
+
+def test_event_scheduler_matches_tick_loop_over_many_seeds(game_data):
+    # Skill kills on secondary targets only reach the HP mirror at the next
+    # tick's regen sync; the event scheduler must end the combat on that tick
+    def run(seed, scheduler):
+        rng = random.Random(seed)
+        team_a = build_team(game_data, rng, 'a', rng.randint(1, 10))
+        team_b = build_team(game_data, rng, 'b', rng.randint(1, 10))
+        sim = CombatSimulator(dt=0.1, timeout=60, scheduler=scheduler, seed=seed)
+        result = sim.simulate(team_a, team_b, mode='outcome')
+        return result['winner'], result['duration'], list(sim.a_hp), list(sim.b_hp)
+
+    mismatches = [seed for seed in range(150) if run(seed, 'event') != run(seed, 'tick')]
+    assert mismatches == []
+
+
+def test_event_scheduler_processes_fewer_ticks(game_data):
+    def ticks(scheduler, size, seeds=range(10)):
+        total = 0
+        for seed in seeds:
+            rng = random.Random(seed)
+            team_a = build_team(game_data, rng, 'a', size)
+            team_b = build_team(game_data, rng, 'b', size)
+            total += CombatSimulator(dt=0.1, timeout=60, scheduler=scheduler, seed=seed).simulate(team_a, team_b, mode='outcome')['ticks']
+        return total
+
+    # Crowded boards have an attack due on most ticks...
+    assert ticks('event', 10) * 1.6 < ticks('tick', 10)
+    # ...sparse ones skip nearly everything between attacks
+    def duel():
+        return ([make_unit("a1", "A1", hp=400, attack=30, defense=5, attack_speed=0.5)],
+                [make_unit("b1", "B1", hp=400, attack=25, defense=5, attack_speed=0.4)])
+
+    tick = CombatSimulator(dt=0.1, timeout=60).simulate(*duel(), mode='outcome')
+    event = CombatSimulator(dt=0.1, timeout=60, scheduler='event').simulate(*duel(), mode='outcome')
+    assert (event['winner'], event['duration']) == (tick['winner'], tick['duration'])
+    assert event['ticks'] * 5 < tick['ticks']
+
+
+def test_event_scheduler_follows_attack_speed_changes():
+    # A haste applied mid-combat must move the unit's next attack forward
+    def run(scheduler):
+        a = [make_unit("a1", "A1", hp=600, attack=30, defense=5, attack_speed=0.25)]
+        b = [make_unit("b1", "B1", hp=600, attack=25, defense=5, attack_speed=0.4)]
+        sim = CombatSimulator(dt=0.1, timeout=30, scheduler=scheduler)
+
+        def haste(event_type, data):
+            if event_type == 'attack' and data.get('attacker_id') == 'b1' and a[0].attack_speed < 1:
+                a[0].attack_speed = 2.0
+
+        result = sim.simulate(a, b, event_callback=haste)
+        return result['winner'], result['duration'], list(sim.a_hp), list(sim.b_hp)
+
+    assert run('event') == run('tick')
+
+
+def test_event_scheduler_applies_regen_for_skipped_ticks():
+    def teams():
+        a = [make_unit("a1", "A1", hp=400, attack=30, defense=5, attack_speed=0.5)]
+        b = [make_unit("b1", "B1", hp=400, attack=25, defense=5, attack_speed=0.4)]
+        a[0].hp_regen_per_sec = 3.3
+        return a, b
+
+    a_tick, b_tick = teams()
+    tick = CombatSimulator(dt=0.1, timeout=10).simulate(a_tick, b_tick)
+    a_event, b_event = teams()
+    event = CombatSimulator(dt=0.1, timeout=10, scheduler='event').simulate(a_event, b_event)
+
+    assert event['winner'] == tick['winner']
+    assert event['duration'] == tick['duration']
+    assert [u.hp for u in a_event + b_event] == [u.hp for u in a_tick + b_tick]
+    assert [u.mana for u in a_event + b_event] == [u.mana for u in a_tick + b_tick]
+
+
+def test_event_scheduler_skips_idle_snapshots():
+    def count_snapshots(scheduler):
+        a = [make_unit("a1", "A1", hp=300, attack=20, defense=5, attack_speed=0.5)]
+        b = [make_unit("b1", "B1", hp=300, attack=20, defense=5, attack_speed=0.5)]
+        events = []
+        CombatSimulator(dt=0.1, timeout=5, scheduler=scheduler).simulate(a, b, event_callback=lambda t, p: events.append(t))
+        return events.count('state_snapshot')
+
+    assert count_snapshots('event') < count_snapshots('tick')
+
+
+def test_unknown_scheduler_rejected():
+    with pytest.raises(ValueError):
+        CombatSimulator(scheduler='bogus')
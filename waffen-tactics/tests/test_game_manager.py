@@ -101,3 +101,22 @@ def test_get_board_synergies_returns_dict(gm):
     # board empty -> should return a dict (possibly empty)
     sy = gm.get_board_synergies(player)
     assert isinstance(sy, dict)
+
+
+def test_game_managers_share_one_game_data():
+    from waffen_tactics.services.data_loader import get_game_data
+    from waffen_tactics.services.game_manager import get_game_manager
+
+    data = get_game_data()
+    assert GameManager().data is data
+    assert get_game_manager() is get_game_manager()
+    assert get_game_manager().data is data
+    assert isinstance(data.units, tuple) and isinstance(data.traits, tuple)
+
+
+def test_services_can_be_injected(gm):
+    engine = gm.synergy_engine
+    injected = GameManager(data=gm.data, shop_service=gm.shop_service, synergy_engine=engine)
+    assert injected.synergy_engine is engine
+    assert injected.combat_manager.synergy_engine is engine
+    assert injected.shop_service is gm.shop_service
@@ -1,7 +1,9 @@
 """
 Tests for the modular effect processor system
 """
+import random
 import unittest
+from waffen_tactics.services.combat_unit import CombatUnit
 from waffen_tactics.services.modular_effect_processor import (
     ModularEffectProcessor,
     ModularEffect,
@@ -160,5 +162,54 @@ class TestModularEffectProcessor(unittest.TestCase):
         self.assertEqual(reward2.value, 10)
 
 
+def _trigger_effect(trigger, value, **conditions):
+    return {'trigger': trigger, 'conditions': conditions, 'rewards': [{'type': 'stat_buff', 'stats': ['attack'], 'value': value}]}
+
+
+def _unit(uid, effects=()):
+    return CombatUnit(id=uid, name=uid, hp=100, attack=10, defense=5, attack_speed=1.0, effects=list(effects))
+
+
+class TestTriggerSubscriptions(unittest.TestCase):
+    """Unit trigger effects are dispatched from the subscription index"""
+
+    def _dispatch(self, subscribe, seed=5):
+        units = [
+            _unit('a', [_trigger_effect('on_enemy_death', 1, chance_percent=50)]),
+            _unit('b', [{'type': 'buff'}, _trigger_effect('on_enemy_death', 2, trigger_once=True)]),
+            _unit('c', [_trigger_effect('on_ally_death', 4)]),
+            _unit('d', [_trigger_effect('on_enemy_death', 8, trigger_once=True)]),
+        ]
+        processor = ModularEffectProcessor(rng=random.Random(seed))
+        if subscribe:
+            processor.subscribe_units(units)
+        for _ in range(6):
+            processor.process_trigger(TriggerType.ON_ENEMY_DEATH, {'all_units': units, 'target_unit': units[3], 'triggered_rewards': set()})
+        units[2].effects.append(_trigger_effect('on_enemy_death', 16))
+        processor.process_trigger(TriggerType.ON_ENEMY_DEATH, {'all_units': units, 'triggered_rewards': set()})
+        return [u.attack for u in units], processor
+
+    def test_matches_scan_dispatch(self):
+        for seed in range(5):
+            self.assertEqual(self._dispatch(True, seed)[0], self._dispatch(False, seed)[0])
+
+    def test_effect_changes_refresh_subscribers(self):
+        attacks, processor = self._dispatch(True)
+        # The on_enemy_death effect added to 'c' mid-combat was dispatched
+        self.assertEqual(attacks[2], 10 + 16)
+        processor.unsubscribe_units()
+        self.assertEqual(processor._subscriptions, {})
+
+    def test_registered_effects_are_bucketed_by_trigger(self):
+        processor = ModularEffectProcessor()
+        death = ModularEffect(TriggerType.ON_ENEMY_DEATH, EffectConditions(), [])
+        win = ModularEffect(TriggerType.ON_WIN, EffectConditions(), [])
+        processor.register_effect('death', death)
+        processor.register_effect('win', win)
+        self.assertEqual(list(processor._effects_by_trigger[TriggerType.ON_ENEMY_DEATH]), ['death'])
+        processor.unregister_effect('death')
+        self.assertNotIn(TriggerType.ON_ENEMY_DEATH, processor._effects_by_trigger)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.data_loader import load_game_data
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, effects=None, max_mana=100):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects or [], max_mana=max_mana, stats=stats)
+
+
+def build_team(data, rng, prefix, size):
+    team = []
+    for i, u in enumerate(rng.sample(data.units, size)):
+        team.append(CombatUnit(
+            id=f"{prefix}_{i}", name=u.name, hp=u.stats.hp, attack=u.stats.attack,
+            defense=u.stats.defense, attack_speed=u.stats.attack_speed,
+            max_mana=u.stats.max_mana, skill=u.skill, stats=u.stats,
+            position=rng.choice(['front', 'back']),
+        ))
+    return team
+
+
+def run_matchup(data, seed, mode, scheduler='tick'):
+    rng = random.Random(seed)
+    team_a = build_team(data, rng, 'a', rng.randint(1, 10))
+    team_b = build_team(data, rng, 'b', rng.randint(1, 10))
+    random.seed(seed)
+    sim = CombatSimulator(dt=0.1, timeout=60, scheduler=scheduler)
+    result = sim.simulate(team_a, team_b, event_callback=lambda *_: None, mode=mode)
+    return (
+        result['winner'],
+        result['duration'],
+        result['team_a_survivors'],
+        result['team_b_survivors'],
+        result['timeout'],
+        [u.hp for u in team_a],
+        [u.hp for u in team_b],
+        [u.mana for u in team_a + team_b],
+    )
+
+
+@pytest.fixture(scope='module')
+def game_data():
+    return load_game_data()
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_outcome_mode_matches_full_mode(game_data, seed):
+    assert run_matchup(game_data, seed, 'outcome') == run_matchup(game_data, seed, 'full')
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_outcome_mode_matches_full_mode_with_event_scheduler(game_data, seed):
+    assert run_matchup(game_data, seed, 'outcome', scheduler='event') == run_matchup(game_data, seed, 'full')
+
+
+def test_outcome_mode_matches_with_on_death_rewards():
+    def teams():
+        on_kill = {
+            "trigger": "on_enemy_death",
+            "conditions": {"chance_percent": 100},
+            "rewards": [{"type": "stat_buff", "stats": ["attack"], "value": 5, "value_type": "flat", "duration": "permanent"}]
+        }
+        a = [make_unit("a1", "A1", hp=300, attack=40, defense=5, attack_speed=1.2, effects=[on_kill])]
+        b = [make_unit("b1", "B1", hp=40, attack=5, defense=1, attack_speed=0.5),
+             make_unit("b2", "B2", hp=120, attack=10, defense=2, attack_speed=0.7)]
+        return a, b
+
+    a_full, b_full = teams()
+    full = CombatSimulator(dt=0.1, timeout=20).simulate(a_full, b_full)
+    a_out, b_out = teams()
+    out = CombatSimulator(dt=0.1, timeout=20).simulate(a_out, b_out, mode='outcome')
+
+    assert out['winner'] == full['winner']
+    assert out['duration'] == full['duration']
+    assert a_out[0].attack == a_full[0].attack
+    assert [u.hp for u in a_out + b_out] == [u.hp for u in a_full + b_full]
+
+
+def test_outcome_mode_is_headless():
+    a = [make_unit("a1", "A1", hp=200, attack=30, defense=5, attack_speed=1.0)]
+    b = [make_unit("b1", "B1", hp=120, attack=10, defense=2, attack_speed=0.8)]
+    events = []
+
+    res = CombatSimulator(dt=0.1, timeout=10).simulate(a, b, event_callback=lambda t, p: events.append(t), mode='outcome')
+
+    assert events == []
+    assert res['log'] == []
+    assert res['winner'] == 'team_a'
+
+
+def test_unknown_mode_rejected():
+    a = [make_unit("a1", "A1")]
+    b = [make_unit("b1", "B1")]
+    with pytest.raises(ValueError):
+        CombatSimulator().simulate(a, b, mode='bogus')
@@ -0,0 +1,52 @@
+"""Tests for typed pending-action records on the simulator scheduler"""
+import pickle
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.pending_action import PendingAction
+
+
+def _teams():
+    a = [CombatUnit(id='a1', name='Alpha', hp=500, attack=60, defense=5, attack_speed=1.0)]
+    b = [CombatUnit(id='b1', name='Bravo', hp=400, attack=50, defense=5, attack_speed=1.0)]
+    return a, b
+
+
+def test_basic_attacks_are_queued_as_records():
+    sim = CombatSimulator(dt=0.1, timeout=5, seed=2)
+    seen = []
+
+    def cb(event_type, data):
+        if event_type == 'animation_start' and not seen:
+            seen.extend(sim.pending_actions())
+
+    a, b = _teams()
+    sim.simulate(a, b, cb)
+
+    attacks = [p for p in seen if p.kind == PendingAction.ATTACK]
+    assert attacks, seen
+    first = attacks[0]
+    assert first.side in ('team_a', 'team_b')
+    assert first.attacker_idx == 0 and first.target_idx == 0
+    assert first.deliver_ts > first.compute_ts
+    assert not hasattr(first, '__dict__')
+
+
+def test_record_round_trips_through_dict_and_pickle():
+    action = PendingAction.attack('team_a', 1, 2, 33, 1.2, 1.0, 100, 67)
+    data = action.to_dict()
+    assert data == {'kind': 'attack', 'deliver_ts': 1.2, 'side': 'team_a', 'attacker_idx': 1, 'target_idx': 2, 'damage': 33, 'compute_ts': 1.0, 'old_hp': 100, 'new_hp': 67}
+    assert PendingAction.from_dict(data).to_dict() == data
+    assert pickle.loads(pickle.dumps(action)).to_dict() == data
+
+
+def test_event_records_deliver_payload():
+    sim = CombatSimulator(dt=0.1, timeout=5)
+    delivered = []
+    sim.schedule_event(0.0, PendingAction.event(0.0, 'custom', {'timestamp': 0.0, 'x': 1}))
+
+    class Sink:
+        def emit(self, event_type, payload):
+            delivered.append((event_type, payload))
+
+    sim._deliver_scheduled_events(Sink())
+    assert delivered == [('custom', {'timestamp': 0.0, 'x': 1})]
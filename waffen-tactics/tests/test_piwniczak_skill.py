@@ -6,6 +6,7 @@ from types import SimpleNamespace
 
 from waffen_tactics.services.data_loader import load_game_data
 from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.combat_unit import _HP_WRITER
 
 
 def make_combat_unit_from_unitdef(unit_def, instance_id='inst', hp=None, max_hp=None):
@@ -33,7 +34,7 @@ def make_combat_unit_from_unitdef(unit_def, instance_id='inst', hp=None, max_hp=
 
     cu.max_hp = max_m
     # Use canonical setter to initialize HP in tests
-    cu._set_hp(cur_hp, caller_module='event_canonicalizer')
+    cu._set_hp(cur_hp, caller_module=_HP_WRITER)
     return cu
 
 
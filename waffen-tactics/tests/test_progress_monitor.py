@@ -0,0 +1,37 @@
+"""Tests for stalemate detection in the combat simulator"""
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.progress_monitor import ProgressMonitor
+
+
+def _unit(uid, hp, attack=20, attack_speed=1.0):
+    return CombatUnit(id=uid, name=uid, hp=hp, attack=attack, defense=0, attack_speed=attack_speed)
+
+
+def test_only_new_lows_count_as_progress():
+    monitor = ProgressMonitor(2.0, [100], [100])
+    assert not monitor.observe(1.0, [80], [100])
+    # Healing back up and dropping to the same low again is not progress
+    assert not monitor.observe(2.0, [100], [100])
+    assert monitor.observe(3.0, [80], [100])
+    assert not monitor.observe(3.5, [79], [100])
+    assert monitor.last_progress == 3.5
+
+
+def test_stalled_combat_ends_on_total_hp():
+    sim = CombatSimulator(dt=0.1, timeout=60, stall_window=5.0)
+    result = sim.simulate([_unit('a', 300, attack_speed=0)], [_unit('b', 500, attack_speed=0)])
+    assert result['stalemate'] is True
+    assert result['timeout'] is False
+    assert result['winner'] == 'team_b'
+    assert abs(result['duration'] - 5.0) < 1e-9
+    assert result['ticks_saved'] == 550
+
+
+def test_progressing_combat_is_not_cut_short():
+    def teams():
+        return [_unit('a1', 400, attack=30), _unit('a2', 300)], [_unit('b1', 500)]
+
+    plain = CombatSimulator(dt=0.1, timeout=60, seed=3).simulate(*teams())
+    monitored = CombatSimulator(dt=0.1, timeout=60, seed=3, stall_window=CombatSimulator.STALL_WINDOW).simulate(*teams())
+    assert monitored['stalemate'] is False and monitored['ticks_saved'] == 0
+    assert (monitored['winner'], monitored['duration']) == (plain['winner'], plain['duration'])
@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from waffen_tactics.services.data_loader import load_game_data
 from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.combat_unit import _HP_WRITER
 from waffen_tactics.models.skill import Skill
 
 
@@ -34,7 +35,7 @@ def make_combat_unit_from_unitdef(unit_def, instance_id='inst', hp=None, max_hp=
     # Ensure max_hp attribute exists for conditional checks
     cu.max_hp = max_m
     # Initialize HP via canonical setter to satisfy HP assignment restrictions
-    cu._set_hp(cur_hp, caller_module='event_canonicalizer')
+    cu._set_hp(cur_hp, caller_module=_HP_WRITER)
     return cu
 
 
@@ -1,7 +1,6 @@
 import copy
 from pathlib import Path
 import json
-import asyncio
 
 from waffen_tactics.services.combat_shared import CombatUnit
 from waffen_tactics.models.skill import Effect, SkillExecutionContext
@@ -94,7 +93,7 @@ def test_seq_137_replay_matches_snapshot():
     ctx = SkillExecutionContext(caster=pepe, team_a=[pepe], team_b=[un4], combat_time=1.0)
     eff = Effect(type='debuff', params={'stat': 'attack', 'value': -15, 'duration': 4, 'value_type': 'flat'})
     handler = DebuffHandler()
-    res = asyncio.get_event_loop().run_until_complete(handler.execute(eff, ctx, un4))
+    res = handler.execute(eff, ctx, un4)
     assert res and isinstance(res, list)
     event = res[0]
     assert event[0] == 'stat_buff'
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.data_loader import load_game_data
+from waffen_tactics.services.modular_effect_processor import ModularEffectProcessor
+from waffen_tactics.models.skill import SkillExecutionContext
+
+
+@pytest.fixture(scope='module')
+def game_data():
+    return load_game_data()
+
+
+@pytest.fixture(autouse=True)
+def random_targeting(monkeypatch):
+    # Exercise the random target-selection path
+    monkeypatch.setenv('WAFFEN_DETERMINISTIC_TARGETING', '0')
+
+
+def build_teams(data, size=6):
+    layout = random.Random(1234)
+    teams = []
+    for prefix in ('a', 'b'):
+        team = []
+        for i, u in enumerate(layout.sample(data.units, size)):
+            team.append(CombatUnit(
+                id=f"{prefix}_{i}", name=u.name, hp=u.stats.hp, attack=u.stats.attack,
+                defense=u.stats.defense, attack_speed=u.stats.attack_speed,
+                max_mana=u.stats.max_mana, skill=u.skill, stats=u.stats,
+                position='front' if i % 2 else 'back',
+            ))
+        teams.append(team)
+    return teams
+
+
+def run_seeded(data, seed):
+    team_a, team_b = build_teams(data)
+    events = []
+    sim = CombatSimulator(dt=0.1, timeout=60, seed=seed)
+    result = sim.simulate(team_a, team_b, event_callback=lambda t, p: events.append((t, p.get('timestamp'), p.get('target_id'))))
+    return result['winner'], result['duration'], [u.hp for u in team_a + team_b], events
+
+
+def test_same_seed_reproduces_combat(game_data):
+    random.seed(1)
+    first = run_seeded(game_data, 7)
+    random.seed(99)
+    second = run_seeded(game_data, 7)
+    assert first == second
+
+
+def test_seeded_combat_leaves_global_random_untouched(game_data):
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    run_seeded(game_data, 3)
+    assert random.random() == expected
+
+
+def test_different_seeds_change_random_choices(game_data):
+    runs = {tuple(run_seeded(game_data, seed)[3]) for seed in range(4)}
+    assert len(runs) > 1
+
+
+def test_simulator_shares_rng_with_modular_processor():
+    rng = random.Random(11)
+    sim = CombatSimulator(rng=rng)
+    assert sim.rng is rng
+    assert sim.modular_effect_processor.rng is rng
+
+    processor = ModularEffectProcessor()
+    CombatSimulator(seed=4, modular_effect_processor=processor)
+    assert processor.rng is not random
+
+
+def test_skill_context_rng_resolution():
+    rng = random.Random(2)
+    assert SkillExecutionContext(caster=None, team_a=[], team_b=[], rng=rng).get_rng() is rng
+    assert SkillExecutionContext(caster=None, team_a=[], team_b=[]).get_rng() is random
+    seeded = SkillExecutionContext(caster=None, team_a=[], team_b=[], random_seed=3, rng=rng).get_rng()
+    assert seeded.random() == random.Random(3).random()
@@ -1,9 +1,8 @@
-import asyncio
 import json
 from pathlib import Path
 
 from waffen_tactics.models.skill import Effect, SkillExecutionContext
-from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.combat_unit import CombatUnit, _HP_WRITER
 
 
 def _load_template(unit_id_or_name: str):
@@ -51,7 +50,7 @@ def _make_unit(id, name, attack=0, hp=600, max_hp=600, shield=0):
         unit.attack = int(attack)
         # Initialize HP via canonical setter for CombatUnit instances
         try:
-            unit._set_hp(int(hp), caller_module='event_canonicalizer')
+            unit._set_hp(int(hp), caller_module=_HP_WRITER)
         except Exception:
             unit.hp = int(hp)
         unit.max_hp = int(max_hp)
@@ -99,8 +98,7 @@ def test_seq_137_pepe_debuff_applies_to_un4given():
 
     handler = DebuffHandler()
 
-    # execute (handler is async)
-    res = asyncio.get_event_loop().run_until_complete(handler.execute(eff, ctx, un4given))
+    res = handler.execute(eff, ctx, un4given)
 
     # handler should return an event tuple ('stat_buff', payload)
     assert res and isinstance(res, list)
@@ -25,3 +25,13 @@ def test_shop_roll_returns_requested_count():
     random.seed(7)
     offers = shop.roll(level=3, count=3)
     assert len(offers) == 3
+
+
+def test_from_game_data_shares_indexes():
+    from waffen_tactics.services.data_loader import get_game_data
+    data = get_game_data()
+    shop = ShopService.from_game_data(data)
+    assert shop.units_by_cost is data.units_by_cost
+    assert shop.traits_by_name is data.traits_by_name
+    random.seed(3)
+    assert all(u.cost == 1 for u in shop.roll(level=1, count=5))
@@ -0,0 +1,52 @@
+"""Tests for the streaming simulate_iter entry point"""
+from waffen_tactics.models.unit import Stats
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.services.skill_parser import skill_parser
+
+DELAYED_BURN = {
+    'name': 'Delayed Burn',
+    'description': 'Wait then apply DoT',
+    'mana_cost': 0,
+    'effects': [
+        {'type': 'delay', 'duration': 1.5},
+        {'type': 'damage_over_time', 'target': 'single_enemy', 'damage': 10, 'duration': 4, 'interval': 1},
+    ],
+}
+
+
+def _teams():
+    stats = Stats(attack=20, hp=300, defense=5, max_mana=10, attack_speed=1.0, mana_on_attack=10, mana_regen=0)
+    caster = CombatUnit(id='a_0', name='Caster', hp=300, attack=20, defense=5, attack_speed=1.0, stats=stats, max_mana=10)
+    caster.skill = {'effect': {'skill': skill_parser._parse_skill(DELAYED_BURN)}}
+    enemies = [CombatUnit(id=f'b_{i}', name='Target', hp=250, attack=15, defense=5, attack_speed=0.8) for i in range(2)]
+    return [caster], enemies
+
+
+def _key(event_type, data):
+    return event_type, data.get('seq'), data.get('timestamp')
+
+
+def test_stream_matches_callback_order():
+    collected = []
+    expected = CombatSimulator(seed=7).simulate(*_teams(), lambda t, d: collected.append(_key(t, d)))
+
+    sim = CombatSimulator(seed=7)
+    streamed = [_key(t, d) for t, d in sim.simulate_iter(*_teams())]
+
+    assert streamed == collected
+    assert any(t == 'damage_over_time_applied' for t, _, _ in streamed)
+    assert sim.last_result['winner'] == expected['winner']
+    assert sim.last_result['duration'] == expected['duration']
+
+
+def test_events_are_released_while_combat_runs():
+    sim = CombatSimulator(seed=7)
+    seen = []
+    stream = sim.simulate_iter(*_teams(), lambda t, d: seen.append(t))
+    first_type, _ = next(stream)
+    assert first_type == seen[0]
+    assert sim.last_result is None
+    # Nothing is released ahead of the simulation clock
+    for _, data in stream:
+        assert data.get('timestamp', 0.0) <= sim._current_time + 1e-9
+    assert sim.last_result is not None
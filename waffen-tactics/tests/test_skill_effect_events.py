@@ -1,6 +1,6 @@
 from waffen_tactics.services.skill_executor import skill_executor
 from waffen_tactics.models.skill import Skill, Effect, EffectType, TargetType, SkillExecutionContext
-from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.combat_unit import CombatUnit, _HP_WRITER
 
 
 def make_skill_with_heal_and_shield():
@@ -17,7 +17,7 @@ def test_skill_emits_heal_and_shield_events_and_applies_effects():
     caster.mana = 100  # full mana
     caster.max_hp = 100
     # Initialize via canonical setter
-    caster._set_hp(50, caller_module='event_canonicalizer')
+    caster._set_hp(50, caller_module=_HP_WRITER)
 
     # No enemies needed for SELF-targeted effects
     team_a = [caster]
@@ -105,7 +105,7 @@ def test_random_vs_persistent_single_enemy_targeting():
     
     # Reset enemy HP and caster mana
     for enemy in enemies:
-        enemy._set_hp(200, caller_module='event_canonicalizer')
+        enemy._set_hp(200, caller_module=_HP_WRITER)
         enemy.effects = []
     caster.mana = 120
     
@@ -223,7 +223,7 @@ def test_updated_skill_examples_from_docs():
     
     # Reset for next test
     for enemy in enemies:
-        enemy._set_hp(500, caller_module='event_canonicalizer')
+        enemy._set_hp(500, caller_module=_HP_WRITER)
         enemy.effects = []
     caster.mana = 120
     
@@ -0,0 +1,55 @@
+"""Tests for skills compiled into cached execution plans"""
+from waffen_tactics.models.skill import Effect, EffectType, Skill, SkillExecutionContext, TargetType
+from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.skill_executor import skill_executor
+from waffen_tactics.services.skill_plan import SkillPlan, compile_skill, skill_plan_for
+
+
+def _skill(amount=40, target=TargetType.SINGLE_ENEMY):
+    return Skill(name='Zap', description='', effects=[Effect(type=EffectType.DAMAGE, target=target, params={'amount': amount})])
+
+
+def _unit(uid, skill=None):
+    return CombatUnit(id=uid, name=uid, hp=500, attack=10, defense=0, attack_speed=1.0, max_mana=100, skill=skill)
+
+
+def test_units_sharing_a_template_share_one_plan():
+    skill = _skill()
+    wrapped = {'name': 'Zap', 'effect': {'skill': skill}}
+    first, second = _unit('a', wrapped), _unit('b', dict(wrapped))
+    plan = skill_plan_for(first)
+    assert isinstance(plan, SkillPlan)
+    assert skill_plan_for(second) is plan is compile_skill(skill)
+    assert plan.announce_damage == 40 and plan.announce_target is not None
+
+
+def test_reassigning_skill_recompiles():
+    unit = _unit('a', _skill(10))
+    before = skill_plan_for(unit)
+    assert skill_plan_for(unit) is before
+    unit.skill = _skill(20, TargetType.ENEMY_TEAM)
+    after = skill_plan_for(unit)
+    assert after is not before
+    assert after.announce_damage == 20 and after.announce_target is None
+
+
+def test_caster_side_is_resolved_once():
+    caster, enemy = _unit('a'), _unit('b')
+    context = SkillExecutionContext(caster=caster, team_a=[caster], team_b=[enemy])
+    assert context.enemy_team == [enemy]
+    assert context.caster_on_team_a is True
+    hinted = SkillExecutionContext(caster=caster, team_a=[enemy], team_b=[caster], caster_on_team_a=False)
+    assert hinted.caster_team == [caster]
+
+
+def test_plan_and_skill_cast_identically():
+    skill = _skill(75)
+    results = []
+    for source in (skill, compile_skill(skill)):
+        caster, enemy = _unit('a'), _unit('b')
+        caster.mana = 100
+        context = SkillExecutionContext(caster=caster, team_a=[caster], team_b=[enemy], combat_time=1.0, random_seed=3)
+        events = skill_executor.execute_skill(source, context)
+        results.append(([e[0] for e in events], enemy.hp, caster.mana))
+    assert results[0] == results[1]
+    assert results[0][1] < 500
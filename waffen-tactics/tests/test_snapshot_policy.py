@@ -0,0 +1,68 @@
+import pytest
+
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.engine.combat_state import CombatState
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, effects=None, max_mana=100):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects or [], max_mana=max_mana, stats=stats)
+
+
+def teams():
+    return (
+        [make_unit('a1', 'A1', hp=400, attack=30), make_unit('a2', 'A2', hp=300, attack=25)],
+        [make_unit('b1', 'B1', hp=500, attack=20)],
+    )
+
+
+def run(**kwargs):
+    events = []
+    sim = CombatSimulator(dt=0.1, timeout=20, seed=1, **kwargs)
+    result = sim.simulate(*teams(), event_callback=lambda t, d: events.append((t, d)))
+    return result, events
+
+
+def test_delta_lists_only_changed_fields():
+    a, b = teams()
+    state = CombatState(a, b)
+    state.track_deltas = True
+    state.get_snapshot_data(0.0)
+    assert state.get_delta_data(0.1) == {'player_units': [], 'opponent_units': [], 'timestamp': 0.1}
+
+    a[0].mana = 30
+    b[0].effects = list(b[0].effects) + [{'type': 'stun', 'id': 's1', 'expires_at': 1.0}]
+    delta = state.get_delta_data(0.2)
+    assert delta['player_units'] == [{'id': 'a1', 'current_mana': 30}]
+    assert delta['opponent_units'] == [{'id': 'b1', 'effects': [{'type': 'stun', 'id': 's1', 'expires_at': 1.0}]}]
+    assert state.get_delta_data(0.3)['player_units'] == []
+
+
+def test_keyframe_policy_emits_keyframes_and_deltas():
+    full_result, full_events = run()
+    key_result, key_events = run(snapshot_policy='keyframe', keyframe_interval=2.0)
+
+    assert (key_result['winner'], key_result['duration']) == (full_result['winner'], full_result['duration'])
+    keyframes = [d['timestamp'] for t, d in key_events if t == 'state_snapshot']
+    assert keyframes == [float(2 * i) for i in range(len(keyframes))]
+    deltas = [d for t, d in key_events if t == 'state_delta']
+    assert deltas and all(d['player_units'] or d['opponent_units'] for d in deltas)
+    snapshot_count = sum(1 for t, _ in full_events if t == 'state_snapshot')
+    assert len(keyframes) + len(deltas) < snapshot_count
+
+
+def test_unknown_snapshot_policy_rejected():
+    with pytest.raises(ValueError):
+        CombatSimulator(snapshot_policy='sometimes')
+
+
+def test_combat_ends_when_a_side_is_wiped_out():
+    result, events = run()
+    died = [d['timestamp'] for t, d in events if t == 'unit_died']
+    snapshots = [d for t, d in events if t == 'state_snapshot']
+    # The last death is delivered at the start of the final tick
+    assert result['winner'] == 'team_a'
+    assert result['duration'] == pytest.approx(max(died))
+    assert snapshots[0]['alive_counts'] == {'team_a': 2, 'team_b': 1}
+    assert snapshots[-1]['alive_counts'] == {'team_a': result['team_a_survivors'], 'team_b': 0}
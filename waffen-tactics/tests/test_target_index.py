@@ -0,0 +1,88 @@
+"""Tests for the incrementally maintained target index"""
+import random
+
+from waffen_tactics.services.combat_attack_processor import CombatAttackProcessor
+from waffen_tactics.services.combat_unit import CombatUnit
+from waffen_tactics.services.target_index import HpMirror, TargetIndex, TargetPolicy
+
+
+def _unit(uid, position, effects=None):
+    return CombatUnit(id=uid, name=uid, hp=100, attack=10, defense=5, attack_speed=1.0, position=position, effects=effects or [])
+
+
+def test_lines_follow_deaths_revivals_and_repositioning():
+    team = [_unit('f0', 'front'), _unit('b1', 'back'), _unit('f2', 'front'), _unit('x3', 'middle')]
+    hp = HpMirror([100, 100, 100, 100])
+    index = TargetIndex(team, hp)
+    assert (index.front, index.back, index.alive) == ([0, 2], [1], 3)
+
+    hp[0] = 0
+    assert index.front == [2] and index.preferred(False) == [2]
+    hp[2] = 0
+    assert index.preferred(False) == [1]
+    hp[0] = 30
+    assert index.front == [0]
+
+    team[1]._stats.position = 'front'
+    index.reposition(1)
+    assert (index.front, index.back) == ([0, 1], [])
+    assert index.preferred(True) == [0, 1]
+
+
+def test_least_hp_matches_scan_order():
+    team = [_unit('f0', 'front'), _unit('b1', 'back'), _unit('f2', 'front'), _unit('b3', 'back')]
+    hp = HpMirror([50, 20, 20, 80])
+    index = TargetIndex(team, hp)
+    # Ties resolve in line order: front first by default, back first for backline attackers
+    hp[0] = 20
+    assert index.least_hp(False) == 0
+    assert index.least_hp(True) == 1
+    hp[0] = 0
+    hp[1] = 5
+    assert index.least_hp(False) == 1
+    hp[1] = 0
+    hp[2] = 0
+    assert index.least_hp(True) == 3
+    hp[3] = 0
+    assert index.least_hp(False) is None
+
+
+def test_policy_is_resolved_from_effects():
+    assert TargetPolicy.for_unit(_unit('a', 'front', [{'type': 'target_backline'}])) == TargetPolicy(True, False)
+    assert TargetPolicy.for_unit(_unit('a', 'front', [{'type': 'target_least_hp'}])) == TargetPolicy(False, True)
+
+
+def test_indexed_selection_matches_scan_selection():
+    churn = random.Random(7)
+    positions = ['front', 'back', 'front', 'back', 'front', 'back']
+    for effects in ([], [{'type': 'target_backline'}], [{'type': 'target_least_hp'}], [{'type': 'target_backline'}, {'type': 'target_least_hp'}]):
+        attackers = [_unit('a0', 'front', effects)]
+        defenders = [_unit(f'd{j}', p) for j, p in enumerate(positions)]
+        values = [churn.randint(0, 100) for _ in defenders]
+        mirror = HpMirror(values)
+        own = HpMirror([100])
+        TargetIndex(defenders, mirror)
+        TargetIndex(attackers, own)
+        for _ in range(200):
+            j = churn.randrange(len(defenders))
+            mirror[j] = churn.choice([0, churn.randint(1, 100)])
+            for deterministic in (True, False):
+                indexed, scanned = CombatAttackProcessor(), CombatAttackProcessor()
+                indexed._resolved_deterministic_targeting = scanned._resolved_deterministic_targeting = deterministic
+                indexed.rng, scanned.rng = random.Random(j), random.Random(j)
+                expected = scanned._select_target(attackers, defenders, [100], list(mirror), 0)
+                assert indexed._select_target(attackers, defenders, own, mirror, 0) == expected
+
+
+def test_hp_mirror_counts_living_units():
+    hp = HpMirror([10, 0, 5])
+    assert hp.alive == 2
+    hp[0] = 0
+    hp[2] = 3
+    assert hp.alive == 1
+    hp[1] = 7
+    assert hp.alive == 2
+    hp[:] = [0, 0, 0]
+    assert hp.alive == 0
+    hp.append(4)
+    assert hp.alive == 1
@@ -0,0 +1,62 @@
+from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+from waffen_tactics.models.unit import Stats
+
+
+def make_unit(id, name, hp=100, attack=20, defense=10, attack_speed=1.0, effects=None, max_mana=100):
+    stats = Stats(attack=attack, hp=hp, defense=defense, max_mana=max_mana, attack_speed=attack_speed, mana_on_attack=10)
+    return CombatUnit(id=id, name=name, hp=hp, attack=attack, defense=defense, attack_speed=attack_speed, effects=effects or [], max_mana=max_mana, stats=stats)
+
+
+def run(team_a, team_b, scheduler='tick', timeout=3):
+    events = []
+    sim = CombatSimulator(dt=0.1, timeout=timeout, scheduler=scheduler)
+    sim.simulate(team_a, team_b, event_callback=lambda t, d: events.append((t, d)))
+    return sim, events
+
+
+def test_expirations_are_emitted_in_team_order():
+    a = [make_unit(f'a{i}', f'A{i}', hp=1000, attack=0, effects=[{'type': 'stun', 'id': f'e{i}', 'expires_at': 1.0}]) for i in range(3)]
+    b = [make_unit('b0', 'B0', hp=1000, attack=0, effects=[{'type': 'stun', 'id': 'eb', 'expires_at': 1.0}])]
+    _, events = run(a, b)
+    expired = [d.get('effect_id') for t, d in events if t == 'effect_expired']
+    assert expired == ['e0', 'e1', 'e2', 'eb']
+    assert all(not u.effects for u in a + b)
+
+
+def test_effects_added_mid_combat_are_queued():
+    unit = make_unit('a0', 'A0', hp=1000, attack=0)
+    enemy = make_unit('b0', 'B0', hp=1000, attack=0)
+    sim = CombatSimulator(dt=0.1, timeout=3)
+    events = []
+
+    def callback(event_type, data):
+        events.append((event_type, data))
+        if event_type == 'animation_start' and len(events) == 1:
+            # Emitters reassign the list; the new list must stay tracked
+            unit.effects = list(unit.effects) + [{'type': 'buff', 'id': 'late', 'expires_at': 1.5}]
+
+    sim.simulate([unit], [enemy], event_callback=callback)
+    expired = [d for t, d in events if t == 'effect_expired']
+    assert [d.get('effect_id') for d in expired] == ['late']
+    assert expired[0]['timestamp'] == 1.5
+
+
+def test_removed_effects_are_skipped_lazily():
+    effect = {'type': 'stun', 'id': 'gone', 'expires_at': 2.0}
+    unit = make_unit('a0', 'A0', hp=1000, attack=0, effects=[effect])
+    enemy = make_unit('b0', 'B0', hp=1000, attack=0)
+    sim = CombatSimulator(dt=0.1, timeout=3, scheduler='event')
+
+    def callback(event_type, data):
+        if event_type == 'animation_start' and effect in unit.effects:
+            unit.effects.remove(effect)
+
+    sim.simulate([unit], [enemy], event_callback=callback)
+    assert not any(entry[4] is effect for entry in sim._timed_effects)
+
+
+def test_listeners_are_detached_after_simulate():
+    unit = make_unit('a0', 'A0', hp=1000, attack=0)
+    enemy = make_unit('b0', 'B0', hp=1000, attack=0)
+    run([unit], [enemy])
+    assert unit.effects.listener is None and enemy.effects.listener is None
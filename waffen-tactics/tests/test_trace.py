@@ -0,0 +1,79 @@
+import pytest
+
+from waffen_tactics import trace
+
+
+@pytest.fixture
+def lines():
+    captured = []
+    trace.set_writer(captured.append)
+    yield captured
+    trace.configure(None)
+    trace.set_writer(None)
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted while disabled")
+
+
+def test_disabled_trace_does_not_format(lines):
+    trace.configure(None)
+    trace.debug('skills', "value=%s", Exploding())
+    trace.debug('skills', lambda: str(Exploding()))
+    assert lines == []
+    assert not trace.enabled('skills')
+
+
+def test_categories_and_levels(lines):
+    trace.configure('all:info,skills')
+    trace.debug('skills', "casting %s", 'Nova')
+    trace.debug('damage', "hidden")
+    trace.info('damage', "shown %d", 3)
+    trace.debug('effects', lambda: "lazy")
+    assert lines == ['[skills] casting Nova', '[damage] shown 3']
+
+
+def test_set_level_and_bad_level(lines):
+    trace.set_level('attack', 'debug')
+    assert trace.enabled('attack') and not trace.enabled('sim')
+    trace.set_level('attack', None)
+    assert not trace.enabled('attack')
+    with pytest.raises(ValueError):
+        trace.set_level('attack', 'loud')
+
+
+def test_simulator_final_hp_is_traced(lines):
+    from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+    from waffen_tactics.models.unit import Stats
+
+    def make_unit(id, hp):
+        stats = Stats(attack=30, hp=hp, defense=0, max_mana=100, attack_speed=1.0, mana_on_attack=10)
+        return CombatUnit(id=id, name=id, hp=hp, attack=30, defense=0, attack_speed=1.0, max_mana=100, stats=stats)
+
+    CombatSimulator(dt=0.1, timeout=5).simulate([make_unit('a', 200)], [make_unit('b', 50)])
+    assert lines == []
+    trace.configure('sim')
+    CombatSimulator(dt=0.1, timeout=5).simulate([make_unit('a', 200)], [make_unit('b', 50)])
+    assert len(lines) == 1 and lines[0].startswith('[sim] final hp a_hp=[')
+
+
+def test_warning_and_error_levels(lines):
+    trace.configure('attack:warning')
+    trace.debug('attack', "hidden")
+    trace.warning('attack', "missing=%s", ['post_hp'])
+    trace.error('attack', "raised %s", 'boom')
+    assert lines == ["[attack] missing=['post_hp']", '[attack] raised boom']
+
+
+def test_lethal_combat_writes_nothing_untraced(lines, capsys):
+    from waffen_tactics.services.combat_shared import CombatSimulator, CombatUnit
+    from waffen_tactics.models.unit import Stats
+
+    def make_unit(id, hp):
+        stats = Stats(attack=30, hp=hp, defense=0, max_mana=100, attack_speed=1.0, mana_on_attack=10)
+        return CombatUnit(id=id, name=id, hp=hp, attack=30, defense=0, attack_speed=1.0, max_mana=100, stats=stats)
+
+    result = CombatSimulator(dt=0.1, timeout=5).simulate([make_unit('a', 200)], [make_unit('b', 50)], event_callback=lambda *_: None)
+    assert result['winner'] == 'team_a'
+    assert lines == [] and capsys.readouterr().out == ''
@@ -0,0 +1,67 @@
+"""Tests for the cached combat-ready unit templates"""
+from waffen_tactics.models.player_state import PlayerState
+from waffen_tactics.services.data_loader import get_game_data
+from waffen_tactics.services.synergy import SynergyEngine
+from waffen_tactics.services.unit_templates import UnitTemplateCache, template_cache_for
+
+
+def _setup():
+    data = get_game_data()
+    engine = SynergyEngine(list(data.traits))
+    units = list(data.units[:5])
+    return engine, units, engine.compute(units)
+
+
+def test_cache_hit_returns_same_template():
+    engine, units, active = _setup()
+    cache = UnitTemplateCache(engine)
+    player = PlayerState(user_id=1, username='p', wins=3, losses=2)
+    first = cache.get(units[0], 2, active, player)
+    assert cache.get(units[0], 2, dict(active), PlayerState(user_id=2, username='q', wins=3, losses=2)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Wins, star level and synergies are all part of the key
+    assert cache.get(units[0], 2, active, PlayerState(user_id=1, username='p', wins=4, losses=2)) is not first
+    assert cache.get(units[0], 3, active, player) is not first
+    assert cache.get(units[0], 2, {}, player) is not first
+
+
+def test_template_matches_uncached_computation():
+    engine, units, active = _setup()
+    cache = UnitTemplateCache(engine)
+    player = PlayerState(user_id=1, username='p', wins=6, losses=1)
+    for unit in units:
+        template = cache.get(unit, 2, active, player)
+        base = {
+            'hp': int(unit.stats.hp * 1.6),
+            'attack': int(unit.stats.attack * 1.4),
+            'defense': int(unit.stats.defense),
+            'attack_speed': float(unit.stats.attack_speed),
+        }
+        expected = engine.apply_dynamic_effects(unit, engine.apply_stat_buffs(base, unit, active), active, player)
+        assert template.base_stats == base
+        assert template.stats == expected
+        assert list(template.effects) == engine.get_active_effects(unit, active)
+
+
+def test_spawned_units_do_not_share_state():
+    engine, units, active = _setup()
+    template = UnitTemplateCache(engine).get(units[0], 1, active)
+    stats = template.buffed_stats({'attack': 7, 'unknown': 1})
+    assert stats['attack'] == template.stats['attack'] + 7
+    assert 'unknown' not in stats
+
+    a = template.spawn('a', 'front', stats)
+    b = template.spawn('b', 'back')
+    a.effects.append({'type': 'buff', 'stat': 'attack', 'value': 1})
+    assert len(b.effects) == len(template.effects)
+    assert (a.attack, b.attack) == (stats['attack'], template.stats['attack'])
+    assert (a.position, b.position) == ('front', 'back')
+    if template.skill:
+        assert a.skill == template.skill and a.skill is not template.skill
+
+
+def test_template_cache_for_is_per_engine():
+    engine, _, _ = _setup()
+    other = SynergyEngine([])
+    assert template_cache_for(engine) is template_cache_for(engine)
+    assert template_cache_for(engine) is not template_cache_for(other)